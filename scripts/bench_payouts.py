@@ -0,0 +1,80 @@
+"""Benchmark scalar vs vectorized settlement payouts.
+
+Usage:
+    python scripts/bench_payouts.py [--sizes 1000,10000,100000,1000000] [--repeat 3]
+
+Prints the best-of-N wall time for ``calculate_payout`` applied per site and
+for one ``calculate_payouts`` call, and checks that both give the same result.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.scorer import calculate_payout, calculate_payouts  # noqa: E402
+
+REWARD_RATE = 10
+PENALTY_RATE = 5
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark settlement payout scoring")
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000,1000000",
+        help="comma-separated site counts",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (best is kept)")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def best_of(repeat: int, fn) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    args = parse_args()
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'sites':>10} {'scalar_s':>10} {'vector_s':>10} {'speedup':>8}")
+    for size in sizes:
+        reductions = rng.integers(0, 400, size=size, dtype=np.int64)
+        target_share = 250
+        reduction_list = reductions.tolist()
+
+        scalar_s, scalar = best_of(
+            args.repeat,
+            lambda: [
+                calculate_payout(r, target_share, REWARD_RATE, PENALTY_RATE)
+                for r in reduction_list
+            ],
+        )
+        vector_s, vector = best_of(
+            args.repeat,
+            lambda: calculate_payouts(reductions, target_share, REWARD_RATE, PENALTY_RATE),
+        )
+        if vector.tolist() != scalar:
+            print(f"[bench] FAIL: results differ at {size} sites")
+            sys.exit(1)
+        print(f"{size:>10} {scalar_s:>10.4f} {vector_s:>10.4f} {scalar_s / vector_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@
 const fs = require("node:fs");
 const path = require("node:path");
 const { ethers } = require("ethers");
+const { cachedForFile, errorMessage, runCli } = require("./chain_action_runtime");
 
 const DEFAULT_DEPLOY_OUT = "cache/fuji-bridge-deployment-latest.json";
 const VALID_CONFIRM_MODES = new Set(["sync", "hybrid"]);
@@ -22,16 +23,6 @@ function readJson(filePath) {
   return JSON.parse(fs.readFileSync(filePath, "utf-8"));
 }
 
-function readStdin() {
-  return new Promise((resolve, reject) => {
-    let data = "";
-    process.stdin.setEncoding("utf-8");
-    process.stdin.on("data", (chunk) => { data += chunk; });
-    process.stdin.on("end", () => { resolve(data.trim()); });
-    process.stdin.on("error", reject);
-  });
-}
-
 function loadAbi(relativeArtifactPath) {
   const absolutePath = path.resolve(process.cwd(), relativeArtifactPath);
   const artifact = readJson(absolutePath);
@@ -159,8 +150,12 @@ function requirePrivateKey() {
   return privateKey;
 }
 
+function deploymentOut() {
+  return process.env.BRIDGE_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+}
+
 function resolveDeployment() {
-  const deployOut = process.env.BRIDGE_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+  const deployOut = deploymentOut();
   const deployPath = path.resolve(process.cwd(), deployOut);
   if (!fs.existsSync(deployPath)) {
     throw new Error(`Bridge deployment report not found: ${deployOut}`);
@@ -173,43 +168,59 @@ function resolveDeployment() {
   return { deployOut, contracts };
 }
 
-async function main() {
-  const action = process.argv[2] || "";
+async function connect(ctx) {
+  if (!ctx.provider) {
+    const rpcUrl = process.env.BRIDGE_RPC_URL;
+    if (!rpcUrl) {
+      throw new Error("BRIDGE_RPC_URL is required for bridge chain action");
+    }
+    const provider = new ethers.JsonRpcProvider(rpcUrl);
+    const network = await provider.getNetwork();
+    ctx.provider = provider;
+    ctx.chainName = `bridge:${network.chainId.toString()}`;
+  }
+  return ctx;
+}
+
+function loadBridge(ctx) {
+  const deployPath = path.resolve(process.cwd(), deploymentOut());
+  return cachedForFile(ctx, "bridge", deployPath, () => {
+    const { contracts } = resolveDeployment();
+    const privateKey = requirePrivateKey();
+    const wallet = new ethers.Wallet(privateKey, ctx.provider);
+    const bridgeAbi = loadAbi("artifacts/contracts/DRTBridge.sol/DRTBridge.json");
+    return new ethers.Contract(contracts.bridge, bridgeAbi, wallet);
+  });
+}
+
+async function runAction(action, requestedConfirmMode, payload, ctx) {
   if (!action) {
     throw new Error(
-      "Missing action. Expected: send_tokens | receive_tokens | set_remote_bridge | check_tx"
+      "Missing action. Expected: send_tokens | receive_tokens | set_remote_bridge | check_tx | check_txs"
     );
   }
 
   const confirmMode = normalizeConfirmMode(
-    process.argv[3] || process.env.DR_TX_CONFIRM_MODE || "hybrid"
+    requestedConfirmMode || process.env.DR_TX_CONFIRM_MODE || "hybrid"
   );
-  const payloadRaw = await readStdin();
-  const payload = payloadRaw ? JSON.parse(payloadRaw) : {};
+  const { provider, chainName } = await connect(ctx);
 
-  const rpcUrl = process.env.BRIDGE_RPC_URL;
-  if (!rpcUrl) {
-    throw new Error("BRIDGE_RPC_URL is required for bridge chain action");
+  if (action === "check_txs") {
+    // Receipts are requested concurrently so the provider can coalesce them
+    // into a single JSON-RPC batch.
+    const txHashes = Array.isArray(payload.tx_hashes) ? payload.tx_hashes : [];
+    const results = await Promise.all(
+      txHashes.map((txHash) => checkTx(provider, String(txHash || ""), chainName))
+    );
+    return { ok: true, action, confirm_mode: confirmMode, results };
   }
 
-  const provider = new ethers.JsonRpcProvider(rpcUrl);
-  const network = await provider.getNetwork();
-  const chainName = `bridge:${network.chainId.toString()}`;
-
   if (action === "check_tx") {
     const txInfo = await checkTx(provider, String(payload.tx_hash || ""), chainName);
-    process.stdout.write(
-      `${JSON.stringify({ ok: true, action, confirm_mode: confirmMode, ...txInfo })}\n`
-    );
-    return;
+    return { ok: true, action, confirm_mode: confirmMode, ...txInfo };
   }
 
-  const { contracts } = resolveDeployment();
-  const privateKey = requirePrivateKey();
-  const wallet = new ethers.Wallet(privateKey, provider);
-
-  const bridgeAbi = loadAbi("artifacts/contracts/DRTBridge.sol/DRTBridge.json");
-  const bridge = new ethers.Contract(contracts.bridge, bridgeAbi, wallet);
+  const bridge = loadBridge(ctx);
 
   if (action === "send_tokens") {
     const amount = payload.amount;
@@ -217,8 +228,7 @@ async function main() {
       throw new Error("send_tokens requires amount");
     }
     const txInfo = await sendTx(bridge.sendTokens(amount), chainName, confirmMode);
-    process.stdout.write(`${JSON.stringify({ ok: true, action, ...txInfo })}\n`);
-    return;
+    return { ok: true, action, ...txInfo };
   }
 
   if (action === "receive_tokens") {
@@ -234,8 +244,7 @@ async function main() {
       chainName,
       confirmMode
     );
-    process.stdout.write(`${JSON.stringify({ ok: true, action, ...txInfo })}\n`);
-    return;
+    return { ok: true, action, ...txInfo };
   }
 
   if (action === "set_remote_bridge") {
@@ -249,15 +258,13 @@ async function main() {
       chainName,
       confirmMode
     );
-    process.stdout.write(`${JSON.stringify({ ok: true, action, ...txInfo })}\n`);
-    return;
+    return { ok: true, action, ...txInfo };
   }
 
   throw new Error(`Unsupported action: ${action}`);
 }
 
-main().catch((err) => {
-  const message = err instanceof Error ? err.message : String(err);
-  console.error("[bridge-action] failed:", message);
+runCli(runAction, (err) => {
+  console.error("[bridge-action] failed:", errorMessage(err));
   process.exit(1);
 });
@@ -0,0 +1,104 @@
+"use strict";
+
+/**
+ * Shared CLI runtime for the *_chain_action.js scripts.
+ *
+ * One-shot mode (default):
+ *   node <script> <action> [confirm_mode] < payload.json
+ *   Prints a single JSON line on stdout and exits.
+ *
+ * Worker mode:
+ *   node <script> --serve
+ *   Reads line-delimited JSON requests {id, action, confirm_mode, payload}
+ *   from stdin and answers each one with a single JSON line {id, ok, ...}.
+ *   Requests are handled one at a time. The `ctx` object passed to the
+ *   handler lives as long as the process, so providers, wallets and
+ *   contract handles are created once and reused across requests.
+ *   Handles built from a deployment report go through `cachedForFile`,
+ *   which rebuilds them when the report is rewritten (e.g. a redeploy).
+ *   Signing actions are serialized by services/chain_worker.py, since
+ *   every worker signs with the same PRIVATE_KEY.
+ *   The built-in `ping` action is used by services/chain_worker.py for
+ *   health checks.
+ */
+
+const fs = require("node:fs");
+const readline = require("node:readline");
+
+const SERVE_FLAG = "--serve";
+
+function readStdin() {
+  return new Promise((resolve, reject) => {
+    let data = "";
+    process.stdin.setEncoding("utf-8");
+    process.stdin.on("data", (chunk) => {
+      data += chunk;
+    });
+    process.stdin.on("end", () => {
+      resolve(data.trim());
+    });
+    process.stdin.on("error", reject);
+  });
+}
+
+function errorMessage(err) {
+  return err && err.message ? err.message : String(err);
+}
+
+function writeLine(output) {
+  process.stdout.write(`${JSON.stringify(output)}\n`);
+}
+
+/**
+ * Return `ctx[key]`, calling `build()` again whenever `filePath` has been
+ * modified, replaced or removed since the cached value was built.
+ */
+function cachedForFile(ctx, key, filePath, build) {
+  const stat = fs.statSync(filePath, { throwIfNoEntry: false });
+  const version = stat ? `${stat.mtimeMs}:${stat.size}:${stat.ino}` : "missing";
+  const entry = ctx[key];
+  if (entry && entry.version === version) {
+    return entry.value;
+  }
+  const value = build();
+  ctx[key] = { version, value };
+  return value;
+}
+
+async function runOnce(handler) {
+  const action = process.argv[2] || "";
+  const confirmMode = process.argv[3];
+  const payloadRaw = await readStdin();
+  const payload = payloadRaw ? JSON.parse(payloadRaw) : {};
+  writeLine(await handler(action, confirmMode, payload, {}));
+}
+
+async function serve(handler) {
+  const ctx = {};
+  const lines = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    const raw = line.trim();
+    if (!raw) continue;
+    let id = null;
+    try {
+      const request = JSON.parse(raw);
+      id = request.id != null ? request.id : null;
+      const action = String(request.action || "");
+      if (action === "ping") {
+        writeLine({ id, ok: true, action, pid: process.pid });
+        continue;
+      }
+      const output = await handler(action, request.confirm_mode, request.payload || {}, ctx);
+      writeLine({ ...output, id });
+    } catch (err) {
+      writeLine({ id, ok: false, error: errorMessage(err) });
+    }
+  }
+}
+
+function runCli(handler, onError) {
+  const run = process.argv[2] === SERVE_FLAG ? serve(handler) : runOnce(handler);
+  run.catch(onError);
+}
+
+module.exports = { cachedForFile, errorMessage, runCli };
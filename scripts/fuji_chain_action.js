@@ -4,6 +4,7 @@
 const fs = require("node:fs");
 const path = require("node:path");
 const { ethers } = require("ethers");
+const { cachedForFile, errorMessage, runCli } = require("./chain_action_runtime");
 
 const DEFAULT_RPC_URL = "https://api.avax-test.network/ext/bc/C/rpc";
 const DEFAULT_DEPLOY_OUT = "cache/fuji-deployment-latest.json";
@@ -13,20 +14,6 @@ function readJson(filePath) {
   return JSON.parse(fs.readFileSync(filePath, "utf-8"));
 }
 
-function readStdin() {
-  return new Promise((resolve, reject) => {
-    let data = "";
-    process.stdin.setEncoding("utf-8");
-    process.stdin.on("data", (chunk) => {
-      data += chunk;
-    });
-    process.stdin.on("end", () => {
-      resolve(data.trim());
-    });
-    process.stdin.on("error", reject);
-  });
-}
-
 function loadAbi(relativeArtifactPath) {
   const absolutePath = path.resolve(process.cwd(), relativeArtifactPath);
   const artifact = readJson(absolutePath);
@@ -214,8 +201,12 @@ function requirePrivateKey() {
   return privateKey;
 }
 
+function deploymentOut() {
+  return process.env.DR_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+}
+
 function resolveDeployment() {
-  const deployOut = process.env.DR_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+  const deployOut = deploymentOut();
   const deployPath = path.resolve(process.cwd(), deployOut);
   if (!fs.existsSync(deployPath)) {
     throw new Error(`Deployment report not found: ${deployOut}`);
@@ -233,56 +224,78 @@ function resolveDeployment() {
   };
 }
 
-async function main() {
-  const action = process.argv[2] || "";
+async function connect(ctx) {
+  if (!ctx.provider) {
+    const rpcUrl = process.env.DR_FUJI_RPC_URL || DEFAULT_RPC_URL;
+    const provider = new ethers.JsonRpcProvider(rpcUrl);
+    const network = await provider.getNetwork();
+    ctx.provider = provider;
+    ctx.chainName = `fuji:${network.chainId.toString()}`;
+  }
+  return ctx;
+}
+
+function loadContracts(ctx) {
+  const deployPath = path.resolve(process.cwd(), deploymentOut());
+  return cachedForFile(ctx, "contracts", deployPath, () => {
+    const privateKey = requirePrivateKey();
+    const { deployOut, contracts } = resolveDeployment();
+    const wallet = new ethers.Wallet(privateKey, ctx.provider);
+    return {
+      deployOut,
+      wallet,
+      eventManager: new ethers.Contract(
+        contracts.event_manager,
+        loadAbi("artifacts/contracts/EventManager.sol/EventManager.json"),
+        wallet
+      ),
+      proofRegistry: new ethers.Contract(
+        contracts.proof_registry,
+        loadAbi("artifacts/contracts/ProofRegistry.sol/ProofRegistry.json"),
+        wallet
+      ),
+      settlement: new ethers.Contract(
+        contracts.settlement,
+        loadAbi("artifacts/contracts/Settlement.sol/Settlement.json"),
+        wallet
+      ),
+    };
+  });
+}
+
+async function runAction(action, requestedConfirmMode, payload, ctx) {
   if (!action) {
     throw new Error(
-      "Missing action. Expected one of: create_event | close_event | submit_proof | settle_event | claim_reward | check_tx"
+      "Missing action. Expected one of: create_event | close_event | submit_proof | settle_event | claim_reward | check_tx | check_txs"
     );
   }
 
   const confirmMode = normalizeConfirmMode(
-    process.argv[3] || process.env.DR_TX_CONFIRM_MODE || "hybrid"
+    requestedConfirmMode || process.env.DR_TX_CONFIRM_MODE || "hybrid"
   );
-  const payloadRaw = await readStdin();
-  const payload = payloadRaw ? JSON.parse(payloadRaw) : {};
-  const rpcUrl = process.env.DR_FUJI_RPC_URL || DEFAULT_RPC_URL;
-
-  const provider = new ethers.JsonRpcProvider(rpcUrl);
-  const network = await provider.getNetwork();
-  const chainName = `fuji:${network.chainId.toString()}`;
+  const { provider, chainName } = await connect(ctx);
+
+  if (action === "check_txs") {
+    // Receipts are requested concurrently so the provider can coalesce them
+    // into a single JSON-RPC batch.
+    const txHashes = Array.isArray(payload.tx_hashes) ? payload.tx_hashes : [];
+    const results = await Promise.all(
+      txHashes.map((txHash) => checkTx(provider, String(txHash || ""), chainName))
+    );
+    return { ok: true, action, confirm_mode: confirmMode, results };
+  }
 
   if (action === "check_tx") {
     const txInfo = await checkTx(provider, String(payload.tx_hash || ""), chainName);
-    process.stdout.write(
-      `${JSON.stringify({
-        ok: true,
-        action,
-        confirm_mode: confirmMode,
-        ...txInfo,
-      })}\n`
-    );
-    return;
+    return {
+      ok: true,
+      action,
+      confirm_mode: confirmMode,
+      ...txInfo,
+    };
   }
 
-  const privateKey = requirePrivateKey();
-  const { deployOut, contracts } = resolveDeployment();
-  const wallet = new ethers.Wallet(privateKey, provider);
-  const eventManager = new ethers.Contract(
-    contracts.event_manager,
-    loadAbi("artifacts/contracts/EventManager.sol/EventManager.json"),
-    wallet
-  );
-  const proofRegistry = new ethers.Contract(
-    contracts.proof_registry,
-    loadAbi("artifacts/contracts/ProofRegistry.sol/ProofRegistry.json"),
-    wallet
-  );
-  const settlement = new ethers.Contract(
-    contracts.settlement,
-    loadAbi("artifacts/contracts/Settlement.sol/Settlement.json"),
-    wallet
-  );
+  const { deployOut, wallet, eventManager, proofRegistry, settlement } = loadContracts(ctx);
 
   let txInfo;
   if (action === "create_event") {
@@ -365,22 +378,20 @@ async function main() {
     throw new Error(`Unsupported action: ${action}`);
   }
 
-  process.stdout.write(
-    `${JSON.stringify({
-      ok: true,
-      action,
-      confirm_mode: confirmMode,
-      deploy_out: deployOut,
-      from: wallet.address,
-      ...txInfo,
-    })}\n`
-  );
+  return {
+    ok: true,
+    action,
+    confirm_mode: confirmMode,
+    deploy_out: deployOut,
+    from: wallet.address,
+    ...txInfo,
+  };
 }
 
-main().catch((err) => {
+runCli(runAction, (err) => {
   const output = {
     ok: false,
-    error: err && err.message ? err.message : String(err),
+    error: errorMessage(err),
   };
   process.stderr.write(`${JSON.stringify(output)}\n`);
   process.exit(1);
@@ -14,6 +14,7 @@
 const fs = require("node:fs");
 const path = require("node:path");
 const { ethers } = require("ethers");
+const { cachedForFile, errorMessage, runCli } = require("./chain_action_runtime");
 
 const DEFAULT_DEPLOY_OUT = "cache/l1-bridge-deployment-latest.json";
 const VALID_CONFIRM_MODES = new Set(["sync", "hybrid"]);
@@ -22,16 +23,6 @@ function readJson(filePath) {
   return JSON.parse(fs.readFileSync(filePath, "utf-8"));
 }
 
-function readStdin() {
-  return new Promise((resolve, reject) => {
-    let data = "";
-    process.stdin.setEncoding("utf-8");
-    process.stdin.on("data", (chunk) => { data += chunk; });
-    process.stdin.on("end", () => { resolve(data.trim()); });
-    process.stdin.on("error", reject);
-  });
-}
-
 function loadAbi(relativeArtifactPath) {
   const absolutePath = path.resolve(process.cwd(), relativeArtifactPath);
   const artifact = readJson(absolutePath);
@@ -141,8 +132,12 @@ function toPayloadBytes(payload) {
   return ethers.toUtf8Bytes(JSON.stringify(payload));
 }
 
+function deploymentOut() {
+  return process.env.ICM_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+}
+
 function resolveDeployment() {
-  const deployOut = process.env.ICM_DEPLOY_OUT || DEFAULT_DEPLOY_OUT;
+  const deployOut = deploymentOut();
   const deployPath = path.resolve(process.cwd(), deployOut);
   if (!fs.existsSync(deployPath)) {
     throw new Error(`ICM deployment report not found: ${deployOut}`);
@@ -155,36 +150,44 @@ function resolveDeployment() {
   return { deployOut, contracts };
 }
 
-async function main() {
-  const action = process.argv[2] || "";
+async function connect(ctx) {
+  if (!ctx.provider) {
+    const rpcUrl = process.env.ICM_RPC_URL;
+    if (!rpcUrl) {
+      throw new Error("ICM_RPC_URL is required for icm chain action");
+    }
+    const provider = new ethers.JsonRpcProvider(rpcUrl);
+    const network = await provider.getNetwork();
+    ctx.provider = provider;
+    ctx.chainName = `icm:${network.chainId.toString()}`;
+  }
+  return ctx;
+}
+
+function loadRelayer(ctx) {
+  const deployPath = path.resolve(process.cwd(), deploymentOut());
+  return cachedForFile(ctx, "relayer", deployPath, () => {
+    const { contracts } = resolveDeployment();
+    const privateKey = process.env.PRIVATE_KEY || "";
+    if (!privateKey) {
+      throw new Error("PRIVATE_KEY is required for icm chain action");
+    }
+    const wallet = new ethers.Wallet(privateKey, ctx.provider);
+    const relayerAbi = loadAbi("artifacts/contracts/ICMRelayer.sol/ICMRelayer.json");
+    return new ethers.Contract(contracts.icm_relayer, relayerAbi, wallet);
+  });
+}
+
+async function runAction(action, requestedConfirmMode, payload, ctx) {
   if (!action) {
     throw new Error("Missing action. Expected: receive_message | mark_processed");
   }
 
   const confirmMode = normalizeConfirmMode(
-    process.argv[3] || process.env.DR_TX_CONFIRM_MODE || "hybrid"
+    requestedConfirmMode || process.env.DR_TX_CONFIRM_MODE || "hybrid"
   );
-  const payloadRaw = await readStdin();
-  const payload = payloadRaw ? JSON.parse(payloadRaw) : {};
-
-  const rpcUrl = process.env.ICM_RPC_URL;
-  if (!rpcUrl) {
-    throw new Error("ICM_RPC_URL is required for icm chain action");
-  }
-
-  const provider = new ethers.JsonRpcProvider(rpcUrl);
-  const network = await provider.getNetwork();
-  const chainName = `icm:${network.chainId.toString()}`;
-
-  const { contracts } = resolveDeployment();
-  const privateKey = process.env.PRIVATE_KEY || "";
-  if (!privateKey) {
-    throw new Error("PRIVATE_KEY is required for icm chain action");
-  }
-  const wallet = new ethers.Wallet(privateKey, provider);
-
-  const relayerAbi = loadAbi("artifacts/contracts/ICMRelayer.sol/ICMRelayer.json");
-  const relayer = new ethers.Contract(contracts.icm_relayer, relayerAbi, wallet);
+  const { chainName } = await connect(ctx);
+  const relayer = loadRelayer(ctx);
 
   if (action === "receive_message") {
     const sourceChainId = resolveBytes32(payload.source_chain_id);
@@ -200,23 +203,20 @@ async function main() {
       chainName,
       confirmMode
     );
-    process.stdout.write(`${JSON.stringify({ ok: true, action, ...txInfo })}\n`);
-    return;
+    return { ok: true, action, ...txInfo };
   }
 
   if (action === "mark_processed") {
     const messageId = resolveBytes32(payload.message_id);
     const success = payload.success !== false;
     const txInfo = await sendTx(relayer.markProcessed(messageId, success), chainName, confirmMode);
-    process.stdout.write(`${JSON.stringify({ ok: true, action, ...txInfo })}\n`);
-    return;
+    return { ok: true, action, ...txInfo };
   }
 
   throw new Error(`Unsupported action: ${action}`);
 }
 
-main().catch((err) => {
-  const message = err instanceof Error ? err.message : String(err);
-  console.error("[icm-action] failed:", message);
+runCli(runAction, (err) => {
+  console.error("[icm-action] failed:", errorMessage(err));
   process.exit(1);
 });
@@ -8,7 +8,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 import pandas as pd
 
 from services.collector import generate_load_data
-from services.baseline import compute_baseline_simple, compute_baseline_prophet
+from services.baseline import (
+    compute_baseline_prophet,
+    compute_baseline_simple,
+    default_model_cache,
+)
+
+SITE_ID = "demo-site"
 
 
 def main():
@@ -38,8 +44,10 @@ def main():
 
     # Method 2: Prophet forecast
     print("\n[Prophet] Training model (this may take a moment)...")
-    prophet = compute_baseline_prophet(history, event_start, event_end)
+    prophet = compute_baseline_prophet(history, event_start, event_end, site_id=SITE_ID)
     print(f"[Prophet] Forecast baseline: {prophet:.2f} kW")
+    compute_baseline_prophet(history, event_start, event_end, site_id=SITE_ID)
+    print(f"[Prophet] Model cache after a repeat run: {default_model_cache().stats()}")
 
     # Comparison
     diff = prophet - simple
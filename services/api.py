@@ -4,17 +4,22 @@ from __future__ import annotations
 
 import os
 import uuid
+import warnings
+from contextlib import asynccontextmanager
 from typing import Any, Callable
 
-from fastapi import Body, Depends, FastAPI, Request
+from fastapi import Body, Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from fastapi.responses import JSONResponse
 
 import pandas as pd
 
-from services.baseline_engine import BaselineEngine
+from services.baseline_engine import BaselineEngine, BaselineResult
 from services.bridge import BridgeDirection, BridgeService
+from services.chain_worker import chain_worker_health
+from services.db import open_storage
+from services.dispatch import Dispatcher
 from services.dto import (
     AgentAnomalyRequest,
     AgentInsightRequest,
@@ -22,10 +27,13 @@ from services.dto import (
     AgentStatusResponse,
     AnomalyReport,
     AuditDTO,
+    BaselineBatchRequest,
+    BaselineBatchResponse,
     BaselineCompareRequest,
     BaselineCompareResponse,
     BaselineMethodsResponse,
     BaselineResultDTO,
+    BaselineSiteResultDTO,
     BridgeStatsDTO,
     BridgeTransferCreateRequest,
     BridgeSourceSubmittedRequest,
@@ -45,6 +53,7 @@ from services.dto import (
     ICMMessageDTO,
     ICMStatsDTO,
     JudgeSummaryDTO,
+    MeterIngestResponse,
     ProofDTO,
     ProofSubmitRequest,
     SettleRequest,
@@ -52,8 +61,11 @@ from services.dto import (
 )
 from services.agent import AgentService
 from services.icm import ICMService, MessageType
+from services.meter_ingest import INGEST_FORMATS, MeterIngest
+from services.meter_store import MeterStore, parse_timezone
 from services.submitter import ServiceError, SubmitterService
-from services.task_queue import InMemoryTaskQueue, TaskType
+from services.task_queue import TaskStatus, TaskType, create_task_queue
+from services.task_worker import TaskWorker, service_batch_handlers, service_handlers
 
 
 def _cors_origins() -> list[str]:
@@ -121,6 +133,10 @@ async def _icm_service(request: Request) -> ICMService:
     return request.app.state.icm
 
 
+async def _meter_store(request: Request) -> MeterStore:
+    return request.app.state.meter_store
+
+
 async def _task_queue(request: Request):
     return request.app.state.task_queue
 
@@ -153,6 +169,84 @@ def _required_sites(chain_mode: str) -> list[str]:
     return ["site-a", "site-b"]
 
 
+def _ingest_format(content_type: str | None) -> str | None:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in {"", "application/x-ndjson", "application/jsonl", "application/json"}:
+        return "ndjson"
+    if media_type in {"text/csv", "application/csv"}:
+        return "csv"
+    return None
+
+
+def _task_not_before(value: Any) -> float | None:
+    """``not_before`` as epoch seconds: a number as-is, a string as ISO 8601 (UTC if naive)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        ts = pd.NaT
+    if pd.isna(ts):
+        raise ServiceError(422, "INVALID_TIMESTAMP", "not_before is not a valid timestamp")
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.timestamp()
+
+
+def _invalid_timestamp_site(site_ids: list[str], timestamps: list[str]) -> str | None:
+    """Site of the first row whose timestamp does not parse, if any."""
+    parsed = pd.to_datetime(pd.Series(timestamps, dtype=object), errors="coerce", utc=True)
+    invalid = parsed.isna().to_numpy()
+    return site_ids[int(invalid.argmax())] if invalid.any() else None
+
+
+def _compare_history(
+    engine: BaselineEngine, history: list[dict[str, Any]], event_hour: int
+) -> list[BaselineResult]:
+    return engine.compute_all(pd.DataFrame(history), event_hour)
+
+
+def _mixed_offset_site(site_ids: list[str], timestamps: list[str]) -> str | None:
+    """Site of the first row whose UTC offset differs from the first row's, if any.
+
+    ``BaselineEngine`` buckets by wall-clock hour, so the batch must share
+    one offset; pandas returns an object column instead of a datetime one
+    when it does not.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        try:
+            parsed = pd.to_datetime(pd.Series(timestamps, dtype=object), errors="coerce")
+        except ValueError:
+            parsed = None
+    if parsed is not None and parsed.dtype != object:
+        return None
+    offsets = [pd.Timestamp(ts).utcoffset() for ts in timestamps]
+    for site_id, offset in zip(site_ids, offsets):
+        if offset != offsets[0]:
+            return site_id
+    return None
+
+
+def _task_worker_enabled() -> bool:
+    return os.getenv("DR_TASK_WORKER", "inline").strip().lower() != "off"
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    worker = app.state.task_worker
+    if worker is not None:
+        worker.start()
+    try:
+        yield
+    finally:
+        if worker is not None:
+            await worker.stop()
+        app.state.dispatcher.shutdown()
+
+
 def _require_idempotency_key(request: Request) -> str:
     key = (request.headers.get("Idempotency-Key") or "").strip()
     if not key:
@@ -214,12 +308,35 @@ def _icm_status_order(status: str) -> int:
 
 
 def create_app(db_path: str | None = None) -> FastAPI:
-    app = FastAPI(title="DR Agent API", version="0.1.0")
-    app.state.submitter = SubmitterService(db_path=db_path)
-    app.state.bridge = BridgeService(db_path=db_path)
-    app.state.icm = ICMService(db_path=db_path)
-    app.state.task_queue = InMemoryTaskQueue()
+    app = FastAPI(title="DR Agent API", version="0.1.0", lifespan=_lifespan)
+    # One storage context for the whole app: the database is opened and
+    # migrated once and every service shares its writer and readers.
+    app.state.db = db = open_storage(db_path)
+    app.state.submitter = SubmitterService(db=db)
+    app.state.bridge = BridgeService(db=db)
+    app.state.icm = ICMService(db=db)
+    app.state.meter_store = MeterStore(db=db)
+    app.state.task_queue = create_task_queue(db=db)
     app.state.agent_service = AgentService()
+    app.state.dispatcher = dispatch = Dispatcher()
+    # Runs queued tasks inside the API process unless DR_TASK_WORKER=off
+    # (then ``python -m services.worker`` runs them).
+    app.state.task_worker = (
+        TaskWorker(
+            app.state.task_queue,
+            service_handlers(
+                app.state.submitter,
+                app.state.bridge,
+                app.state.icm,
+                run_chain=dispatch.chain,
+                run_db=dispatch.db,
+            ),
+            batch_handlers=service_batch_handlers(app.state.submitter, run_chain=dispatch.chain),
+            run_blocking=dispatch.db,
+        )
+        if _task_worker_enabled()
+        else None
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=_cors_origins(),
@@ -270,6 +387,11 @@ def create_app(db_path: str | None = None) -> FastAPI:
             "tx_confirm_mode": _tx_confirm_mode(),
             "demo_site_mode": os.getenv("DR_DEMO_SITE_MODE", "dual"),
             "required_sites": _required_sites(mode),
+            "dispatch": dispatch.health(),
+            "chain_workers": chain_worker_health(),
+            "task_worker": (
+                app.state.task_worker.health() if app.state.task_worker is not None else None
+            ),
         }
 
     @app.post("/events", response_model=EventDTO)
@@ -278,7 +400,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.create_event(payload)
+        return await dispatch.chain(svc.create_event, payload)
 
     @app.post("/events/{event_id}/close", response_model=EventDTO)
     async def close_event(
@@ -286,7 +408,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.close_event(event_id)
+        return await dispatch.chain(svc.close_event, event_id)
 
     @app.post("/proofs", response_model=ProofDTO)
     async def submit_proof(
@@ -295,7 +417,12 @@ def create_app(db_path: str | None = None) -> FastAPI:
         actor_id: str = Depends(_actor_id),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.submit_proof(payload, actor_id=actor_id)
+        await svc.wait_for_create_confirmation(
+            payload.event_id, run_chain=dispatch.chain, run_db=dispatch.db
+        )
+        return await dispatch.chain(
+            svc.submit_proof, payload, actor_id=actor_id, create_confirmed=True
+        )
 
     @app.post("/settle/{event_id}", response_model=list[SettlementDTO])
     async def settle_event(
@@ -304,7 +431,12 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.settle_event(event_id=event_id, site_ids=payload.site_ids)
+        await svc.wait_for_close_confirmation(
+            event_id, run_chain=dispatch.chain, run_db=dispatch.db
+        )
+        return await dispatch.chain(
+            svc.settle_event, event_id=event_id, site_ids=payload.site_ids, close_confirmed=True
+        )
 
     @app.post("/claim/{event_id}/{site_id}", response_model=SettlementDTO)
     async def claim_reward(
@@ -314,7 +446,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
         actor_id: str = Depends(_actor_id),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.claim_reward(event_id=event_id, site_id=site_id, actor_id=actor_id)
+        return await dispatch.chain(
+            svc.claim_reward, event_id=event_id, site_id=site_id, actor_id=actor_id
+        )
 
     @app.get("/events/{event_id}", response_model=EventDTO)
     async def get_event(
@@ -322,7 +456,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "participant", "auditor")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.get_event(event_id)
+        return await dispatch.chain(svc.get_event, event_id)
 
     @app.get("/events/{event_id}/records", response_model=list[SettlementDTO])
     async def get_records(
@@ -330,7 +464,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "auditor")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.list_settlements(event_id)
+        return await dispatch.chain(svc.list_settlements, event_id)
 
     @app.get("/audit/{event_id}/{site_id}", response_model=AuditDTO)
     async def get_audit(
@@ -339,7 +473,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "auditor")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.get_audit(event_id, site_id)
+        return await dispatch.db(svc.get_audit, event_id, site_id)
 
     @app.get("/system/chain-mode")
     async def get_chain_mode(
@@ -359,7 +493,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "participant", "auditor")),
         svc: SubmitterService = Depends(_service),
     ):
-        return svc.get_judge_summary(event_id=event_id, network_mode=_chain_mode())
+        return await dispatch.chain(
+            svc.get_judge_summary, event_id=event_id, network_mode=_chain_mode()
+        )
 
     @app.post("/v1/bridge/transfers", response_model=BridgeTransferDTO)
     async def create_bridge_transfer(
@@ -369,7 +505,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         svc: BridgeService = Depends(_bridge_service),
     ):
         direction = BridgeDirection(payload.direction)
-        existing = svc.get_by_idempotency(idem_key)
+        existing = await dispatch.db(svc.get_by_idempotency, idem_key)
         if existing:
             if (
                 existing.sender != payload.sender
@@ -382,7 +518,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
                     "Idempotency-Key already used with different payload",
                 )
             return _bridge_to_dto(existing)
-        transfer = svc.initiate_transfer(
+        transfer = await dispatch.db(
+            svc.initiate_transfer,
             sender=payload.sender,
             amount_wei=payload.amount_wei,
             direction=direction,
@@ -395,7 +532,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        return [_bridge_to_dto(t) for t in svc.list_pending_transfers()]
+        transfers = await dispatch.db(svc.list_pending_transfers)
+        return [_bridge_to_dto(t) for t in transfers]
 
     @app.post(
         "/v1/bridge/transfers/{transfer_id}/source-submitted",
@@ -408,7 +546,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if transfer.source_tx_hash and transfer.source_tx_hash != payload.source_tx_hash:
@@ -419,7 +557,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
             )
         if _bridge_status_order(transfer.status) >= _bridge_status_order("source_submitted"):
             return _bridge_to_dto(transfer)
-        updated = svc.mark_source_submitted(transfer_id, payload.source_tx_hash)
+        updated = await dispatch.db(
+            svc.mark_source_submitted, transfer_id, payload.source_tx_hash
+        )
         return _bridge_to_dto(updated)
 
     @app.post(
@@ -433,19 +573,23 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if transfer.status != "initiated":
             return _bridge_to_dto(transfer)
         try:
-            tx_out = svc.send_bridge_tokens(transfer_id, payload.amount_wei)
+            tx_out = await dispatch.chain(
+                svc.send_bridge_tokens, transfer_id, payload.amount_wei
+            )
             tx_hash = tx_out.get("tx_hash")
             if not tx_hash:
                 raise ServiceError(
                     502, "BRIDGE_TX_FAILED", "bridge send_tokens missing tx_hash"
                 )
-            updated = svc.mark_source_submitted(transfer_id, str(tx_hash))
+            updated = await dispatch.db(
+                svc.mark_source_submitted, transfer_id, str(tx_hash)
+            )
             return _bridge_to_dto(updated)
         except RuntimeError as exc:
             raise ServiceError(502, "BRIDGE_TX_FAILED", str(exc)) from exc
@@ -460,12 +604,12 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if _bridge_status_order(transfer.status) >= _bridge_status_order("source_confirmed"):
             return _bridge_to_dto(transfer)
-        updated = svc.mark_source_confirmed(transfer_id)
+        updated = await dispatch.db(svc.mark_source_confirmed, transfer_id)
         return _bridge_to_dto(updated)
 
     @app.post(
@@ -479,7 +623,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if transfer.dest_tx_hash and transfer.dest_tx_hash != payload.dest_tx_hash:
@@ -490,7 +634,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
             )
         if _bridge_status_order(transfer.status) >= _bridge_status_order("dest_submitted"):
             return _bridge_to_dto(transfer)
-        updated = svc.mark_dest_submitted(transfer_id, payload.dest_tx_hash)
+        updated = await dispatch.db(
+            svc.mark_dest_submitted, transfer_id, payload.dest_tx_hash
+        )
         return _bridge_to_dto(updated)
 
     @app.post(
@@ -504,13 +650,14 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if transfer.status not in {"source_confirmed", "dest_submitted"}:
             return _bridge_to_dto(transfer)
         try:
-            tx_out = svc.receive_bridge_tokens(
+            tx_out = await dispatch.chain(
+                svc.receive_bridge_tokens,
                 transfer_id,
                 payload.source_nonce,
                 payload.recipient,
@@ -522,7 +669,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
                 raise ServiceError(
                     502, "BRIDGE_TX_FAILED", "bridge receive_tokens missing tx_hash"
                 )
-            updated = svc.mark_dest_submitted(transfer_id, str(tx_hash))
+            updated = await dispatch.db(
+                svc.mark_dest_submitted, transfer_id, str(tx_hash)
+            )
             return _bridge_to_dto(updated)
         except RuntimeError as exc:
             raise ServiceError(502, "BRIDGE_TX_FAILED", str(exc)) from exc
@@ -537,12 +686,12 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         if _bridge_status_order(transfer.status) >= _bridge_status_order("completed"):
             return _bridge_to_dto(transfer)
-        updated = svc.mark_completed(transfer_id)
+        updated = await dispatch.db(svc.mark_completed, transfer_id)
         return _bridge_to_dto(updated)
 
     @app.get("/v1/bridge/transfers/{transfer_id}", response_model=BridgeTransferDTO)
@@ -551,7 +700,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        transfer = svc.get_transfer(transfer_id)
+        transfer = await dispatch.db(svc.get_transfer, transfer_id)
         if not transfer:
             raise ServiceError(404, "BRIDGE_TRANSFER_NOT_FOUND", "bridge transfer not found")
         return _bridge_to_dto(transfer)
@@ -564,7 +713,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         svc: ICMService = Depends(_icm_service),
     ):
         message_type = MessageType(payload.message_type)
-        existing = svc.get_by_idempotency(idem_key)
+        existing = await dispatch.db(svc.get_by_idempotency, idem_key)
         if existing:
             if (
                 existing.source_chain != payload.source_chain
@@ -579,7 +728,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
                     "Idempotency-Key already used with different payload",
                 )
             return _icm_to_dto(existing)
-        message = svc.create_message(
+        message = await dispatch.db(
+            svc.create_message,
             source_chain=payload.source_chain,
             dest_chain=payload.dest_chain,
             message_type=message_type,
@@ -594,7 +744,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: ICMService = Depends(_icm_service),
     ):
-        return [_icm_to_dto(m) for m in svc.list_pending_messages()]
+        messages = await dispatch.db(svc.list_pending_messages)
+        return [_icm_to_dto(m) for m in messages]
 
     @app.post("/v1/icm/messages/{message_id}/sent", response_model=ICMMessageDTO)
     async def mark_icm_sent(
@@ -604,7 +755,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value == "failed":
@@ -617,7 +768,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
             )
         if _icm_status_order(message.status.value) >= _icm_status_order("sent"):
             return _icm_to_dto(message)
-        updated = svc.mark_sent(message_id, payload.tx_hash)
+        updated = await dispatch.db(svc.mark_sent, message_id, payload.tx_hash)
         return _icm_to_dto(updated)
 
     @app.post("/v1/icm/messages/{message_id}/delivered", response_model=ICMMessageDTO)
@@ -628,7 +779,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value == "failed":
@@ -641,7 +792,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
             )
         if _icm_status_order(message.status.value) >= _icm_status_order("delivered"):
             return _icm_to_dto(message)
-        updated = svc.mark_delivered(message_id, payload.dest_tx_hash)
+        updated = await dispatch.db(
+            svc.mark_delivered, message_id, payload.dest_tx_hash
+        )
         return _icm_to_dto(updated)
 
     @app.post("/v1/icm/messages/{message_id}/processed", response_model=ICMMessageDTO)
@@ -651,14 +804,14 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value == "failed":
             raise ServiceError(409, "IDEMPOTENCY_CONFLICT", "message already failed")
         if _icm_status_order(message.status.value) >= _icm_status_order("processed"):
             return _icm_to_dto(message)
-        updated = svc.mark_processed(message_id)
+        updated = await dispatch.db(svc.mark_processed, message_id)
         return _icm_to_dto(updated)
 
     @app.post("/v1/icm/messages/{message_id}/failed", response_model=ICMMessageDTO)
@@ -669,14 +822,14 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value == "processed":
             raise ServiceError(409, "IDEMPOTENCY_CONFLICT", "message already processed")
         if message.status.value == "failed":
             return _icm_to_dto(message)
-        updated = svc.mark_failed(message_id, payload.error)
+        updated = await dispatch.db(svc.mark_failed, message_id, payload.error)
         return _icm_to_dto(updated)
 
     @app.post("/v1/icm/messages/{message_id}/relay", response_model=ICMMessageDTO)
@@ -686,17 +839,17 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value in {"failed", "processed"}:
             return _icm_to_dto(message)
         try:
-            tx_out = svc.relay_message(message)
+            tx_out = await dispatch.chain(svc.relay_message, message)
             tx_hash = tx_out.get("tx_hash")
             if not tx_hash:
                 raise ServiceError(502, "ICM_TX_FAILED", "icm relay missing tx_hash")
-            updated = svc.mark_delivered(message_id, str(tx_hash))
+            updated = await dispatch.db(svc.mark_delivered, message_id, str(tx_hash))
             return _icm_to_dto(updated)
         except RuntimeError as exc:
             raise ServiceError(502, "ICM_TX_FAILED", str(exc)) from exc
@@ -709,17 +862,19 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _idem: str = Depends(_require_idempotency_key),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         if message.status.value == "failed":
             return _icm_to_dto(message)
         try:
-            tx_out = svc.mark_processed_onchain(message, payload.success)
+            tx_out = await dispatch.chain(
+                svc.mark_processed_onchain, message, payload.success
+            )
             tx_hash = tx_out.get("tx_hash")
             if not tx_hash:
                 raise ServiceError(502, "ICM_TX_FAILED", "icm mark_processed missing tx_hash")
-            updated = svc.mark_processed(message_id)
+            updated = await dispatch.db(svc.mark_processed, message_id)
             return _icm_to_dto(updated)
         except RuntimeError as exc:
             raise ServiceError(502, "ICM_TX_FAILED", str(exc)) from exc
@@ -730,7 +885,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         svc: ICMService = Depends(_icm_service),
     ):
-        message = svc.get_message(message_id)
+        message = await dispatch.db(svc.get_message, message_id)
         if not message:
             raise ServiceError(404, "ICM_MESSAGE_NOT_FOUND", "icm message not found")
         return _icm_to_dto(message)
@@ -742,14 +897,14 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "auditor")),
         svc: BridgeService = Depends(_bridge_service),
     ):
-        return svc.get_stats()
+        return await dispatch.db(svc.get_stats)
 
     @app.get("/v1/icm/stats", response_model=ICMStatsDTO)
     async def get_icm_stats(
         _role: str = Depends(_require_role("operator", "auditor")),
         svc: ICMService = Depends(_icm_service),
     ):
-        return svc.get_stats()
+        return await dispatch.db(svc.get_stats)
 
     # ---------- Baseline Endpoints ----------
 
@@ -767,9 +922,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
     ):
         if not payload.history:
             raise ServiceError(422, "EMPTY_HISTORY", "history data is required")
-        df = pd.DataFrame(payload.history)
         engine = BaselineEngine()
-        all_results = engine.compute_all(df, payload.event_hour)
+        all_results = await dispatch.db(_compare_history, engine, payload.history, payload.event_hour)
         result_dtos = [
             BaselineResultDTO(
                 baseline_kwh=r.baseline_kwh,
@@ -788,6 +942,145 @@ def create_app(db_path: str | None = None) -> FastAPI:
         )
         return BaselineCompareResponse(results=result_dtos, recommended=recommended)
 
+    @app.post("/v1/baseline/batch", response_model=BaselineBatchResponse)
+    async def batch_baselines(
+        payload: BaselineBatchRequest,
+        _role: str = Depends(_require_role("operator", "participant", "auditor")),
+    ):
+        if not payload.site_id:
+            raise ServiceError(422, "EMPTY_HISTORY", "history data is required")
+        if not len(payload.site_id) == len(payload.timestamp) == len(payload.kw):
+            raise ServiceError(
+                422,
+                "COLUMN_LENGTH_MISMATCH",
+                "site_id, timestamp and kw must have the same length",
+                details={
+                    "site_id": len(payload.site_id),
+                    "timestamp": len(payload.timestamp),
+                    "kw": len(payload.kw),
+                },
+            )
+        invalid_site = _invalid_timestamp_site(payload.site_id, payload.timestamp)
+        if invalid_site is not None:
+            raise ServiceError(
+                422,
+                "INVALID_TIMESTAMP",
+                f"history for site {invalid_site} has an invalid timestamp",
+                details={"site_id": invalid_site},
+            )
+        mixed_site = _mixed_offset_site(payload.site_id, payload.timestamp)
+        if mixed_site is not None:
+            raise ServiceError(
+                422,
+                "INVALID_TIMESTAMP",
+                "timestamps must share one UTC offset",
+                details={"site_id": mixed_site},
+            )
+        engine = BaselineEngine()
+        by_site = await dispatch.db(
+            engine.compute_many,
+            payload.site_id,
+            payload.timestamp,
+            [float("nan") if kw is None else kw for kw in payload.kw],
+            payload.event_hour,
+        )
+        sites = []
+        for site_id, results in by_site.items():
+            result_dtos = [BaselineResultDTO(**r.to_dict()) for r in results]
+            best = max(results, key=lambda r: r.confidence)
+            sites.append(
+                BaselineSiteResultDTO(
+                    site_id=site_id,
+                    results=result_dtos,
+                    recommended=BaselineResultDTO(**best.to_dict()),
+                )
+            )
+        return BaselineBatchResponse(sites=sites)
+
+    @app.post("/v1/meters/ingest", response_model=MeterIngestResponse)
+    async def ingest_meter_readings(
+        request: Request,
+        site_id: str | None = None,
+        ingest_format: str | None = Query(None, alias="format"),
+        _role: str = Depends(_require_role("operator")),
+        store: MeterStore = Depends(_meter_store),
+    ):
+        """Stream NDJSON or CSV readings into the meter store.
+
+        The body is consumed as it arrives; ``site_id`` fills in rows that
+        carry none. The format follows Content-Type unless ``format`` is set.
+        """
+        fmt = ingest_format or _ingest_format(request.headers.get("content-type"))
+        if fmt not in INGEST_FORMATS:
+            raise ServiceError(
+                415,
+                "UNSUPPORTED_MEDIA_TYPE",
+                "body must be NDJSON or CSV",
+                details={"formats": list(INGEST_FORMATS)},
+            )
+        session = MeterIngest(store, format=fmt, site_id=site_id)
+        async for piece in request.stream():
+            if session.feed(piece):
+                await dispatch.db(session.flush)
+        report = await dispatch.db(session.finish)
+        return MeterIngestResponse(**report.to_dict())
+
+    @app.get("/v1/meters/{site_id}/baseline", response_model=BaselineCompareResponse)
+    async def meter_baseline(
+        site_id: str,
+        event_hour: int = Query(ge=0, le=23),
+        days: int = Query(28, ge=1, le=366),
+        end: str | None = None,
+        tz: str | None = None,
+        _role: str = Depends(_require_role("operator", "participant", "auditor")),
+        store: MeterStore = Depends(_meter_store),
+    ):
+        """Baselines from stored readings in the ``days`` before ``end``.
+
+        ``end`` defaults to just after the site's latest reading. Readings
+        are stored in UTC; ``tz`` (an IANA zone or ``+HH:MM`` offset, default
+        UTC) gives the site's local time, in which ``event_hour`` and a
+        naive ``end`` are read.
+        """
+        try:
+            site_tz = parse_timezone(tz) if tz is not None else None
+        except ValueError:
+            raise ServiceError(422, "INVALID_TIMEZONE", "tz is not a known time zone or UTC offset")
+        if end is not None:
+            try:
+                window_end = pd.Timestamp(end)
+            except (TypeError, ValueError):
+                window_end = pd.NaT
+            if pd.isna(window_end):
+                raise ServiceError(422, "INVALID_TIMESTAMP", "end is not a valid timestamp")
+        else:
+            latest = await dispatch.db(store.latest, site_id)
+            if latest is None:
+                raise ServiceError(404, "METER_READINGS_NOT_FOUND", "no meter readings for site")
+            window_end = latest + pd.Timedelta(milliseconds=1)
+        if window_end.tzinfo is None:
+            # A wall time repeated or skipped by a DST change resolves to
+            # standard time / the next valid instant instead of raising.
+            window_end = window_end.tz_localize(
+                site_tz or "UTC", ambiguous=False, nonexistent="shift_forward"
+            )
+        window_start = window_end - pd.Timedelta(days=days)
+
+        def _compute():
+            series = store.read(site_id, window_start, window_end)
+            if not len(series):
+                return None
+            return BaselineEngine().compute_all(series.history(site_tz), event_hour)
+
+        results = await dispatch.db(_compute)
+        if results is None:
+            raise ServiceError(404, "METER_READINGS_NOT_FOUND", "no meter readings in window")
+        best = max(results, key=lambda r: r.confidence)
+        return BaselineCompareResponse(
+            results=[BaselineResultDTO(**r.to_dict()) for r in results],
+            recommended=BaselineResultDTO(**best.to_dict()),
+        )
+
     # ---------- Dashboard Summary ----------
 
     @app.get("/v1/dashboard/summary", response_model=DashboardSummaryDTO)
@@ -796,8 +1089,8 @@ def create_app(db_path: str | None = None) -> FastAPI:
         bridge_svc: BridgeService = Depends(_bridge_service),
         icm_svc: ICMService = Depends(_icm_service),
     ):
-        bridge_stats = bridge_svc.get_stats()
-        icm_stats = icm_svc.get_stats()
+        bridge_stats = await dispatch.db(bridge_svc.get_stats)
+        icm_stats = await dispatch.db(icm_svc.get_stats)
         engine = BaselineEngine()
         return DashboardSummaryDTO(
             chain_mode=_chain_mode(),
@@ -811,6 +1104,9 @@ def create_app(db_path: str | None = None) -> FastAPI:
     class TaskCreateRequest(BaseModel):
         task_type: str
         payload: dict[str, Any] = {}
+        priority: int | None = None
+        not_before: float | str | None = None
+        dedup_key: str | None = None
 
     @app.post("/v1/tasks")
     async def create_task(
@@ -818,6 +1114,13 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator")),
         queue=Depends(_task_queue),
     ):
+        """Enqueue a task.
+
+        ``priority`` overrides the task type's lane (lower runs first);
+        ``not_before`` (ISO 8601 or epoch seconds) holds the task until then.
+        With ``dedup_key``, a pending or running task holding the same key
+        is returned instead of enqueueing another.
+        """
         data = await request.json()
         task_type_str = data.get("task_type", "")
         payload = data.get("payload", {})
@@ -825,7 +1128,16 @@ def create_app(db_path: str | None = None) -> FastAPI:
             tt = TaskType(task_type_str)
         except ValueError:
             raise ServiceError(422, "INVALID_TASK_TYPE", f"unknown task type: {task_type_str}")
-        task = queue.enqueue(tt, payload)
+        priority = data.get("priority")
+        if priority is not None and (isinstance(priority, bool) or not isinstance(priority, int)):
+            raise ServiceError(422, "INVALID_PRIORITY", "priority must be an integer")
+        not_before = _task_not_before(data.get("not_before"))
+        dedup_key = data.get("dedup_key")
+        if dedup_key is not None and (not isinstance(dedup_key, str) or not dedup_key.strip()):
+            raise ServiceError(422, "INVALID_DEDUP_KEY", "dedup_key must be a non-empty string")
+        task = await dispatch.db(queue.enqueue, tt, payload, priority, not_before, dedup_key)
+        if request.app.state.task_worker is not None:
+            request.app.state.task_worker.wake()
         return task.to_dict()
 
     @app.get("/v1/tasks/summary")
@@ -833,7 +1145,41 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "auditor")),
         queue=Depends(_task_queue),
     ):
-        return {"pending_count": queue.pending_count()}
+        """Task counts per status and per type; served from the queue's counters."""
+        by_type = await dispatch.db(queue.counts_by_type)
+        counts = {status.value: 0 for status in TaskStatus}
+        for per_status in by_type.values():
+            for status, n in per_status.items():
+                counts[status] += n
+        return {"pending_count": counts["pending"], "counts": counts, "by_type": by_type}
+
+    @app.get("/v1/tasks/dead-letter")
+    async def list_dead_letters(
+        limit: int = Query(100, ge=1, le=1000),
+        _role: str = Depends(_require_role("operator", "auditor")),
+        queue=Depends(_task_queue),
+    ):
+        """Tasks that used up their retries, most recent first."""
+        tasks = await dispatch.db(queue.dead_letters, limit)
+        return {"tasks": [task.to_dict() for task in tasks], "count": len(tasks)}
+
+    @app.post("/v1/tasks/{task_id}/requeue")
+    async def requeue_dead_letter(
+        task_id: str,
+        request: Request,
+        _role: str = Depends(_require_role("operator")),
+        queue=Depends(_task_queue),
+    ):
+        """Move a dead-lettered task back to pending with fresh retries."""
+        try:
+            task = await dispatch.db(queue.requeue_dead_letter, task_id)
+        except ValueError as exc:
+            if await dispatch.db(queue.get, task_id) is None:
+                raise ServiceError(404, "TASK_NOT_FOUND", "task not found")
+            raise ServiceError(409, "TASK_NOT_DEAD_LETTER", str(exc))
+        if request.app.state.task_worker is not None:
+            request.app.state.task_worker.wake()
+        return task.to_dict()
 
     @app.get("/v1/tasks/{task_id}")
     async def get_task(
@@ -841,7 +1187,7 @@ def create_app(db_path: str | None = None) -> FastAPI:
         _role: str = Depends(_require_role("operator", "auditor")),
         queue=Depends(_task_queue),
     ):
-        task = queue.get(task_id)
+        task = await dispatch.db(queue.get, task_id)
         if task is None:
             raise ServiceError(404, "TASK_NOT_FOUND", "task not found")
         return task.to_dict()
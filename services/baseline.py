@@ -3,12 +3,35 @@
 Two methods:
 1. Simple 7-day same-hour average (fallback)
 2. Prophet forecast (primary)
+
+Fitted Prophet models are cached per site in ``ProphetModelCache``, keyed by
+a fingerprint of the history (last timestamp, row count and a content hash).
+A repeated baseline for the same site and window skips the fit; when the
+history only gained rows at the end, the refit is warm-started from the
+previous model's parameters.
+
+Env vars:
+  DR_PROPHET_CACHE_SIZE — fitted models kept in memory (default: 64)
+  DR_PROPHET_CACHE_DIR  — directory to persist the latest model per site (default: unset, memory only)
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
 import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
 
+from services.env import int_env
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +63,8 @@ def compute_baseline_prophet(
     history_df: pd.DataFrame,
     event_start: str,
     event_end: str,
+    site_id: str | None = None,
+    cache: ProphetModelCache | None = None,
 ) -> float:
     """Compute baseline using Prophet forecast.
 
@@ -49,49 +74,288 @@ def compute_baseline_prophet(
         history_df: DataFrame with columns (timestamp, kw).
         event_start: Event start time (ISO format string).
         event_end: Event end time (ISO format string).
+        site_id: Site the history belongs to. When given, the fitted model
+            is cached (in ``cache`` or the process-wide default cache).
+        cache: Model cache to use instead of the default one.
 
     Returns:
         Baseline power in kW (average over event window).
     """
     try:
-        from prophet import Prophet
+        return forecast_prophet(history_df, event_start, event_end, site_id, cache)
+    except Exception as e:
+        logger.warning("Prophet failed (%s), falling back to simple method", e)
+        event_hour = pd.Timestamp(event_start).hour
+        return compute_baseline_simple(history_df, event_hour)
 
-        # Prepare data for Prophet
-        df = history_df[["timestamp", "kw"]].copy()
-        df.columns = ["ds", "y"]
-        df["ds"] = pd.to_datetime(df["ds"])
 
-        model = Prophet(daily_seasonality=True, weekly_seasonality=True)
-        model.fit(df)
+def forecast_prophet(
+    history_df: pd.DataFrame,
+    event_start: str,
+    event_end: str,
+    site_id: str | None = None,
+    cache: ProphetModelCache | None = None,
+) -> float:
+    """Prophet forecast averaged over the event window, without fallback.
 
-        # Create future dataframe for the event window
-        future_start = pd.Timestamp(event_start)
-        future_end = pd.Timestamp(event_end)
-        future = pd.date_range(start=future_start, end=future_end, freq="15min")
-        future_df = pd.DataFrame({"ds": future})
+    Same arguments as ``compute_baseline_prophet``; raises if Prophet is
+    unavailable or the fit fails.
+    """
+    # Prepare data for Prophet
+    df = _prophet_frame(history_df)
 
-        forecast = model.predict(future_df)
-        baseline = float(forecast["yhat"].mean())
+    if site_id is None:
+        model = fit_prophet(df)
+    else:
+        model = (cache or default_model_cache()).get_or_fit(site_id, df)
 
-        logger.info("Prophet baseline: %.2f kW", baseline)
-        return baseline
+    # Create future dataframe for the event window
+    future_start = pd.Timestamp(event_start)
+    future_end = pd.Timestamp(event_end)
+    future = pd.date_range(start=future_start, end=future_end, freq="15min")
+    future_df = pd.DataFrame({"ds": future})
 
-    except Exception as e:
-        logger.warning("Prophet failed (%s), falling back to simple method", e)
-        event_hour = pd.Timestamp(event_start).hour
-        return compute_baseline_simple(history_df, event_hour)
+    forecast = model.predict(future_df)
+    baseline = float(forecast["yhat"].mean())
+
+    logger.info("Prophet baseline: %.2f kW", baseline)
+    return baseline
 
 
 def compute_baseline_with_method(
     history_df: pd.DataFrame,
     event_start: str,
     event_end: str,
+    site_id: str | None = None,
+    cache: ProphetModelCache | None = None,
 ) -> tuple[float, str]:
-    """Return baseline value and method label for audit tracking."""
+    """Return baseline value and method label for audit tracking.
+
+    The label is ``"simple"`` whenever Prophet failed and the fallback was
+    used. Fitted models are cached only when ``site_id`` is passed.
+    """
     try:
-        baseline = compute_baseline_prophet(history_df, event_start, event_end)
+        baseline = forecast_prophet(history_df, event_start, event_end, site_id, cache)
         return baseline, "prophet"
-    except Exception:
+    except Exception as e:
+        logger.warning("Prophet failed (%s), falling back to simple method", e)
         event_hour = pd.Timestamp(event_start).hour
         baseline = compute_baseline_simple(history_df, event_hour)
         return baseline, "simple"
+
+
+# ---------------------------------------------------------------------------
+# Fitted model cache
+# ---------------------------------------------------------------------------
+
+FitFn = Callable[[pd.DataFrame, Any], Any]
+
+
+def fit_prophet(df: pd.DataFrame, init: dict[str, Any] | None = None) -> Any:
+    """Fit a Prophet model on a (ds, y) frame, optionally warm-started."""
+    from prophet import Prophet
+
+    model = Prophet(daily_seasonality=True, weekly_seasonality=True)
+    if init is None:
+        return model.fit(df)
+    return model.fit(df, init=init)
+
+
+def warm_start_params(model: Any) -> dict[str, Any]:
+    """Initial values for a refit, taken from a fitted model's parameters."""
+    params = {name: model.params[name][0][0] for name in ("k", "m", "sigma_obs")}
+    params.update({name: model.params[name][0] for name in ("delta", "beta")})
+    return params
+
+
+def history_fingerprint(df: pd.DataFrame) -> str:
+    """``<last ds ns>:<rows>:<content hash>`` of a (ds, y) frame."""
+    return _fingerprint(df, _row_hashes(df))
+
+
+@dataclass
+class _CachedModel:
+    fingerprint: str
+    rows: int
+    digest: str
+    model: Any
+
+
+class ProphetModelCache:
+    """LRU cache of fitted Prophet models keyed by site and history fingerprint.
+
+    ``get_or_fit`` returns the cached model when the history is unchanged,
+    warm-starts a refit when the site's latest cached model was fit on a
+    prefix of the history (only new rows appended), and fits from scratch
+    otherwise or when the warm-started fit fails. With ``cache_dir`` set, the latest model per site is also
+    written to disk and reloaded after a restart.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        cache_dir: str | Path | None = None,
+        fit: FitFn = fit_prophet,
+    ):
+        self.max_entries = (
+            max_entries if max_entries is not None
+            else int_env("DR_PROPHET_CACHE_SIZE", 64, minimum=1)
+        )
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._fit = fit
+        self._entries: OrderedDict[tuple[str, str], _CachedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "warm_starts": 0, "disk_loads": 0}
+
+    def get_or_fit(self, site_id: str, df: pd.DataFrame) -> Any:
+        """Fitted model for ``site_id`` on the (ds, y) frame ``df``."""
+        row_hashes = _row_hashes(df)
+        fingerprint = _fingerprint(df, row_hashes)
+        key = (site_id, fingerprint)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry.model
+            previous = self._latest_for_site(site_id)
+
+        stored = self._load(site_id)
+        if stored is not None and stored.fingerprint == fingerprint:
+            with self._lock:
+                self._stats["disk_loads"] += 1
+            self._store(site_id, stored, persist=False)
+            return stored.model
+        if stored is not None and (previous is None or stored.rows > previous.rows):
+            previous = stored
+
+        init = None
+        if previous is not None and _is_prefix(previous, row_hashes):
+            init = warm_start_params(previous.model)
+        try:
+            model = self._fit(df, init)
+        except Exception as exc:
+            if init is None:
+                raise
+            # The longer history can add changepoints or seasonalities, so
+            # the previous delta/beta no longer fit the new model's shapes.
+            logger.warning("Warm start failed for %s (%s), refitting cold", site_id, exc)
+            init = None
+            model = self._fit(df, None)
+
+        with self._lock:
+            self._stats["misses"] += 1
+            if init is not None:
+                self._stats["warm_starts"] += 1
+        entry = _CachedModel(fingerprint, len(df), _digest(row_hashes), model)
+        self._store(site_id, entry, persist=True)
+        return model
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _latest_for_site(self, site_id: str) -> _CachedModel | None:
+        for (cached_site, _), entry in reversed(self._entries.items()):
+            if cached_site == site_id:
+                return entry
+        return None
+
+    def _store(self, site_id: str, entry: _CachedModel, persist: bool) -> None:
+        with self._lock:
+            self._entries[(site_id, entry.fingerprint)] = entry
+            self._entries.move_to_end((site_id, entry.fingerprint))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if persist and self.cache_dir is not None:
+            try:
+                self._save(site_id, entry)
+            except Exception as exc:
+                logger.warning("Could not persist Prophet model for %s (%s)", site_id, exc)
+
+    def _path(self, site_id: str) -> Path:
+        name = hashlib.sha256(site_id.encode("utf-8")).hexdigest()[:32]
+        return self.cache_dir / f"{name}.json"
+
+    def _save(self, site_id: str, entry: _CachedModel) -> None:
+        from prophet.serialize import model_to_json
+
+        path = self._path(site_id)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "site_id": site_id,
+            "fingerprint": entry.fingerprint,
+            "rows": entry.rows,
+            "digest": entry.digest,
+            "model": model_to_json(entry.model),
+        }))
+        os.replace(tmp, path)
+
+    def _load(self, site_id: str) -> _CachedModel | None:
+        if self.cache_dir is None:
+            return None
+        path = self._path(site_id)
+        if not path.exists():
+            return None
+        try:
+            from prophet.serialize import model_from_json
+
+            data = json.loads(path.read_text())
+            if data["site_id"] != site_id:
+                return None
+            return _CachedModel(
+                data["fingerprint"], data["rows"], data["digest"],
+                model_from_json(data["model"]),
+            )
+        except Exception as exc:
+            logger.warning("Ignoring unreadable Prophet model %s (%s)", path, exc)
+            return None
+
+
+_default_cache: ProphetModelCache | None = None
+_default_cache_lock = threading.Lock()
+
+
+def default_model_cache() -> ProphetModelCache:
+    """Process-wide cache configured from DR_PROPHET_CACHE_*."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ProphetModelCache(
+                cache_dir=os.getenv("DR_PROPHET_CACHE_DIR", "").strip() or None
+            )
+        return _default_cache
+
+
+def _prophet_frame(history_df: pd.DataFrame) -> pd.DataFrame:
+    df = history_df[["timestamp", "kw"]].copy()
+    df.columns = ["ds", "y"]
+    df["ds"] = pd.to_datetime(df["ds"])
+    return df
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(df[["ds", "y"]], index=False).to_numpy()
+
+
+def _digest(row_hashes: np.ndarray) -> str:
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:32]
+
+
+def _fingerprint(df: pd.DataFrame, row_hashes: np.ndarray) -> str:
+    last = pd.Timestamp(df["ds"].iloc[-1]).value if len(df) else 0
+    return f"{last}:{len(df)}:{_digest(row_hashes)}"
+
+
+def _is_prefix(previous: _CachedModel, row_hashes: np.ndarray) -> bool:
+    return (
+        0 < previous.rows < len(row_hashes)
+        and _digest(row_hashes[: previous.rows]) == previous.digest
+    )
@@ -5,6 +5,10 @@ Methods:
   - ewma: Exponentially Weighted Moving Average for same-hour values
   - percentile: Percentile-based baseline for same-hour values
   - auto: Selects best method based on data quality/quantity
+
+``BaselineEngine.compute_many`` scores many sites from one columnar batch
+(site_id, timestamp, kw) with grouped array operations instead of one
+frame per site.
 """
 
 from __future__ import annotations
@@ -12,6 +16,7 @@ from __future__ import annotations
 from dataclasses import dataclass, asdict
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 
@@ -26,31 +31,125 @@ class BaselineResult:
         return asdict(self)
 
 
-def compute_simple_baseline(history_df: pd.DataFrame, event_hour: int) -> float:
-    df = history_df.copy()
-    df["hour"] = pd.to_datetime(df["timestamp"]).dt.hour
+_HOURS_PER_DAY = 24
+_WEEK_NS = 7 * 24 * 3600 * 1_000_000_000
+
+
+class HistoryIndex:
+    """One site's history, parsed once and bucketed by hour of day.
+
+    Timestamps are parsed a single time; readings are then reordered so
+    each hour of day is one contiguous slice of ``kw`` (and of the
+    matching epoch-nanosecond timestamps), keeping the original row order
+    inside a bucket. Every baseline method reads its slice directly
+    instead of re-parsing and filtering the frame.
+
+    Semantics match the pandas formulation: rows with unparseable
+    timestamps are coerced to NaT and belong to no hour (they still count
+    towards the overall mean), NaN readings are skipped by the mean and
+    quantiles, and EWMA weights follow ``ewm(adjust=False)``. Timestamps
+    mixing UTC offsets raise ``ValueError``.
+    """
+
+    def __init__(self, timestamps: Any, kw: Any):
+        # Normalise to ns so ``asi8`` is in nanoseconds whatever the input unit.
+        parsed = pd.DatetimeIndex(pd.to_datetime(timestamps, errors="coerce")).as_unit("ns")
+        self.kw = np.asarray(kw, dtype=np.float64)
+        if len(parsed) != len(self.kw):
+            raise ValueError("timestamps and kw must have the same length")
+
+        valid = ~parsed.isna()
+        ts_ns = parsed.asi8
+        hours = np.where(valid, parsed.hour, -1)
+        self.ts_ns = ts_ns
+        self.hours = hours
+        self.latest_ns = int(ts_ns[valid].max()) if valid.any() else None
+
+        order = np.argsort(hours, kind="stable")
+        self._kw_by_hour = self.kw[order]
+        self._ts_by_hour = ts_ns[order]
+        self._bounds = np.searchsorted(hours[order], np.arange(_HOURS_PER_DAY + 1))
+
+    @classmethod
+    def from_frame(cls, history_df: pd.DataFrame) -> HistoryIndex:
+        return cls(history_df["timestamp"], history_df["kw"])
+
+    def __len__(self) -> int:
+        return len(self.kw)
+
+    def same_hour(self, event_hour: int) -> np.ndarray:
+        """Readings at ``event_hour``, in original row order."""
+        return self._kw_by_hour[self._slice(event_hour)]
+
+    def same_hour_count(self, event_hour: int) -> int:
+        bucket = self._slice(event_hour)
+        return bucket.stop - bucket.start
+
+    def simple(self, event_hour: int) -> float:
+        """7-day same-hour average; overall mean if there is none."""
+        bucket = self._slice(event_hour)
+        values = self._kw_by_hour[bucket]
+        if self.latest_ns is not None:
+            values = values[self._ts_by_hour[bucket] >= self.latest_ns - _WEEK_NS]
+        if values.size == 0:
+            return _mean(self.kw)
+        return _mean(values)
 
-    cutoff = pd.to_datetime(df["timestamp"]).max() - pd.Timedelta(days=7)
-    recent = df[pd.to_datetime(df["timestamp"]) >= cutoff]
+    def ewma(self, event_hour: int, span: int = 24) -> float:
+        """Last value of the same-hour EWMA; overall mean if there is none."""
+        values = self.same_hour(event_hour)
+        if values.size == 0:
+            return _mean(self.kw)
+        present = ~np.isnan(values)
+        if not present.any():
+            return float("nan")
 
-    same_hour = recent[recent["hour"] == event_hour]
-    if same_hour.empty:
-        return float(df["kw"].mean())
-    return float(same_hour["kw"].mean())
+        # Closed form of the pandas recursion, seeded with the first reading:
+        #   y_k = (d_k * y_{k-1} + a * x_k) / (d_k + a),  d_k = (1 - a) ** gap_k
+        # where gap_k counts rows since the previous reading, so missing
+        # readings still decay the running average. With no gaps this is
+        # the usual y_k = (1 - a) * y_{k-1} + a * x_k.
+        alpha = 2.0 / (span + 1.0)
+        observed = values[present]
+        decay = (1.0 - alpha) ** np.diff(np.flatnonzero(present))
+        carry = decay / (decay + alpha)
+        kept = np.append(np.cumprod(carry[::-1])[::-1], 1.0)
+        weights = kept * np.concatenate(([1.0], 1.0 - carry))
+        return float(np.dot(weights, observed))
+
+    def percentile(self, event_hour: int, percentile: int = 50) -> float:
+        """Same-hour percentile; overall percentile if there is none."""
+        if percentile < 0 or percentile > 100:
+            raise ValueError(f"percentile must be 0-100, got {percentile}")
+        values = self.same_hour(event_hour)
+        if values.size == 0:
+            values = self.kw
+        return _quantile(values, percentile / 100)
+
+    def _slice(self, event_hour: int) -> slice:
+        if not 0 <= event_hour < _HOURS_PER_DAY:
+            return slice(0, 0)
+        return slice(int(self._bounds[event_hour]), int(self._bounds[event_hour + 1]))
+
+
+def _mean(values: np.ndarray) -> float:
+    present = values[~np.isnan(values)]
+    return float(present.mean()) if present.size else float("nan")
+
+
+def _quantile(values: np.ndarray, q: float) -> float:
+    present = values[~np.isnan(values)]
+    return float(np.quantile(present, q)) if present.size else float("nan")
+
+
+def compute_simple_baseline(history_df: pd.DataFrame, event_hour: int) -> float:
+    return HistoryIndex.from_frame(history_df).simple(event_hour)
 
 
 def compute_ewma_baseline(
     history_df: pd.DataFrame, event_hour: int, span: int = 24
 ) -> float:
-    df = history_df.copy()
-    df["hour"] = pd.to_datetime(df["timestamp"]).dt.hour
-    same_hour = df[df["hour"] == event_hour].copy()
-
-    if same_hour.empty:
-        return float(df["kw"].mean())
-
-    ewma = same_hour["kw"].ewm(span=span, adjust=False).mean()
-    return float(ewma.iloc[-1])
+    return HistoryIndex.from_frame(history_df).ewma(event_hour, span=span)
 
 
 def compute_percentile_baseline(
@@ -58,22 +157,22 @@ def compute_percentile_baseline(
 ) -> float:
     if percentile < 0 or percentile > 100:
         raise ValueError(f"percentile must be 0-100, got {percentile}")
+    return HistoryIndex.from_frame(history_df).percentile(event_hour, percentile)
 
-    df = history_df.copy()
-    df["hour"] = pd.to_datetime(df["timestamp"]).dt.hour
-    same_hour = df[df["hour"] == event_hour]
 
-    if same_hour.empty:
-        return float(df["kw"].quantile(percentile / 100))
-    return float(same_hour["kw"].quantile(percentile / 100))
+class BaselineEngine:
+    """Computes baselines from a history frame or a prebuilt ``HistoryIndex``.
 
+    Passing a ``HistoryIndex`` skips re-parsing when the same history is
+    scored several times; ``compute_all`` and ``auto`` build one index and
+    share it across methods.
+    """
 
-class BaselineEngine:
     _METHODS = {"simple", "ewma", "percentile", "auto"}
 
     def compute(
         self,
-        history_df: pd.DataFrame,
+        history_df: pd.DataFrame | HistoryIndex,
         event_hour: int,
         method: str = "auto",
     ) -> BaselineResult:
@@ -82,33 +181,65 @@ class BaselineEngine:
                 f"unknown method: '{method}'. Valid: {', '.join(sorted(self._METHODS))}"
             )
 
+        index = self.index(history_df)
         if method == "auto":
-            return self._compute_auto(history_df, event_hour)
+            return self._compute_auto(index, event_hour)
         if method == "simple":
-            return self._compute_simple(history_df, event_hour)
+            return self._compute_simple(index, event_hour)
         if method == "ewma":
-            return self._compute_ewma(history_df, event_hour)
+            return self._compute_ewma(index, event_hour)
         if method == "percentile":
-            return self._compute_percentile(history_df, event_hour)
+            return self._compute_percentile(index, event_hour)
 
         raise ValueError(f"unknown method: {method}")
 
     def compute_all(
-        self, history_df: pd.DataFrame, event_hour: int
+        self, history_df: pd.DataFrame | HistoryIndex, event_hour: int
     ) -> list[BaselineResult]:
+        index = self.index(history_df)
         results = []
         for method in ("simple", "ewma", "percentile"):
-            results.append(self.compute(history_df, event_hour, method=method))
+            results.append(self.compute(index, event_hour, method=method))
         return results
 
+    def compute_many(
+        self,
+        site_ids: Any,
+        timestamps: Any,
+        kw: Any,
+        event_hour: int,
+    ) -> dict[str, list[BaselineResult]]:
+        """``compute_all`` for every site of a columnar batch in one pass.
+
+        The three columns are parallel arrays; a site's rows need not be
+        contiguous. Timestamps are parsed once for the whole batch and each
+        method is evaluated for all sites at once with grouped array
+        operations. Returns results per site, in order of first appearance,
+        equal to calling ``compute_all`` on each site's rows.
+        """
+        codes, sites = pd.factorize(np.asarray(site_ids, dtype=object))
+        index = HistoryIndex(timestamps, kw)
+        if len(codes) != len(index):
+            raise ValueError("site_ids, timestamps and kw must have the same length")
+        return _results_by_site(
+            [str(site) for site in sites],
+            _site_baselines(codes, len(sites), index, event_hour),
+        )
+
     def available_methods(self) -> list[str]:
         return sorted(self._METHODS)
 
+    @staticmethod
+    def index(history: pd.DataFrame | HistoryIndex) -> HistoryIndex:
+        if isinstance(history, HistoryIndex):
+            return history
+        return HistoryIndex.from_frame(history)
+
     def _compute_simple(
-        self, df: pd.DataFrame, event_hour: int
+        self, index: HistoryIndex, event_hour: int
     ) -> BaselineResult:
-        value = compute_simple_baseline(df, event_hour)
-        n_points = len(df[pd.to_datetime(df["timestamp"]).dt.hour == event_hour])
+        value = index.simple(event_hour)
+        n_points = index.same_hour_count(event_hour)
         confidence = min(1.0, n_points / 7)
         return BaselineResult(
             baseline_kwh=value,
@@ -118,10 +249,10 @@ class BaselineEngine:
         )
 
     def _compute_ewma(
-        self, df: pd.DataFrame, event_hour: int
+        self, index: HistoryIndex, event_hour: int
     ) -> BaselineResult:
-        value = compute_ewma_baseline(df, event_hour, span=24)
-        n_points = len(df[pd.to_datetime(df["timestamp"]).dt.hour == event_hour])
+        value = index.ewma(event_hour, span=24)
+        n_points = index.same_hour_count(event_hour)
         confidence = min(1.0, n_points / 7) * 0.95
         return BaselineResult(
             baseline_kwh=value,
@@ -131,10 +262,10 @@ class BaselineEngine:
         )
 
     def _compute_percentile(
-        self, df: pd.DataFrame, event_hour: int
+        self, index: HistoryIndex, event_hour: int
     ) -> BaselineResult:
-        value = compute_percentile_baseline(df, event_hour, percentile=75)
-        n_points = len(df[pd.to_datetime(df["timestamp"]).dt.hour == event_hour])
+        value = index.percentile(event_hour, percentile=75)
+        n_points = index.same_hour_count(event_hour)
         confidence = min(1.0, n_points / 7) * 0.9
         return BaselineResult(
             baseline_kwh=value,
@@ -144,8 +275,155 @@ class BaselineEngine:
         )
 
     def _compute_auto(
-        self, df: pd.DataFrame, event_hour: int
+        self, index: HistoryIndex, event_hour: int
     ) -> BaselineResult:
-        all_results = self.compute_all(df, event_hour)
+        all_results = self.compute_all(index, event_hour)
         best = max(all_results, key=lambda r: r.confidence)
         return best
+
+
+# ---------------------------------------------------------------------------
+# Grouped kernels for compute_many
+# ---------------------------------------------------------------------------
+
+_EWMA_SPAN = 24
+_PERCENTILE = 75
+
+
+def _site_baselines(
+    codes: np.ndarray, n_sites: int, index: HistoryIndex, event_hour: int
+) -> dict[str, np.ndarray]:
+    kw = index.kw
+    present = ~np.isnan(kw)
+    same_hour = index.hours == event_hour
+
+    n_points = np.bincount(codes[same_hour], minlength=n_sites)
+    overall_mean = _grouped_mean(codes, kw, present, n_sites)
+
+    latest = np.full(n_sites, np.iinfo(np.int64).min, dtype=np.int64)
+    dated = index.hours >= 0
+    np.maximum.at(latest, codes[dated], index.ts_ns[dated])
+    recent = same_hour & (index.ts_ns >= latest[codes] - _WEEK_NS)
+    recent_rows = np.bincount(codes[recent], minlength=n_sites)
+    simple = np.where(
+        recent_rows > 0, _grouped_mean(codes, kw, recent & present, n_sites), overall_mean
+    )
+
+    ewma = np.where(
+        n_points > 0,
+        _grouped_ewma(codes[same_hour], kw[same_hour], n_sites, _EWMA_SPAN),
+        overall_mean,
+    )
+
+    q = _PERCENTILE / 100
+    percentile = _grouped_quantile(codes[same_hour], kw[same_hour], n_sites, q)
+    # Only sites without a same-hour reading fall back to all their rows.
+    fallback = (n_points == 0)[codes]
+    if fallback.any():
+        overall = _grouped_quantile(codes[fallback], kw[fallback], n_sites, q)
+        percentile = np.where(n_points > 0, percentile, overall)
+    return {
+        "n_points": n_points,
+        "simple": simple,
+        "ewma": ewma,
+        "percentile": percentile,
+    }
+
+
+def _results_by_site(
+    sites: list[str], columns: dict[str, np.ndarray]
+) -> dict[str, list[BaselineResult]]:
+    results: dict[str, list[BaselineResult]] = {}
+    for i, site in enumerate(sites):
+        n_points = int(columns["n_points"][i])
+        confidence = min(1.0, n_points / 7)
+        results[site] = [
+            BaselineResult(
+                baseline_kwh=float(columns["simple"][i]),
+                method="simple",
+                confidence=confidence,
+                details={"same_hour_points": n_points},
+            ),
+            BaselineResult(
+                baseline_kwh=float(columns["ewma"][i]),
+                method="ewma",
+                confidence=confidence * 0.95,
+                details={"span": _EWMA_SPAN, "same_hour_points": n_points},
+            ),
+            BaselineResult(
+                baseline_kwh=float(columns["percentile"][i]),
+                method="percentile",
+                confidence=confidence * 0.9,
+                details={"percentile": _PERCENTILE, "same_hour_points": n_points},
+            ),
+        ]
+    return results
+
+
+def _grouped_mean(
+    codes: np.ndarray, values: np.ndarray, mask: np.ndarray, n_groups: int
+) -> np.ndarray:
+    counts = np.bincount(codes[mask], minlength=n_groups)
+    sums = np.bincount(codes[mask], weights=values[mask], minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def _grouped_quantile(
+    codes: np.ndarray, values: np.ndarray, n_groups: int, q: float
+) -> np.ndarray:
+    """Linear-interpolated quantile of the non-NaN values of each group."""
+    present = ~np.isnan(values)
+    codes, values = codes[present], values[present]
+    order = np.lexsort((values, codes))
+    ordered = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    result = np.full(n_groups, np.nan)
+    has = counts > 0
+    position = (counts[has] - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts[has] - 1)
+    low = ordered[starts[has] + lower]
+    high = ordered[starts[has] + upper]
+    result[has] = low + (high - low) * (position - lower)
+    return result
+
+
+def _grouped_ewma(
+    codes: np.ndarray, values: np.ndarray, n_groups: int, span: int
+) -> np.ndarray:
+    """``HistoryIndex.ewma`` for every group at once, in row order.
+
+    The per-reading weights are products of carry factors over the later
+    readings of the same group; they are summed in log space so one
+    cumulative sum serves all groups.
+    """
+    order = np.argsort(codes, kind="stable")
+    codes, values = codes[order], values[order]
+    position = np.arange(len(codes)) - np.searchsorted(codes, codes)
+
+    present = ~np.isnan(values)
+    codes, values, position = codes[present], values[present], position[present]
+    result = np.full(n_groups, np.nan)
+    if codes.size == 0:
+        return result
+
+    alpha = 2.0 / (span + 1.0)
+    first = np.ones(codes.size, dtype=bool)
+    first[1:] = codes[1:] != codes[:-1]
+    gap = np.diff(position, prepend=0)
+    log_decay = gap * np.log1p(-alpha)
+    log_norm = np.logaddexp(log_decay, np.log(alpha))
+    log_carry = np.where(first, 0.0, log_decay - log_norm)
+
+    # Sum of log_carry over the later readings of each group.
+    cumulative = np.cumsum(log_carry)
+    last = np.append(np.flatnonzero(first[1:]), codes.size - 1)
+    group_total = cumulative[last][np.cumsum(first) - 1]
+    log_weight = (group_total - cumulative) + np.where(first, 0.0, np.log(alpha) - log_norm)
+
+    sums = np.bincount(codes, weights=np.exp(log_weight) * values, minlength=n_groups)
+    seen = np.bincount(codes, minlength=n_groups) > 0
+    result[seen] = sums[seen]
+    return result
@@ -0,0 +1,206 @@
+"""Parallel Prophet baselines across the sites of an event.
+
+Prophet fits are CPU-bound and single-threaded, so computing baselines for
+an event with many sites one after another leaves every core but one idle.
+``ParallelBaselineRunner`` fans the site histories out to a
+``ProcessPoolExecutor`` and yields each ``SiteBaseline`` as soon as its fit
+finishes. A site whose forecast raises falls back to
+``compute_baseline_simple`` in the parent; the other sites are unaffected.
+
+A worker process dying breaks the whole pool and fails every fit in
+flight, so at most ``max_workers`` sites are in flight at a time. When
+the pool breaks, those sites are rerun one at a time on a fresh pool:
+only the site that kills its worker again falls back, and the rest keep
+their Prophet baseline.
+
+Workers are spawned (not forked) so the pool is safe to start from a
+threaded API process. Each worker keeps its own ``default_model_cache``;
+set DR_PROPHET_CACHE_DIR to share fitted models between workers and runs.
+
+Env vars:
+  DR_BASELINE_WORKERS — worker processes (default: CPU count)
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+import pandas as pd
+
+from services.baseline import compute_baseline_simple, forecast_prophet
+from services.env import int_env
+
+logger = logging.getLogger(__name__)
+
+ForecastFn = Callable[[pd.DataFrame, str, str, str], float]
+
+
+@dataclass
+class SiteBaseline:
+    """One site's baseline; ``elapsed_s`` is the time spent computing it."""
+
+    site_id: str
+    baseline_kw: float
+    method: str
+    elapsed_s: float
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _forecast_site(
+    forecast: ForecastFn,
+    site_id: str,
+    history_df: pd.DataFrame,
+    event_start: str,
+    event_end: str,
+) -> tuple[float, float]:
+    started = time.perf_counter()
+    value = forecast(history_df, event_start, event_end, site_id)
+    return value, time.perf_counter() - started
+
+
+class ParallelBaselineRunner:
+    """Fits per-site Prophet baselines on a pool of worker processes."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        forecast: ForecastFn = forecast_prophet,
+    ):
+        self.max_workers = (
+            max_workers if max_workers is not None
+            else int_env("DR_BASELINE_WORKERS", default=os.cpu_count() or 1, minimum=1)
+        )
+        self._forecast = forecast
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        histories: Mapping[str, pd.DataFrame] | Iterable[tuple[str, pd.DataFrame]],
+        event_start: str,
+        event_end: str,
+    ) -> Iterator[SiteBaseline]:
+        """Yield one ``SiteBaseline`` per site, in completion order."""
+        items = iter(histories.items() if isinstance(histories, Mapping) else histories)
+        pending: dict[Future, tuple[str, pd.DataFrame]] = {}
+        # Sites whose fit was lost to a broken pool, rerun in isolation.
+        suspects: list[tuple[str, pd.DataFrame]] = []
+
+        def fill() -> None:
+            while len(pending) < self.max_workers:
+                item = next(items, None)
+                if item is None:
+                    return
+                site_id, history_df = item
+                pending[self._submit(site_id, history_df, event_start, event_end)] = item
+
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                site_id, history_df = pending.pop(future)
+                try:
+                    value, elapsed = future.result()
+                except BrokenProcessPool:
+                    suspects.append((site_id, history_df))
+                except Exception as exc:
+                    yield self._fallback(site_id, history_df, event_start, exc)
+                else:
+                    yield SiteBaseline(site_id, value, "prophet", elapsed)
+            if suspects:
+                if pending:
+                    # The rest of the broken pool's futures fail shortly.
+                    continue
+                self._reset()
+                for site_id, history_df in suspects:
+                    yield self._run_isolated(site_id, history_df, event_start, event_end)
+                suspects = []
+            fill()
+
+    def run_all(
+        self,
+        histories: Mapping[str, pd.DataFrame] | Iterable[tuple[str, pd.DataFrame]],
+        event_start: str,
+        event_end: str,
+    ) -> dict[str, SiteBaseline]:
+        return {r.site_id: r for r in self.run(histories, event_start, event_end)}
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ParallelBaselineRunner:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _submit(
+        self, site_id: str, history_df: pd.DataFrame, event_start: str, event_end: str
+    ) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self._executor
+        try:
+            return executor.submit(
+                _forecast_site, self._forecast, site_id, history_df, event_start, event_end
+            )
+        except BrokenProcessPool as exc:
+            # A worker died since the pool was last used; fail this site like
+            # the fits lost with it (``run`` reruns those) and start a fresh
+            # pool for the next submission.
+            self._reset()
+            failed: Future = Future()
+            failed.set_exception(exc)
+            return failed
+
+    def _run_isolated(
+        self, site_id: str, history_df: pd.DataFrame, event_start: str, event_end: str
+    ) -> SiteBaseline:
+        """Fit one site alone, so a pool it breaks can only be its own fault."""
+        try:
+            value, elapsed = self._submit(site_id, history_df, event_start, event_end).result()
+        except Exception as exc:
+            if isinstance(exc, BrokenProcessPool):
+                self._reset()
+            return self._fallback(site_id, history_df, event_start, exc)
+        return SiteBaseline(site_id, value, "prophet", elapsed)
+
+    def _fallback(
+        self, site_id: str, history_df: pd.DataFrame, event_start: str, exc: Exception
+    ) -> SiteBaseline:
+        logger.warning(
+            "Prophet failed for %s (%s), falling back to simple method", site_id, exc
+        )
+        started = time.perf_counter()
+        value = compute_baseline_simple(history_df, pd.Timestamp(event_start).hour)
+        return SiteBaseline(
+            site_id,
+            value,
+            "simple",
+            time.perf_counter() - started,
+            error=str(exc) or type(exc).__name__,
+        )
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
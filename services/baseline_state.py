@@ -0,0 +1,409 @@
+"""Incremental per-site baseline state, updated as meter readings arrive.
+
+``BaselineEngine`` rescans a site's whole history on every call. This module
+keeps the same three baselines as running state instead, so readings can be
+pushed one at a time (or in batches) and a baseline is read in O(1):
+
+  - simple: per hour of day, a 7-day window of readings with a running
+    sum and count; the overall mean is the fallback
+  - ewma: per hour of day, the last value of the ``ewm(adjust=False)``
+    recursion, with missing readings decaying the average as in
+    ``HistoryIndex.ewma``
+  - percentile: per hour of day, a P² streaming quantile sketch (exact
+    until five readings have been seen)
+
+Pushed in chronological order, the state gives the same simple and EWMA
+values as ``BaselineEngine.compute_all`` over the same rows; the percentile
+is the P² estimate. ``to_dict``/``from_dict`` (and ``BaselineStateStore.save``/
+``load``) round-trip the full state through JSON so it survives restarts.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+import pandas as pd
+
+from services.baseline_engine import BaselineResult
+from services.data_adapters import MeterReading
+
+_HOURS_PER_DAY = 24
+_DAY_NS = 24 * 3600 * 1_000_000_000
+_METHODS = ("simple", "ewma", "percentile")
+
+
+class P2Quantile:
+    """P² estimate of one quantile (Jain & Chlamtac) in constant memory.
+
+    Keeps five markers whose heights track the minimum, the p/2, p and
+    (1+p)/2 quantiles, and the maximum. Until five values are seen the
+    estimate is the exact linear-interpolated quantile.
+    """
+
+    def __init__(self, q: float):
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"q must be 0-1, got {q}")
+        self.q = q
+        self.count = 0
+        self.heights: list[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1.0 + 2 * q, 1.0 + 4 * q, 3.0 + 2 * q, 5.0]
+        self._step = [0.0, q / 2, q, (1.0 + q) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            bisect.insort(heights, x)
+            return
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(heights, x) - 1
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self._step[i]
+        for i in (1, 2, 3):
+            self._adjust(i)
+
+    def value(self) -> float:
+        if self.count == 0:
+            return float("nan")
+        if self.count <= 5:
+            position = (self.count - 1) * self.q
+            lower = math.floor(position)
+            upper = min(lower + 1, self.count - 1)
+            low, high = self.heights[lower], self.heights[upper]
+            return low + (high - low) * (position - lower)
+        return self.heights[2]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "q": self.q,
+            "count": self.count,
+            "heights": list(self.heights),
+            "positions": list(self.positions),
+            "desired": list(self.desired),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> P2Quantile:
+        sketch = cls(data["q"])
+        sketch.count = data["count"]
+        sketch.heights = list(data["heights"])
+        sketch.positions = list(data["positions"])
+        sketch.desired = list(data["desired"])
+        return sketch
+
+    def _adjust(self, i: int) -> None:
+        n, h = self.positions, self.heights
+        d = self.desired[i] - n[i]
+        if not ((d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1)):
+            return
+        step = 1 if d > 0 else -1
+        parabolic = h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+        if h[i - 1] < parabolic < h[i + 1]:
+            h[i] = parabolic
+        else:
+            h[i] += step * (h[i + step] - h[i]) / (n[i + step] - n[i])
+        n[i] += step
+
+
+class _HourBucket:
+    """Running state for one hour of day."""
+
+    def __init__(self, q: float):
+        self.rows = 0
+        # 7-day window: (ts_ns, kw) sorted by time, plus running sum/count
+        # of its non-NaN readings.
+        self.window: list[tuple[int, float]] = []
+        self.window_sum = 0.0
+        self.window_count = 0
+        # EWMA: last value and rows since the last non-NaN reading.
+        self.ewma: float | None = None
+        self.gap = 0
+        self.sketch = P2Quantile(q)
+
+    def add(self, ts_ns: int, kw: float, cutoff_ns: int, alpha: float) -> None:
+        self.rows += 1
+        if ts_ns >= cutoff_ns:
+            bisect.insort(self.window, (ts_ns, kw))
+            if not math.isnan(kw):
+                self.window_sum += kw
+                self.window_count += 1
+
+        self.gap += 1
+        if math.isnan(kw):
+            return
+        if self.ewma is None:
+            self.ewma = kw
+        else:
+            decay = (1.0 - alpha) ** self.gap
+            self.ewma = (decay * self.ewma + alpha * kw) / (decay + alpha)
+        self.gap = 0
+        self.sketch.add(kw)
+
+    def evict(self, cutoff_ns: int) -> None:
+        window = self.window
+        stale = bisect.bisect_left(window, (cutoff_ns, -math.inf))
+        if stale == 0:
+            return
+        for _, kw in window[:stale]:
+            if not math.isnan(kw):
+                self.window_sum -= kw
+                self.window_count -= 1
+        del window[:stale]
+        if self.window_count == 0:
+            # Drop accumulated rounding error whenever the window drains.
+            self.window_sum = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "window": [list(entry) for entry in self.window],
+            "window_sum": self.window_sum,
+            "window_count": self.window_count,
+            "ewma": self.ewma,
+            "gap": self.gap,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> _HourBucket:
+        bucket = cls(data["sketch"]["q"])
+        bucket.rows = data["rows"]
+        bucket.window = [(int(ts), float(kw)) for ts, kw in data["window"]]
+        bucket.window_sum = data["window_sum"]
+        bucket.window_count = data["window_count"]
+        bucket.ewma = data["ewma"]
+        bucket.gap = data["gap"]
+        bucket.sketch = P2Quantile.from_dict(data["sketch"])
+        return bucket
+
+
+class SiteBaselineState:
+    """Streaming simple / EWMA / percentile baselines for one site."""
+
+    def __init__(self, percentile: int = 75, span: int = 24, window_days: int = 7):
+        if percentile < 0 or percentile > 100:
+            raise ValueError(f"percentile must be 0-100, got {percentile}")
+        self.percentile = percentile
+        self.span = span
+        self.window_days = window_days
+        self.latest_ns: int | None = None
+        self.total_sum = 0.0
+        self.total_count = 0
+        self.overall = P2Quantile(percentile / 100)
+        self.buckets = [_HourBucket(percentile / 100) for _ in range(_HOURS_PER_DAY)]
+
+    def push(self, reading: MeterReading) -> None:
+        parsed = pd.to_datetime(reading.timestamp, errors="coerce")
+        if pd.isna(parsed):
+            self._add(None, -1, reading.kw)
+        else:
+            self._add(parsed.value, parsed.hour, reading.kw)
+
+    def push_many(self, readings: Iterable[MeterReading]) -> None:
+        """Apply readings in order; timestamps are parsed in one call.
+
+        Unparseable timestamps become NaT: the reading counts towards the
+        overall fallback but belongs to no hour, as in ``push``.
+        """
+        readings = list(readings)
+        if not readings:
+            return
+        parsed = _parse_timestamps([r.timestamp for r in readings])
+        valid = ~parsed.isna()
+        for reading, ts_ns, hour, ok in zip(readings, parsed.asi8, parsed.hour, valid):
+            self._add(int(ts_ns) if ok else None, int(hour) if ok else -1, reading.kw)
+
+    def same_hour_count(self, event_hour: int) -> int:
+        bucket = self._bucket(event_hour)
+        return bucket.rows if bucket else 0
+
+    def simple(self, event_hour: int) -> float:
+        """7-day same-hour average; overall mean if there is none."""
+        bucket = self._bucket(event_hour)
+        if bucket is None or not bucket.window:
+            return self._overall_mean()
+        if self.latest_ns is not None:
+            bucket.evict(self._cutoff())
+        if not bucket.window:
+            return self._overall_mean()
+        if bucket.window_count == 0:
+            return float("nan")
+        return bucket.window_sum / bucket.window_count
+
+    def ewma(self, event_hour: int) -> float:
+        """Last value of the same-hour EWMA; overall mean if there is none."""
+        bucket = self._bucket(event_hour)
+        if bucket is None or bucket.rows == 0:
+            return self._overall_mean()
+        return float("nan") if bucket.ewma is None else bucket.ewma
+
+    def percentile_value(self, event_hour: int) -> float:
+        """Same-hour percentile estimate; overall estimate if there is none."""
+        bucket = self._bucket(event_hour)
+        if bucket is None or bucket.rows == 0:
+            return self.overall.value()
+        return bucket.sketch.value()
+
+    def compute(self, event_hour: int, method: str = "auto") -> BaselineResult:
+        if method == "auto":
+            return max(self.compute_all(event_hour), key=lambda r: r.confidence)
+        if method not in _METHODS:
+            raise ValueError(
+                f"unknown method: '{method}'. Valid: {', '.join(sorted(_METHODS + ('auto',)))}"
+            )
+        n_points = self.same_hour_count(event_hour)
+        confidence = min(1.0, n_points / 7)
+        if method == "simple":
+            return BaselineResult(
+                baseline_kwh=self.simple(event_hour),
+                method="simple",
+                confidence=confidence,
+                details={"same_hour_points": n_points},
+            )
+        if method == "ewma":
+            return BaselineResult(
+                baseline_kwh=self.ewma(event_hour),
+                method="ewma",
+                confidence=confidence * 0.95,
+                details={"span": self.span, "same_hour_points": n_points},
+            )
+        return BaselineResult(
+            baseline_kwh=self.percentile_value(event_hour),
+            method="percentile",
+            confidence=confidence * 0.9,
+            details={"percentile": self.percentile, "same_hour_points": n_points},
+        )
+
+    def compute_all(self, event_hour: int) -> list[BaselineResult]:
+        return [self.compute(event_hour, method) for method in _METHODS]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "percentile": self.percentile,
+            "span": self.span,
+            "window_days": self.window_days,
+            "latest_ns": self.latest_ns,
+            "total_sum": self.total_sum,
+            "total_count": self.total_count,
+            "overall": self.overall.to_dict(),
+            "buckets": [bucket.to_dict() for bucket in self.buckets],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SiteBaselineState:
+        state = cls(data["percentile"], data["span"], data["window_days"])
+        state.latest_ns = data["latest_ns"]
+        state.total_sum = data["total_sum"]
+        state.total_count = data["total_count"]
+        state.overall = P2Quantile.from_dict(data["overall"])
+        state.buckets = [_HourBucket.from_dict(bucket) for bucket in data["buckets"]]
+        return state
+
+    def _add(self, ts_ns: int | None, hour: int, kw: float | None) -> None:
+        kw = float("nan") if kw is None else float(kw)
+        if not math.isnan(kw):
+            self.total_sum += kw
+            self.total_count += 1
+            self.overall.add(kw)
+        if ts_ns is None:
+            # Unparseable timestamps belong to no hour, as in HistoryIndex.
+            return
+        if self.latest_ns is None or ts_ns > self.latest_ns:
+            self.latest_ns = ts_ns
+        bucket = self.buckets[hour]
+        cutoff = self._cutoff()
+        bucket.add(ts_ns, kw, cutoff, 2.0 / (self.span + 1.0))
+        bucket.evict(cutoff)
+
+    def _cutoff(self) -> int:
+        return self.latest_ns - self.window_days * _DAY_NS
+
+    def _overall_mean(self) -> float:
+        return self.total_sum / self.total_count if self.total_count else float("nan")
+
+    def _bucket(self, event_hour: int) -> _HourBucket | None:
+        if not 0 <= event_hour < _HOURS_PER_DAY:
+            return None
+        return self.buckets[event_hour]
+
+
+class BaselineStateStore:
+    """``SiteBaselineState`` per site, routed by ``MeterReading.site_id``."""
+
+    def __init__(self, percentile: int = 75, span: int = 24, window_days: int = 7):
+        self.percentile = percentile
+        self.span = span
+        self.window_days = window_days
+        self.sites: dict[str, SiteBaselineState] = {}
+
+    def push(self, reading: MeterReading) -> None:
+        self.push_many([reading])
+
+    def push_many(self, readings: Iterable[MeterReading]) -> None:
+        by_site: dict[str, list[MeterReading]] = {}
+        for reading in readings:
+            by_site.setdefault(reading.site_id, []).append(reading)
+        for site_id, site_readings in by_site.items():
+            self.state(site_id).push_many(site_readings)
+
+    def state(self, site_id: str) -> SiteBaselineState:
+        state = self.sites.get(site_id)
+        if state is None:
+            state = SiteBaselineState(self.percentile, self.span, self.window_days)
+            self.sites[site_id] = state
+        return state
+
+    def compute(self, site_id: str, event_hour: int, method: str = "auto") -> BaselineResult:
+        if site_id not in self.sites:
+            raise KeyError(f"no readings for site: {site_id}")
+        return self.sites[site_id].compute(event_hour, method)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "percentile": self.percentile,
+            "span": self.span,
+            "window_days": self.window_days,
+            "sites": {site_id: state.to_dict() for site_id, state in self.sites.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BaselineStateStore:
+        store = cls(data["percentile"], data["span"], data["window_days"])
+        store.sites = {
+            site_id: SiteBaselineState.from_dict(state)
+            for site_id, state in data["sites"].items()
+        }
+        return store
+
+    def save(self, path: str | Path) -> None:
+        """Write the state as JSON, atomically replacing ``path``."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> BaselineStateStore:
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+def _parse_timestamps(timestamps: list[Any]) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(timestamps, format="ISO8601", errors="coerce"))
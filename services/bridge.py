@@ -1,22 +1,26 @@
 """Bridge service for DRT cross-chain transfers (ICTT pattern).
 
-Tracks the lifecycle of cross-chain bridge transfers in SQLite:
+Tracks the lifecycle of cross-chain bridge transfers in the configured database:
   initiated → source_submitted → source_confirmed → dest_submitted → completed
 """
 
 from __future__ import annotations
 
-import json
 import os
-import sqlite3
-import subprocess
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
+from typing import Any, Mapping
 
-from services.db import connect as db_connect
+from services.chain_worker import (
+    ChainWorkerError,
+    ChainWorkerProtocolError,
+    get_chain_worker_pool,
+)
+from services.db import Migration, create_tables, migrate, open_storage
+from services.db_backend import DatabaseBackend, column_exists
 
 
 class BridgeDirection(Enum):
@@ -53,16 +57,30 @@ CREATE TABLE IF NOT EXISTS bridge_transfers (
 """
 
 
+def _add_idempotency_key(db: DatabaseBackend) -> None:
+    if not column_exists(db, "bridge_transfers", "idempotency_key"):
+        db.execute("ALTER TABLE bridge_transfers ADD COLUMN idempotency_key TEXT")
+    db.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS bridge_transfers_idempotency_key ON bridge_transfers(idempotency_key)"
+    )
+
+
+BRIDGE_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "bridge_transfers table", create_tables(BRIDGE_SCHEMA_SQL)),
+    Migration(2, "bridge_transfers idempotency key", _add_idempotency_key),
+)
+
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 class BridgeService:
-    def __init__(self, db_path: str | None = None):
-        self.conn = db_connect(db_path)
-        self.conn.executescript(BRIDGE_SCHEMA_SQL)
-        self._ensure_idempotency_key()
-        self.conn.commit()
+    def __init__(
+        self, db_path: str | None = None, db: DatabaseBackend | None = None
+    ):
+        self._db = db if db is not None else open_storage(db_path)
+        migrate(self._db, "bridge", BRIDGE_MIGRATIONS)
         self.chain_mode = os.getenv("DR_CHAIN_MODE", "simulated")
         self.chain_action_script = (
             Path(__file__).resolve().parents[1]
@@ -70,15 +88,6 @@ class BridgeService:
             / _chain_action_script_for_mode(self.chain_mode)
         )
 
-    def _ensure_idempotency_key(self) -> None:
-        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(bridge_transfers)")}
-        if "idempotency_key" not in columns:
-            self.conn.execute("ALTER TABLE bridge_transfers ADD COLUMN idempotency_key TEXT")
-        self.conn.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS bridge_transfers_idempotency_key ON bridge_transfers(idempotency_key)"
-        )
-        self.conn.commit()
-
     def initiate_transfer(
         self,
         sender: str,
@@ -88,16 +97,16 @@ class BridgeService:
     ) -> BridgeTransfer:
         transfer_id = f"bridge-{uuid.uuid4().hex[:12]}"
         now = _utc_now()
-        self.conn.execute(
-            """
-            INSERT INTO bridge_transfers
-                (transfer_id, idempotency_key, sender, amount_wei, direction, status,
-                 source_tx_hash, dest_tx_hash, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, 'initiated', NULL, NULL, ?, ?)
-            """,
-            (transfer_id, idempotency_key, sender, amount_wei, direction.value, now, now),
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                """
+                INSERT INTO bridge_transfers
+                    (transfer_id, idempotency_key, sender, amount_wei, direction, status,
+                     source_tx_hash, dest_tx_hash, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'initiated', NULL, NULL, ?, ?)
+                """,
+                (transfer_id, idempotency_key, sender, amount_wei, direction.value, now, now),
+            )
         return self._get(transfer_id)
 
     def mark_source_submitted(
@@ -121,31 +130,31 @@ class BridgeService:
         return self._get(transfer_id)
 
     def get_transfer(self, transfer_id: str) -> BridgeTransfer | None:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             "SELECT * FROM bridge_transfers WHERE transfer_id = ?",
             (transfer_id,),
-        ).fetchone()
+        )
         if row is None:
             return None
         return self._row_to_transfer(row)
 
     def get_by_idempotency(self, idempotency_key: str) -> BridgeTransfer | None:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             "SELECT * FROM bridge_transfers WHERE idempotency_key = ?",
             (idempotency_key,),
-        ).fetchone()
+        )
         if row is None:
             return None
         return self._row_to_transfer(row)
 
     def get_stats(self) -> dict:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             "SELECT COUNT(*) as total FROM bridge_transfers"
-        ).fetchone()
+        )
         total = row["total"] if row else 0
-        row_p = self.conn.execute(
+        row_p = self._db.fetchone(
             "SELECT COUNT(*) as cnt FROM bridge_transfers WHERE status != 'completed'"
-        ).fetchone()
+        )
         pending = row_p["cnt"] if row_p else 0
         completed = total - pending
         return {
@@ -155,9 +164,9 @@ class BridgeService:
         }
 
     def list_pending_transfers(self) -> list[BridgeTransfer]:
-        rows = self.conn.execute(
+        rows = self._db.fetchall(
             "SELECT * FROM bridge_transfers WHERE status != 'completed' ORDER BY created_at",
-        ).fetchall()
+        )
         return [self._row_to_transfer(r) for r in rows]
 
     def send_bridge_tokens(self, transfer_id: str, amount_wei: str) -> dict:
@@ -204,14 +213,14 @@ class BridgeService:
             sets.append("dest_tx_hash = ?")
             params.append(dest_tx_hash)
         params.append(transfer_id)
-        self.conn.execute(
-            f"UPDATE bridge_transfers SET {', '.join(sets)} WHERE transfer_id = ?",
-            params,
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                f"UPDATE bridge_transfers SET {', '.join(sets)} WHERE transfer_id = ?",
+                params,
+            )
 
     @staticmethod
-    def _row_to_transfer(row: sqlite3.Row) -> BridgeTransfer:
+    def _row_to_transfer(row: Mapping[str, Any]) -> BridgeTransfer:
         return BridgeTransfer(
             transfer_id=row["transfer_id"],
             sender=row["sender"],
@@ -227,27 +236,13 @@ class BridgeService:
     def _chain_action(self, action: str, payload: dict) -> dict:
         if not self.chain_action_script.exists():
             raise ValueError(f"bridge chain action script not found: {self.chain_action_script}")
-        cmd = ["node", str(self.chain_action_script), action]
-        result = subprocess.run(
-            cmd,
-            input=json.dumps(payload),
-            text=True,
-            capture_output=True,
-            check=False,
-            env=os.environ.copy(),
-        )
-        if result.returncode != 0:
-            stderr = (result.stderr or "").strip()
-            stdout = (result.stdout or "").strip()
-            detail = stderr or stdout or f"exit={result.returncode}"
-            raise RuntimeError(f"bridge chain action failed: {detail}")
-        raw = (result.stdout or "").strip()
-        if not raw:
-            raise RuntimeError("bridge chain action returned empty output")
+        pool = get_chain_worker_pool(self.chain_action_script)
         try:
-            return json.loads(raw.splitlines()[-1])
-        except json.JSONDecodeError as exc:
+            return pool.call(action, payload)
+        except ChainWorkerProtocolError as exc:
             raise RuntimeError("bridge chain action returned non-json output") from exc
+        except ChainWorkerError as exc:
+            raise RuntimeError(f"bridge chain action failed: {exc}") from exc
 
 
 def _chain_action_script_for_mode(chain_mode: str) -> str:
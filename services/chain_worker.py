@@ -0,0 +1,376 @@
+"""Persistent Node worker pool for chain action scripts.
+
+Each ``scripts/*_chain_action.js`` script can run in ``--serve`` mode, where
+it keeps its provider, wallet and contract handles alive and answers
+line-delimited JSON requests on stdin/stdout:
+
+    request:  {"id": 7, "action": "create_event", "confirm_mode": "hybrid", "payload": {...}}
+    response: {"id": 7, "ok": true, "tx_hash": "0x...", ...}
+              {"id": 7, "ok": false, "error": "..."}
+
+``ChainWorkerPool`` keeps a bounded set of such processes per script, pings
+workers that have been idle for a while and respawns any worker that exits,
+times out or breaks the protocol. Pools are shared process-wide through
+``get_chain_worker_pool`` so SubmitterService, BridgeService and ICMService
+reuse the same warm workers instead of paying Node startup, module import
+and RPC handshake on every transaction.
+
+Every script signs with the same ``PRIVATE_KEY``, so two workers sending
+at once would race for the account nonce. Actions outside
+``READ_ONLY_ACTIONS`` therefore run one at a time across all pools in this
+process (a single signing lane); receipt checks still run in parallel.
+Workers also rebuild their contract handles when the deployment report
+they were built from changes on disk.
+
+Env vars:
+  DR_CHAIN_WORKER_POOL_SIZE        — workers per script (default: 2)
+  DR_CHAIN_WORKER_TIMEOUT_SECONDS  — per-request timeout (default: 120)
+  DR_CHAIN_WORKER_HEALTH_SECONDS   — idle time before a ping health check (default: 30)
+"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import itertools
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from services.env import float_env, int_env
+
+SERVE_FLAG = "--serve"
+_STDERR_TAIL_LINES = 20
+_PING_TIMEOUT_SECONDS = 5.0
+
+# Actions that only read chain state; every other action signs a transaction.
+READ_ONLY_ACTIONS = frozenset({"ping", "check_tx", "check_txs"})
+_SIGNING_LOCK = threading.Lock()
+
+
+class ChainWorkerError(RuntimeError):
+    """Chain action failed, or the worker died before answering."""
+
+
+class ChainWorkerProtocolError(ChainWorkerError):
+    """Worker answered with output that is not a valid response line."""
+
+
+class ChainWorker:
+    """One long-lived ``node <script> --serve`` process."""
+
+    def __init__(self, script: Path):
+        self.script = script
+        self.last_used = 0.0
+        self._proc: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._stderr_tail: collections.deque[str] = collections.deque(
+            maxlen=_STDERR_TAIL_LINES
+        )
+        self._ids = itertools.count(1)
+        self._stderr_reader: threading.Thread | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    def start(self) -> None:
+        self._proc = subprocess.Popen(
+            ["node", str(self.script), SERVE_FLAG],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=os.environ.copy(),
+        )
+        self.last_used = time.monotonic()
+        threading.Thread(
+            target=self._pump_stdout, args=(self._proc,), daemon=True
+        ).start()
+        self._stderr_reader = threading.Thread(
+            target=self._pump_stderr, args=(self._proc,), daemon=True
+        )
+        self._stderr_reader.start()
+
+    def call(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        confirm_mode: str | None,
+        timeout: float,
+    ) -> dict[str, Any]:
+        if not self.alive:
+            raise ChainWorkerError(self._exit_detail())
+
+        request_id = next(self._ids)
+        request = {
+            "id": request_id,
+            "action": action,
+            "confirm_mode": confirm_mode,
+            "payload": payload,
+        }
+        try:
+            assert self._proc is not None and self._proc.stdin is not None
+            self._proc.stdin.write(json.dumps(request) + "\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as exc:
+            raise ChainWorkerError(self._exit_detail()) from exc
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise ChainWorkerError(
+                    f"chain worker timed out after {timeout:g}s on {action}"
+                )
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise ChainWorkerError(self._exit_detail())
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError as exc:
+                self.close()
+                raise ChainWorkerProtocolError(
+                    f"chain worker returned non-json output: {line[:200]}"
+                ) from exc
+            if not isinstance(response, dict):
+                self.close()
+                raise ChainWorkerProtocolError("chain worker returned non-object output")
+            if response.get("id") != request_id:
+                # Stale answer to a request that already timed out.
+                continue
+            break
+
+        self.last_used = time.monotonic()
+        response.pop("id", None)
+        if not response.get("ok", False):
+            raise ChainWorkerError(str(response.get("error") or "unknown error"))
+        return response
+
+    def ping(self, timeout: float = _PING_TIMEOUT_SECONDS) -> bool:
+        try:
+            self.call("ping", {}, None, timeout)
+        except ChainWorkerError:
+            return False
+        return True
+
+    def close(self) -> None:
+        proc = self._proc
+        if proc is None:
+            return
+        if proc.poll() is None:
+            try:
+                assert proc.stdin is not None
+                proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def _pump_stdout(self, proc: subprocess.Popen[str]) -> None:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            line = line.strip()
+            if line:
+                self._lines.put(line)
+        self._lines.put(None)
+
+    def _pump_stderr(self, proc: subprocess.Popen[str]) -> None:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            line = line.strip()
+            if line:
+                self._stderr_tail.append(line)
+
+    def _exit_detail(self) -> str:
+        proc = self._proc
+        if proc is not None:
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
+        if self._stderr_reader is not None:
+            self._stderr_reader.join(timeout=1)
+        stderr = "\n".join(self._stderr_tail).strip()
+        if stderr:
+            return stderr
+        code = proc.returncode if proc is not None else None
+        return f"chain worker exited (exit={code})"
+
+
+class ChainWorkerPool:
+    """Bounded pool of ``ChainWorker`` processes for a single script.
+
+    Workers are spawned lazily on first use. A worker is checked out for
+    exactly one request at a time, so read-only requests to the same pool
+    run in parallel up to ``size``; signing requests also wait for the
+    process-wide signing lane.
+    """
+
+    def __init__(
+        self,
+        script: Path,
+        size: int = 2,
+        timeout: float = 120.0,
+        health_interval: float = 30.0,
+    ):
+        self.script = script
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self._idle: queue.LifoQueue[ChainWorker | None] = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._workers: set[ChainWorker] = set()
+        self.closed = False
+        self._stats = {"calls": 0, "failures": 0, "spawned": 0, "respawned": 0}
+
+    def call(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        confirm_mode: str | None = None,
+    ) -> dict[str, Any]:
+        if self.closed:
+            raise ChainWorkerError("chain worker pool is closed")
+        if action in READ_ONLY_ACTIONS:
+            return self._call(action, payload, confirm_mode)
+        if not _SIGNING_LOCK.acquire(timeout=self.timeout):
+            raise ChainWorkerError(f"signing lane busy after {self.timeout:g}s")
+        try:
+            return self._call(action, payload, confirm_mode)
+        finally:
+            _SIGNING_LOCK.release()
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            alive = sum(1 for w in self._workers if w.alive)
+            return {
+                "script": self.script.name,
+                "size": self.size,
+                "alive": alive,
+                "idle": self._idle.qsize(),
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        self.closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+    def _call(
+        self,
+        action: str,
+        payload: dict[str, Any],
+        confirm_mode: str | None,
+    ) -> dict[str, Any]:
+        try:
+            worker = self._idle.get(timeout=self.timeout)
+        except queue.Empty as exc:
+            raise ChainWorkerError(
+                f"no chain worker available after {self.timeout:g}s"
+            ) from exc
+
+        try:
+            worker = self._ready(worker)
+            with self._lock:
+                self._stats["calls"] += 1
+            return worker.call(action, payload, confirm_mode, self.timeout)
+        except ChainWorkerError:
+            with self._lock:
+                self._stats["failures"] += 1
+            if worker is not None and not worker.alive:
+                self._discard(worker)
+                worker = None
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def _ready(self, worker: ChainWorker | None) -> ChainWorker:
+        if worker is not None and worker.alive:
+            idle_for = time.monotonic() - worker.last_used
+            if idle_for < self.health_interval or worker.ping():
+                return worker
+        if worker is not None:
+            self._discard(worker)
+            with self._lock:
+                self._stats["respawned"] += 1
+        return self._spawn()
+
+    def _spawn(self) -> ChainWorker:
+        worker = ChainWorker(self.script)
+        try:
+            worker.start()
+        except OSError as exc:
+            raise ChainWorkerError(f"failed to start chain worker: {exc}") from exc
+        with self._lock:
+            self._workers.add(worker)
+            self._stats["spawned"] += 1
+        return worker
+
+    def _discard(self, worker: ChainWorker) -> None:
+        worker.close()
+        with self._lock:
+            self._workers.discard(worker)
+
+
+_POOLS: dict[Path, ChainWorkerPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_chain_worker_pool(script: Path) -> ChainWorkerPool:
+    """Return the process-wide pool for ``script``, creating it on first use."""
+    key = script.resolve()
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None or pool.closed:
+            pool = ChainWorkerPool(
+                key,
+                size=int_env("DR_CHAIN_WORKER_POOL_SIZE", default=2, minimum=1),
+                timeout=float_env(
+                    "DR_CHAIN_WORKER_TIMEOUT_SECONDS", default=120.0, minimum=1.0
+                ),
+                health_interval=float_env(
+                    "DR_CHAIN_WORKER_HEALTH_SECONDS", default=30.0, minimum=0.0
+                ),
+            )
+            _POOLS[key] = pool
+        return pool
+
+
+def chain_worker_health() -> list[dict[str, Any]]:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    return [pool.health() for pool in pools]
+
+
+def shutdown_chain_worker_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_chain_worker_pools)
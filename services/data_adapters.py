@@ -2,6 +2,20 @@
 
 Adapters normalize data from different sources (CSV, JSON, API, IoT)
 into a standard format for baseline computation and proof building.
+
+Two read paths are offered:
+  - ``load`` returns ``MeterReading`` objects, convenient for small inputs
+  - ``load_dataframe`` / ``iter_chunks`` read straight into columnar
+    DataFrames (UTC datetime64 ``timestamp``, float64 ``kw``) without
+    building a Python object per row; ``iter_chunks`` bounds memory for
+    files larger than RAM. Offsets are converted to UTC, so files whose
+    offset changes across DST still load as one datetime64 column, and
+    naive timestamps are taken to be UTC
+
+``ArrowAdapter`` reads Parquet or Arrow IPC files through ``pyarrow.dataset``
+(optional dependency), pushing site and time-range filters down to the
+scan and memory-mapping the file, and can hand the result to
+``BaselineEngine`` as a ``HistoryIndex``.
 """
 
 from __future__ import annotations
@@ -10,10 +24,16 @@ import csv
 import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator
 
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from services.baseline_engine import HistoryIndex
+
+DEFAULT_CHUNK_ROWS = 100_000
+
 
 @dataclass
 class MeterReading:
@@ -26,15 +46,161 @@ class MeterReading:
 
 
 def validate_readings(readings: list[MeterReading]) -> list[str]:
+    """One message per missing timestamp or negative kw, in row order.
+
+    Offending rows are found with array masks; messages are only built for
+    them. Prefer ``validate_frame`` for large inputs.
+    """
+    if not readings:
+        return []
+    missing = np.array([not r.timestamp for r in readings])
+    kw = np.array([r.kw for r in readings], dtype=np.float64)
+    negative = kw < 0
     errors: list[str] = []
-    for i, r in enumerate(readings):
-        if not r.timestamp:
+    for i in np.flatnonzero(missing | negative):
+        if missing[i]:
             errors.append(f"reading[{i}]: missing timestamp")
-        if r.kw < 0:
-            errors.append(f"reading[{i}]: negative kw value ({r.kw})")
+        if negative[i]:
+            errors.append(f"reading[{i}]: negative kw value ({readings[i].kw})")
     return errors
 
 
+@dataclass
+class ValidationIssue:
+    count: int
+    sample: list[int]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ValidationReport:
+    """Counts per issue plus the first offending row indices of each.
+
+    Issues: missing_timestamp (absent or unparseable), missing_kw, negative_kw,
+    duplicate_timestamp (repeats an earlier row), out_of_order (earlier than
+    the previous row), gap (reading that follows a hole longer than 1.5x the
+    expected interval) and spike (reading far from both neighbours, in
+    units of the median absolute step).
+    """
+
+    rows: int
+    issues: dict[str, ValidationIssue]
+    expected_interval_s: float | None
+    missing_intervals: int
+
+    @property
+    def ok(self) -> bool:
+        return all(issue.count == 0 for issue in self.issues.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "ok": self.ok,
+            "issues": {name: issue.to_dict() for name, issue in self.issues.items()},
+            "expected_interval_s": self.expected_interval_s,
+            "missing_intervals": self.missing_intervals,
+        }
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    expected_interval: str | pd.Timedelta | None = None,
+    spike_factor: float = 10.0,
+    sample_size: int = 10,
+) -> ValidationReport:
+    """Vectorized validation of a (timestamp, kw) frame.
+
+    ``expected_interval`` defaults to the median step between readings.
+    Every check is a linear pass over the columns, except that gap and
+    spike detection sort the timestamps first when the rows are out of
+    order.
+    """
+    ts = df["timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        # utc=True keeps offsets that change across DST in one datetime64 column.
+        ts = pd.to_datetime(ts, format="ISO8601", utc=True, errors="coerce")
+    ts_ns = pd.DatetimeIndex(ts).as_unit("ns").asi8
+    kw = pd.to_numeric(df["kw"], errors="coerce").to_numpy(dtype=np.float64)
+    rows = len(ts_ns)
+
+    missing_ts = pd.isna(ts).to_numpy() if rows else np.zeros(0, dtype=bool)
+    masks: dict[str, np.ndarray] = {
+        "missing_timestamp": missing_ts,
+        "missing_kw": np.isnan(kw),
+        "negative_kw": kw < 0,
+        "duplicate_timestamp": pd.Series(ts_ns).duplicated().to_numpy() & ~missing_ts,
+    }
+
+    # Rows with a timestamp, in file order and in time order.
+    dated = np.flatnonzero(~missing_ts)
+    out_of_order = np.zeros(rows, dtype=bool)
+    out_of_order[dated[1:]] = np.diff(ts_ns[dated]) < 0
+    masks["out_of_order"] = out_of_order
+    if out_of_order.any():
+        dated = dated[np.argsort(ts_ns[dated], kind="stable")]
+    steps = np.diff(ts_ns[dated])
+
+    interval_ns = _expected_interval_ns(steps, expected_interval)
+    gap = np.zeros(rows, dtype=bool)
+    missing_intervals = 0
+    if interval_ns:
+        long_steps = steps > 1.5 * interval_ns
+        gap[dated[1:][long_steps]] = True
+        missing_intervals = int(np.sum(np.round(steps[long_steps] / interval_ns) - 1))
+    masks["gap"] = gap
+    masks["spike"] = _spikes(kw, dated, rows, spike_factor)
+
+    return ValidationReport(
+        rows=rows,
+        issues={
+            name: ValidationIssue(
+                count=int(mask.sum()),
+                sample=np.flatnonzero(mask)[:sample_size].tolist(),
+            )
+            for name, mask in masks.items()
+        },
+        expected_interval_s=interval_ns / 1e9 if interval_ns else None,
+        missing_intervals=missing_intervals,
+    )
+
+
+def _expected_interval_ns(
+    steps: np.ndarray, expected_interval: str | pd.Timedelta | None
+) -> int | None:
+    if expected_interval is not None:
+        return int(pd.Timedelta(expected_interval).value)
+    positive = steps[steps > 0]
+    if positive.size == 0:
+        return None
+    return int(np.median(positive))
+
+
+def _spikes(kw: np.ndarray, order: np.ndarray, rows: int, factor: float) -> np.ndarray:
+    spikes = np.zeros(rows, dtype=bool)
+    values = kw[order]
+    if values.size < 3:
+        return spikes
+    step = np.diff(values)
+    finite = np.isfinite(step)
+    if not finite.any():
+        return spikes
+    scale = np.median(np.abs(step[finite]))
+    if scale == 0:
+        scale = np.median(np.abs(values[np.isfinite(values)])) or 1.0
+    with np.errstate(invalid="ignore"):
+        rise, fall = step[:-1], step[1:]
+        # A spike jumps away from the previous reading and back again.
+        is_spike = (
+            (np.abs(rise) > factor * scale)
+            & (np.abs(fall) > factor * scale)
+            & (np.sign(rise) == -np.sign(fall))
+        )
+    spikes[order[1:-1][is_spike]] = True
+    return spikes
+
+
 class CSVAdapter:
     def __init__(self, timestamp_col: str = "timestamp", kw_col: str = "kw"):
         self.timestamp_col = timestamp_col
@@ -55,29 +221,46 @@ class CSVAdapter:
         return readings
 
     def load_dataframe(self, file_path: str, site_id: str) -> pd.DataFrame:
-        readings = self.load(file_path, site_id)
-        return pd.DataFrame(
-            [{"timestamp": r.timestamp, "kw": r.kw} for r in readings]
-        )
+        """Columnar load: one ``read_csv`` pass into typed columns."""
+        frame = pd.read_csv(file_path, **self._read_options())
+        return _meter_frame(frame, self.timestamp_col, self.kw_col)
+
+    def iter_chunks(
+        self, file_path: str, site_id: str, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """Yield ``load_dataframe``-shaped frames of at most ``chunk_rows`` rows."""
+        with pd.read_csv(file_path, chunksize=chunk_rows, **self._read_options()) as reader:
+            for chunk in reader:
+                yield _meter_frame(chunk, self.timestamp_col, self.kw_col)
+
+    def _read_options(self) -> dict[str, Any]:
+        return {
+            "usecols": [self.timestamp_col, self.kw_col],
+            "dtype": {self.kw_col: "float64"},
+        }
 
 
 class JSONAdapter:
+    """Reads a JSON array of readings, or JSON Lines with ``lines=True``.
+
+    ``data_path`` (dotted keys) locates the array inside a JSON document;
+    it does not apply to JSON Lines, where every line is one reading.
+    """
+
     def __init__(
         self,
         data_path: str | None = None,
         timestamp_key: str = "timestamp",
         kw_key: str = "kw",
+        lines: bool = False,
     ):
         self.data_path = data_path
         self.timestamp_key = timestamp_key
         self.kw_key = kw_key
+        self.lines = lines
 
     def load(self, file_path: str, site_id: str) -> list[MeterReading]:
-        raw = json.loads(Path(file_path).read_text())
-
-        if self.data_path:
-            for key in self.data_path.split("."):
-                raw = raw[key]
+        raw = self._records(file_path)
 
         readings: list[MeterReading] = []
         for item in raw:
@@ -91,20 +274,235 @@ class JSONAdapter:
         return readings
 
     def load_dataframe(self, file_path: str, site_id: str) -> pd.DataFrame:
-        readings = self.load(file_path, site_id)
-        return pd.DataFrame(
-            [{"timestamp": r.timestamp, "kw": r.kw} for r in readings]
+        """Columnar load: the two fields are pulled straight into typed columns."""
+        if self.lines:
+            chunks = list(self.iter_chunks(file_path, site_id))
+            if not chunks:
+                return _meter_frame(None, self.timestamp_key, self.kw_key)
+            return pd.concat(chunks, ignore_index=True)
+        raw = self._records(file_path)
+        columns = pd.DataFrame({
+            self.timestamp_key: [item[self.timestamp_key] for item in raw],
+            self.kw_key: [item[self.kw_key] for item in raw],
+        })
+        return _meter_frame(columns, self.timestamp_key, self.kw_key)
+
+    def iter_chunks(
+        self, file_path: str, site_id: str, chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """Yield ``load_dataframe``-shaped frames of at most ``chunk_rows`` rows.
+
+        JSON Lines files are streamed; a JSON document has to be parsed
+        whole first, so only its conversion is chunked.
+        """
+        if not self.lines:
+            frame = self.load_dataframe(file_path, site_id)
+            for start in range(0, len(frame), chunk_rows):
+                yield frame.iloc[start:start + chunk_rows].reset_index(drop=True)
+            return
+        with pd.read_json(
+            file_path, lines=True, chunksize=chunk_rows, dtype=False, convert_dates=False
+        ) as reader:
+            for chunk in reader:
+                yield _meter_frame(chunk, self.timestamp_key, self.kw_key)
+
+    def _records(self, file_path: str) -> list[dict[str, Any]]:
+        if self.lines:
+            with open(file_path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        raw = json.loads(Path(file_path).read_text())
+        if self.data_path:
+            for key in self.data_path.split("."):
+                raw = raw[key]
+        return raw
+
+
+def _meter_frame(
+    columns: pd.DataFrame | None, timestamp_col: str, kw_col: str
+) -> pd.DataFrame:
+    """Normalize raw source columns to (timestamp: UTC datetime64, kw: float64)."""
+    if columns is None or columns.empty:
+        return pd.DataFrame({
+            "timestamp": pd.Series(dtype="datetime64[ns, UTC]"),
+            "kw": pd.Series(dtype="float64"),
+        })
+    return pd.DataFrame({
+        "timestamp": pd.to_datetime(columns[timestamp_col], format="ISO8601", utc=True),
+        "kw": pd.to_numeric(columns[kw_col]).astype("float64"),
+    })
+
+
+class ArrowAdapter:
+    """Parquet (``format="parquet"``) or Arrow IPC (``format="ipc"``) meter files.
+
+    Files hold one row per reading with a timestamp-typed column, a float
+    kw column and, for multi-site files, a site column. Reads go through
+    ``pyarrow.dataset``: only the two value columns are projected, the site
+    and ``[start, end)`` time filters are pushed into the scan (so Parquet
+    row groups outside the range are skipped from their statistics), and
+    the file is memory-mapped. Needs ``pyarrow``.
+    """
+
+    def __init__(
+        self,
+        format: str = "parquet",
+        timestamp_col: str = "timestamp",
+        kw_col: str = "kw",
+        site_col: str = "site_id",
+        memory_map: bool = True,
+    ):
+        if format not in ("parquet", "ipc"):
+            raise ValueError(f"format must be 'parquet' or 'ipc', got {format!r}")
+        self.format = format
+        self.timestamp_col = timestamp_col
+        self.kw_col = kw_col
+        self.site_col = site_col
+        self.memory_map = memory_map
+
+    def load(self, file_path: str, site_id: str) -> list[MeterReading]:
+        df = self.load_dataframe(file_path, site_id)
+        return [
+            MeterReading(timestamp=ts.isoformat(), kw=float(kw), site_id=site_id)
+            for ts, kw in zip(df["timestamp"], df["kw"])
+        ]
+
+    def load_table(
+        self,
+        file_path: str,
+        site_id: str | None = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> Any:
+        """Filtered ``pyarrow.Table`` with just the timestamp and kw columns."""
+        dataset = self._dataset(file_path)
+        return dataset.to_table(
+            columns=[self.timestamp_col, self.kw_col],
+            filter=self._filter(dataset.schema, site_id, start, end),
         )
 
+    def load_dataframe(
+        self,
+        file_path: str,
+        site_id: str | None = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> pd.DataFrame:
+        return self._to_frame(self.load_table(file_path, site_id, start, end))
+
+    def iter_chunks(
+        self,
+        file_path: str,
+        site_id: str | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        start: Any = None,
+        end: Any = None,
+    ) -> Iterator[pd.DataFrame]:
+        dataset = self._dataset(file_path)
+        batches = dataset.to_batches(
+            columns=[self.timestamp_col, self.kw_col],
+            filter=self._filter(dataset.schema, site_id, start, end),
+            batch_size=chunk_rows,
+        )
+        for batch in batches:
+            if batch.num_rows:
+                yield self._to_frame(batch)
+
+    def load_history(
+        self,
+        file_path: str,
+        site_id: str | None = None,
+        start: Any = None,
+        end: Any = None,
+    ) -> HistoryIndex:
+        """``HistoryIndex`` for ``BaselineEngine`` built from the Arrow buffers.
+
+        Timestamps arrive already typed, so nothing is parsed, but both
+        columns are still converted to NumPy/pandas (``to_numpy`` and
+        ``to_pandas``), which copies them out of the Arrow buffers.
+        """
+        from services.baseline_engine import HistoryIndex
+
+        table = self.load_table(file_path, site_id, start, end)
+        timestamps = table.column(self.timestamp_col).to_pandas()
+        kw = table.column(self.kw_col).to_numpy()
+        return HistoryIndex(timestamps, kw)
+
+    def _dataset(self, file_path: str) -> Any:
+        ds, fs = _require_pyarrow()
+        return ds.dataset(
+            file_path,
+            format=self.format,
+            filesystem=fs.LocalFileSystem(use_mmap=self.memory_map),
+        )
+
+    def _filter(self, schema: Any, site_id: str | None, start: Any, end: Any) -> Any:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        conditions = []
+        if site_id is not None and self.site_col in schema.names:
+            conditions.append(ds.field(self.site_col) == site_id)
+        if start is not None or end is not None:
+            ts_type = schema.field(self.timestamp_col).type
+            if not pa.types.is_timestamp(ts_type):
+                raise ValueError(
+                    f"time filters need a timestamp column, "
+                    f"'{self.timestamp_col}' is {ts_type}"
+                )
+            if start is not None:
+                bound = pa.scalar(_as_arrow_datetime(start, ts_type), type=ts_type)
+                conditions.append(ds.field(self.timestamp_col) >= bound)
+            if end is not None:
+                bound = pa.scalar(_as_arrow_datetime(end, ts_type), type=ts_type)
+                conditions.append(ds.field(self.timestamp_col) < bound)
+        if not conditions:
+            return None
+        combined = conditions[0]
+        for condition in conditions[1:]:
+            combined = combined & condition
+        return combined
+
+    def _to_frame(self, data: Any) -> pd.DataFrame:
+        frame = data.to_pandas()
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(frame[self.timestamp_col]),
+            "kw": frame[self.kw_col].astype("float64"),
+        })
+
+
+def _require_pyarrow() -> tuple[Any, Any]:
+    try:
+        import pyarrow.dataset as ds
+        import pyarrow.fs as fs
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow adapters. "
+            "Install with: pip install pyarrow"
+        )
+    return ds, fs
+
+
+def _as_arrow_datetime(value: Any, ts_type: Any) -> Any:
+    """A datetime comparable with a column of Arrow type ``ts_type``."""
+    ts = pd.Timestamp(value)
+    if ts_type.tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    elif ts_type.tz is None and ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.to_pydatetime()
+
+
+MeterAdapter = CSVAdapter | JSONAdapter | ArrowAdapter
+
 
 class DataAdapterRegistry:
     def __init__(self) -> None:
-        self._adapters: dict[str, CSVAdapter | JSONAdapter] = {}
+        self._adapters: dict[str, MeterAdapter] = {}
 
-    def register(self, name: str, adapter: CSVAdapter | JSONAdapter) -> None:
+    def register(self, name: str, adapter: MeterAdapter) -> None:
         self._adapters[name] = adapter
 
-    def get(self, name: str) -> CSVAdapter | JSONAdapter:
+    def get(self, name: str) -> MeterAdapter:
         if name not in self._adapters:
             raise KeyError(f"unknown adapter: {name}")
         return self._adapters[name]
@@ -117,4 +515,6 @@ class DataAdapterRegistry:
         registry = cls()
         registry.register("csv", CSVAdapter())
         registry.register("json", JSONAdapter())
+        registry.register("parquet", ArrowAdapter("parquet"))
+        registry.register("arrow", ArrowAdapter("ipc"))
         return registry
@@ -1,10 +1,38 @@
-"""SQLite persistence for DR Agent MVP."""
+"""Persistence for DR Agent MVP.
+
+SQLite by default; ``open_storage`` returns a PostgreSQL backend instead
+when ``DR_DB_BACKEND=postgres`` (see ``services.db_backend``).
+
+Env vars:
+  DR_AGENT_DB                — database file (default: cache/dr_agent.db)
+  DR_SQLITE_SYNCHRONOUS      — OFF | NORMAL | FULL | EXTRA (default: NORMAL)
+  DR_SQLITE_CACHE_SIZE       — PRAGMA cache_size; negative means KiB (default: -16000)
+  DR_SQLITE_MMAP_SIZE        — PRAGMA mmap_size in bytes (default: 134217728)
+  DR_SQLITE_BUSY_TIMEOUT_MS  — PRAGMA busy_timeout (default: 5000)
+  DR_SQLITE_READERS          — read-only connections per pool (default: 4)
+"""
 
 from __future__ import annotations
 
+import itertools
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from services.db_backend import (
+    BackendType,
+    DatabaseBackend,
+    SQLiteBackend,
+    adapt_ddl,
+    column_exists,
+    create_backend,
+)
+from services.env import int_env
 
 DEFAULT_DB_PATH = "cache/dr_agent.db"
 
@@ -91,12 +119,7 @@ CREATE INDEX IF NOT EXISTS idx_audits_event ON audits(event_id);
 """
 
 
-def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
-    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
-    return any(row[1] == column for row in rows)
-
-
-def _apply_schema_migrations(conn: sqlite3.Connection) -> None:
+def _apply_schema_migrations(db: DatabaseBackend) -> None:
     migrations: list[tuple[str, str, str]] = [
         ("events", "close_tx_hash", "ALTER TABLE events ADD COLUMN close_tx_hash TEXT"),
         ("events", "tx_fee_wei", "ALTER TABLE events ADD COLUMN tx_fee_wei TEXT"),
@@ -208,13 +231,12 @@ def _apply_schema_migrations(conn: sqlite3.Connection) -> None:
         ),
     ]
     for table, column, sql in migrations:
-        if not _column_exists(conn, table, column):
-            conn.execute(sql)
-    conn.commit()
+        if not column_exists(db, table, column):
+            db.execute(sql)
 
 
-def _backfill_tx_metadata(conn: sqlite3.Connection) -> None:
-    conn.executescript(
+def _backfill_tx_metadata(db: DatabaseBackend) -> None:
+    db.execute_script(
         """
         UPDATE events
         SET tx_state = CASE
@@ -282,18 +304,265 @@ def _backfill_tx_metadata(conn: sqlite3.Connection) -> None:
         WHERE claim_tx_hash IS NOT NULL AND claim_tx_state = 'confirmed' AND claim_tx_confirmed_at IS NULL;
         """
     )
-    conn.commit()
 
 
-def connect(db_path: str | None = None) -> sqlite3.Connection:
-    path = db_path or os.getenv("DR_AGENT_DB", DEFAULT_DB_PATH)
-    target = Path(path)
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    component TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    applied_at TEXT NOT NULL,
+    PRIMARY KEY (component, version)
+);
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One ordered schema step, recorded in ``schema_version`` once applied."""
+
+    version: int
+    description: str
+    apply: Callable[[DatabaseBackend], None]
+
+
+def create_tables(ddl: str) -> Callable[[DatabaseBackend], None]:
+    """Migration step running SQLite-flavoured ``ddl`` in the backend's dialect."""
+    return lambda db: db.execute_script(adapt_ddl(ddl, db.backend_type))
+
+
+CORE_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "base schema", create_tables(SCHEMA_SQL)),
+    Migration(2, "tx metadata columns on pre-existing tables", _apply_schema_migrations),
+    Migration(3, "backfill tx metadata", _backfill_tx_metadata),
+)
+
+
+def _as_backend(db: DatabaseBackend | sqlite3.Connection) -> DatabaseBackend:
+    if isinstance(db, sqlite3.Connection):
+        return SQLiteBackend(connection=db)
+    return db
+
+
+def schema_version(db: DatabaseBackend | sqlite3.Connection, component: str) -> int:
+    db = _as_backend(db)
+    db.execute_script(SCHEMA_VERSION_SQL)
+    row = db.fetchone(
+        "SELECT MAX(version) AS version FROM schema_version WHERE component = ?",
+        (component,),
+    )
+    return row["version"] or 0
+
+
+def apply_migrations(
+    db: DatabaseBackend | sqlite3.Connection,
+    component: str,
+    migrations: Sequence[Migration],
+) -> list[int]:
+    """Apply the migrations of ``component`` newer than its recorded version.
+
+    Accepts a backend or a raw SQLite connection. Returns the versions
+    applied by this call. Once a database is current this is a single
+    indexed lookup, regardless of table sizes.
+    """
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise ValueError(f"{component} migrations must have increasing versions")
+
+    db = _as_backend(db)
+    current = schema_version(db, component)
+    applied: list[int] = []
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+        migration.apply(db)
+        db.execute(
+            """
+            INSERT INTO schema_version(component,version,description,applied_at)
+            VALUES(?,?,?,?)
+            """,
+            (
+                component,
+                migration.version,
+                migration.description,
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        db.commit()
+        applied.append(migration.version)
+    return applied
+
+
+# Arbitrary constant key for pg_advisory_lock, shared by every replica.
+_MIGRATION_LOCK_KEY = 74_110_206
+
+
+def migrate(db: DatabaseBackend, component: str, migrations: Sequence[Migration]) -> list[int]:
+    """``apply_migrations`` inside the backend's write scope.
+
+    On PostgreSQL the run holds an advisory lock, so replicas starting
+    together apply each step once.
+    """
+    with db.write():
+        if db.backend_type != BackendType.POSTGRES:
+            return apply_migrations(db, component, migrations)
+        db.fetchone("SELECT pg_advisory_lock(?)", (_MIGRATION_LOCK_KEY,))
+        try:
+            return apply_migrations(db, component, migrations)
+        finally:
+            db.fetchone("SELECT pg_advisory_unlock(?)", (_MIGRATION_LOCK_KEY,))
+
+
+_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    synchronous = os.getenv("DR_SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
+    if synchronous not in _SYNCHRONOUS_MODES:
+        synchronous = "NORMAL"
+    conn.execute(f"PRAGMA busy_timeout = {max(0, int_env('DR_SQLITE_BUSY_TIMEOUT_MS', 5000))}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    conn.execute(f"PRAGMA cache_size = {int_env('DR_SQLITE_CACHE_SIZE', -16000)}")
+    conn.execute(f"PRAGMA mmap_size = {max(0, int_env('DR_SQLITE_MMAP_SIZE', 134217728))}")
+
+
+def _resolve_path(db_path: str | None) -> Path:
+    target = Path(db_path or os.getenv("DR_AGENT_DB", DEFAULT_DB_PATH))
     target.parent.mkdir(parents=True, exist_ok=True)
+    return target
+
 
+def _open(target: Path) -> sqlite3.Connection:
     conn = sqlite3.connect(target, check_same_thread=False)
     conn.row_factory = sqlite3.Row
-    conn.executescript(SCHEMA_SQL)
-    _apply_schema_migrations(conn)
-    _backfill_tx_metadata(conn)
-    conn.commit()
+    _apply_pragmas(conn)
+    return conn
+
+
+def connect(db_path: str | None = None) -> sqlite3.Connection:
+    conn = _open(_resolve_path(db_path))
+    apply_migrations(conn, "core", CORE_MIGRATIONS)
     return conn
+
+
+class ConnectionPool:
+    """One writer connection plus a fixed set of read-only connections.
+
+    This is the application's storage context: ``create_app`` builds one
+    and injects it into every service, so the file is opened and migrated
+    once and all services share the same writer.
+
+    The database runs in WAL mode, so readers never block behind the
+    writer and vice versa. Writes go through ``write()``, a transaction
+    scope on the single writer connection: the outermost block commits on
+    success and rolls back on error, and nested blocks (including ones
+    opened by other services) join the same transaction. Any other access
+    through ``conn`` uses a reader pinned to the calling thread, assigned
+    round-robin from ``readers`` query-only connections. Inside a
+    ``write()`` block ``conn`` is the writer, so reads see the pending
+    changes.
+
+    Pending core migrations run once, on the writer. The pool implements
+    ``services.db_backend.DatabaseBackend``, which is what the services
+    program against; ``open_storage`` picks it or a PostgreSQL backend.
+    """
+
+    IntegrityError = sqlite3.IntegrityError
+    DatabaseError = sqlite3.DatabaseError
+
+    def __init__(self, db_path: str | None = None, readers: int | None = None):
+        self.path = _resolve_path(db_path)
+        self.writer = connect(str(self.path))
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        size = readers if readers is not None else int_env("DR_SQLITE_READERS", 4)
+        self._readers = [self._open_reader() for _ in range(max(1, size))]
+        self._next_reader = itertools.count()
+        self._connected = True
+
+    @property
+    def backend_type(self) -> BackendType:
+        return BackendType.SQLITE
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def readers(self) -> int:
+        return len(self._readers)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if getattr(self._local, "write_depth", 0):
+            return self.writer
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            reader = self._readers[next(self._next_reader) % len(self._readers)]
+            self._local.reader = reader
+        return reader
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            depth = getattr(self._local, "write_depth", 0)
+            self._local.write_depth = depth + 1
+            try:
+                yield self.writer
+            except BaseException:
+                if depth == 0 and self.writer.in_transaction:
+                    self.writer.rollback()
+                raise
+            else:
+                if depth == 0 and self.writer.in_transaction:
+                    self.writer.commit()
+            finally:
+                self._local.write_depth = depth
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        with self.write() as conn:
+            conn.execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> None:
+        with self.write() as conn:
+            conn.executemany(sql, seq_of_params)
+
+    def execute_script(self, sql: str) -> None:
+        with self.write() as conn:
+            conn.executescript(sql)
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Row | None:
+        return self.conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def commit(self) -> None:
+        self.writer.commit()
+
+    def rollback(self) -> None:
+        self.writer.rollback()
+
+    def close(self) -> None:
+        for conn in (*self._readers, self.writer):
+            conn.close()
+        self._connected = False
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = _open(self.path)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+
+def open_storage(db_path: str | None = None) -> DatabaseBackend:
+    """Build the storage context selected by ``DR_DB_BACKEND``.
+
+    ``db_path`` only applies to SQLite; PostgreSQL reads ``DR_PG_URL``.
+    """
+    backend_type = BackendType.from_env(os.getenv("DR_DB_BACKEND", "sqlite"))
+    if backend_type == BackendType.SQLITE:
+        return ConnectionPool(db_path)
+    backend = create_backend(backend_type)
+    migrate(backend, "core", CORE_MIGRATIONS)
+    return backend
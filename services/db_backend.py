@@ -5,18 +5,34 @@ allowing the system to switch between them via configuration.
 
 Usage:
     backend = create_backend()  # reads DR_DB_BACKEND env var
-    backend.execute("INSERT INTO t VALUES (?)", ("x",))
+    with backend.write():
+        backend.execute("INSERT INTO t VALUES (?)", ("x",))
     row = backend.fetchone("SELECT * FROM t WHERE id = ?", ("x",))
-    backend.commit()
+
+SQL is written once in the SQLite dialect (``?`` placeholders, SQLite
+column types); ``adapt_ddl`` and the PostgreSQL backend translate it.
+Driver errors are exposed per backend as ``IntegrityError`` and
+``DatabaseError`` so callers never import a driver module.
+
+Env vars:
+  DR_DB_BACKEND       — sqlite | postgres (default: sqlite)
+  DR_PG_URL           — PostgreSQL DSN, required for the postgres backend
+  DR_PG_POOL_MIN      — connections opened up front (default: 1)
+  DR_PG_POOL_MAX      — connections per process (default: 10)
 """
 
 from __future__ import annotations
 
 import os
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Any, Protocol, Sequence
+from typing import Any, ContextManager, Iterable, Iterator, Protocol, Sequence
+
+from services.env import int_env
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +66,9 @@ class BackendType(Enum):
 # ---------------------------------------------------------------------------
 
 class DatabaseBackend(Protocol):
+    IntegrityError: type[Exception]
+    DatabaseError: type[Exception]
+
     @property
     def backend_type(self) -> BackendType: ...
 
@@ -58,6 +77,8 @@ class DatabaseBackend(Protocol):
 
     def execute(self, sql: str, params: Sequence[Any] = ()) -> None: ...
 
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> None: ...
+
     def execute_script(self, sql: str) -> None: ...
 
     def fetchone(self, sql: str, params: Sequence[Any] = ()) -> dict[str, Any] | None: ...
@@ -70,24 +91,73 @@ class DatabaseBackend(Protocol):
 
     def close(self) -> None: ...
 
+    def write(self) -> ContextManager[Any]:
+        """Transaction scope yielding the driver connection.
+
+        The outermost block commits on success and rolls back on error;
+        nested blocks on the same thread join the open transaction.
+        """
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Dialect helpers
+# ---------------------------------------------------------------------------
+
+_INTEGER_RE = re.compile(r"\bINTEGER\b", re.IGNORECASE)
+
+
+def adapt_ddl(sql: str, backend_type: BackendType) -> str:
+    """Rewrite SQLite-flavoured DDL for ``backend_type``.
+
+    PostgreSQL ``INTEGER`` is 32-bit, while SQLite stores up to 64 bits in
+    the same column type, so integer columns become ``BIGINT``.
+    """
+    if backend_type == BackendType.POSTGRES:
+        return _INTEGER_RE.sub("BIGINT", sql)
+    return sql
+
+
+def column_exists(backend: DatabaseBackend, table: str, column: str) -> bool:
+    if backend.backend_type == BackendType.POSTGRES:
+        row = backend.fetchone(
+            """
+            SELECT 1 AS present FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ? AND column_name = ?
+            """,
+            (table, column),
+        )
+        return row is not None
+    rows = backend.fetchall(f"PRAGMA table_info({table})")
+    return any(row["name"] == column for row in rows)
+
 
 # ---------------------------------------------------------------------------
 # SQLite backend
 # ---------------------------------------------------------------------------
 
 class SQLiteBackend:
+    IntegrityError = sqlite3.IntegrityError
+    DatabaseError = sqlite3.DatabaseError
+
     def __init__(
         self,
         db_path: str | None = None,
         init_schema: str | None = None,
+        connection: sqlite3.Connection | None = None,
     ):
-        path = db_path or "cache/dr_agent.db"
-        target = Path(path)
-        target.parent.mkdir(parents=True, exist_ok=True)
-
-        self._conn = sqlite3.connect(target, check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
+        if connection is not None:
+            self._conn = connection
+        else:
+            path = db_path or "cache/dr_agent.db"
+            target = Path(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            self._conn = sqlite3.connect(target, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
         self._connected = True
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
 
         if init_schema:
             self._conn.executescript(init_schema)
@@ -108,13 +178,16 @@ class SQLiteBackend:
     def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
         self._conn.execute(sql, params)
 
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> None:
+        self._conn.executemany(sql, seq_of_params)
+
     def execute_script(self, sql: str) -> None:
         self._conn.executescript(sql)
 
     def fetchone(
         self, sql: str, params: Sequence[Any] = ()
     ) -> dict[str, Any] | None:
-        row = self._conn.execute(sql, params).fetchone()
+        row = self._cursor().execute(sql, params).fetchone()
         if row is None:
             return None
         return row  # sqlite3.Row supports dict-key access
@@ -122,7 +195,7 @@ class SQLiteBackend:
     def fetchall(
         self, sql: str, params: Sequence[Any] = ()
     ) -> list[dict[str, Any]]:
-        return self._conn.execute(sql, params).fetchall()
+        return self._cursor().execute(sql, params).fetchall()
 
     def commit(self) -> None:
         self._conn.commit()
@@ -134,32 +207,91 @@ class SQLiteBackend:
         self._conn.close()
         self._connected = False
 
+    def _cursor(self) -> sqlite3.Cursor:
+        # Rows stay dict-accessible even on a caller-supplied connection
+        # without a row factory.
+        cur = self._conn.cursor()
+        cur.row_factory = sqlite3.Row
+        return cur
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            depth = self._write_depth
+            self._write_depth = depth + 1
+            try:
+                yield self._conn
+            except BaseException:
+                if depth == 0 and self._conn.in_transaction:
+                    self._conn.rollback()
+                raise
+            else:
+                if depth == 0 and self._conn.in_transaction:
+                    self._conn.commit()
+            finally:
+                self._write_depth = depth
+
 
 # ---------------------------------------------------------------------------
-# PostgreSQL backend (stub — requires psycopg2/psycopg)
+# PostgreSQL backend (requires psycopg2)
 # ---------------------------------------------------------------------------
 
 class PostgresBackend:
+    """PostgreSQL over a thread-safe psycopg2 connection pool.
+
+    Each process holds at most ``max_connections`` connections, so several
+    API replicas can share one server. Threads borrow a connection per
+    statement; when the pool is exhausted they wait for one to be returned
+    instead of failing. Inside ``write()`` a thread keeps its connection
+    for the whole transaction, so nested blocks and reads see the pending
+    changes. Statements outside ``write()`` run in their own short
+    transaction, and ``commit``/``rollback`` act on the calling thread's
+    open ``write()`` transaction.
+    """
+
     _backend_type = BackendType.POSTGRES
 
-    def __init__(self, pg_url: str, init_schema: str | None = None):
+    def __init__(
+        self,
+        pg_url: str,
+        init_schema: str | None = None,
+        min_connections: int | None = None,
+        max_connections: int | None = None,
+    ):
         try:
             import psycopg2
             import psycopg2.extras
+            import psycopg2.pool
         except ImportError:
             raise ImportError(
                 "psycopg2 is required for PostgreSQL backend. "
                 "Install with: pip install psycopg2-binary"
             )
 
-        self._conn = psycopg2.connect(pg_url)
-        self._conn.autocommit = False
+        self.IntegrityError = psycopg2.IntegrityError
+        self.DatabaseError = psycopg2.DatabaseError
+        self._cursor_factory = psycopg2.extras.RealDictCursor
+        self._execute_batch = psycopg2.extras.execute_batch
+
+        low = (
+            min_connections
+            if min_connections is not None
+            else int_env("DR_PG_POOL_MIN", default=1, minimum=0)
+        )
+        high = (
+            max_connections
+            if max_connections is not None
+            else int_env("DR_PG_POOL_MAX", default=10, minimum=1)
+        )
+        high = max(1, low, high)
+        self._pool = psycopg2.pool.ThreadedConnectionPool(low, high, pg_url)
+        self._slots = threading.BoundedSemaphore(high)
+        self._local = threading.local()
+        self.max_connections = high
         self._connected = True
 
         if init_schema:
-            with self._conn.cursor() as cur:
-                cur.execute(init_schema)
-            self._conn.commit()
+            self.execute_script(init_schema)
 
     @property
     def backend_type(self) -> BackendType:
@@ -170,46 +302,90 @@ class PostgresBackend:
         return self._connected
 
     def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
-        with self._conn.cursor() as cur:
-            cur.execute(self._adapt_placeholders(sql), params)
+        with self._connection() as conn, conn.cursor() as cur:
+            cur.execute(self._adapt_placeholders(sql), tuple(params))
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> None:
+        # execute_batch sends pages of statements per round trip, unlike
+        # cursor.executemany which issues one per row.
+        with self._connection() as conn, conn.cursor() as cur:
+            self._execute_batch(
+                cur, self._adapt_placeholders(sql), [tuple(p) for p in seq_of_params]
+            )
 
     def execute_script(self, sql: str) -> None:
-        with self._conn.cursor() as cur:
+        with self._connection() as conn, conn.cursor() as cur:
             cur.execute(sql)
-        self._conn.commit()
 
     def fetchone(
         self, sql: str, params: Sequence[Any] = ()
     ) -> dict[str, Any] | None:
-        import psycopg2.extras
-
-        with self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(self._adapt_placeholders(sql), params)
-            return cur.fetchone()
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=self._cursor_factory) as cur:
+                cur.execute(self._adapt_placeholders(sql), tuple(params))
+                return cur.fetchone()
 
     def fetchall(
         self, sql: str, params: Sequence[Any] = ()
     ) -> list[dict[str, Any]]:
-        import psycopg2.extras
-
-        with self._conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(self._adapt_placeholders(sql), params)
-            return cur.fetchall()
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=self._cursor_factory) as cur:
+                cur.execute(self._adapt_placeholders(sql), tuple(params))
+                return cur.fetchall()
 
     def commit(self) -> None:
-        self._conn.commit()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.commit()
 
     def rollback(self) -> None:
-        self._conn.rollback()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.rollback()
 
     def close(self) -> None:
-        self._conn.close()
+        self._pool.closeall()
         self._connected = False
 
+    @contextmanager
+    def write(self) -> Iterator[Any]:
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+        with self._connection() as conn:
+            self._local.conn = conn
+            try:
+                yield conn
+            finally:
+                self._local.conn = None
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """The thread's ``write()`` connection, or a pooled one for one call."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        self._slots.acquire()
+        try:
+            conn = self._pool.getconn()
+            try:
+                yield conn
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self._slots.release()
+
     @staticmethod
     def _adapt_placeholders(sql: str) -> str:
         """Convert SQLite-style ? placeholders to PostgreSQL %s."""
-        return sql.replace("?", "%s")
+        return sql.replace("%", "%%").replace("?", "%s")
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,149 @@
+"""Bounded thread-pool dispatch for blocking service calls.
+
+API handlers are ``async def`` but the services they call are synchronous
+(SQLite queries, chain worker round trips). ``Dispatcher`` runs those calls
+on per-subsystem thread pools so a slow chain action never stalls the event
+loop, and a burst of chain traffic cannot starve plain DB reads:
+
+  chain — calls that may submit or check on-chain transactions
+  db    — calls that only touch the local database
+
+Each lane has a worker limit and a queue cap. When the queue is full the
+call is rejected with a retryable 503 instead of piling up unbounded work.
+Lane limits, active workers and queue depth are reported via ``health()``
+and surfaced on ``/healthz``.
+
+Env vars:
+  DR_DISPATCH_CHAIN_WORKERS  — concurrent chain-lane calls (default: 4)
+  DR_DISPATCH_DB_WORKERS     — concurrent db-lane calls (default: 8)
+  DR_DISPATCH_MAX_QUEUE      — queued calls per lane before rejecting (default: 256)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from services.env import int_env
+from services.submitter import ServiceError
+
+T = TypeVar("T")
+
+CHAIN_LANE = "chain"
+DB_LANE = "db"
+
+
+class DispatchLane:
+    """One bounded thread pool plus the counters reported on /healthz."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"dispatch-{name}"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._stats = {"completed": 0, "failed": 0, "rejected": 0}
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._queued + self._active >= self.max_workers + self.max_queue:
+                self._stats["rejected"] += 1
+                raise ServiceError(
+                    503,
+                    "SERVER_BUSY",
+                    f"{self.name} dispatch queue is full",
+                    retryable=True,
+                    details={"lane": self.name, "queued": self._queued},
+                )
+            self._queued += 1
+        try:
+            future = self._executor.submit(self._invoke, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            # e.g. RuntimeError after shutdown: the call never reached the queue.
+            with self._lock:
+                self._queued -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                **self._stats,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _invoke(self, call: Callable[[], T]) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            result = call()
+        except BaseException:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        else:
+            with self._lock:
+                self._stats["completed"] += 1
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+class Dispatcher:
+    """Routes blocking calls to the ``chain`` or ``db`` lane."""
+
+    def __init__(
+        self,
+        chain_workers: int | None = None,
+        db_workers: int | None = None,
+        max_queue: int | None = None,
+    ):
+        queue_cap = (
+            max_queue
+            if max_queue is not None
+            else int_env("DR_DISPATCH_MAX_QUEUE", default=256, minimum=0)
+        )
+        self.lanes = {
+            CHAIN_LANE: DispatchLane(
+                CHAIN_LANE,
+                chain_workers
+                if chain_workers is not None
+                else int_env("DR_DISPATCH_CHAIN_WORKERS", default=4, minimum=1),
+                queue_cap,
+            ),
+            DB_LANE: DispatchLane(
+                DB_LANE,
+                db_workers
+                if db_workers is not None
+                else int_env("DR_DISPATCH_DB_WORKERS", default=8, minimum=1),
+                queue_cap,
+            ),
+        }
+
+    async def chain(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.lanes[CHAIN_LANE].run(fn, *args, **kwargs)
+
+    async def db(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.lanes[DB_LANE].run(fn, *args, **kwargs)
+
+    def health(self) -> dict[str, dict[str, Any]]:
+        return {name: lane.health() for name, lane in self.lanes.items()}
+
+    def shutdown(self) -> None:
+        for lane in self.lanes.values():
+            lane.shutdown()
@@ -233,6 +233,36 @@ class BaselineCompareResponse(BaseModel):
     recommended: BaselineResultDTO
 
 
+class BaselineBatchRequest(BaseModel):
+    """Columnar history for many sites: three parallel arrays, one row each."""
+
+    site_id: list[str]
+    timestamp: list[str]
+    kw: list[float | None]
+    event_hour: int = Field(ge=0, le=23)
+
+
+class BaselineSiteResultDTO(BaseModel):
+    site_id: str
+    results: list[BaselineResultDTO]
+    recommended: BaselineResultDTO
+
+
+class BaselineBatchResponse(BaseModel):
+    sites: list[BaselineSiteResultDTO]
+
+
+class MeterIngestResponse(BaseModel):
+    rows: int
+    written: int
+    rejected_rows: int
+    rejected: dict[str, int]
+    issues: dict[str, int]
+    chunks: int
+    elapsed_s: float
+    rows_per_s: float
+
+
 class BaselineMethodsResponse(BaseModel):
     methods: list[str]
 
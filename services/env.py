@@ -0,0 +1,31 @@
+"""Numeric environment settings shared by the services.
+
+Unset, blank or unparseable values fall back to the default; parsed
+values are clamped to ``minimum`` when one is given.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def int_env(name: str, default: int, minimum: int | None = None) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
+
+
+def float_env(name: str, default: float, minimum: float | None = None) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if minimum is None else max(minimum, value)
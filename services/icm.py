@@ -8,16 +8,20 @@ from __future__ import annotations
 
 import json
 import os
-import sqlite3
-import subprocess
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any
+from typing import Any, Mapping
 from pathlib import Path
 
-from services.db import connect as db_connect
+from services.chain_worker import (
+    ChainWorkerError,
+    ChainWorkerProtocolError,
+    get_chain_worker_pool,
+)
+from services.db import Migration, create_tables, migrate, open_storage
+from services.db_backend import DatabaseBackend, column_exists
 
 
 class MessageType(Enum):
@@ -69,16 +73,30 @@ CREATE TABLE IF NOT EXISTS icm_messages (
 """
 
 
+def _add_idempotency_key(db: DatabaseBackend) -> None:
+    if not column_exists(db, "icm_messages", "idempotency_key"):
+        db.execute("ALTER TABLE icm_messages ADD COLUMN idempotency_key TEXT")
+    db.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS icm_messages_idempotency_key ON icm_messages(idempotency_key)"
+    )
+
+
+ICM_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "icm_messages table", create_tables(ICM_SCHEMA_SQL)),
+    Migration(2, "icm_messages idempotency key", _add_idempotency_key),
+)
+
+
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
 class ICMService:
-    def __init__(self, db_path: str | None = None):
-        self.conn = db_connect(db_path)
-        self.conn.executescript(ICM_SCHEMA_SQL)
-        self._ensure_idempotency_key()
-        self.conn.commit()
+    def __init__(
+        self, db_path: str | None = None, db: DatabaseBackend | None = None
+    ):
+        self._db = db if db is not None else open_storage(db_path)
+        migrate(self._db, "icm", ICM_MIGRATIONS)
         self.chain_mode = os.getenv("DR_CHAIN_MODE", "simulated")
         self.chain_action_script = (
             Path(__file__).resolve().parents[1]
@@ -86,15 +104,6 @@ class ICMService:
             / _chain_action_script_for_mode(self.chain_mode)
         )
 
-    def _ensure_idempotency_key(self) -> None:
-        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(icm_messages)")}
-        if "idempotency_key" not in columns:
-            self.conn.execute("ALTER TABLE icm_messages ADD COLUMN idempotency_key TEXT")
-        self.conn.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS icm_messages_idempotency_key ON icm_messages(idempotency_key)"
-        )
-        self.conn.commit()
-
     def create_message(
         self,
         source_chain: str,
@@ -106,18 +115,18 @@ class ICMService:
     ) -> ICMMessage:
         message_id = f"icm-{uuid.uuid4().hex[:12]}"
         now = _utc_now()
-        self.conn.execute(
-            """
-            INSERT INTO icm_messages
-                (message_id, idempotency_key, source_chain, dest_chain, message_type, sender,
-                 payload, status, source_tx_hash, dest_tx_hash, error,
-                 created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', NULL, NULL, NULL, ?, ?)
-            """,
-            (message_id, idempotency_key, source_chain, dest_chain, message_type.value,
-             sender, json.dumps(payload), now, now),
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                """
+                INSERT INTO icm_messages
+                    (message_id, idempotency_key, source_chain, dest_chain, message_type, sender,
+                     payload, status, source_tx_hash, dest_tx_hash, error,
+                     created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 'pending', NULL, NULL, NULL, ?, ?)
+                """,
+                (message_id, idempotency_key, source_chain, dest_chain, message_type.value,
+                 sender, json.dumps(payload), now, now),
+            )
         return self._get(message_id)
 
     def mark_sent(self, message_id: str, tx_hash: str) -> ICMMessage:
@@ -137,36 +146,36 @@ class ICMService:
         return self._get(message_id)
 
     def get_message(self, message_id: str) -> ICMMessage | None:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             "SELECT * FROM icm_messages WHERE message_id = ?",
             (message_id,),
-        ).fetchone()
+        )
         if row is None:
             return None
         return self._row_to_message(row)
 
     def get_by_idempotency(self, idempotency_key: str) -> ICMMessage | None:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             "SELECT * FROM icm_messages WHERE idempotency_key = ?",
             (idempotency_key,),
-        ).fetchone()
+        )
         if row is None:
             return None
         return self._row_to_message(row)
 
     def get_stats(self) -> dict:
-        rows = self.conn.execute(
+        rows = self._db.fetchall(
             "SELECT status, COUNT(*) as cnt FROM icm_messages GROUP BY status"
-        ).fetchall()
+        )
         by_status = {"pending": 0, "sent": 0, "delivered": 0, "processed": 0, "failed": 0}
         total = 0
         for r in rows:
             by_status[r["status"]] = r["cnt"]
             total += r["cnt"]
 
-        type_rows = self.conn.execute(
+        type_rows = self._db.fetchall(
             "SELECT message_type, COUNT(*) as cnt FROM icm_messages GROUP BY message_type"
-        ).fetchall()
+        )
         by_type = {"bridge_transfer": 0, "settlement_sync": 0, "proof_attestation": 0}
         for r in type_rows:
             by_type[r["message_type"]] = r["cnt"]
@@ -178,16 +187,16 @@ class ICMService:
         }
 
     def list_pending_messages(self) -> list[ICMMessage]:
-        rows = self.conn.execute(
+        rows = self._db.fetchall(
             "SELECT * FROM icm_messages WHERE status NOT IN ('processed', 'failed') ORDER BY created_at",
-        ).fetchall()
+        )
         return [self._row_to_message(r) for r in rows]
 
     def list_by_type(self, message_type: MessageType) -> list[ICMMessage]:
-        rows = self.conn.execute(
+        rows = self._db.fetchall(
             "SELECT * FROM icm_messages WHERE message_type = ? ORDER BY created_at",
             (message_type.value,),
-        ).fetchall()
+        )
         return [self._row_to_message(r) for r in rows]
 
     def relay_message(self, message: ICMMessage) -> dict:
@@ -233,14 +242,14 @@ class ICMService:
             sets.append("error = ?")
             params.append(error)
         params.append(message_id)
-        self.conn.execute(
-            f"UPDATE icm_messages SET {', '.join(sets)} WHERE message_id = ?",
-            params,
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                f"UPDATE icm_messages SET {', '.join(sets)} WHERE message_id = ?",
+                params,
+            )
 
     @staticmethod
-    def _row_to_message(row: sqlite3.Row) -> ICMMessage:
+    def _row_to_message(row: Mapping[str, Any]) -> ICMMessage:
         return ICMMessage(
             message_id=row["message_id"],
             source_chain=row["source_chain"],
@@ -259,27 +268,13 @@ class ICMService:
     def _chain_action(self, action: str, payload: dict) -> dict:
         if not self.chain_action_script.exists():
             raise RuntimeError(f"icm chain action script not found: {self.chain_action_script}")
-        cmd = ["node", str(self.chain_action_script), action]
-        result = subprocess.run(
-            cmd,
-            input=json.dumps(payload),
-            text=True,
-            capture_output=True,
-            check=False,
-            env=os.environ.copy(),
-        )
-        if result.returncode != 0:
-            stderr = (result.stderr or "").strip()
-            stdout = (result.stdout or "").strip()
-            detail = stderr or stdout or f"exit={result.returncode}"
-            raise RuntimeError(f"icm chain action failed: {detail}")
-        raw = (result.stdout or "").strip()
-        if not raw:
-            raise RuntimeError("icm chain action returned empty output")
+        pool = get_chain_worker_pool(self.chain_action_script)
         try:
-            return json.loads(raw.splitlines()[-1])
-        except json.JSONDecodeError as exc:
+            return pool.call(action, payload)
+        except ChainWorkerProtocolError as exc:
             raise RuntimeError("icm chain action returned non-json output") from exc
+        except ChainWorkerError as exc:
+            raise RuntimeError(f"icm chain action failed: {exc}") from exc
 
 
 def _chain_action_script_for_mode(chain_mode: str) -> str:
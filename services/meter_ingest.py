@@ -0,0 +1,217 @@
+"""Streaming meter ingest: NDJSON or CSV uploads into the ``MeterStore``.
+
+An upload is fed to ``MeterIngest`` piece by piece as it arrives. Complete
+lines are buffered until ``chunk_rows`` are pending; that chunk is then
+parsed into columns, checked and upserted, so only one chunk (plus a
+partial trailing line) is held in memory however large the body is.
+
+A row is rejected when its line is malformed or it has no site id, no
+parseable timestamp or no numeric kw. Accepted rows also go through
+``validate_frame`` per site and chunk; its findings (gaps, spikes,
+duplicates, ...) are counted in the report but do not reject rows, and a
+gap spanning two chunks is not seen. CSV fields must not contain newlines.
+
+Env vars:
+  DR_METER_INGEST_CHUNK_ROWS — rows parsed and validated at a time (default: 10000)
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+from services.data_adapters import validate_frame
+from services.env import int_env
+from services.meter_store import MeterStore
+
+INGEST_FORMATS = ("ndjson", "csv")
+REJECT_REASONS = ("malformed", "missing_site_id", "missing_timestamp", "missing_kw")
+
+# validate_frame checks that duplicate the reject reasons above.
+_REJECTED_CHECKS = {"missing_timestamp", "missing_kw"}
+
+
+@dataclass
+class IngestReport:
+    """Totals for one upload; ``elapsed_s`` runs from the first byte."""
+
+    rows: int = 0
+    written: int = 0
+    rejected: dict[str, int] = field(default_factory=lambda: dict.fromkeys(REJECT_REASONS, 0))
+    issues: dict[str, int] = field(default_factory=dict)
+    chunks: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def rejected_rows(self) -> int:
+        return sum(self.rejected.values())
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "written": self.written,
+            "rejected_rows": self.rejected_rows,
+            "rejected": dict(self.rejected),
+            "issues": dict(self.issues),
+            "chunks": self.chunks,
+            "elapsed_s": self.elapsed_s,
+            "rows_per_s": self.rows_per_s,
+        }
+
+
+class MeterIngest:
+    """One upload: ``feed`` body pieces, ``flush`` ready chunks, then ``finish``.
+
+    ``site_id`` is used for rows without a site column value. ``feed`` only
+    splits lines and is cheap; ``flush`` does the parsing and database
+    writes, so async callers can run it off the event loop.
+    """
+
+    def __init__(
+        self,
+        store: MeterStore,
+        format: str = "ndjson",
+        site_id: str | None = None,
+        chunk_rows: int | None = None,
+        timestamp_col: str = "timestamp",
+        kw_col: str = "kw",
+        site_col: str = "site_id",
+    ):
+        if format not in INGEST_FORMATS:
+            raise ValueError(f"unsupported ingest format: {format}")
+        self.store = store
+        self.format = format
+        self.site_id = site_id
+        self.chunk_rows = (
+            chunk_rows if chunk_rows is not None
+            else int_env("DR_METER_INGEST_CHUNK_ROWS", default=10_000, minimum=1)
+        )
+        self.timestamp_col = timestamp_col
+        self.kw_col = kw_col
+        self.site_col = site_col
+        self.report = IngestReport()
+        self._started = time.perf_counter()
+        self._header: bytes | None = None
+        self._tail = b""
+        self._pending: list[bytes] = []
+
+    def feed(self, data: bytes) -> bool:
+        """Buffer ``data``; True once a full chunk is waiting to be flushed."""
+        if data:
+            lines = (self._tail + data).split(b"\n")
+            self._tail = lines.pop()
+            self._pending.extend(lines)
+        return len(self._pending) >= self.chunk_rows
+
+    def flush(self) -> None:
+        """Parse, check and write every full chunk that is pending."""
+        while len(self._pending) >= self.chunk_rows:
+            lines = self._pending[:self.chunk_rows]
+            del self._pending[:self.chunk_rows]
+            self._process(lines)
+
+    def finish(self) -> IngestReport:
+        """Write what is left, including an unterminated last line."""
+        self._pending.append(self._tail)
+        self._tail = b""
+        self.flush()
+        lines, self._pending = self._pending, []
+        self._process(lines)
+        self.report.elapsed_s = time.perf_counter() - self._started
+        return self.report
+
+    def ingest(self, pieces: Iterable[bytes]) -> IngestReport:
+        for piece in pieces:
+            if self.feed(piece):
+                self.flush()
+        return self.finish()
+
+    def _process(self, lines: list[bytes]) -> None:
+        lines = [line.rstrip(b"\r") for line in lines]
+        lines = [line for line in lines if line.strip()]
+        if self.format == "csv" and self._header is None and lines:
+            self._header = lines.pop(0)
+        if not lines:
+            return
+
+        if self.format == "csv":
+            frame = pd.read_csv(
+                io.BytesIO(b"\n".join([self._header, *lines])),
+                dtype=str,
+                on_bad_lines="skip",
+            )
+        else:
+            frame = self._ndjson_frame(lines)
+        self.report.rows += len(lines)
+        self.report.rejected["malformed"] += len(lines) - len(frame)
+        self.report.chunks += 1
+        if not len(frame):
+            return
+
+        sites = self._column(frame, self.site_col)
+        if self.site_id is not None:
+            sites = sites.fillna(self.site_id).replace("", self.site_id)
+        ts = pd.to_datetime(
+            self._column(frame, self.timestamp_col), format="ISO8601", errors="coerce", utc=True
+        )
+        kw = pd.to_numeric(self._column(frame, self.kw_col), errors="coerce")
+
+        no_site = (sites.isna() | (sites.astype(str).str.strip() == "")).to_numpy()
+        no_ts = ts.isna().to_numpy() & ~no_site
+        no_kw = kw.isna().to_numpy() & ~no_site & ~no_ts
+        self.report.rejected["missing_site_id"] += int(no_site.sum())
+        self.report.rejected["missing_timestamp"] += int(no_ts.sum())
+        self.report.rejected["missing_kw"] += int(no_kw.sum())
+
+        keep = ~(no_site | no_ts | no_kw)
+        accepted = pd.DataFrame({
+            "site_id": sites[keep].astype(str),
+            "timestamp": ts[keep],
+            "kw": kw[keep].astype(np.float64),
+        })
+        if not len(accepted):
+            return
+        for _, group in accepted.groupby("site_id", sort=False):
+            checked = validate_frame(group[["timestamp", "kw"]].reset_index(drop=True))
+            for name, issue in checked.issues.items():
+                if name not in _REJECTED_CHECKS:
+                    self.report.issues[name] = self.report.issues.get(name, 0) + issue.count
+        self.report.written += self.store.ingest(
+            accepted["site_id"], accepted["timestamp"], accepted["kw"]
+        )
+
+    @staticmethod
+    def _ndjson_frame(lines: list[bytes]) -> pd.DataFrame:
+        # Decode the chunk as one JSON array; go line by line only when
+        # some line does not parse.
+        try:
+            parsed = json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            parsed = None
+        if parsed is not None and len(parsed) == len(lines):
+            return pd.DataFrame.from_records([r for r in parsed if isinstance(r, dict)])
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return pd.DataFrame.from_records(records)
+
+    @staticmethod
+    def _column(frame: pd.DataFrame, name: str) -> pd.Series:
+        if name in frame:
+            return frame[name]
+        return pd.Series(None, index=frame.index, dtype=object)
@@ -0,0 +1,228 @@
+"""Persistent meter readings, keyed by (site_id, timestamp).
+
+Readings live in one ``meter_readings`` table whose primary key is
+``(site_id, ts_ms)``. On SQLite the table is ``WITHOUT ROWID``, so rows
+are stored clustered on that key: one site's window is a single
+contiguous range scan. On PostgreSQL the composite primary key B-tree
+serves the same range queries.
+
+Timestamps are stored as UTC epoch milliseconds; naive inputs are taken
+to be UTC and the local offset of aware inputs is not kept. Pass ``tz``
+(an IANA zone or a fixed offset such as ``-07:00``) to ``history`` to
+bucket readings by the site's local hour of day, as an inline history
+carrying that offset would be. Ingest is an upsert, so re-sending a
+reading replaces it.
+
+Env vars:
+  DR_METER_INGEST_BATCH — rows per ingest transaction (default: 10000)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import timedelta, timezone, tzinfo
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+
+from services.baseline_engine import HistoryIndex
+from services.db import Migration, migrate, open_storage
+from services.db_backend import BackendType, DatabaseBackend, adapt_ddl
+from services.env import int_env
+
+METER_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS meter_readings (
+    site_id TEXT NOT NULL,
+    ts_ms INTEGER NOT NULL,
+    kw DOUBLE PRECISION,
+    PRIMARY KEY (site_id, ts_ms)
+)
+"""
+
+_UPSERT_SQL = (
+    "INSERT INTO meter_readings (site_id, ts_ms, kw) VALUES (?, ?, ?) "
+    "ON CONFLICT (site_id, ts_ms) DO UPDATE SET kw = excluded.kw"
+)
+
+_NS_PER_MS = 1_000_000
+_OFFSET_RE = re.compile(r"([+-])(\d{2}):?(\d{2})")
+
+
+def _create_meter_tables(db: DatabaseBackend) -> None:
+    ddl = adapt_ddl(METER_SCHEMA_SQL, db.backend_type).strip()
+    if db.backend_type == BackendType.SQLITE:
+        # Cluster rows on (site_id, ts_ms) instead of an implicit rowid.
+        ddl += " WITHOUT ROWID"
+    db.execute_script(ddl + ";")
+
+
+METER_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "meter_readings table", _create_meter_tables),
+)
+
+
+@dataclass
+class MeterSeries:
+    """One site's readings in a window, oldest first."""
+
+    site_id: str
+    timestamps: np.ndarray  # datetime64[ns], UTC
+    kw: np.ndarray  # float64, NaN where the reading was missing
+
+    def __len__(self) -> int:
+        return len(self.kw)
+
+    def to_frame(self, tz: tzinfo | str | None = None) -> pd.DataFrame:
+        return pd.DataFrame({"timestamp": self._index(tz), "kw": self.kw})
+
+    def history(self, tz: tzinfo | str | None = None) -> HistoryIndex:
+        """``HistoryIndex`` bucketed by hour of day in ``tz`` (UTC when None)."""
+        if tz is None:
+            return HistoryIndex(self.timestamps, self.kw)
+        return HistoryIndex(self._index(tz), self.kw)
+
+    def _index(self, tz: tzinfo | str | None) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(self.timestamps, tz="UTC")
+        return index if tz is None else index.tz_convert(parse_timezone(tz))
+
+
+class MeterStore:
+    def __init__(
+        self,
+        db_path: str | None = None,
+        db: DatabaseBackend | None = None,
+        batch_rows: int | None = None,
+    ):
+        self._db = db if db is not None else open_storage(db_path)
+        migrate(self._db, "meter", METER_MIGRATIONS)
+        self.batch_rows = (
+            batch_rows if batch_rows is not None
+            else int_env("DR_METER_INGEST_BATCH", default=10_000, minimum=1)
+        )
+
+    def ingest(self, site_ids: Any, timestamps: Any, kw: Any) -> int:
+        """Upsert readings and return how many rows were written.
+
+        ``site_ids`` is one id for every row or a sequence parallel to
+        ``timestamps`` and ``kw``. Each batch of ``batch_rows`` readings is
+        written with one ``executemany`` in its own transaction.
+        """
+        ts_ms = _to_epoch_ms(timestamps)
+        values = np.asarray(kw, dtype=np.float64)
+        if len(ts_ms) != len(values):
+            raise ValueError("timestamps and kw must have the same length")
+        if isinstance(site_ids, str):
+            sites = [site_ids] * len(values)
+        else:
+            sites = [str(site_id) for site_id in site_ids]
+            if len(sites) != len(values):
+                raise ValueError("site_ids and kw must have the same length")
+
+        kw_col = values.astype(object)
+        kw_col[np.isnan(values)] = None
+        rows = list(zip(sites, ts_ms.tolist(), kw_col.tolist()))
+        for start in range(0, len(rows), self.batch_rows):
+            with self._db.write():
+                self._db.executemany(_UPSERT_SQL, rows[start:start + self.batch_rows])
+        return len(rows)
+
+    def ingest_frame(self, df: pd.DataFrame, site_id: str | None = None) -> int:
+        """Upsert a ``timestamp``/``kw`` frame; ``site_id`` column unless given."""
+        sites = site_id if site_id is not None else df["site_id"]
+        return self.ingest(sites, df["timestamp"], df["kw"])
+
+    def read(self, site_id: str, start: Any = None, end: Any = None) -> MeterSeries:
+        """Readings with ``start <= timestamp < end``; open bounds when None."""
+        lo = _bound_ms(start, default=np.iinfo(np.int64).min)
+        hi = _bound_ms(end, default=np.iinfo(np.int64).max)
+        rows = self._db.fetchall(
+            "SELECT ts_ms, kw FROM meter_readings "
+            "WHERE site_id = ? AND ts_ms >= ? AND ts_ms < ? ORDER BY ts_ms",
+            (site_id, lo, hi),
+        )
+        ts_ms = np.fromiter((r["ts_ms"] for r in rows), dtype=np.int64, count=len(rows))
+        kw = np.fromiter(
+            (np.nan if r["kw"] is None else r["kw"] for r in rows),
+            dtype=np.float64,
+            count=len(rows),
+        )
+        return MeterSeries(site_id, (ts_ms * _NS_PER_MS).view("datetime64[ns]"), kw)
+
+    def history(
+        self,
+        site_id: str,
+        start: Any = None,
+        end: Any = None,
+        tz: tzinfo | str | None = None,
+    ) -> HistoryIndex:
+        return self.read(site_id, start, end).history(tz)
+
+    def latest(self, site_id: str) -> pd.Timestamp | None:
+        row = self._db.fetchone(
+            "SELECT MAX(ts_ms) AS ts_ms FROM meter_readings WHERE site_id = ?",
+            (site_id,),
+        )
+        if row is None or row["ts_ms"] is None:
+            return None
+        return pd.Timestamp(int(row["ts_ms"]), unit="ms", tz="UTC")
+
+    def count(self, site_id: str | None = None) -> int:
+        if site_id is None:
+            row = self._db.fetchone("SELECT COUNT(*) AS n FROM meter_readings")
+        else:
+            row = self._db.fetchone(
+                "SELECT COUNT(*) AS n FROM meter_readings WHERE site_id = ?", (site_id,)
+            )
+        return int(row["n"]) if row else 0
+
+    def sites(self) -> list[str]:
+        rows = self._db.fetchall(
+            "SELECT DISTINCT site_id FROM meter_readings ORDER BY site_id"
+        )
+        return [r["site_id"] for r in rows]
+
+
+def parse_timezone(tz: tzinfo | str) -> tzinfo:
+    """``tzinfo`` for an IANA zone name or a ``+HH:MM`` UTC offset.
+
+    Raises ValueError for anything else.
+    """
+    if isinstance(tz, tzinfo):
+        return tz
+    match = _OFFSET_RE.fullmatch(tz.strip())
+    if match:
+        sign, hours, minutes = match.groups()
+        offset = timedelta(hours=int(hours), minutes=int(minutes))
+        if offset >= timedelta(hours=24):
+            raise ValueError(f"UTC offset out of range: {tz}")
+        return timezone(-offset if sign == "-" else offset)
+    try:
+        return ZoneInfo(tz.strip())
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone: {tz}") from None
+
+
+def _to_epoch_ms(timestamps: Any) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        # Already parsed: skip to_datetime, which iterates the values.
+        parsed = pd.DatetimeIndex(timestamps)
+        if parsed.tz is None:
+            parsed = parsed.tz_localize("UTC")
+    else:
+        parsed = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True))
+    parsed = parsed.as_unit("ns")
+    if parsed.isna().any():
+        raise ValueError("timestamps must all be present and parseable")
+    return parsed.asi8 // _NS_PER_MS
+
+
+def _bound_ms(value: Any, default: int) -> int:
+    if value is None:
+        return int(default)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.as_unit("ns").value // _NS_PER_MS)
@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+import numpy as np
+
+_INT64_MIN = int(np.iinfo(np.int64).min)
+_INT64_MAX = int(np.iinfo(np.int64).max)
+_FLOAT_SCREEN = 2.0**62
+
 
 def calculate_payout(
     reduction_kwh: int,
@@ -20,3 +28,92 @@ def calculate_payout(
     reward = reduction_kwh * reward_rate
     penalty = (target_share - reduction_kwh) * penalty_rate
     return reward - penalty
+
+
+def calculate_payouts(
+    reductions_kwh: Any,
+    target_shares: Any,
+    reward_rate: Any,
+    penalty_rate: Any,
+) -> np.ndarray:
+    """Vectorized ``calculate_payout`` over many sites.
+
+    Arguments are integer scalars or array-likes, broadcast against each
+    other. Returns a 1-D int64 array identical to applying the scalar
+    formula element-wise. Raises ``OverflowError`` if an input or an
+    intermediate value of the selected branch does not fit in int64,
+    instead of wrapping silently.
+    """
+    reduction, share, reward_rate, penalty_rate = (
+        _as_int64(value, name)
+        for value, name in (
+            (reductions_kwh, "reductions_kwh"),
+            (target_shares, "target_shares"),
+            (reward_rate, "reward_rate"),
+            (penalty_rate, "penalty_rate"),
+        )
+    )
+
+    # Branch-free form of the scalar formula:
+    #   min(reduction, share) * reward_rate - max(share - reduction, 0) * penalty_rate
+    # The shortfall is only evaluated (and checked) where the target is missed.
+    met = reduction >= share
+    credited = np.minimum(reduction, share)
+    reward, reward_over = _checked_mul(credited, reward_rate)
+    shortfall, shortfall_over = _checked_sub(share, reduction)
+    shortfall = np.where(met, 0, shortfall)
+    penalty, penalty_over = _checked_mul(shortfall, penalty_rate)
+    payout, payout_over = _checked_sub(reward, penalty)
+
+    overflow = np.ravel(reward_over | (shortfall_over & ~met) | penalty_over | payout_over)
+    if overflow.any():
+        index = int(np.flatnonzero(overflow)[0])
+        raise OverflowError(f"payout for site index {index} overflows int64")
+    return np.ravel(payout)
+
+
+def _as_int64(value: Any, name: str) -> np.ndarray:
+    array = np.asarray(value)
+    if array.size == 0:
+        return array.astype(np.int64)
+    if array.dtype == object:
+        # Python ints beyond 64 bits land here.
+        try:
+            return array.astype(np.int64)
+        except (OverflowError, TypeError, ValueError) as exc:
+            raise OverflowError(f"{name} does not fit in int64") from exc
+    if array.dtype.kind == "u":
+        if array.max() > _INT64_MAX:
+            raise OverflowError(f"{name} does not fit in int64")
+        return array.astype(np.int64)
+    if array.dtype.kind not in "ib":
+        raise TypeError(f"{name} must be integers, got {array.dtype}")
+    return array.astype(np.int64, copy=False)
+
+
+def _checked_mul(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(over="ignore"):
+        product = a * b
+    # float64 rounding is far smaller than the gap between 2**62 and the
+    # int64 limit, so only products screened above 2**62 need the exact
+    # (Python int) check.
+    suspect = np.abs(np.multiply(a, b, dtype=np.float64)) >= _FLOAT_SCREEN
+    if not suspect.any():
+        return product, suspect
+    overflow = np.zeros(product.shape, dtype=bool)
+    overflow[suspect] = [
+        not _INT64_MIN <= int(x) * int(y) <= _INT64_MAX
+        for x, y in zip(
+            np.broadcast_to(a, product.shape)[suspect],
+            np.broadcast_to(b, product.shape)[suspect],
+        )
+    ]
+    return product, overflow
+
+
+def _checked_sub(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(over="ignore"):
+        difference = a - b
+    # Overflow iff the operands differ in sign and the result's sign differs from a.
+    overflow = ((a ^ b) & (a ^ difference)) < 0
+    return difference, overflow
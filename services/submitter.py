@@ -6,16 +6,21 @@ an auditable SQLite index for query and hash re-check.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import os
-import sqlite3
-import subprocess
 import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping
 
-from services.db import connect
+from services.chain_worker import (
+    ChainWorkerError,
+    ChainWorkerProtocolError,
+    get_chain_worker_pool,
+)
+from services.db import open_storage
+from services.db_backend import DatabaseBackend
 from services.dto import (
     AuditDTO,
     EventCreateRequest,
@@ -25,8 +30,10 @@ from services.dto import (
     ProofSubmitRequest,
     SettlementDTO,
 )
+from services.env import float_env, int_env
 from services.proof_builder import build_proof_artifacts, recompute_hash
-from services.scorer import calculate_payout
+from services.scorer import calculate_payouts
+from services.tx_watcher import TxWatcher
 
 
 class ServiceError(Exception):
@@ -46,9 +53,22 @@ class ServiceError(Exception):
         self.details = details or {}
 
 
+# Runs a blocking call off the event loop, e.g. a Dispatcher lane.
+RunBlocking = Callable[..., Awaitable[Any]]
+
+# table -> (key columns, tx column prefixes) tracked by _reconcile_pending_txs.
+_TX_RECONCILE_TARGETS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "events": (("event_id",), ("tx", "close_tx")),
+    "proofs": (("event_id", "site_id"), ("tx",)),
+    "settlements": (("event_id", "site_id"), ("tx", "claim_tx")),
+}
+
+
 class SubmitterService:
-    def __init__(self, db_path: str | None = None):
-        self.conn = connect(db_path)
+    def __init__(
+        self, db_path: str | None = None, db: DatabaseBackend | None = None
+    ):
+        self._db = db if db is not None else open_storage(db_path)
         self.chain_mode = _normalize_chain_mode(os.getenv("DR_CHAIN_MODE", "simulated"))
         self.tx_confirm_mode = _normalize_tx_confirm_mode(
             os.getenv("DR_TX_CONFIRM_MODE", "hybrid")
@@ -59,6 +79,12 @@ class SubmitterService:
             / "scripts"
             / _chain_action_script_for_mode(self.chain_mode)
         )
+        self.tx_watcher = TxWatcher(
+            lambda tx_hashes: self._check_txs(tx_hashes),
+            poll_seconds=float_env(
+                "DR_TX_WATCH_POLL_SECONDS", default=0.8, minimum=0.2
+            ),
+        )
 
     def _required_sites(self) -> list[str]:
         configured = os.getenv("DR_REQUIRED_SITES", "").strip()
@@ -82,47 +108,23 @@ class SubmitterService:
                 f"chain action script not found: {self.chain_action_script}",
             )
 
-        cmd = ["node", str(self.chain_action_script), action]
-        if confirm_mode:
-            cmd.append(confirm_mode)
-        result = subprocess.run(
-            cmd,
-            input=json.dumps(payload),
-            text=True,
-            capture_output=True,
-            check=False,
-            env=os.environ.copy(),
-        )
-
-        if result.returncode != 0:
-            stderr = (result.stderr or "").strip()
-            stdout = (result.stdout or "").strip()
-            detail = stderr or stdout or f"exit={result.returncode}"
-            raise ServiceError(
-                502,
-                "CHAIN_TX_FAILED",
-                f"on-chain {action} failed: {detail}",
-                    details={"action": action},
-                )
-
-        raw = (result.stdout or "").strip()
-        if not raw:
-            raise ServiceError(
-                502,
-                "CHAIN_TX_INVALID_RESPONSE",
-                f"on-chain {action} returned empty output",
-                    details={"action": action},
-                )
-
+        pool = get_chain_worker_pool(self.chain_action_script)
         try:
-            return json.loads(raw.splitlines()[-1])
-        except json.JSONDecodeError as exc:
+            return pool.call(action, payload, confirm_mode=confirm_mode)
+        except ChainWorkerProtocolError as exc:
             raise ServiceError(
                 502,
                 "CHAIN_TX_INVALID_RESPONSE",
                 f"on-chain {action} returned non-json output",
                 details={"action": action},
             ) from exc
+        except ChainWorkerError as exc:
+            raise ServiceError(
+                502,
+                "CHAIN_TX_FAILED",
+                f"on-chain {action} failed: {exc}",
+                details={"action": action},
+            ) from exc
 
     def _chain_tx(self, action: str, payload: dict) -> dict[str, str | None]:
         now = _utc_now()
@@ -165,30 +167,36 @@ class SubmitterService:
             "tx_error": str(tx_error) if tx_error else None,
         }
 
-    def _check_tx(self, tx_hash: str) -> dict[str, str | None]:
+    def _check_txs(self, tx_hashes: list[str]) -> dict[str, dict[str, str | None]]:
+        unique_hashes = list(dict.fromkeys(h for h in tx_hashes if h))
         if not self.live_chain:
             now = _utc_now()
             return {
-                "tx_state": "confirmed",
-                "tx_fee_wei": "0",
-                "tx_confirmed_at": now,
-                "tx_error": None,
+                tx_hash: {
+                    "tx_state": "confirmed",
+                    "tx_fee_wei": "0",
+                    "tx_confirmed_at": now,
+                    "tx_error": None,
+                }
+                for tx_hash in unique_hashes
             }
-        payload_out = self._chain_action("check_tx", {"tx_hash": tx_hash})
-        tx_state = _normalize_tx_state(payload_out.get("tx_state"))
-        fee_wei = payload_out.get("fee_wei")
-        tx_error = payload_out.get("error")
-        confirmed_at = (
-            str(payload_out.get("confirmed_at") or _utc_now())
-            if tx_state == "confirmed"
-            else None
-        )
-        return {
-            "tx_state": tx_state,
-            "tx_fee_wei": str(fee_wei) if fee_wei is not None else None,
-            "tx_confirmed_at": confirmed_at,
-            "tx_error": str(tx_error) if tx_error else None,
-        }
+
+        batch_size = int_env("DR_CHECK_TX_BATCH_SIZE", default=100, minimum=1)
+        results: dict[str, dict[str, str | None]] = {}
+        for start in range(0, len(unique_hashes), batch_size):
+            batch = unique_hashes[start : start + batch_size]
+            payload_out = self._chain_action("check_txs", {"tx_hashes": batch})
+            entries = payload_out.get("results")
+            if not isinstance(entries, list) or len(entries) != len(batch):
+                raise ServiceError(
+                    502,
+                    "CHAIN_TX_INVALID_RESPONSE",
+                    "on-chain check_txs returned malformed results",
+                    details={"action": "check_txs"},
+                )
+            for tx_hash, entry in zip(batch, entries):
+                results[tx_hash] = _tx_check_result(entry)
+        return results
 
     def _update_tx_fields(
         self,
@@ -210,7 +218,7 @@ class SubmitterService:
         )
         tx_error = tx_result.get("tx_error") if tx_state == "failed" else None
 
-        self.conn.execute(
+        self._db.execute(
             f"""
             UPDATE {table}
             SET {state_column} = ?,
@@ -223,129 +231,63 @@ class SubmitterService:
         )
         return True
 
+    def reconcile_txs(self, event_id: str | None = None) -> None:
+        """Persist the chain state of unresolved txs (one event's, or all)."""
+        self._reconcile_pending_txs(event_id)
+
     def _reconcile_pending_txs(self, event_id: str | None = None) -> None:
         if not self.live_chain or self.tx_confirm_mode != "hybrid":
             return
 
-        tx_cache: dict[str, dict[str, str | None]] = {}
-
-        def cached_check(tx_hash: str) -> dict[str, str | None]:
-            cached = tx_cache.get(tx_hash)
-            if cached is None:
-                cached = self._check_tx(tx_hash)
-                tx_cache[tx_hash] = cached
-            return cached
-
-        updated = False
-
-        event_rows = self.conn.execute(
-            """
-            SELECT event_id,tx_hash,tx_state,tx_fee_wei,close_tx_hash,close_tx_state,close_tx_fee_wei
-            FROM events
-            WHERE (? IS NULL OR event_id = ?)
-            """,
-            (event_id, event_id),
-        ).fetchall()
-        for row in event_rows:
-            if _tx_needs_reconcile(row["tx_hash"], row["tx_state"], row["tx_fee_wei"]):
-                updated = (
-                    self._update_tx_fields(
-                        "events",
-                        "event_id = ?",
-                        (row["event_id"],),
-                        "tx_state",
-                        "tx_fee_wei",
-                        "tx_confirmed_at",
-                        "tx_error",
-                        cached_check(row["tx_hash"]),
-                    )
-                    or updated
-                )
-            if _tx_needs_reconcile(
-                row["close_tx_hash"], row["close_tx_state"], row["close_tx_fee_wei"]
-            ):
-                updated = (
-                    self._update_tx_fields(
-                        "events",
-                        "event_id = ?",
-                        (row["event_id"],),
-                        "close_tx_state",
-                        "close_tx_fee_wei",
-                        "close_tx_confirmed_at",
-                        "close_tx_error",
-                        cached_check(row["close_tx_hash"]),
-                    )
-                    or updated
-                )
-
-        proof_rows = self.conn.execute(
-            """
-            SELECT event_id,site_id,tx_hash,tx_state,tx_fee_wei
-            FROM proofs
-            WHERE (? IS NULL OR event_id = ?)
-            """,
-            (event_id, event_id),
-        ).fetchall()
-        for row in proof_rows:
-            if not _tx_needs_reconcile(row["tx_hash"], row["tx_state"], row["tx_fee_wei"]):
-                continue
-            updated = (
-                self._update_tx_fields(
-                    "proofs",
-                    "event_id = ? AND site_id = ?",
-                    (row["event_id"], row["site_id"]),
-                    "tx_state",
-                    "tx_fee_wei",
-                    "tx_confirmed_at",
-                    "tx_error",
-                    cached_check(row["tx_hash"]),
-                )
-                or updated
+        # Collect every unresolved hash first so the chain lookup is one
+        # batched round trip instead of one call per row.
+        pending: list[tuple[str, tuple[str, ...], tuple, str, str]] = []
+        for table, (key_columns, prefixes) in _TX_RECONCILE_TARGETS.items():
+            columns = [
+                *key_columns,
+                *(
+                    f"{prefix}_{suffix}"
+                    for prefix in prefixes
+                    for suffix in ("hash", "state", "fee_wei")
+                ),
+            ]
+            rows = self._db.fetchall(
+                f"""
+                SELECT {','.join(columns)}
+                FROM {table}
+                WHERE (? IS NULL OR event_id = ?)
+                """,
+                (event_id, event_id),
             )
+            for row in rows:
+                for prefix in prefixes:
+                    tx_hash = row[f"{prefix}_hash"]
+                    if _tx_needs_reconcile(
+                        tx_hash, row[f"{prefix}_state"], row[f"{prefix}_fee_wei"]
+                    ):
+                        key_values = tuple(row[column] for column in key_columns)
+                        pending.append((table, key_columns, key_values, prefix, tx_hash))
+
+        if not pending:
+            return
 
-        settlement_rows = self.conn.execute(
-            """
-            SELECT event_id,site_id,tx_hash,tx_state,tx_fee_wei,claim_tx_hash,claim_tx_state,claim_tx_fee_wei
-            FROM settlements
-            WHERE (? IS NULL OR event_id = ?)
-            """,
-            (event_id, event_id),
-        ).fetchall()
-        for row in settlement_rows:
-            if _tx_needs_reconcile(row["tx_hash"], row["tx_state"], row["tx_fee_wei"]):
-                updated = (
-                    self._update_tx_fields(
-                        "settlements",
-                        "event_id = ? AND site_id = ?",
-                        (row["event_id"], row["site_id"]),
-                        "tx_state",
-                        "tx_fee_wei",
-                        "tx_confirmed_at",
-                        "tx_error",
-                        cached_check(row["tx_hash"]),
-                    )
-                    or updated
-                )
-            if _tx_needs_reconcile(
-                row["claim_tx_hash"], row["claim_tx_state"], row["claim_tx_fee_wei"]
-            ):
-                updated = (
-                    self._update_tx_fields(
-                        "settlements",
-                        "event_id = ? AND site_id = ?",
-                        (row["event_id"], row["site_id"]),
-                        "claim_tx_state",
-                        "claim_tx_fee_wei",
-                        "claim_tx_confirmed_at",
-                        "claim_tx_error",
-                        cached_check(row["claim_tx_hash"]),
-                    )
-                    or updated
+        tx_results = self._check_txs([tx_hash for *_, tx_hash in pending])
+        with self._db.write():
+            for table, key_columns, key_values, prefix, tx_hash in pending:
+                tx_result = tx_results.get(tx_hash)
+                if tx_result is None:
+                    continue
+                self._update_tx_fields(
+                    table,
+                    " AND ".join(f"{column} = ?" for column in key_columns),
+                    key_values,
+                    f"{prefix}_state",
+                    f"{prefix}_fee_wei",
+                    f"{prefix}_confirmed_at",
+                    f"{prefix}_error",
+                    tx_result,
                 )
 
-        if updated:
-            self.conn.commit()
-
     def _tx_pipeline_counts(self, event_id: str) -> dict[str, int]:
         by_hash: dict[str, str] = {}
 
@@ -369,37 +311,37 @@ class SubmitterService:
                 return
             by_hash[tx_hash] = "confirmed"
 
-        event_rows = self.conn.execute(
+        event_rows = self._db.fetchall(
             """
             SELECT tx_hash,tx_state,tx_fee_wei,close_tx_hash,close_tx_state,close_tx_fee_wei
             FROM events
             WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchall()
+        )
         for row in event_rows:
             register(row["tx_hash"], row["tx_state"], row["tx_fee_wei"])
             register(row["close_tx_hash"], row["close_tx_state"], row["close_tx_fee_wei"])
 
-        proof_rows = self.conn.execute(
+        proof_rows = self._db.fetchall(
             """
             SELECT tx_hash,tx_state,tx_fee_wei
             FROM proofs
             WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchall()
+        )
         for row in proof_rows:
             register(row["tx_hash"], row["tx_state"], row["tx_fee_wei"])
 
-        settlement_rows = self.conn.execute(
+        settlement_rows = self._db.fetchall(
             """
             SELECT tx_hash,tx_state,tx_fee_wei,claim_tx_hash,claim_tx_state,claim_tx_fee_wei
             FROM settlements
             WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchall()
+        )
         for row in settlement_rows:
             register(row["tx_hash"], row["tx_state"], row["tx_fee_wei"])
             register(row["claim_tx_hash"], row["claim_tx_state"], row["claim_tx_fee_wei"])
@@ -414,127 +356,146 @@ class SubmitterService:
                 counts["submitted"] += 1
         return counts
 
-    def _ensure_close_confirmed_before_settle(self, event_id: str) -> None:
-        if not self.live_chain or self.tx_confirm_mode != "hybrid":
-            return
-
-        timeout_seconds = _int_env("DR_SETTLE_CLOSE_WAIT_SECONDS", default=6, minimum=1)
-        poll_seconds = _float_env(
-            "DR_SETTLE_CLOSE_POLL_SECONDS", default=0.8, minimum=0.2
+    def _event_tx_row(self, event_id: str, prefix: str) -> Mapping[str, Any]:
+        row = self._db.fetchone(
+            f"""
+            SELECT {prefix}_hash,{prefix}_state,{prefix}_error
+            FROM events
+            WHERE event_id = ?
+            """,
+            (event_id,),
         )
-        started = time.monotonic()
-
-        while True:
-            self._reconcile_pending_txs(event_id)
-            row = self.conn.execute(
-                """
-                SELECT close_tx_hash,close_tx_state,close_tx_error
-                FROM events
-                WHERE event_id = ?
-                """,
+        if row is None:
+            raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
+        return row
+
+    def _apply_event_tx_result(
+        self, event_id: str, prefix: str, tx_result: dict[str, str | None]
+    ) -> None:
+        with self._db.write():
+            self._update_tx_fields(
+                "events",
+                "event_id = ?",
                 (event_id,),
-            ).fetchone()
-            if row is None:
-                raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
+                f"{prefix}_state",
+                f"{prefix}_fee_wei",
+                f"{prefix}_confirmed_at",
+                f"{prefix}_error",
+                tx_result,
+            )
 
-            close_tx_hash = row["close_tx_hash"]
-            close_tx_state = _normalize_tx_state(row["close_tx_state"])
-            close_tx_error = row["close_tx_error"]
+    def _await_event_tx(
+        self, event_id: str, prefix: str, timeout_seconds: int
+    ) -> Mapping[str, Any]:
+        """Return the event row once its ``{prefix}`` tx has settled or timed out.
 
-            if close_tx_state == "confirmed":
-                return
-            if close_tx_state == "failed":
-                raise ServiceError(
-                    409,
-                    "CLOSE_TX_FAILED",
-                    "close transaction failed on-chain; retry close before settlement",
-                    retryable=True,
-                    details={
-                        "event_id": event_id,
-                        "close_tx_hash": close_tx_hash,
-                        "close_tx_error": close_tx_error,
-                    },
-                )
-            if not close_tx_hash:
-                raise ServiceError(
-                    409, "EVENT_NOT_CLOSED", "event must be closed before settlement"
-                )
+        Pending hashes are handed to the background watcher and this thread
+        waits on the per-hash future instead of polling SQLite.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        self._reconcile_pending_txs(event_id)
+        while True:
+            row = self._event_tx_row(event_id, prefix)
+            tx_hash = row[f"{prefix}_hash"]
+            remaining = deadline - time.monotonic()
+            if (
+                not tx_hash
+                or _normalize_tx_state(row[f"{prefix}_state"]) != "submitted"
+                or remaining <= 0
+            ):
+                return row
+            tx_result = self.tx_watcher.wait(tx_hash, timeout=remaining)
+            if tx_result is None:
+                return self._event_tx_row(event_id, prefix)
+            self._apply_event_tx_result(event_id, prefix, tx_result)
 
-            elapsed = time.monotonic() - started
-            if elapsed >= timeout_seconds:
-                raise ServiceError(
-                    409,
-                    "CLOSE_TX_PENDING_CONFIRMATION",
-                    f"close transaction still pending confirmation after {timeout_seconds}s",
-                    retryable=True,
-                    details={
-                        "event_id": event_id,
-                        "close_tx_hash": close_tx_hash,
-                        "close_tx_state": close_tx_state,
-                    },
-                )
+    async def _await_event_tx_async(
+        self,
+        event_id: str,
+        prefix: str,
+        timeout_seconds: int,
+        run_chain: RunBlocking | None = None,
+        run_db: RunBlocking | None = None,
+    ) -> Mapping[str, Any]:
+        """Event-loop counterpart of ``_await_event_tx``.
+
+        Reconciliation goes through ``run_chain`` and row reads/writes
+        through ``run_db`` (threads by default), so only the watcher wait
+        runs on the loop.
+        """
+        chain = run_chain or asyncio.to_thread
+        db = run_db or asyncio.to_thread
+        deadline = time.monotonic() + timeout_seconds
+        await chain(self._reconcile_pending_txs, event_id)
+        while True:
+            row = await db(self._event_tx_row, event_id, prefix)
+            tx_hash = row[f"{prefix}_hash"]
+            remaining = deadline - time.monotonic()
+            if (
+                not tx_hash
+                or _normalize_tx_state(row[f"{prefix}_state"]) != "submitted"
+                or remaining <= 0
+            ):
+                return row
+            tx_result = await self.tx_watcher.wait_async(tx_hash, timeout=remaining)
+            if tx_result is None:
+                return await db(self._event_tx_row, event_id, prefix)
+            await db(self._apply_event_tx_result, event_id, prefix, tx_result)
 
-            time.sleep(poll_seconds)
+    def _needs_confirmation_gate(self) -> bool:
+        return self.live_chain and self.tx_confirm_mode == "hybrid"
+
+    def _ensure_close_confirmed_before_settle(self, event_id: str) -> None:
+        if not self._needs_confirmation_gate():
+            return
+        timeout_seconds = int_env("DR_SETTLE_CLOSE_WAIT_SECONDS", default=6, minimum=1)
+        row = self._await_event_tx(event_id, "close_tx", timeout_seconds)
+        _raise_unless_close_confirmed(event_id, row, timeout_seconds)
 
     def _ensure_create_confirmed_before_proof(self, event_id: str) -> None:
-        if not self.live_chain or self.tx_confirm_mode != "hybrid":
+        if not self._needs_confirmation_gate():
             return
+        timeout_seconds = int_env("DR_PROOF_CREATE_WAIT_SECONDS", default=6, minimum=1)
+        row = self._await_event_tx(event_id, "tx", timeout_seconds)
+        _raise_unless_create_confirmed(event_id, row)
 
-        timeout_seconds = _int_env("DR_PROOF_CREATE_WAIT_SECONDS", default=6, minimum=1)
-        poll_seconds = _float_env(
-            "DR_PROOF_CREATE_POLL_SECONDS", default=0.8, minimum=0.2
+    async def wait_for_close_confirmation(
+        self,
+        event_id: str,
+        run_chain: RunBlocking | None = None,
+        run_db: RunBlocking | None = None,
+    ) -> None:
+        """Await the close tx before ``settle_event`` without blocking the loop.
+
+        Pass ``close_confirmed=True`` to the following ``settle_event`` so
+        it does not check again.
+        """
+        if not self._needs_confirmation_gate():
+            return
+        timeout_seconds = int_env("DR_SETTLE_CLOSE_WAIT_SECONDS", default=6, minimum=1)
+        row = await self._await_event_tx_async(
+            event_id, "close_tx", timeout_seconds, run_chain, run_db
         )
-        started = time.monotonic()
-
-        while True:
-            self._reconcile_pending_txs(event_id)
-            row = self.conn.execute(
-                """
-                SELECT tx_hash,tx_state,tx_error
-                FROM events
-                WHERE event_id = ?
-                """,
-                (event_id,),
-            ).fetchone()
-            if row is None:
-                raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
-
-            create_tx_hash = row["tx_hash"]
-            create_tx_state = _normalize_tx_state(row["tx_state"])
-            create_tx_error = row["tx_error"]
+        _raise_unless_close_confirmed(event_id, row, timeout_seconds)
 
-            if create_tx_state == "confirmed":
-                return
-            if create_tx_state == "failed":
-                raise ServiceError(
-                    409,
-                    "CREATE_TX_FAILED",
-                    "create transaction failed on-chain; recreate event before proof submission",
-                    retryable=True,
-                    details={
-                        "event_id": event_id,
-                        "create_tx_hash": create_tx_hash,
-                        "create_tx_error": create_tx_error,
-                    },
-                )
-            if not create_tx_hash:
-                return
-
-            elapsed = time.monotonic() - started
-            if elapsed >= timeout_seconds:
-                raise ServiceError(
-                    409,
-                    "CREATE_TX_PENDING_CONFIRMATION",
-                    "create transaction is submitted but not confirmed yet",
-                    retryable=True,
-                    details={
-                        "event_id": event_id,
-                        "create_tx_hash": create_tx_hash,
-                        "create_tx_state": create_tx_state,
-                    },
-                )
-
-            time.sleep(poll_seconds)
+    async def wait_for_create_confirmation(
+        self,
+        event_id: str,
+        run_chain: RunBlocking | None = None,
+        run_db: RunBlocking | None = None,
+    ) -> None:
+        """Await the create tx before ``submit_proof`` without blocking the loop.
+
+        Pass ``create_confirmed=True`` to the following ``submit_proof`` so
+        it does not check again.
+        """
+        if not self._needs_confirmation_gate():
+            return
+        timeout_seconds = int_env("DR_PROOF_CREATE_WAIT_SECONDS", default=6, minimum=1)
+        row = await self._await_event_tx_async(
+            event_id, "tx", timeout_seconds, run_chain, run_db
+        )
+        _raise_unless_create_confirmed(event_id, row)
 
     def create_event(self, req: EventCreateRequest) -> EventDTO:
         start_time = _to_rfc3339(req.start_time)
@@ -543,10 +504,10 @@ class SubmitterService:
             raise ServiceError(
                 400, "INVALID_TIME_WINDOW", "start_time must be < end_time"
             )
-        existing = self.conn.execute(
+        existing = self._db.fetchone(
             "SELECT 1 FROM events WHERE event_id = ?",
             (req.event_id,),
-        ).fetchone()
+        )
         if existing is not None:
             raise ServiceError(409, "EVENT_EXISTS", "event_id already exists")
 
@@ -565,32 +526,32 @@ class SubmitterService:
         tx_hash = tx_result["tx_hash"]
 
         try:
-            self.conn.execute(
-                """
-                INSERT INTO events(
-                    event_id,start_time,end_time,target_kw,reward_rate,penalty_rate,
-                    status,tx_hash,tx_fee_wei,tx_state,tx_submitted_at,tx_confirmed_at,tx_error,created_at
-                ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """,
-                (
-                    req.event_id,
-                    start_time,
-                    end_time,
-                    req.target_kw,
-                    req.reward_rate,
-                    req.penalty_rate,
-                    "active",
-                    tx_hash,
-                    tx_result.get("tx_fee_wei"),
-                    tx_result.get("tx_state"),
-                    tx_result.get("tx_submitted_at"),
-                    tx_result.get("tx_confirmed_at"),
-                    tx_result.get("tx_error"),
-                    now,
-                ),
-            )
-            self.conn.commit()
-        except sqlite3.IntegrityError as exc:
+            with self._db.write():
+                self._db.execute(
+                    """
+                    INSERT INTO events(
+                        event_id,start_time,end_time,target_kw,reward_rate,penalty_rate,
+                        status,tx_hash,tx_fee_wei,tx_state,tx_submitted_at,tx_confirmed_at,tx_error,created_at
+                    ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    """,
+                    (
+                        req.event_id,
+                        start_time,
+                        end_time,
+                        req.target_kw,
+                        req.reward_rate,
+                        req.penalty_rate,
+                        "active",
+                        tx_hash,
+                        tx_result.get("tx_fee_wei"),
+                        tx_result.get("tx_state"),
+                        tx_result.get("tx_submitted_at"),
+                        tx_result.get("tx_confirmed_at"),
+                        tx_result.get("tx_error"),
+                        now,
+                    ),
+                )
+        except self._db.IntegrityError as exc:
             raise ServiceError(409, "EVENT_EXISTS", "event_id already exists") from exc
 
         return EventDTO(
@@ -611,7 +572,7 @@ class SubmitterService:
 
     def get_event(self, event_id: str) -> EventDTO:
         self._reconcile_pending_txs(event_id)
-        row = self.conn.execute(
+        row = self._db.fetchone(
             """
             SELECT
                 event_id,start_time,end_time,target_kw,reward_rate,penalty_rate,status,
@@ -620,13 +581,13 @@ class SubmitterService:
             FROM events WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchone()
+        )
         if row is None:
             raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
         return EventDTO(**dict(row))
 
     def close_event(self, event_id: str) -> EventDTO:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             """
             SELECT
                 event_id,start_time,end_time,target_kw,reward_rate,penalty_rate,status,
@@ -635,7 +596,7 @@ class SubmitterService:
             FROM events WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchone()
+        )
         if row is None:
             raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
 
@@ -656,31 +617,31 @@ class SubmitterService:
             },
         )
         close_tx_hash = close_tx_result["tx_hash"]
-        self.conn.execute(
-            """
-            UPDATE events
-            SET status = 'closed',
-                closed_at = ?,
-                close_tx_hash = ?,
-                close_tx_fee_wei = ?,
-                close_tx_state = ?,
-                close_tx_submitted_at = ?,
-                close_tx_confirmed_at = ?,
-                close_tx_error = ?
-            WHERE event_id = ?
-            """,
-            (
-                closed_at,
-                close_tx_hash,
-                close_tx_result.get("tx_fee_wei"),
-                close_tx_result.get("tx_state"),
-                close_tx_result.get("tx_submitted_at"),
-                close_tx_result.get("tx_confirmed_at"),
-                close_tx_result.get("tx_error"),
-                event_id,
-            ),
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                """
+                UPDATE events
+                SET status = 'closed',
+                    closed_at = ?,
+                    close_tx_hash = ?,
+                    close_tx_fee_wei = ?,
+                    close_tx_state = ?,
+                    close_tx_submitted_at = ?,
+                    close_tx_confirmed_at = ?,
+                    close_tx_error = ?
+                WHERE event_id = ?
+                """,
+                (
+                    closed_at,
+                    close_tx_hash,
+                    close_tx_result.get("tx_fee_wei"),
+                    close_tx_result.get("tx_state"),
+                    close_tx_result.get("tx_submitted_at"),
+                    close_tx_result.get("tx_confirmed_at"),
+                    close_tx_result.get("tx_error"),
+                    event_id,
+                ),
+            )
 
         return EventDTO(
             event_id=row["event_id"],
@@ -704,17 +665,20 @@ class SubmitterService:
             close_tx_error=close_tx_result.get("tx_error"),
         )
 
-    def submit_proof(self, req: ProofSubmitRequest, actor_id: str) -> ProofDTO:
-        event = self.conn.execute(
+    def submit_proof(
+        self, req: ProofSubmitRequest, actor_id: str, create_confirmed: bool = False
+    ) -> ProofDTO:
+        event = self._db.fetchone(
             "SELECT status FROM events WHERE event_id = ?",
             (req.event_id,),
-        ).fetchone()
+        )
         if event is None:
             raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
         if event["status"] != "active":
             raise ServiceError(409, "EVENT_NOT_ACTIVE", "event must be active")
 
-        self._ensure_create_confirmed_before_proof(req.event_id)
+        if not create_confirmed:
+            self._ensure_create_confirmed_before_proof(req.event_id)
 
         payload_json, computed_hash, reduction_kwh = build_proof_artifacts(
             event_id=req.event_id,
@@ -745,35 +709,35 @@ class SubmitterService:
         tx_hash = tx_result["tx_hash"]
 
         try:
-            self.conn.execute(
-                """
-                INSERT INTO proofs(
-                    event_id,site_id,baseline_kwh,actual_kwh,reduction_kwh,proof_hash,
-                    uri,payload,baseline_method,tx_hash,tx_fee_wei,tx_state,tx_submitted_at,tx_confirmed_at,tx_error,submitter,submitted_at
-                ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """,
-                (
-                    req.event_id,
-                    req.site_id,
-                    req.baseline_kwh,
-                    req.actual_kwh,
-                    reduction_kwh,
-                    computed_hash,
-                    req.uri,
-                    payload_json,
-                    req.baseline_method,
-                    tx_hash,
-                    tx_result.get("tx_fee_wei"),
-                    tx_result.get("tx_state"),
-                    tx_result.get("tx_submitted_at"),
-                    tx_result.get("tx_confirmed_at"),
-                    tx_result.get("tx_error"),
-                    actor_id,
-                    submitted_at,
-                ),
-            )
-            self.conn.commit()
-        except sqlite3.IntegrityError as exc:
+            with self._db.write():
+                self._db.execute(
+                    """
+                    INSERT INTO proofs(
+                        event_id,site_id,baseline_kwh,actual_kwh,reduction_kwh,proof_hash,
+                        uri,payload,baseline_method,tx_hash,tx_fee_wei,tx_state,tx_submitted_at,tx_confirmed_at,tx_error,submitter,submitted_at
+                    ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    """,
+                    (
+                        req.event_id,
+                        req.site_id,
+                        req.baseline_kwh,
+                        req.actual_kwh,
+                        reduction_kwh,
+                        computed_hash,
+                        req.uri,
+                        payload_json,
+                        req.baseline_method,
+                        tx_hash,
+                        tx_result.get("tx_fee_wei"),
+                        tx_result.get("tx_state"),
+                        tx_result.get("tx_submitted_at"),
+                        tx_result.get("tx_confirmed_at"),
+                        tx_result.get("tx_error"),
+                        actor_id,
+                        submitted_at,
+                    ),
+                )
+        except self._db.IntegrityError as exc:
             raise ServiceError(
                 409,
                 "PROOF_EXISTS",
@@ -797,14 +761,16 @@ class SubmitterService:
             tx_error=tx_result.get("tx_error"),
         )
 
-    def settle_event(self, event_id: str, site_ids: list[str]) -> list[SettlementDTO]:
-        event = self.conn.execute(
+    def settle_event(
+        self, event_id: str, site_ids: list[str], close_confirmed: bool = False
+    ) -> list[SettlementDTO]:
+        event = self._db.fetchone(
             """
             SELECT event_id,target_kw,reward_rate,penalty_rate,status,close_tx_hash,close_tx_state,close_tx_fee_wei
             FROM events WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchone()
+        )
         if event is None:
             raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
 
@@ -816,14 +782,24 @@ class SubmitterService:
                 409, "EVENT_NOT_CLOSED", "event must be closed before settlement"
             )
 
-        self._ensure_close_confirmed_before_settle(event_id)
+        if not close_confirmed:
+            self._ensure_close_confirmed_before_settle(event_id)
 
+        # One joined read covers every proof of the event and whether each
+        # site already has a settlement row.
+        proof_rows = self._db.fetchall(
+            """
+            SELECT p.site_id, p.reduction_kwh, s.site_id IS NOT NULL AS settled
+            FROM proofs p
+            LEFT JOIN settlements s ON s.event_id = p.event_id AND s.site_id = p.site_id
+            WHERE p.event_id = ?
+            ORDER BY p.site_id
+            """,
+            (event_id,),
+        )
+        proofs = {row["site_id"]: row for row in proof_rows}
         if not site_ids:
-            rows = self.conn.execute(
-                "SELECT site_id FROM proofs WHERE event_id = ? ORDER BY site_id",
-                (event_id,),
-            ).fetchall()
-            site_ids = [r["site_id"] for r in rows]
+            site_ids = list(proofs)
 
         # Keep site order stable while removing duplicates.
         deduped_site_ids = list(dict.fromkeys(site_ids))
@@ -831,18 +807,8 @@ class SubmitterService:
         if not site_ids:
             raise ServiceError(400, "EMPTY_SITE_IDS", "site_ids cannot be empty")
 
-        target_share = event["target_kw"] // len(site_ids)
-        now = _utc_now()
-        settlement_rows: list[tuple[str, int]] = []
-
         for site_id in site_ids:
-            proof = self.conn.execute(
-                """
-                SELECT reduction_kwh FROM proofs
-                WHERE event_id = ? AND site_id = ?
-                """,
-                (event_id, site_id),
-            ).fetchone()
+            proof = proofs.get(site_id)
             if proof is None:
                 raise ServiceError(
                     400,
@@ -850,12 +816,7 @@ class SubmitterService:
                     "proof missing for one or more site_ids",
                     details={"site_id": site_id},
                 )
-
-            existing = self.conn.execute(
-                "SELECT 1 FROM settlements WHERE event_id = ? AND site_id = ?",
-                (event_id, site_id),
-            ).fetchone()
-            if existing is not None:
+            if proof["settled"]:
                 raise ServiceError(
                     409,
                     "ALREADY_SETTLED",
@@ -863,13 +824,23 @@ class SubmitterService:
                     details={"site_id": site_id},
                 )
 
-            payout = calculate_payout(
-                reduction_kwh=proof["reduction_kwh"],
-                target_share=target_share,
-                reward_rate=event["reward_rate"],
-                penalty_rate=event["penalty_rate"],
+        target_share = event["target_kw"] // len(site_ids)
+        now = _utc_now()
+        try:
+            payouts = calculate_payouts(
+                [proofs[site_id]["reduction_kwh"] for site_id in site_ids],
+                target_share,
+                event["reward_rate"],
+                event["penalty_rate"],
             )
-            settlement_rows.append((site_id, payout))
+        except OverflowError as exc:
+            raise ServiceError(
+                400,
+                "PAYOUT_OVERFLOW",
+                "payout exceeds the 64-bit range",
+                details={"event_id": event_id},
+            ) from exc
+        settlement_rows = list(zip(site_ids, payouts.tolist()))
 
         try:
             tx_result = self._chain_tx(
@@ -897,60 +868,53 @@ class SubmitterService:
             raise
         tx_hash = tx_result["tx_hash"]
 
-        created: list[SettlementDTO] = []
-        try:
-            self.conn.execute("BEGIN")
-            for site_id, payout in settlement_rows:
-                self.conn.execute(
+        tx_fields = {
+            key: tx_result.get(key)
+            for key in (
+                "tx_fee_wei",
+                "tx_state",
+                "tx_submitted_at",
+                "tx_confirmed_at",
+                "tx_error",
+            )
+        }
+        created = [
+            SettlementDTO(
+                event_id=event_id,
+                site_id=site_id,
+                payout=payout,
+                status="settled",
+                settled_at=now,
+                tx_hash=tx_hash,
+                **tx_fields,
+            )
+            for site_id, payout in settlement_rows
+        ]
+        with self._db.write():
+            try:
+                self._db.executemany(
                     """
                     INSERT INTO settlements(
                         event_id,site_id,payout,status,settled_at,
                         tx_hash,tx_fee_wei,tx_state,tx_submitted_at,tx_confirmed_at,tx_error
                     ) VALUES(?,?,?,?,?,?,?,?,?,?,?)
                     """,
-                    (
-                        event_id,
-                        site_id,
-                        payout,
-                        "settled",
-                        now,
-                        tx_hash,
-                        tx_result.get("tx_fee_wei"),
-                        tx_result.get("tx_state"),
-                        tx_result.get("tx_submitted_at"),
-                        tx_result.get("tx_confirmed_at"),
-                        tx_result.get("tx_error"),
-                    ),
+                    [
+                        (event_id, site_id, payout, "settled", now, tx_hash, *tx_fields.values())
+                        for site_id, payout in settlement_rows
+                    ],
                 )
-                created.append(
-                    SettlementDTO(
-                        event_id=event_id,
-                        site_id=site_id,
-                        payout=payout,
-                        status="settled",
-                        settled_at=now,
-                        tx_hash=tx_hash,
-                        tx_fee_wei=tx_result.get("tx_fee_wei"),
-                        tx_state=tx_result.get("tx_state"),
-                        tx_submitted_at=tx_result.get("tx_submitted_at"),
-                        tx_confirmed_at=tx_result.get("tx_confirmed_at"),
-                        tx_error=tx_result.get("tx_error"),
-                    )
+                self._db.execute(
+                    "UPDATE events SET status = 'settled', settled_at = ? WHERE event_id = ?",
+                    (now, event_id),
                 )
-
-            self.conn.execute(
-                "UPDATE events SET status = 'settled', settled_at = ? WHERE event_id = ?",
-                (now, event_id),
-            )
-            self.conn.commit()
-        except sqlite3.DatabaseError as exc:
-            self.conn.rollback()
-            raise ServiceError(
-                500,
-                "SETTLEMENT_TX_FAILED",
-                "database transaction failed during settlement",
-                retryable=True,
-            ) from exc
+            except self._db.DatabaseError as exc:
+                raise ServiceError(
+                    500,
+                    "SETTLEMENT_TX_FAILED",
+                    "database transaction failed during settlement",
+                    retryable=True,
+                ) from exc
 
         return created
 
@@ -958,7 +922,7 @@ class SubmitterService:
         if self.live_chain and self.tx_confirm_mode == "hybrid":
             self._reconcile_pending_txs(event_id)
 
-        record = self.conn.execute(
+        record = self._db.fetchone(
             """
             SELECT
                 event_id,site_id,payout,status,settled_at,
@@ -967,7 +931,7 @@ class SubmitterService:
             FROM settlements WHERE event_id = ? AND site_id = ?
             """,
             (event_id, site_id),
-        ).fetchone()
+        )
         if record is None:
             raise ServiceError(
                 404, "SETTLEMENT_NOT_FOUND", "settlement record not found"
@@ -1004,10 +968,10 @@ class SubmitterService:
         if record["status"] != "settled":
             raise ServiceError(409, "NOT_CLAIMABLE", "settlement is not claimable")
 
-        proof = self.conn.execute(
+        proof = self._db.fetchone(
             "SELECT submitter FROM proofs WHERE event_id = ? AND site_id = ?",
             (event_id, site_id),
-        ).fetchone()
+        )
         if proof is None:
             raise ServiceError(404, "PROOF_NOT_FOUND", "proof not found")
         if proof["submitter"] != actor_id:
@@ -1024,32 +988,32 @@ class SubmitterService:
         )
         claim_tx_hash = claim_tx_result["tx_hash"]
         claimed_at = _utc_now()
-        self.conn.execute(
-            """
-            UPDATE settlements
-            SET status = 'claimed',
-                claimed_at = ?,
-                claim_tx_hash = ?,
-                claim_tx_fee_wei = ?,
-                claim_tx_state = ?,
-                claim_tx_submitted_at = ?,
-                claim_tx_confirmed_at = ?,
-                claim_tx_error = ?
-            WHERE event_id = ? AND site_id = ?
-            """,
-            (
-                claimed_at,
-                claim_tx_hash,
-                claim_tx_result.get("tx_fee_wei"),
-                claim_tx_result.get("tx_state"),
-                claim_tx_result.get("tx_submitted_at"),
-                claim_tx_result.get("tx_confirmed_at"),
-                claim_tx_result.get("tx_error"),
-                event_id,
-                site_id,
-            ),
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                """
+                UPDATE settlements
+                SET status = 'claimed',
+                    claimed_at = ?,
+                    claim_tx_hash = ?,
+                    claim_tx_fee_wei = ?,
+                    claim_tx_state = ?,
+                    claim_tx_submitted_at = ?,
+                    claim_tx_confirmed_at = ?,
+                    claim_tx_error = ?
+                WHERE event_id = ? AND site_id = ?
+                """,
+                (
+                    claimed_at,
+                    claim_tx_hash,
+                    claim_tx_result.get("tx_fee_wei"),
+                    claim_tx_result.get("tx_state"),
+                    claim_tx_result.get("tx_submitted_at"),
+                    claim_tx_result.get("tx_confirmed_at"),
+                    claim_tx_result.get("tx_error"),
+                    event_id,
+                    site_id,
+                ),
+            )
 
         return SettlementDTO(
             event_id=record["event_id"],
@@ -1073,7 +1037,7 @@ class SubmitterService:
 
     def list_settlements(self, event_id: str) -> list[SettlementDTO]:
         self._reconcile_pending_txs(event_id)
-        rows = self.conn.execute(
+        rows = self._db.fetchall(
             """
             SELECT
                 event_id,site_id,payout,status,settled_at,
@@ -1084,32 +1048,32 @@ class SubmitterService:
             ORDER BY site_id
             """,
             (event_id,),
-        ).fetchall()
+        )
 
         return [SettlementDTO(**dict(row)) for row in rows]
 
     def get_audit(self, event_id: str, site_id: str) -> AuditDTO:
-        row = self.conn.execute(
+        row = self._db.fetchone(
             """
             SELECT event_id,site_id,proof_hash,uri,payload
             FROM proofs
             WHERE event_id = ? AND site_id = ?
             """,
             (event_id, site_id),
-        ).fetchone()
+        )
         if row is None:
             raise ServiceError(404, "PROOF_NOT_FOUND", "proof not found")
 
         requested_at = _utc_now()
-        self.conn.execute(
-            """
-            INSERT INTO audits(event_id,site_id,requested_at)
-            VALUES(?,?,?)
-            ON CONFLICT(event_id,site_id) DO UPDATE SET requested_at = excluded.requested_at
-            """,
-            (event_id, site_id, requested_at),
-        )
-        self.conn.commit()
+        with self._db.write():
+            self._db.execute(
+                """
+                INSERT INTO audits(event_id,site_id,requested_at)
+                VALUES(?,?,?)
+                ON CONFLICT(event_id,site_id) DO UPDATE SET requested_at = excluded.requested_at
+                """,
+                (event_id, site_id, requested_at),
+            )
 
         recomputed = recompute_hash(row["payload"])
 
@@ -1124,18 +1088,18 @@ class SubmitterService:
 
     def get_judge_summary(self, event_id: str, network_mode: str) -> JudgeSummaryDTO:
         self._reconcile_pending_txs(event_id)
-        event = self.conn.execute(
+        event = self._db.fetchone(
             """
             SELECT event_id,status,created_at,closed_at,settled_at
             FROM events
             WHERE event_id = ?
             """,
             (event_id,),
-        ).fetchone()
+        )
         if event is None:
             raise ServiceError(404, "EVENT_NOT_FOUND", "event not found")
 
-        proof_rows = self.conn.execute(
+        proof_rows = self._db.fetchall(
             """
             SELECT site_id,reduction_kwh,submitted_at
             FROM proofs
@@ -1143,8 +1107,8 @@ class SubmitterService:
             ORDER BY site_id
             """,
             (event_id,),
-        ).fetchall()
-        settlement_rows = self.conn.execute(
+        )
+        settlement_rows = self._db.fetchall(
             """
             SELECT site_id,payout,status,settled_at,claimed_at
             FROM settlements
@@ -1152,15 +1116,15 @@ class SubmitterService:
             ORDER BY site_id
             """,
             (event_id,),
-        ).fetchall()
-        audit_row = self.conn.execute(
+        )
+        audit_row = self._db.fetchone(
             """
             SELECT requested_at
             FROM audits
             WHERE event_id = ? AND site_id = 'site-a'
             """,
             (event_id,),
-        ).fetchone()
+        )
 
         proof_map = {row["site_id"]: row for row in proof_rows}
         required_sites = self._required_sites()
@@ -1216,14 +1180,14 @@ class SubmitterService:
         if audit_requested:
             proof_site_a = proof_map.get("site-a")
             if proof_site_a is not None:
-                audit_payload = self.conn.execute(
+                audit_payload = self._db.fetchone(
                     """
                     SELECT proof_hash,payload
                     FROM proofs
                     WHERE event_id = ? AND site_id = 'site-a'
                     """,
                     (event_id,),
-                ).fetchone()
+                )
                 if audit_payload is not None:
                     recomputed = recompute_hash(audit_payload["payload"])
                     audit_match = (
@@ -1316,28 +1280,6 @@ def _to_rfc3339(value: datetime) -> str:
     return value.replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
-def _int_env(name: str, default: int, minimum: int) -> int:
-    raw = os.getenv(name, "").strip()
-    if not raw:
-        return default
-    try:
-        value = int(raw)
-    except ValueError:
-        return default
-    return max(minimum, value)
-
-
-def _float_env(name: str, default: float, minimum: float) -> float:
-    raw = os.getenv(name, "").strip()
-    if not raw:
-        return default
-    try:
-        value = float(raw)
-    except ValueError:
-        return default
-    return max(minimum, value)
-
-
 def _tx_hash() -> str:
     # MVP service path currently returns simulated tx hash from local orchestration.
     return "0x" + uuid.uuid4().hex + uuid.uuid4().hex
@@ -1365,6 +1307,23 @@ def _normalize_tx_state(value: str | None) -> str:
     return "submitted"
 
 
+def _tx_check_result(payload_out: dict) -> dict[str, str | None]:
+    tx_state = _normalize_tx_state(payload_out.get("tx_state"))
+    fee_wei = payload_out.get("fee_wei")
+    tx_error = payload_out.get("error")
+    confirmed_at = (
+        str(payload_out.get("confirmed_at") or _utc_now())
+        if tx_state == "confirmed"
+        else None
+    )
+    return {
+        "tx_state": tx_state,
+        "tx_fee_wei": str(fee_wei) if fee_wei is not None else None,
+        "tx_confirmed_at": confirmed_at,
+        "tx_error": str(tx_error) if tx_error else None,
+    }
+
+
 def _tx_needs_reconcile(
     tx_hash: str | None, tx_state: str | None, tx_fee_wei: str | None
 ) -> bool:
@@ -1376,6 +1335,76 @@ def _tx_needs_reconcile(
     return tx_fee_wei in (None, "")
 
 
+def _raise_unless_close_confirmed(
+    event_id: str, row: Mapping[str, Any], timeout_seconds: int
+) -> None:
+    close_tx_hash = row["close_tx_hash"]
+    close_tx_state = _normalize_tx_state(row["close_tx_state"])
+    close_tx_error = row["close_tx_error"]
+
+    if close_tx_state == "confirmed":
+        return
+    if close_tx_state == "failed":
+        raise ServiceError(
+            409,
+            "CLOSE_TX_FAILED",
+            "close transaction failed on-chain; retry close before settlement",
+            retryable=True,
+            details={
+                "event_id": event_id,
+                "close_tx_hash": close_tx_hash,
+                "close_tx_error": close_tx_error,
+            },
+        )
+    if not close_tx_hash:
+        raise ServiceError(
+            409, "EVENT_NOT_CLOSED", "event must be closed before settlement"
+        )
+    raise ServiceError(
+        409,
+        "CLOSE_TX_PENDING_CONFIRMATION",
+        f"close transaction still pending confirmation after {timeout_seconds}s",
+        retryable=True,
+        details={
+            "event_id": event_id,
+            "close_tx_hash": close_tx_hash,
+            "close_tx_state": close_tx_state,
+        },
+    )
+
+
+def _raise_unless_create_confirmed(event_id: str, row: Mapping[str, Any]) -> None:
+    create_tx_hash = row["tx_hash"]
+    create_tx_state = _normalize_tx_state(row["tx_state"])
+    create_tx_error = row["tx_error"]
+
+    if create_tx_state == "confirmed" or not create_tx_hash:
+        return
+    if create_tx_state == "failed":
+        raise ServiceError(
+            409,
+            "CREATE_TX_FAILED",
+            "create transaction failed on-chain; recreate event before proof submission",
+            retryable=True,
+            details={
+                "event_id": event_id,
+                "create_tx_hash": create_tx_hash,
+                "create_tx_error": create_tx_error,
+            },
+        )
+    raise ServiceError(
+        409,
+        "CREATE_TX_PENDING_CONFIRMATION",
+        "create transaction is submitted but not confirmed yet",
+        retryable=True,
+        details={
+            "event_id": event_id,
+            "create_tx_hash": create_tx_hash,
+            "create_tx_state": create_tx_state,
+        },
+    )
+
+
 def _is_live_chain_mode(mode: str) -> bool:
     return mode in {"fuji-live", "fuji", "custom-l1", "dr-l1"}
 
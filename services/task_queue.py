@@ -2,6 +2,7 @@
 
 Provides a pluggable queue interface with:
   - InMemoryTaskQueue: for testing and simulated mode
+  - DurableTaskQueue: tasks in the application database, kept across restarts
   - (Future) CeleryTaskQueue: for production with Redis backend
 
 Task types:
@@ -9,15 +10,44 @@ Task types:
   - bridge_relay: relay cross-chain bridge transfer
   - icm_deliver: deliver ICM message to destination
   - settle_event: async event settlement
+
+Each task has a priority (lower runs first, default per type from
+``TASK_PRIORITIES``), so settlement is not stuck behind a backlog of
+confirmation polls, and can be held back until a ``not_before`` time.
+A task that fails after ``max_retries`` retries is moved to the dead
+letter status, where it stays until ``requeue_dead_letter``.
+
+An optional ``dedup_key`` makes enqueue idempotent while a task is in
+flight: enqueueing with the key of a pending or running task returns that
+task instead of adding another. The key is free again once the task
+completes, fails or is dead-lettered.
+
+Env vars:
+  DR_TASK_QUEUE                — durable | memory (default: durable)
+  DR_TASK_VISIBILITY_TIMEOUT_S — lease on a dequeued task (default: 60)
+  DR_TASK_FINISHED_TTL_S       — keep completed/failed tasks this long (default: 3600)
+  DR_TASK_DEAD_LETTER_TTL_S    — durable queue: keep dead letters this long (default: 604800)
+  DR_TASK_MAX_FINISHED         — in-memory cap on completed/failed tasks (default: 10000)
 """
 
 from __future__ import annotations
 
+import bisect
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
 import uuid
-from collections import deque
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from typing import Any, Protocol
+from typing import Any, Callable, Iterable, Mapping, Protocol
+
+from services.db import Migration, migrate, open_storage
+from services.db_backend import BackendType, DatabaseBackend, adapt_ddl, column_exists
+from services.env import int_env
 
 
 class TaskType(Enum):
@@ -26,12 +56,30 @@ class TaskType(Enum):
     ICM_DELIVER = "icm_deliver"
     SETTLE_EVENT = "settle_event"
 
+    # Members are singletons compared by identity, so the C-level identity
+    # hash is valid; Enum's own __hash__ is Python code and dominated the
+    # in-memory queue's per-transition index updates.
+    __hash__ = object.__hash__
+
 
 class TaskStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    DEAD_LETTER = "dead_letter"
+
+    __hash__ = object.__hash__  # see TaskType
+
+
+# Claim order across types, lowest first. Settlement and message delivery
+# unblock participants; confirmation polls are numerous and can wait.
+TASK_PRIORITIES: dict[TaskType, int] = {
+    TaskType.SETTLE_EVENT: 0,
+    TaskType.ICM_DELIVER: 1,
+    TaskType.BRIDGE_RELAY: 1,
+    TaskType.CONFIRM_TX: 2,
+}
 
 
 @dataclass
@@ -43,6 +91,8 @@ class Task:
     result: dict[str, Any] | None = None
     error: str | None = None
     retry_count: int = 0
+    priority: int = 0
+    dedup_key: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -53,86 +103,748 @@ class Task:
             "result": self.result,
             "error": self.error,
             "retry_count": self.retry_count,
+            "priority": self.priority,
+            "dedup_key": self.dedup_key,
         }
 
 
 class TaskQueue(Protocol):
-    def enqueue(self, task_type: TaskType, payload: dict[str, Any]) -> Task: ...
+    def enqueue(
+        self,
+        task_type: TaskType,
+        payload: dict[str, Any],
+        priority: int | None = None,
+        not_before: float | None = None,
+        dedup_key: str | None = None,
+    ) -> Task: ...
     def dequeue(self) -> Task | None: ...
+    def dequeue_batch(self, max_tasks: int) -> list[Task]: ...
     def complete(self, task_id: str, result: dict[str, Any] | None = None) -> Task: ...
     def fail(self, task_id: str, error: str) -> Task: ...
+    def retry(self, task_id: str, delay_s: float = 0.0) -> Task: ...
     def get(self, task_id: str) -> Task | None: ...
     def pending_count(self) -> int: ...
+    def counts(self) -> dict[str, int]: ...
+    def counts_by_type(self) -> dict[str, dict[str, int]]: ...
+    def dead_letters(self, limit: int = 100) -> list[Task]: ...
+    def requeue_dead_letter(self, task_id: str) -> Task: ...
+
+
+_FINISHED_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED})
+_IN_FLIGHT_STATUSES = frozenset({TaskStatus.PENDING, TaskStatus.RUNNING})
+
+
+def _priority(task_type: TaskType, priority: int | None) -> int:
+    return TASK_PRIORITIES.get(task_type, 0) if priority is None else int(priority)
 
 
 class InMemoryTaskQueue:
-    def __init__(self, max_retries: int = 3):
+    """``TaskQueue`` held in process memory.
+
+    Pending tasks wait in one FIFO lane per priority and ``dequeue`` takes
+    from the lowest non-empty lane. Tasks scheduled for later (``not_before``
+    or a delayed retry) wait in a heap ordered by ready time and join their
+    lane once it passes.
+
+    Every status change goes through ``_set_status``, which keeps the
+    by-status index and the (type, status) counters current, so counts
+    and status/type listings never scan all tasks. Completed and failed
+    tasks are evicted ``finished_ttl_s`` after they finish, oldest first
+    once more than ``max_finished`` are held; dead letters stay until
+    requeued.
+
+    Public methods hold one lock, so the queue can be shared between the
+    event loop (``TaskWorker``) and dispatcher threads (the API routes).
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.time,
+        finished_ttl_s: float | None = None,
+        max_finished: int | None = None,
+    ):
         self._tasks: dict[str, Task] = {}
-        self._queue: deque[str] = deque()
+        self._lanes: dict[int, deque[str]] = {}
+        self._priorities: list[int] = []
+        # Scheduled tasks as (ready_at, tiebreak, task_id), earliest first.
+        self._delayed: list[tuple[float, int, str]] = []
+        self._delay_seq = itertools.count()
+        # Task ids per status and per type, each in insertion order.
+        self._by_status: dict[TaskStatus, dict[str, None]] = {s: {} for s in TaskStatus}
+        self._by_type: dict[TaskType, dict[str, None]] = {t: {} for t in TaskType}
+        self._type_counts: dict[TaskType, dict[TaskStatus, int]] = {
+            t: dict.fromkeys(TaskStatus, 0) for t in TaskType
+        }
+        # Completed/failed task ids with their finish time, oldest first.
+        self._finished: OrderedDict[str, float] = OrderedDict()
+        # dedup_key -> id of the in-flight task holding it.
+        self._in_flight: dict[str, str] = {}
+        self._evicted = 0
         self._max_retries = max_retries
-
-    def enqueue(self, task_type: TaskType, payload: dict[str, Any]) -> Task:
-        task_id = f"task-{uuid.uuid4().hex[:12]}"
-        task = Task(
-            task_id=task_id,
-            task_type=task_type,
-            payload=payload,
-            status=TaskStatus.PENDING,
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.finished_ttl_s = (
+            finished_ttl_s if finished_ttl_s is not None
+            else int_env("DR_TASK_FINISHED_TTL_S", default=3600, minimum=1)
         )
-        self._tasks[task_id] = task
-        self._queue.append(task_id)
-        return task
+        self.max_finished = (
+            max_finished if max_finished is not None
+            else int_env("DR_TASK_MAX_FINISHED", default=10_000, minimum=0)
+        )
+
+    def enqueue(
+        self,
+        task_type: TaskType,
+        payload: dict[str, Any],
+        priority: int | None = None,
+        not_before: float | None = None,
+        dedup_key: str | None = None,
+    ) -> Task:
+        """Add a task; ``not_before`` (epoch seconds) holds it until then.
+
+        With ``dedup_key``, an in-flight task holding the key is returned
+        instead.
+        """
+        with self._lock:
+            if dedup_key is not None and dedup_key in self._in_flight:
+                return self._tasks[self._in_flight[dedup_key]]
+            self._evict_finished()
+            task_id = f"task-{uuid.uuid4().hex[:12]}"
+            task = Task(
+                task_id=task_id,
+                task_type=task_type,
+                payload=payload,
+                status=TaskStatus.PENDING,
+                priority=_priority(task_type, priority),
+                dedup_key=dedup_key,
+            )
+            self._tasks[task_id] = task
+            if dedup_key is not None:
+                self._in_flight[dedup_key] = task_id
+            self._by_status[task.status][task_id] = None
+            self._by_type[task_type][task_id] = None
+            self._type_counts[task_type][task.status] += 1
+            self._schedule(task, not_before)
+            return task
 
     def dequeue(self) -> Task | None:
-        while self._queue:
-            task_id = self._queue.popleft()
-            task = self._tasks.get(task_id)
-            if task and task.status == TaskStatus.PENDING:
-                task.status = TaskStatus.RUNNING
-                return task
-        return None
+        with self._lock:
+            return self._dequeue()
+
+    def dequeue_batch(self, max_tasks: int) -> list[Task]:
+        tasks = []
+        with self._lock:
+            while len(tasks) < max_tasks:
+                task = self._dequeue()
+                if task is None:
+                    break
+                tasks.append(task)
+        return tasks
 
     def complete(
         self, task_id: str, result: dict[str, Any] | None = None
     ) -> Task:
-        task = self._require(task_id)
-        task.status = TaskStatus.COMPLETED
-        task.result = result
-        return task
+        with self._lock:
+            task = self._require(task_id)
+            self._set_status(task, TaskStatus.COMPLETED)
+            task.result = result
+            self._evict_finished()
+            return task
 
     def fail(self, task_id: str, error: str) -> Task:
-        task = self._require(task_id)
-        task.status = TaskStatus.FAILED
-        task.error = error
-        return task
+        with self._lock:
+            task = self._require(task_id)
+            self._set_status(task, TaskStatus.FAILED)
+            task.error = error
+            # Not evicting here: a failure is usually followed by retry().
+            return task
+
+    def retry(self, task_id: str, delay_s: float = 0.0) -> Task:
+        """Requeue a task, dequeued no sooner than ``delay_s`` from now.
+
+        Past ``max_retries`` the task is dead-lettered and ValueError raised.
+        """
+        with self._lock:
+            task = self._require(task_id)
+            if task.retry_count >= self._max_retries:
+                self._set_status(task, TaskStatus.DEAD_LETTER)
+                raise ValueError(
+                    f"max retries ({self._max_retries}) exceeded for task {task_id}; "
+                    "moved to dead letter"
+                )
+            self._set_status(task, TaskStatus.PENDING)
+            task.error = None
+            task.retry_count += 1
+            self._schedule(task, self._clock() + delay_s if delay_s > 0 else None)
+            return task
 
-    def retry(self, task_id: str) -> Task:
-        task = self._require(task_id)
-        if task.retry_count >= self._max_retries:
-            raise ValueError(
-                f"max retries ({self._max_retries}) exceeded for task {task_id}"
+    def dead_letters(self, limit: int = 100) -> list[Task]:
+        """Dead-lettered tasks, most recent first."""
+        with self._lock:
+            ids = itertools.islice(
+                reversed(self._by_status[TaskStatus.DEAD_LETTER]), max(0, limit)
             )
-        task.status = TaskStatus.PENDING
-        task.error = None
-        task.retry_count += 1
-        self._queue.append(task_id)
+            return [self._tasks[task_id] for task_id in ids]
+
+    def requeue_dead_letter(self, task_id: str) -> Task:
+        """Give a dead-lettered task a fresh set of retries."""
+        with self._lock:
+            task = self._require(task_id)
+            if task.status != TaskStatus.DEAD_LETTER:
+                raise ValueError(f"task {task_id} is not {TaskStatus.DEAD_LETTER.value}")
+            self._set_status(task, TaskStatus.PENDING)
+            task.retry_count = 0
+            self._schedule(task, None)
+            return task
+
+    def get(self, task_id: str) -> Task | None:
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._by_status[TaskStatus.PENDING])
+
+    def counts(self) -> dict[str, int]:
+        """Tasks per status, every status present."""
+        with self._lock:
+            return {status.value: len(ids) for status, ids in self._by_status.items()}
+
+    def counts_by_type(self) -> dict[str, dict[str, int]]:
+        """Tasks per type and status, every type and status present."""
+        with self._lock:
+            return {
+                task_type.value: {
+                    status.value: n for status, n in per_status.items()
+                }
+                for task_type, per_status in self._type_counts.items()
+            }
+
+    def evicted_count(self) -> int:
+        """Finished tasks dropped by TTL or size cap since start."""
+        with self._lock:
+            return self._evicted
+
+    def list_by_type(self, task_type: TaskType) -> list[Task]:
+        with self._lock:
+            return [self._tasks[task_id] for task_id in self._by_type[task_type]]
+
+    def list_by_status(self, status: TaskStatus, limit: int | None = None) -> list[Task]:
+        """Tasks in ``status``, in the order they reached it."""
+        with self._lock:
+            ids = itertools.islice(self._by_status[status], limit)
+            return [self._tasks[task_id] for task_id in ids]
+
+    def _dequeue(self) -> Task | None:
+        self._release_delayed()
+        for priority in self._priorities:
+            lane = self._lanes[priority]
+            while lane:
+                task = self._tasks.get(lane.popleft())
+                if task and task.status == TaskStatus.PENDING:
+                    self._set_status(task, TaskStatus.RUNNING)
+                    return task
+        return None
+
+    def _require(self, task_id: str) -> Task:
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise ValueError(f"task not found: {task_id}")
         return task
 
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        task_id, old = task.task_id, task.status
+        per_status = self._type_counts[task.task_type]
+        del self._by_status[old][task_id]
+        per_status[old] -= 1
+        if old in _FINISHED_STATUSES:
+            del self._finished[task_id]
+        task.status = status
+        self._by_status[status][task_id] = None
+        per_status[status] += 1
+        if status in _FINISHED_STATUSES:
+            self._finished[task_id] = self._clock()
+        if task.dedup_key is not None:
+            self._move_dedup_key(task)
+
+    def _move_dedup_key(self, task: Task) -> None:
+        holder = self._in_flight.get(task.dedup_key)
+        if task.status not in _IN_FLIGHT_STATUSES:
+            if holder == task.task_id:
+                del self._in_flight[task.dedup_key]
+        elif holder is None:
+            self._in_flight[task.dedup_key] = task.task_id
+        elif holder != task.task_id:
+            # Back in flight while a newer task holds the key: drop ours.
+            task.dedup_key = None
+
+    def _evict_finished(self) -> None:
+        expire_before = self._clock() - self.finished_ttl_s
+        finished = self._finished
+        while finished and (
+            len(finished) > self.max_finished or next(iter(finished.values())) <= expire_before
+        ):
+            task_id, _ = finished.popitem(last=False)
+            task = self._tasks.pop(task_id)
+            del self._by_status[task.status][task_id]
+            del self._by_type[task.task_type][task_id]
+            self._type_counts[task.task_type][task.status] -= 1
+            self._evicted += 1
+
+    def _schedule(self, task: Task, ready_at: float | None) -> None:
+        if ready_at is not None and ready_at > self._clock():
+            heapq.heappush(self._delayed, (ready_at, next(self._delay_seq), task.task_id))
+            return
+        lane = self._lanes.get(task.priority)
+        if lane is None:
+            lane = self._lanes[task.priority] = deque()
+            bisect.insort(self._priorities, task.priority)
+        lane.append(task.task_id)
+
+    def _release_delayed(self) -> None:
+        now = self._clock()
+        while self._delayed and self._delayed[0][0] <= now:
+            task = self._tasks.get(heapq.heappop(self._delayed)[2])
+            if task is not None:
+                self._schedule(task, None)
+
+
+TASKS_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL UNIQUE,
+    task_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    retry_count INTEGER NOT NULL DEFAULT 0,
+    available_at INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status_available ON tasks(status, available_at, seq);
+CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(task_type);
+"""
+
+
+def _create_task_tables(db: DatabaseBackend) -> None:
+    ddl = TASKS_SCHEMA_SQL
+    if db.backend_type == BackendType.POSTGRES:
+        ddl = ddl.replace("seq INTEGER PRIMARY KEY", "seq BIGSERIAL PRIMARY KEY")
+    db.execute_script(adapt_ddl(ddl, db.backend_type))
+
+
+def _add_task_priority(db: DatabaseBackend) -> None:
+    if not column_exists(db, "tasks", "priority"):
+        db.execute("ALTER TABLE tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        db.executemany(
+            "UPDATE tasks SET priority = ? WHERE task_type = ?",
+            [(priority, task_type.value) for task_type, priority in TASK_PRIORITIES.items()],
+        )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks(status, priority, available_at, seq)"
+    )
+    db.execute("DROP INDEX IF EXISTS idx_tasks_status_available")
+
+
+def _add_task_dedup_key(db: DatabaseBackend) -> None:
+    if not column_exists(db, "tasks", "dedup_key"):
+        db.execute("ALTER TABLE tasks ADD COLUMN dedup_key TEXT")
+    # Unique among in-flight tasks only; finished tasks release their key.
+    db.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_dedup ON tasks(dedup_key) "
+        "WHERE dedup_key IS NOT NULL AND status IN ('pending', 'running')"
+    )
+
+
+def _add_task_type_status_index(db: DatabaseBackend) -> None:
+    # Covers the (type, status) summary counts; its task_type prefix also
+    # serves list_by_type, so the single-column index is dropped.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_type_status ON tasks(task_type, status)"
+    )
+    db.execute("DROP INDEX IF EXISTS idx_tasks_type")
+
+
+TASK_MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "tasks table", _create_task_tables),
+    Migration(2, "tasks priority", _add_task_priority),
+    Migration(3, "tasks dedup key", _add_task_dedup_key),
+    Migration(4, "tasks type/status index", _add_task_type_status_index),
+)
+
+_PURGE_INTERVAL_MS = 60_000
+
+_TASK_COLUMNS = (
+    "task_id, task_type, payload, status, result, error, retry_count, priority, dedup_key"
+)
+
+_INSERT_TASK_SQL = (
+    "INSERT INTO tasks (task_id, task_type, payload, status, retry_count, priority, "
+    "dedup_key, available_at, created_at, updated_at) "
+    "VALUES (?, ?, ?, 'pending', 0, ?, ?, ?, ?, ?)"
+)
+
+# Going back to pending keeps the task's dedup key unless a newer in-flight
+# task took it meanwhile.
+_KEEP_FREE_DEDUP_KEY = (
+    "dedup_key = CASE WHEN EXISTS (SELECT 1 FROM tasks AS other "
+    "WHERE other.dedup_key = tasks.dedup_key AND other.task_id <> tasks.task_id "
+    "AND other.status IN ('pending', 'running')) "
+    "THEN NULL ELSE dedup_key END"
+)
+
+
+class DurableTaskQueue:
+    """``TaskQueue`` on the ``tasks`` table of the application database.
+
+    Dequeue claims tasks atomically: one ``UPDATE ... RETURNING`` marks the
+    available pending rows with the lowest priority, oldest first, as
+    running and leases them for
+    ``visibility_timeout_s`` (``available_at`` holds the lease expiry while
+    a task runs). A task whose worker dies without completing or failing
+    it becomes pending again once its lease expires, so delivery is at
+    least once. An expired lease counts as a retry: past ``max_retries``
+    the task is dead-lettered instead of redelivered, so a task that keeps
+    killing its worker cannot loop forever. ``extend_lease`` keeps a
+    long-running task claimed.
+
+    ``available_at`` also holds a pending task back until its ``not_before``
+    or retry delay. Claims and pending counts are served by the (status,
+    priority, available_at, seq) index. The per-status and per-(type,
+    status) summary counts scan the covering claim and (task_type, status)
+    indexes rather than the table, so their cost grows with the rows kept.
+    Those are bounded: completed and failed rows older than
+    ``finished_ttl_s``, and dead letters older than ``dead_letter_ttl_s``,
+    are deleted at most once a minute as part of a claim (or by
+    ``purge_finished``).
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        db: DatabaseBackend | None = None,
+        max_retries: int = 3,
+        visibility_timeout_s: float | None = None,
+        clock: Callable[[], float] = time.time,
+        finished_ttl_s: float | None = None,
+        dead_letter_ttl_s: float | None = None,
+    ):
+        self._db = db if db is not None else open_storage(db_path)
+        migrate(self._db, "task_queue", TASK_MIGRATIONS)
+        self._max_retries = max_retries
+        self.visibility_timeout_s = (
+            visibility_timeout_s if visibility_timeout_s is not None
+            else int_env("DR_TASK_VISIBILITY_TIMEOUT_S", default=60, minimum=1)
+        )
+        self.finished_ttl_s = (
+            finished_ttl_s if finished_ttl_s is not None
+            else int_env("DR_TASK_FINISHED_TTL_S", default=3600, minimum=1)
+        )
+        self.dead_letter_ttl_s = (
+            dead_letter_ttl_s if dead_letter_ttl_s is not None
+            else int_env("DR_TASK_DEAD_LETTER_TTL_S", default=7 * 24 * 3600, minimum=1)
+        )
+        self._next_purge_ms = 0
+        self._clock = clock
+        # SKIP LOCKED lets concurrent PostgreSQL workers claim different rows.
+        lock = " FOR UPDATE SKIP LOCKED" if self._db.backend_type == BackendType.POSTGRES else ""
+        self._claim_sql = (
+            "UPDATE tasks SET status = 'running', available_at = ?, updated_at = ? "
+            "WHERE seq IN (SELECT seq FROM tasks WHERE status = 'pending' AND available_at <= ? "
+            f"ORDER BY priority, available_at, seq LIMIT ?{lock}) "
+            f"RETURNING seq, {_TASK_COLUMNS}"
+        )
+
+    def enqueue(
+        self,
+        task_type: TaskType,
+        payload: dict[str, Any],
+        priority: int | None = None,
+        not_before: float | None = None,
+        dedup_key: str | None = None,
+    ) -> Task:
+        """Add a task; ``not_before`` (epoch seconds) holds it until then.
+
+        With ``dedup_key``, an in-flight task holding the key is returned
+        instead.
+        """
+        if dedup_key is None:
+            return self.enqueue_many([(task_type, payload)], priority, not_before)[0]
+        now = self._now_ms()
+        available_at = now if not_before is None else max(now, int(not_before * 1000))
+        with self._db.write():
+            while True:
+                # The partial unique index turns a concurrent duplicate into
+                # a no-op insert; the holder is then read back.
+                rows = self._db.fetchall(
+                    f"{_INSERT_TASK_SQL} ON CONFLICT DO NOTHING RETURNING {_TASK_COLUMNS}",
+                    (
+                        f"task-{uuid.uuid4().hex[:12]}", task_type.value, json.dumps(payload),
+                        _priority(task_type, priority), dedup_key, available_at, now, now,
+                    ),
+                )
+                if not rows:
+                    rows = self._db.fetchall(
+                        f"SELECT {_TASK_COLUMNS} FROM tasks "
+                        "WHERE dedup_key = ? AND status IN ('pending', 'running')",
+                        (dedup_key,),
+                    )
+                if rows:
+                    return _row_to_task(rows[0])
+
+    def enqueue_many(
+        self,
+        items: Iterable[tuple[TaskType, dict[str, Any]]],
+        priority: int | None = None,
+        not_before: float | None = None,
+    ) -> list[Task]:
+        """Enqueue several tasks in one transaction, in order."""
+        now = self._now_ms()
+        available_at = now if not_before is None else max(now, int(not_before * 1000))
+        tasks = [
+            Task(
+                task_id=f"task-{uuid.uuid4().hex[:12]}",
+                task_type=task_type,
+                payload=payload,
+                status=TaskStatus.PENDING,
+                priority=_priority(task_type, priority),
+            )
+            for task_type, payload in items
+        ]
+        with self._db.write():
+            self._db.executemany(
+                _INSERT_TASK_SQL,
+                [
+                    (
+                        t.task_id, t.task_type.value, json.dumps(t.payload),
+                        t.priority, None, available_at, now, now,
+                    )
+                    for t in tasks
+                ],
+            )
+        return tasks
+
+    def dequeue(self) -> Task | None:
+        tasks = self.dequeue_batch(1)
+        return tasks[0] if tasks else None
+
+    def dequeue_batch(self, max_tasks: int) -> list[Task]:
+        """Claim up to ``max_tasks`` tasks, by priority then oldest first."""
+        if max_tasks <= 0:
+            return []
+        now = self._now_ms()
+        lease_until = now + int(self.visibility_timeout_s * 1000)
+        with self._db.write():
+            if now >= self._next_purge_ms:
+                self._purge_finished(now)
+            self._requeue_expired(now)
+            rows = self._db.fetchall(self._claim_sql, (lease_until, now, now, max_tasks))
+        # RETURNING does not promise the subquery's order.
+        rows = sorted(rows, key=lambda r: (r["priority"], r["seq"]))
+        return [_row_to_task(r) for r in rows]
+
+    def extend_lease(self, task_id: str, seconds: float | None = None) -> Task:
+        """Push a running task's lease ``seconds`` (default: the timeout) out."""
+        extra = self.visibility_timeout_s if seconds is None else seconds
+        now = self._now_ms()
+        return self._update(
+            task_id,
+            "available_at = ?, updated_at = ?",
+            (now + int(extra * 1000), now),
+            status=TaskStatus.RUNNING,
+        )
+
+    def complete(
+        self, task_id: str, result: dict[str, Any] | None = None
+    ) -> Task:
+        return self._update(
+            task_id,
+            "status = 'completed', result = ?, updated_at = ?",
+            (json.dumps(result) if result is not None else None, self._now_ms()),
+        )
+
+    def complete_many(self, results: Mapping[str, dict[str, Any] | None]) -> None:
+        """Complete several tasks in one transaction; unknown ids are ignored."""
+        now = self._now_ms()
+        with self._db.write():
+            self._db.executemany(
+                "UPDATE tasks SET status = 'completed', result = ?, updated_at = ? "
+                "WHERE task_id = ?",
+                [
+                    (json.dumps(result) if result is not None else None, now, task_id)
+                    for task_id, result in results.items()
+                ],
+            )
+
+    def fail(self, task_id: str, error: str) -> Task:
+        return self._update(
+            task_id,
+            "status = 'failed', error = ?, updated_at = ?",
+            (error, self._now_ms()),
+        )
+
+    def retry(self, task_id: str, delay_s: float = 0.0) -> Task:
+        """Requeue a task, claimable no sooner than ``delay_s`` from now.
+
+        Past ``max_retries`` the task is dead-lettered and ValueError raised.
+        """
+        now = self._now_ms()
+        with self._db.write():
+            task = self._require(task_id)
+            if task.retry_count < self._max_retries:
+                return self._update(
+                    task_id,
+                    "status = 'pending', error = NULL, retry_count = retry_count + 1, "
+                    f"available_at = ?, updated_at = ?, {_KEEP_FREE_DEDUP_KEY}",
+                    (now + int(delay_s * 1000), now),
+                )
+            self._update(task_id, "status = 'dead_letter', updated_at = ?", (now,))
+        raise ValueError(
+            f"max retries ({self._max_retries}) exceeded for task {task_id}; "
+            "moved to dead letter"
+        )
+
+    def dead_letters(self, limit: int = 100) -> list[Task]:
+        """Dead-lettered tasks, most recent first."""
+        rows = self._db.fetchall(
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE status = 'dead_letter' "
+            "ORDER BY updated_at DESC, seq DESC LIMIT ?",
+            (max(0, limit),),
+        )
+        return [_row_to_task(r) for r in rows]
+
+    def requeue_dead_letter(self, task_id: str) -> Task:
+        """Give a dead-lettered task a fresh set of retries."""
+        now = self._now_ms()
+        return self._update(
+            task_id,
+            f"status = 'pending', retry_count = 0, available_at = ?, updated_at = ?, "
+            f"{_KEEP_FREE_DEDUP_KEY}",
+            (now, now),
+            status=TaskStatus.DEAD_LETTER,
+        )
+
     def get(self, task_id: str) -> Task | None:
-        return self._tasks.get(task_id)
+        row = self._db.fetchone(
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)
+        )
+        return _row_to_task(row) if row is not None else None
 
     def pending_count(self) -> int:
-        return sum(
-            1 for t in self._tasks.values() if t.status == TaskStatus.PENDING
+        row = self._db.fetchone(
+            "SELECT COUNT(*) AS n FROM tasks WHERE status = 'pending'"
+        )
+        return int(row["n"]) if row else 0
+
+    def counts(self) -> dict[str, int]:
+        """Tasks per status, every status present."""
+        rows = self._db.fetchall(
+            "SELECT status, COUNT(*) AS n FROM tasks GROUP BY status"
         )
+        counts = {status.value: 0 for status in TaskStatus}
+        counts.update({r["status"]: int(r["n"]) for r in rows})
+        return counts
+
+    def counts_by_type(self) -> dict[str, dict[str, int]]:
+        """Tasks per type and status, every type and status present."""
+        rows = self._db.fetchall(
+            "SELECT task_type, status, COUNT(*) AS n FROM tasks GROUP BY task_type, status"
+        )
+        counts = {t.value: {s.value: 0 for s in TaskStatus} for t in TaskType}
+        for r in rows:
+            counts.setdefault(r["task_type"], {s.value: 0 for s in TaskStatus})[r["status"]] = int(r["n"])
+        return counts
+
+    def purge_finished(self) -> int:
+        """Delete finished tasks and dead letters past their TTL; return how many."""
+        with self._db.write():
+            return self._purge_finished(self._now_ms())
 
     def list_by_type(self, task_type: TaskType) -> list[Task]:
-        return [
-            t for t in self._tasks.values() if t.task_type == task_type
-        ]
+        rows = self._db.fetchall(
+            f"SELECT {_TASK_COLUMNS} FROM tasks WHERE task_type = ? ORDER BY seq",
+            (task_type.value,),
+        )
+        return [_row_to_task(r) for r in rows]
+
+    def _purge_finished(self, now: int) -> int:
+        self._next_purge_ms = now + _PURGE_INTERVAL_MS
+        rows = self._db.fetchall(
+            "DELETE FROM tasks WHERE (status IN ('completed', 'failed') AND updated_at <= ?) "
+            "OR (status = 'dead_letter' AND updated_at <= ?) RETURNING seq",
+            (
+                now - int(self.finished_ttl_s * 1000),
+                now - int(self.dead_letter_ttl_s * 1000),
+            ),
+        )
+        return len(rows)
+
+    def _requeue_expired(self, now: int) -> None:
+        self._db.execute(
+            "UPDATE tasks SET status = 'dead_letter', error = ?, updated_at = ? "
+            "WHERE status = 'running' AND available_at <= ? AND retry_count >= ?",
+            ("lease expired", now, now, self._max_retries),
+        )
+        self._db.execute(
+            "UPDATE tasks SET status = 'pending', retry_count = retry_count + 1, "
+            "updated_at = ? WHERE status = 'running' AND available_at <= ?",
+            (now, now),
+        )
+
+    def _update(
+        self,
+        task_id: str,
+        assignments: str,
+        params: tuple[Any, ...],
+        status: TaskStatus | None = None,
+    ) -> Task:
+        where, where_params = "task_id = ?", (task_id,)
+        if status is not None:
+            where, where_params = "task_id = ? AND status = ?", (task_id, status.value)
+        with self._db.write():
+            # fetchall steps RETURNING to completion before the commit.
+            rows = self._db.fetchall(
+                f"UPDATE tasks SET {assignments} WHERE {where} RETURNING {_TASK_COLUMNS}",
+                (*params, *where_params),
+            )
+        row = rows[0] if rows else None
+        if row is None:
+            if status is not None and self.get(task_id) is not None:
+                raise ValueError(f"task {task_id} is not {status.value}")
+            raise ValueError(f"task not found: {task_id}")
+        return _row_to_task(row)
 
     def _require(self, task_id: str) -> Task:
-        task = self._tasks.get(task_id)
+        task = self.get(task_id)
         if task is None:
             raise ValueError(f"task not found: {task_id}")
         return task
+
+    def _now_ms(self) -> int:
+        return int(self._clock() * 1000)
+
+
+def create_task_queue(db: DatabaseBackend | None = None) -> TaskQueue:
+    """The queue selected by ``DR_TASK_QUEUE``, on ``db`` when durable."""
+    kind = os.getenv("DR_TASK_QUEUE", "durable").strip().lower()
+    if kind == "memory":
+        return InMemoryTaskQueue()
+    return DurableTaskQueue(db=db)
+
+
+def _row_to_task(row: Any) -> Task:
+    return Task(
+        task_id=row["task_id"],
+        task_type=TaskType(row["task_type"]),
+        payload=json.loads(row["payload"]),
+        status=TaskStatus(row["status"]),
+        result=json.loads(row["result"]) if row["result"] is not None else None,
+        error=row["error"],
+        retry_count=int(row["retry_count"]),
+        priority=int(row["priority"]),
+        dedup_key=row["dedup_key"],
+    )
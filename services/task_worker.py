@@ -0,0 +1,428 @@
+"""Asyncio runtime that executes queued tasks.
+
+``TaskWorker`` claims batches from a ``TaskQueue`` and runs the handler
+registered for each ``TaskType``, at most ``concurrency`` at a time. A
+handler that returns completes its task, with the returned dict as the
+result. One that raises fails the task and, unless the error is permanent,
+retries it after a jittered exponential backoff (``backoff_base_s *
+2**retries``, capped at ``backoff_max_s``, with up to ``jitter`` of it
+taken off at random so failures from one outage do not retry in lockstep)
+until the queue's ``max_retries`` is used up and it is dead-lettered.
+While a handler runs on a queue with leases (``DurableTaskQueue``) the
+lease is extended every half visibility timeout.
+
+A type can have a batch handler instead: tasks of that type claimed
+together (up to ``max_batch``) run as one execution taking one
+concurrency slot, and the handler returns an outcome per task id (a
+result, or an exception to fail that task with). Claiming keeps going
+while the queue returns full claims, so a burst is coalesced into as few
+executions as ``max_batch`` allows.
+
+Blocking queue calls go through ``run_blocking``; the API passes its db
+dispatch lane. ``service_handlers`` maps each task type to the service
+calls the matching endpoint makes. ``create_app`` starts a worker in its
+lifespan; ``python -m services.worker`` runs one as a separate process.
+
+Env vars:
+  DR_TASK_WORKER_CONCURRENCY — handlers running at once (default: 8)
+  DR_TASK_POLL_SECONDS       — wait after an empty claim (default: 0.5)
+  DR_TASK_BACKOFF_BASE_S     — delay before the first retry (default: 1)
+  DR_TASK_BACKOFF_MAX_S      — retry delay cap (default: 300)
+  DR_TASK_BACKOFF_JITTER     — random share taken off a delay (default: 0.5)
+  DR_TASK_MAX_BATCH          — tasks per batch-handler execution (default: 100)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Mapping
+
+from services.env import float_env, int_env
+from services.submitter import ServiceError
+from services.task_queue import Task, TaskQueue, TaskType
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Task], Awaitable["dict[str, Any] | None"]]
+# Outcome per task id: a result dict (or None) completes, an exception
+# fails; ids left out complete without a result.
+BatchHandler = Callable[[list[Task]], Awaitable[Mapping[str, Any]]]
+RunBlocking = Callable[..., Awaitable[Any]]
+
+
+class PermanentTaskError(Exception):
+    """Raised by a handler for a failure that retrying cannot fix."""
+
+
+class TaskWorker:
+    """Runs queued tasks through per-``TaskType`` async handlers."""
+
+    def __init__(
+        self,
+        queue: TaskQueue,
+        handlers: Mapping[TaskType, Handler] | None = None,
+        batch_handlers: Mapping[TaskType, BatchHandler] | None = None,
+        concurrency: int | None = None,
+        poll_seconds: float | None = None,
+        backoff_base_s: float | None = None,
+        backoff_max_s: float | None = None,
+        jitter: float | None = None,
+        max_batch: int | None = None,
+        run_blocking: RunBlocking | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.queue = queue
+        self.handlers: dict[TaskType, Handler] = dict(handlers or {})
+        self.batch_handlers: dict[TaskType, BatchHandler] = dict(batch_handlers or {})
+        self.concurrency = (
+            concurrency if concurrency is not None
+            else int_env("DR_TASK_WORKER_CONCURRENCY", default=8, minimum=1)
+        )
+        self.poll_seconds = (
+            poll_seconds if poll_seconds is not None
+            else float_env("DR_TASK_POLL_SECONDS", default=0.5, minimum=0.01)
+        )
+        self.backoff_base_s = (
+            backoff_base_s if backoff_base_s is not None
+            else float_env("DR_TASK_BACKOFF_BASE_S", default=1.0, minimum=0.0)
+        )
+        self.backoff_max_s = (
+            backoff_max_s if backoff_max_s is not None
+            else float_env("DR_TASK_BACKOFF_MAX_S", default=300.0, minimum=0.0)
+        )
+        self.jitter = min(1.0, (
+            jitter if jitter is not None
+            else float_env("DR_TASK_BACKOFF_JITTER", default=0.5, minimum=0.0)
+        ))
+        self.max_batch = (
+            max_batch if max_batch is not None
+            else int_env("DR_TASK_MAX_BATCH", default=100, minimum=1)
+        )
+        self._rng = rng or random.Random()
+        # Claimed tasks of batch-handled types waiting to run together.
+        self._collected: dict[TaskType, list[Task]] = {}
+        self._run_blocking = run_blocking or asyncio.to_thread
+        self._running: set[asyncio.Task] = set()
+        self._wake: asyncio.Event | None = None
+        self._loop_task: asyncio.Task | None = None
+        self._stats = {"completed": 0, "failed": 0, "retried": 0, "batches": 0}
+
+    def register(self, task_type: TaskType, handler: Handler) -> None:
+        self.handlers[task_type] = handler
+
+    def register_batch(self, task_type: TaskType, handler: BatchHandler) -> None:
+        self.batch_handlers[task_type] = handler
+
+    def backoff(self, retry_count: int) -> float:
+        """Delay before the retry that follows ``retry_count`` earlier ones."""
+        delay = min(self.backoff_max_s, self.backoff_base_s * 2 ** retry_count)
+        return delay * (1.0 - self.jitter * self._rng.random())
+
+    def wake(self) -> None:
+        """Claim again now instead of at the end of the poll wait."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def health(self) -> dict[str, Any]:
+        return {
+            "running": self._loop_task is not None and not self._loop_task.done(),
+            "concurrency": self.concurrency,
+            "active": len(self._running),
+            **self._stats,
+        }
+
+    async def run_once(self) -> int:
+        """Claim tasks for the free slots, start them, return how many."""
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+        tasks = await self._run_blocking(self.queue.dequeue_batch, free)
+        for task in tasks:
+            if task.task_type not in self.batch_handlers:
+                self._spawn(self._execute(task))
+                continue
+            group = self._collected.setdefault(task.task_type, [])
+            group.append(task)
+            if len(group) >= self.max_batch:
+                self._spawn(self._execute_batch(self._collected.pop(task.task_type)))
+        if len(tasks) < free:
+            # Nothing more to coalesce right now.
+            self._flush_batches()
+        return len(tasks)
+
+    async def drain(self) -> None:
+        """Run until the queue has nothing claimable and every task is done."""
+        while await self.run_once() or self._running:
+            if self._running:
+                await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+
+    async def run(self) -> None:
+        """Claim and run tasks until cancelled."""
+        self._wake = asyncio.Event()
+        while True:
+            # Cleared before claiming, so a slot freed meanwhile is not missed.
+            self._wake.clear()
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("task claim failed")
+                claimed = 0
+            if claimed and len(self._running) < self.concurrency:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self.run())
+        return self._loop_task
+
+    async def stop(self) -> None:
+        """Stop claiming and wait for the handlers already running."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        self._flush_batches()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        running = asyncio.create_task(coro)
+        self._running.add(running)
+        running.add_done_callback(self._finished)
+
+    def _flush_batches(self) -> None:
+        collected, self._collected = self._collected, {}
+        for tasks in collected.values():
+            self._spawn(self._execute_batch(tasks))
+
+    def _finished(self, running: asyncio.Task) -> None:
+        self._running.discard(running)
+        # A slot is free: claim the next task without waiting for the poll.
+        self.wake()
+
+    async def _execute(self, task: Task) -> None:
+        try:
+            await self._run_handler(task)
+        except Exception:
+            # The queue call recording the outcome failed; on a leased queue
+            # the task is delivered again once its lease expires.
+            logger.exception("could not record outcome of task %s", task.task_id)
+
+    async def _execute_batch(self, tasks: list[Task]) -> None:
+        self._stats["batches"] += 1
+        heartbeats = [self._start_heartbeat(task) for task in tasks]
+        try:
+            outcomes = await self.batch_handlers[tasks[0].task_type](tasks)
+        except Exception as exc:
+            outcomes = {task.task_id: exc for task in tasks}
+        finally:
+            for heartbeat in heartbeats:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+        for task in tasks:
+            outcome = outcomes.get(task.task_id)
+            try:
+                if isinstance(outcome, Exception):
+                    await self._settle_failure(task, outcome)
+                else:
+                    await self._run_blocking(self.queue.complete, task.task_id, outcome)
+                    self._stats["completed"] += 1
+            except Exception:
+                logger.exception("could not record outcome of task %s", task.task_id)
+
+    async def _run_handler(self, task: Task) -> None:
+        handler = self.handlers.get(task.task_type)
+        if handler is None:
+            await self._settle_failure(
+                task, PermanentTaskError(f"no handler for task type {task.task_type.value}")
+            )
+            return
+        heartbeat = self._start_heartbeat(task)
+        try:
+            result = await handler(task)
+        except Exception as exc:
+            await self._settle_failure(task, exc)
+        else:
+            await self._run_blocking(self.queue.complete, task.task_id, result)
+            self._stats["completed"] += 1
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+    async def _settle_failure(self, task: Task, exc: Exception) -> None:
+        error = str(exc) or type(exc).__name__
+        await self._run_blocking(self.queue.fail, task.task_id, error)
+        if _is_permanent(exc):
+            self._stats["failed"] += 1
+            logger.warning("task %s failed permanently: %s", task.task_id, error)
+            return
+        try:
+            await self._run_blocking(
+                self.queue.retry, task.task_id, self.backoff(task.retry_count)
+            )
+        except ValueError:
+            self._stats["failed"] += 1
+            logger.warning(
+                "task %s dead-lettered after %d retries: %s", task.task_id, task.retry_count, error
+            )
+        else:
+            self._stats["retried"] += 1
+
+    def _start_heartbeat(self, task: Task) -> asyncio.Task | None:
+        extend = getattr(self.queue, "extend_lease", None)
+        timeout = getattr(self.queue, "visibility_timeout_s", None)
+        if extend is None or not timeout:
+            return None
+
+        async def beat() -> None:
+            while True:
+                await asyncio.sleep(timeout / 2)
+                try:
+                    await self._run_blocking(extend, task.task_id)
+                except ValueError:
+                    return
+
+        return asyncio.create_task(beat())
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, PermanentTaskError):
+        return True
+    # Client errors from the services (unknown ids, bad state) do not heal.
+    return isinstance(exc, ServiceError) and not exc.retryable and exc.status_code < 500
+
+
+def service_handlers(
+    submitter: Any,
+    bridge: Any,
+    icm: Any,
+    run_chain: RunBlocking | None = None,
+    run_db: RunBlocking | None = None,
+    confirm_timeout_s: float = 30.0,
+) -> dict[TaskType, Handler]:
+    """Handlers that make the same service calls as the matching endpoints.
+
+    Chain actions go through ``run_chain`` and database calls through
+    ``run_db`` (the API's dispatch lanes; threads by default).
+    """
+    chain = run_chain or asyncio.to_thread
+    db = run_db or asyncio.to_thread
+
+    async def confirm_tx(task: Task) -> dict[str, Any]:
+        tx_hash = _require_field(task, "tx_hash")
+        result = await submitter.tx_watcher.wait_async(tx_hash, timeout=confirm_timeout_s)
+        if result is None:
+            raise TimeoutError(f"tx {tx_hash} still pending")
+        await chain(submitter.reconcile_txs, task.payload.get("event_id"))
+        return {"tx_hash": tx_hash, **result}
+
+    async def bridge_relay(task: Task) -> dict[str, Any]:
+        transfer_id = _require_field(task, "transfer_id")
+        transfer = await db(bridge.get_transfer, transfer_id)
+        if transfer is None:
+            raise PermanentTaskError(f"bridge transfer not found: {transfer_id}")
+        if transfer.status not in {"source_confirmed", "dest_submitted"}:
+            return {"transfer_id": transfer_id, "status": transfer.status, "relayed": False}
+        tx_out = await chain(
+            bridge.receive_bridge_tokens,
+            transfer_id,
+            task.payload.get("source_nonce"),
+            task.payload.get("recipient"),
+            task.payload.get("amount_wei", transfer.amount_wei),
+            task.payload.get("source_chain_id"),
+        )
+        tx_hash = tx_out.get("tx_hash")
+        if not tx_hash:
+            raise RuntimeError("bridge receive_tokens missing tx_hash")
+        updated = await db(bridge.mark_dest_submitted, transfer_id, str(tx_hash))
+        return {"transfer_id": transfer_id, "status": updated.status, "tx_hash": str(tx_hash)}
+
+    async def icm_deliver(task: Task) -> dict[str, Any]:
+        message_id = _require_field(task, "message_id")
+        message = await db(icm.get_message, message_id)
+        if message is None:
+            raise PermanentTaskError(f"ICM message not found: {message_id}")
+        if message.status.value in {"failed", "processed"}:
+            return {"message_id": message_id, "status": message.status.value, "relayed": False}
+        tx_out = await chain(icm.relay_message, message)
+        tx_hash = tx_out.get("tx_hash")
+        if not tx_hash:
+            raise RuntimeError("icm relay missing tx_hash")
+        updated = await db(icm.mark_delivered, message_id, str(tx_hash))
+        return {"message_id": message_id, "status": updated.status.value, "tx_hash": str(tx_hash)}
+
+    async def settle_event(task: Task) -> dict[str, Any]:
+        event_id = _require_field(task, "event_id")
+        settlements = await chain(
+            submitter.settle_event, event_id, list(task.payload.get("site_ids") or [])
+        )
+        return {"event_id": event_id, "settlements": len(settlements)}
+
+    return {
+        TaskType.CONFIRM_TX: confirm_tx,
+        TaskType.BRIDGE_RELAY: bridge_relay,
+        TaskType.ICM_DELIVER: icm_deliver,
+        TaskType.SETTLE_EVENT: settle_event,
+    }
+
+
+def service_batch_handlers(
+    submitter: Any,
+    run_chain: RunBlocking | None = None,
+    confirm_timeout_s: float = 30.0,
+) -> dict[TaskType, BatchHandler]:
+    """Batch handlers coalescing ``confirm_tx`` tasks.
+
+    One execution waits on all of its hashes through the submitter's
+    ``TxWatcher``, which resolves every watched hash with one batched
+    ``check_txs`` lookup per poll, then reconciles once for all of them,
+    instead of one watcher slot and one reconcile per task.
+    """
+    chain = run_chain or asyncio.to_thread
+
+    async def confirm_txs(tasks: list[Task]) -> dict[str, Any]:
+        outcomes: dict[str, Any] = {}
+        by_hash: dict[str, list[Task]] = {}
+        for task in tasks:
+            try:
+                by_hash.setdefault(_require_field(task, "tx_hash"), []).append(task)
+            except PermanentTaskError as exc:
+                outcomes[task.task_id] = exc
+        hashes = list(by_hash)
+        results = await asyncio.gather(
+            *(submitter.tx_watcher.wait_async(h, timeout=confirm_timeout_s) for h in hashes),
+            return_exceptions=True,
+        )
+        resolved = []
+        for tx_hash, result in zip(hashes, results):
+            if result is None:
+                result = TimeoutError(f"tx {tx_hash} still pending")
+            else:
+                resolved.extend(by_hash[tx_hash])
+            for task in by_hash[tx_hash]:
+                outcomes[task.task_id] = (
+                    result if isinstance(result, Exception) else {"tx_hash": tx_hash, **result}
+                )
+        event_ids = {task.payload.get("event_id") for task in resolved}
+        # One unscoped pass covers every event; otherwise reconcile each.
+        for event_id in [None] if None in event_ids else sorted(event_ids):
+            await chain(submitter.reconcile_txs, event_id)
+        return outcomes
+
+    return {TaskType.CONFIRM_TX: confirm_txs}
+
+
+def _require_field(task: Task, name: str) -> Any:
+    value = task.payload.get(name)
+    if not value:
+        raise PermanentTaskError(f"{task.task_type.value} task needs payload.{name}")
+    return value
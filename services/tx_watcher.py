@@ -0,0 +1,160 @@
+"""Background confirmation watcher for submitted chain transactions.
+
+``TxWatcher`` owns the set of tx hashes that request handlers are waiting
+on. A single daemon thread resolves all of them with one batched lookup
+per poll interval and publishes the first non-pending state through a
+per-hash ``Future``. Request handlers await ``wait_async(tx_hash, timeout)``
+(or block on ``wait`` from worker threads) instead of sleeping and
+re-querying SQLite, so the event loop stays free and concurrent requests
+waiting on the same transaction share one lookup and wake as soon as it
+settles.
+
+The watcher never touches the database; callers persist the published
+result on their own connection.
+
+Env vars:
+  DR_TX_WATCH_POLL_SECONDS — interval between batched lookups (default: 0.8)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable
+
+TxResult = dict[str, str | None]
+CheckTxs = Callable[[list[str]], dict[str, TxResult]]
+
+
+class TxWatcher:
+    """Resolves pending tx hashes in the background and publishes results."""
+
+    def __init__(self, check_txs: CheckTxs, poll_seconds: float = 0.8):
+        self._check_txs = check_txs
+        self.poll_seconds = poll_seconds
+        self._futures: dict[str, Future[TxResult]] = {}
+        self._waiters: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> list[str]:
+        with self._lock:
+            return list(self._futures)
+
+    def watch(self, tx_hash: str) -> Future[TxResult]:
+        """Return the shared future for ``tx_hash``, starting to track it."""
+        return self._track(tx_hash, waiter=False)
+
+    def wait(self, tx_hash: str, timeout: float) -> TxResult | None:
+        """Block until ``tx_hash`` leaves the submitted state.
+
+        Returns the published tx result, or ``None`` on timeout. Errors
+        raised by the lookup are re-raised to every waiter.
+        """
+        future = self._track(tx_hash, waiter=True)
+        try:
+            return future.result(timeout=max(0.0, timeout))
+        except FutureTimeoutError:
+            return None
+        finally:
+            self._release(tx_hash, future)
+
+    async def wait_async(self, tx_hash: str, timeout: float) -> TxResult | None:
+        """Awaitable ``wait`` for use from request handlers on the event loop."""
+        future = self._track(tx_hash, waiter=True)
+        try:
+            # Shield so a timeout does not cancel the future other waiters share.
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout=max(0.0, timeout)
+            )
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._release(tx_hash, future)
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+
+    def _track(self, tx_hash: str, waiter: bool) -> Future[TxResult]:
+        with self._lock:
+            future = self._futures.get(tx_hash)
+            if future is None:
+                future = Future()
+                self._futures[tx_hash] = future
+            if waiter:
+                self._waiters[tx_hash] = self._waiters.get(tx_hash, 0) + 1
+            self._ensure_thread()
+        self._wake.set()
+        return future
+
+    def _release(self, tx_hash: str, future: Future[TxResult]) -> None:
+        with self._lock:
+            remaining = self._waiters.get(tx_hash, 1) - 1
+            if remaining > 0:
+                self._waiters[tx_hash] = remaining
+                return
+            # Nobody is waiting any more; stop polling this hash.
+            self._waiters.pop(tx_hash, None)
+            if self._futures.get(tx_hash) is future:
+                del self._futures[tx_hash]
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tx-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(timeout=self.poll_seconds)
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            with self._lock:
+                tx_hashes = list(self._futures)
+            if tx_hashes:
+                self._poll(tx_hashes)
+                # Throttle so a burst of new watches still costs one
+                # lookup per interval.
+                self._stopped.wait(timeout=self.poll_seconds)
+
+    def _poll(self, tx_hashes: list[str]) -> None:
+        try:
+            results = self._check_txs(tx_hashes)
+        except Exception as exc:
+            with self._lock:
+                failed = [self._futures.pop(h) for h in tx_hashes if h in self._futures]
+            for future in failed:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        resolved: list[tuple[Future[TxResult], TxResult]] = []
+        with self._lock:
+            for tx_hash in tx_hashes:
+                result = results.get(tx_hash)
+                if result is None or result.get("tx_state") == "submitted":
+                    continue
+                future = self._futures.pop(tx_hash, None)
+                if future is not None:
+                    resolved.append((future, result))
+        for future, result in resolved:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,63 @@
+"""Standalone task worker: ``python -m services.worker``.
+
+Runs the ``TaskWorker`` that ``create_app`` otherwise starts in its
+lifespan, against the durable task queue in the configured database. Use
+it with ``DR_TASK_WORKER=off`` on the API processes so tasks run apart
+from request handling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from services.bridge import BridgeService
+from services.db import open_storage
+from services.dispatch import Dispatcher
+from services.icm import ICMService
+from services.submitter import SubmitterService
+from services.task_queue import DurableTaskQueue
+from services.task_worker import TaskWorker, service_batch_handlers, service_handlers
+
+logger = logging.getLogger(__name__)
+
+
+def build_worker(db_path: str | None = None) -> tuple[TaskWorker, Dispatcher]:
+    db = open_storage(db_path)
+    dispatch = Dispatcher()
+    submitter = SubmitterService(db=db)
+    worker = TaskWorker(
+        DurableTaskQueue(db=db),
+        service_handlers(
+            submitter,
+            BridgeService(db=db),
+            ICMService(db=db),
+            run_chain=dispatch.chain,
+            run_db=dispatch.db,
+        ),
+        batch_handlers=service_batch_handlers(submitter, run_chain=dispatch.chain),
+        run_blocking=dispatch.db,
+    )
+    return worker, dispatch
+
+
+async def run_worker(db_path: str | None = None) -> None:
+    worker, dispatch = build_worker(db_path)
+    logger.info("task worker started (concurrency %d)", worker.concurrency)
+    try:
+        await worker.start()
+    finally:
+        await worker.stop()
+        dispatch.shutdown()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(run_worker())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -264,7 +264,7 @@ def test_submit_proof_waits_for_create_confirmation_in_hybrid_live_mode(
     monkeypatch.setenv("DR_CHAIN_MODE", "fuji-live")
     monkeypatch.setenv("DR_TX_CONFIRM_MODE", "hybrid")
     monkeypatch.setenv("DR_PROOF_CREATE_WAIT_SECONDS", "1")
-    monkeypatch.setenv("DR_PROOF_CREATE_POLL_SECONDS", "0.2")
+    monkeypatch.setenv("DR_TX_WATCH_POLL_SECONDS", "0.2")
 
     tx_action_log: list[str] = []
 
@@ -283,16 +283,19 @@ def test_submit_proof_waits_for_create_confirmation_in_hybrid_live_mode(
             raise AssertionError("submit_proof should not be called while create tx is pending")
         raise AssertionError(f"unexpected chain tx action: {action}")
 
-    def fake_check_tx(self, tx_hash: str):
+    def fake_check_txs(self, tx_hashes: list[str]):
         return {
-            "tx_state": "submitted",
-            "tx_fee_wei": None,
-            "tx_confirmed_at": None,
-            "tx_error": None,
+            tx_hash: {
+                "tx_state": "submitted",
+                "tx_fee_wei": None,
+                "tx_confirmed_at": None,
+                "tx_error": None,
+            }
+            for tx_hash in tx_hashes
         }
 
     monkeypatch.setattr(SubmitterService, "_chain_tx", fake_chain_tx)
-    monkeypatch.setattr(SubmitterService, "_check_tx", fake_check_tx)
+    monkeypatch.setattr(SubmitterService, "_check_txs", fake_check_txs)
 
     svc = SubmitterService(db_path=str(tmp_path / "dr_agent_pending_create.db"))
 
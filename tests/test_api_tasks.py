@@ -54,3 +54,75 @@ class TestTaskAPI:
         assert resp.status_code == 200
         data = resp.json()
         assert data["pending_count"] >= 2
+        assert data["counts"]["pending"] == data["pending_count"]
+        assert data["by_type"]["bridge_relay"]["pending"] == 1
+        assert data["by_type"]["icm_deliver"]["pending"] == 1
+
+    def test_schedule_and_priority_fields(self, client):
+        resp = client.post(
+            "/v1/tasks",
+            json={
+                "task_type": "confirm_tx",
+                "payload": {"tx_hash": "0x1"},
+                "priority": 0,
+                "not_before": "2999-01-01T00:00:00Z",
+            },
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 200
+        assert resp.json()["priority"] == 0
+        assert client.app.state.task_queue.dequeue() is None
+
+    def test_invalid_schedule_fields(self, client):
+        bad_time = client.post(
+            "/v1/tasks",
+            json={"task_type": "confirm_tx", "not_before": "soon"},
+            headers=OP_HEADERS,
+        )
+        assert bad_time.status_code == 422
+        bad_priority = client.post(
+            "/v1/tasks",
+            json={"task_type": "confirm_tx", "priority": "high"},
+            headers=OP_HEADERS,
+        )
+        assert bad_priority.status_code == 422
+
+    def test_dead_letter_list_and_requeue(self, client):
+        task_id = client.post(
+            "/v1/tasks",
+            json={"task_type": "icm_deliver", "payload": {"message_id": "m1"}},
+            headers=OP_HEADERS,
+        ).json()["task_id"]
+        queue = client.app.state.task_queue
+        with pytest.raises(ValueError, match="dead letter"):
+            while True:
+                queue.dequeue()
+                queue.fail(task_id, error="relay reverted")
+                queue.retry(task_id)
+
+        resp = client.get("/v1/tasks/dead-letter", headers=OP_HEADERS)
+        assert resp.status_code == 200
+        assert [t["task_id"] for t in resp.json()["tasks"]] == [task_id]
+
+        requeued = client.post(f"/v1/tasks/{task_id}/requeue", headers=OP_HEADERS)
+        assert requeued.status_code == 200
+        assert requeued.json()["status"] == "pending"
+        again = client.post(f"/v1/tasks/{task_id}/requeue", headers=OP_HEADERS)
+        assert again.status_code == 409
+        missing = client.post("/v1/tasks/task-missing/requeue", headers=OP_HEADERS)
+        assert missing.status_code == 404
+        assert client.get("/v1/tasks/dead-letter", headers=OP_HEADERS).json()["count"] == 0
+
+    def test_dedup_key_returns_existing_task(self, client):
+        body = {
+            "task_type": "confirm_tx",
+            "payload": {"tx_hash": "0x1"},
+            "dedup_key": "confirm:0x1",
+        }
+        first = client.post("/v1/tasks", json=body, headers=OP_HEADERS).json()
+        second = client.post("/v1/tasks", json=body, headers=OP_HEADERS).json()
+        assert second["task_id"] == first["task_id"]
+        assert first["dedup_key"] == "confirm:0x1"
+        assert client.get("/v1/tasks/summary", headers=OP_HEADERS).json()["pending_count"] == 1
+        blank = client.post("/v1/tasks", json={**body, "dedup_key": " "}, headers=OP_HEADERS)
+        assert blank.status_code == 422
@@ -0,0 +1,103 @@
+"""Tests for the Parquet / Arrow IPC meter data adapter (needs pyarrow)."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+feather = pytest.importorskip("pyarrow.feather")
+
+from services.baseline_engine import BaselineEngine
+from services.data_adapters import ArrowAdapter, DataAdapterRegistry
+
+
+def _table(days: int = 14) -> "pa.Table":
+    timestamps = pd.date_range("2026-03-01", periods=24 * days, freq="h", tz="UTC")
+    frames = []
+    for i, site_id in enumerate(("site-a", "site-b")):
+        frames.append(pd.DataFrame({
+            "site_id": site_id,
+            "timestamp": timestamps,
+            "kw": 100.0 * (i + 1) + np.arange(len(timestamps)) % 24,
+        }))
+    return pa.Table.from_pandas(pd.concat(frames, ignore_index=True), preserve_index=False)
+
+
+@pytest.fixture(params=["parquet", "ipc"])
+def meter_file(request, tmp_path: Path) -> tuple[str, str]:
+    table = _table()
+    if request.param == "parquet":
+        path = tmp_path / "meter.parquet"
+        pq.write_table(table, path, row_group_size=24)
+    else:
+        path = tmp_path / "meter.arrow"
+        feather.write_feather(table, path)
+    return request.param, str(path)
+
+
+def test_site_filter(meter_file):
+    fmt, path = meter_file
+    df = ArrowAdapter(fmt).load_dataframe(path, site_id="site-b")
+    assert len(df) == 24 * 14
+    assert df["kw"].min() == 200.0
+    assert list(df.columns) == ["timestamp", "kw"]
+
+
+def test_time_range_filter(meter_file):
+    fmt, path = meter_file
+    df = ArrowAdapter(fmt).load_dataframe(
+        path, site_id="site-a", start="2026-03-10", end="2026-03-11"
+    )
+    assert len(df) == 24
+    assert df["timestamp"].min() == pd.Timestamp("2026-03-10", tz="UTC")
+    assert df["timestamp"].max() == pd.Timestamp("2026-03-10 23:00", tz="UTC")
+
+
+def test_chunks_cover_filtered_rows(meter_file):
+    fmt, path = meter_file
+    adapter = ArrowAdapter(fmt)
+    chunks = list(adapter.iter_chunks(path, site_id="site-a", chunk_rows=50))
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == 24 * 14
+
+
+def test_history_feeds_baseline_engine(meter_file):
+    fmt, path = meter_file
+    adapter = ArrowAdapter(fmt)
+    engine = BaselineEngine()
+
+    index = adapter.load_history(path, site_id="site-a")
+    frame = adapter.load_dataframe(path, site_id="site-a")
+
+    assert [r.to_dict() for r in engine.compute_all(index, 14)] == [
+        r.to_dict() for r in engine.compute_all(frame, 14)
+    ]
+
+
+def test_load_returns_meter_readings(meter_file):
+    fmt, path = meter_file
+    readings = ArrowAdapter(fmt).load(path, site_id="site-b")
+    assert len(readings) == 24 * 14
+    assert readings[0].site_id == "site-b"
+    assert pd.Timestamp(readings[0].timestamp) == pd.Timestamp("2026-03-01", tz="UTC")
+
+
+def test_default_registry_reads_parquet(tmp_path: Path):
+    path = tmp_path / "meter.parquet"
+    pq.write_table(_table(days=1), path)
+    df = DataAdapterRegistry.default().get("parquet").load_dataframe(str(path), "site-a")
+    assert len(df) == 24
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
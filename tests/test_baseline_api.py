@@ -1,9 +1,11 @@
 """TDD RED — Baseline comparison API tests."""
 
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 
 from services.api import create_app
+from services.baseline_engine import BaselineEngine
 
 OP_HEADERS = {"x-api-key": "operator-key", "x-actor-id": "operator"}
 PART_HEADERS = {"x-api-key": "participant-key", "x-actor-id": "site-a"}
@@ -102,6 +104,211 @@ class TestBaselineCompare:
         assert resp.status_code == 200
 
 
+class TestBaselineBatch:
+    def _columns(self):
+        columns = {"site_id": [], "timestamp": [], "kw": []}
+        for site_id, base_kw in (("site-a", 100), ("site-b", 40)):
+            for row in _make_history(days=7, hour=14, base_kw=base_kw):
+                columns["site_id"].append(site_id)
+                columns["timestamp"].append(row["timestamp"])
+                columns["kw"].append(row["kw"])
+        return columns
+
+    def test_batch_matches_compare_per_site(self, client):
+        columns = self._columns()
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={**columns, "event_hour": 14},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 200
+        sites = resp.json()["sites"]
+        assert [s["site_id"] for s in sites] == ["site-a", "site-b"]
+        for site in sites:
+            history = [
+                {"timestamp": ts, "kw": kw}
+                for sid, ts, kw in zip(columns["site_id"], columns["timestamp"], columns["kw"])
+                if sid == site["site_id"]
+            ]
+            single = client.post(
+                "/v1/baseline/compare",
+                json={"history": history, "event_hour": 14},
+                headers=OP_HEADERS,
+            ).json()
+            assert site["recommended"]["method"] == single["recommended"]["method"]
+            for got, want in zip(site["results"], single["results"]):
+                assert got["method"] == want["method"]
+                assert got["baseline_kwh"] == pytest.approx(want["baseline_kwh"])
+
+    def test_batch_length_mismatch(self, client):
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={"site_id": ["site-a"], "timestamp": [], "kw": [1.0], "event_hour": 14},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+
+    def test_batch_invalid_timestamp_names_site(self, client):
+        columns = self._columns()
+        bad = columns["site_id"].index("site-b") + 3
+        columns["timestamp"][bad] = "not-a-time"
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={**columns, "event_hour": 14},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+        body = resp.json()
+        assert body["code"] == "INVALID_TIMESTAMP"
+        assert body["details"] == {"site_id": "site-b"}
+
+    def test_batch_mixed_offsets(self, client):
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={
+                "site_id": ["site-a", "site-a"],
+                "timestamp": ["2026-03-05T14:00:00Z", "2026-03-05T15:00:00+02:00"],
+                "kw": [1.0, 2.0],
+                "event_hour": 14,
+            },
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+        assert resp.json()["code"] == "INVALID_TIMESTAMP"
+
+    def test_batch_mixed_offsets_names_site(self, client):
+        columns = self._columns()
+        bad = columns["site_id"].index("site-b") + 5
+        columns["timestamp"][bad] += "+02:00"
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={**columns, "event_hour": 14},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+        assert resp.json()["details"] == {"site_id": "site-b"}
+
+    def test_batch_engine_errors_are_not_offset_errors(self, client, monkeypatch):
+        def broken(*args, **kwargs):
+            raise ValueError("engine bug")
+
+        monkeypatch.setattr(BaselineEngine, "compute_many", broken)
+        with pytest.raises(ValueError, match="engine bug"):
+            client.post(
+                "/v1/baseline/batch",
+                json={**self._columns(), "event_hour": 14},
+                headers=OP_HEADERS,
+            )
+
+    def test_batch_empty(self, client):
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={"site_id": [], "timestamp": [], "kw": [], "event_hour": 14},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+
+    def test_batch_requires_auth(self, client):
+        resp = client.post(
+            "/v1/baseline/batch",
+            json={"site_id": [], "timestamp": [], "kw": [], "event_hour": 14},
+        )
+        assert resp.status_code == 401
+
+
+class TestMeterBaseline:
+    def _store(self, client, days=14):
+        history = _make_history(days=days, hour=14, base_kw=100)
+        client.app.state.meter_store.ingest(
+            "site-a", [r["timestamp"] for r in history], [r["kw"] for r in history]
+        )
+        return history
+
+    def test_matches_compare_on_same_window(self, client):
+        history = self._store(client)
+        resp = client.get(
+            "/v1/meters/site-a/baseline",
+            params={"event_hour": 14, "days": 7},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 200
+        single = client.post(
+            "/v1/baseline/compare",
+            json={"history": history[-24 * 7:], "event_hour": 14},
+            headers=OP_HEADERS,
+        ).json()
+        for got, want in zip(resp.json()["results"], single["results"]):
+            assert got["method"] == want["method"]
+            assert got["baseline_kwh"] == pytest.approx(want["baseline_kwh"])
+
+    def test_explicit_window_end(self, client):
+        self._store(client)
+        resp = client.get(
+            "/v1/meters/site-a/baseline",
+            params={"event_hour": 14, "days": 1, "end": "2026-03-02T00:00:00"},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 200
+        simple = resp.json()["results"][0]
+        assert simple["baseline_kwh"] == pytest.approx(110.0)
+
+    def test_unknown_site_is_404(self, client):
+        resp = client.get(
+            "/v1/meters/site-x/baseline", params={"event_hour": 14}, headers=OP_HEADERS
+        )
+        assert resp.status_code == 404
+        assert resp.json()["code"] == "METER_READINGS_NOT_FOUND"
+
+    def test_local_offset_history_matches_compare(self, client):
+        # 14 days of -07:00 readings peaking at local hour 18 (01:00 UTC).
+        timestamps = pd.date_range(
+            "2026-03-01T00:00:00-07:00", periods=24 * 14, freq="h"
+        )
+        kw = [100.0 if ts.hour == 18 else 1.0 for ts in timestamps]
+        history = [
+            {"timestamp": ts.isoformat(), "kw": v} for ts, v in zip(timestamps, kw)
+        ]
+        client.app.state.meter_store.ingest(
+            "site-a", [r["timestamp"] for r in history], kw
+        )
+        inline = client.post(
+            "/v1/baseline/compare",
+            json={"history": history, "event_hour": 18},
+            headers=OP_HEADERS,
+        ).json()
+        stored = client.get(
+            "/v1/meters/site-a/baseline",
+            params={"event_hour": 18, "days": 14, "tz": "-07:00"},
+            headers=OP_HEADERS,
+        )
+        assert stored.status_code == 200
+        assert inline["recommended"]["baseline_kwh"] == pytest.approx(100.0)
+        for got, want in zip(stored.json()["results"], inline["results"]):
+            assert got["method"] == want["method"]
+            assert got["baseline_kwh"] == pytest.approx(want["baseline_kwh"])
+
+    def test_invalid_tz_is_422(self, client):
+        self._store(client, days=1)
+        resp = client.get(
+            "/v1/meters/site-a/baseline",
+            params={"event_hour": 14, "tz": "Mars/Olympus"},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+        assert resp.json()["code"] == "INVALID_TIMEZONE"
+
+    @pytest.mark.parametrize("end", ["not-a-date", "", "NaT"])
+    def test_invalid_end_is_422(self, client, end):
+        self._store(client, days=1)
+        resp = client.get(
+            "/v1/meters/site-a/baseline",
+            params={"event_hour": 14, "end": end},
+            headers=OP_HEADERS,
+        )
+        assert resp.status_code == 422
+        assert resp.json()["code"] == "INVALID_TIMESTAMP"
+
+
 class TestDashboardSummary:
     def test_dashboard_summary_empty(self, client):
         resp = client.get("/v1/dashboard/summary", headers=OP_HEADERS)
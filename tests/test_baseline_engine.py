@@ -10,6 +10,7 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -20,6 +21,7 @@ if str(PROJECT_ROOT) not in sys.path:
 from services.baseline_engine import (
     BaselineEngine,
     BaselineResult,
+    HistoryIndex,
     compute_ewma_baseline,
     compute_percentile_baseline,
     compute_simple_baseline,
@@ -222,5 +224,132 @@ class TestBaselineEngine:
         assert result.method in {"simple", "ewma", "percentile"}
 
 
+# ---------------------------------------------------------------------------
+# HistoryIndex
+# ---------------------------------------------------------------------------
+
+class TestHistoryIndex:
+    def test_buckets_keep_row_order(self):
+        df = pd.DataFrame({
+            "timestamp": [
+                "2026-03-05T14:10:00Z",
+                "2026-03-05T09:00:00Z",
+                "2026-03-04T14:00:00Z",
+                None,
+            ],
+            "kw": [1.0, 2.0, 3.0, 4.0],
+        })
+        index = HistoryIndex.from_frame(df)
+        assert index.same_hour(14).tolist() == [1.0, 3.0]
+        assert index.same_hour_count(9) == 1
+        assert index.same_hour_count(30) == 0
+        assert len(index) == 4
+
+    def test_matches_pandas_on_shuffled_gappy_history(self):
+        rng = np.random.default_rng(11)
+        timestamps = pd.date_range("2026-01-01", periods=24 * 30, freq="h", tz="UTC")
+        kw = rng.normal(100, 20, len(timestamps))
+        kw[rng.random(len(kw)) < 0.25] = np.nan
+        order = rng.permutation(len(timestamps))
+        df = pd.DataFrame({"timestamp": timestamps[order].astype(str), "kw": kw[order]})
+
+        parsed = pd.to_datetime(df["timestamp"])
+        same_hour = df[parsed.dt.hour == 14]["kw"]
+        recent = df[(parsed >= parsed.max() - pd.Timedelta(days=7)) & (parsed.dt.hour == 14)]
+        index = HistoryIndex.from_frame(df)
+
+        assert index.ewma(14, span=24) == pytest.approx(
+            same_hour.ewm(span=24, adjust=False).mean().iloc[-1], rel=1e-12
+        )
+        assert index.simple(14) == pytest.approx(recent["kw"].mean(), rel=1e-12)
+        assert index.percentile(14, 75) == pytest.approx(same_hour.quantile(0.75), rel=1e-12)
+
+    def test_compute_all_parses_timestamps_once(self, monkeypatch):
+        calls = 0
+        original = pd.to_datetime
+
+        def counting(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(pd, "to_datetime", counting)
+        BaselineEngine().compute(_make_history(), event_hour=14, method="auto")
+        assert calls == 1
+
+    def test_engine_accepts_prebuilt_index(self):
+        df = _make_history()
+        index = HistoryIndex.from_frame(df)
+        engine = BaselineEngine()
+        assert [r.to_dict() for r in engine.compute_all(index, 14)] == [
+            r.to_dict() for r in engine.compute_all(df, 14)
+        ]
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same length"):
+            HistoryIndex(["2026-03-05T14:00:00Z"], [1.0, 2.0])
+
+    def test_unparseable_timestamps_belong_to_no_hour(self):
+        index = HistoryIndex(
+            ["2026-03-05T14:00:00Z", "not-a-time", "2026-03-04T14:00:00Z"],
+            [1.0, 100.0, 3.0],
+        )
+        assert index.same_hour(14).tolist() == [1.0, 3.0]
+        assert sum(index.same_hour_count(h) for h in range(24)) == 2
+        assert len(index) == 3
+
+    def test_non_nanosecond_timestamps(self):
+        timestamps = pd.date_range("2026-01-01", periods=24 * 20, freq="h").values
+        kw = np.arange(len(timestamps), dtype=float)
+        micros = HistoryIndex(timestamps.astype("datetime64[us]"), kw)
+        nanos = HistoryIndex(timestamps, kw)
+        assert micros.simple(14) == nanos.simple(14)
+        assert micros.ts_ns.tolist() == nanos.ts_ns.tolist()
+
+
+# ---------------------------------------------------------------------------
+# BaselineEngine.compute_many — columnar multi-site batch
+# ---------------------------------------------------------------------------
+
+class TestComputeMany:
+    def _batch(self) -> pd.DataFrame:
+        rng = np.random.default_rng(23)
+        frames = []
+        for i, days in enumerate((30, 3, 10, 1)):
+            ts = pd.date_range("2026-02-01", periods=24 * days, freq="h", tz="UTC")
+            kw = rng.normal(100 + 10 * i, 15, len(ts))
+            kw[rng.random(len(kw)) < 0.2] = np.nan
+            frames.append(pd.DataFrame({
+                "site_id": f"site-{i}", "timestamp": ts.astype(str), "kw": kw,
+            }))
+        # A site with no reading at the event hour falls back to all its rows.
+        frames.append(pd.DataFrame({
+            "site_id": "site-off-hour",
+            "timestamp": ["2026-02-01 03:00:00+00:00", "2026-02-02 05:00:00+00:00", "2026-02-03 07:00:00+00:00"],
+            "kw": [5.0, 9.0, 7.0],
+        }))
+        batch = pd.concat(frames, ignore_index=True)
+        order = np.random.default_rng(5).permutation(len(batch))
+        return batch.iloc[order].reset_index(drop=True)
+
+    def test_matches_compute_all_per_site(self):
+        batch = self._batch()
+        engine = BaselineEngine()
+        many = engine.compute_many(batch["site_id"], batch["timestamp"], batch["kw"], 14)
+
+        assert list(many) == list(pd.unique(batch["site_id"]))
+        for site_id, results in many.items():
+            expected = engine.compute_all(batch[batch["site_id"] == site_id], 14)
+            for got, want in zip(results, expected):
+                assert got.method == want.method
+                assert got.confidence == pytest.approx(want.confidence)
+                assert got.details == want.details
+                assert got.baseline_kwh == pytest.approx(want.baseline_kwh, rel=1e-9, nan_ok=True)
+
+    def test_length_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same length"):
+            BaselineEngine().compute_many(["a", "b"], ["2026-03-05T14:00:00Z"] * 2, [1.0], 14)
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,239 @@
+"""Tests for the fitted Prophet model cache in services.baseline."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.baseline import (
+    ProphetModelCache,
+    compute_baseline_prophet,
+    compute_baseline_simple,
+    compute_baseline_with_method,
+    history_fingerprint,
+    warm_start_params,
+)
+
+
+def _history(hours: int = 24 * 7, start: str = "2026-03-01") -> pd.DataFrame:
+    timestamps = pd.date_range(start, periods=hours, freq="h")
+    kw = 100 + 20 * np.sin(np.arange(hours) * 2 * np.pi / 24)
+    return pd.DataFrame({"timestamp": timestamps.astype(str), "kw": kw})
+
+
+def _frame(history: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({"ds": pd.to_datetime(history["timestamp"]), "y": history["kw"]})
+
+
+class FittedModel:
+    """Stands in for a fitted Prophet model: params plus a flat forecast."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.rows = len(df)
+        self.level = float(df["y"].mean())
+        self.params = {
+            "k": np.array([[0.1]]),
+            "m": np.array([[0.2]]),
+            "sigma_obs": np.array([[0.3]]),
+            "delta": np.array([[0.0, 0.1]]),
+            "beta": np.array([[0.5, 0.6]]),
+        }
+
+    def predict(self, future: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({"ds": future["ds"], "yhat": self.level})
+
+
+class CountingFit:
+    def __init__(self):
+        self.calls: list[tuple[int, dict | None]] = []
+
+    def __call__(self, df: pd.DataFrame, init):
+        self.calls.append((len(df), init))
+        return FittedModel(df)
+
+
+# ---------------------------------------------------------------------------
+# ProphetModelCache
+# ---------------------------------------------------------------------------
+
+class TestProphetModelCache:
+    def test_same_history_is_fit_once(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=4, fit=fit)
+        df = _frame(_history())
+
+        first = cache.get_or_fit("site-a", df)
+        second = cache.get_or_fit("site-a", df.copy())
+
+        assert first is second
+        assert len(fit.calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_sites_are_cached_separately(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=4, fit=fit)
+        df = _frame(_history())
+        cache.get_or_fit("site-a", df)
+        cache.get_or_fit("site-b", df)
+        assert len(fit.calls) == 2
+
+    def test_appended_rows_warm_start_the_refit(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=4, fit=fit)
+        history = _history(hours=24 * 8)
+        first = cache.get_or_fit("site-a", _frame(history.iloc[: 24 * 7]))
+
+        cache.get_or_fit("site-a", _frame(history))
+
+        rows, init = fit.calls[-1]
+        assert rows == 24 * 8
+        expected = warm_start_params(first)
+        assert init is not None and set(init) == set(expected)
+        for name, value in expected.items():
+            np.testing.assert_array_equal(init[name], value)
+        assert cache.stats()["warm_starts"] == 1
+
+    def test_failed_warm_start_refits_cold(self):
+        fit = CountingFit()
+
+        def shape_checked_fit(df, init):
+            if init is not None:
+                fit.calls.append((len(df), init))
+                raise ValueError("delta: size mismatch")
+            return fit(df, init)
+
+        cache = ProphetModelCache(max_entries=4, fit=shape_checked_fit)
+        history = _history()
+        cache.get_or_fit("site-a", _frame(history.iloc[:-24]))
+        model = cache.get_or_fit("site-a", _frame(history))
+
+        assert [init is None for _, init in fit.calls] == [True, False, True]
+        assert model.rows == len(history)
+        assert cache.stats()["warm_starts"] == 0
+
+    def test_edited_history_refits_cold(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=4, fit=fit)
+        history = _history()
+        cache.get_or_fit("site-a", _frame(history))
+
+        edited = history.copy()
+        edited.loc[0, "kw"] = 999.0
+        cache.get_or_fit("site-a", _frame(edited))
+
+        assert [init for _, init in fit.calls] == [None, None]
+
+    def test_least_recently_used_model_is_evicted(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=2, fit=fit)
+        df = _frame(_history())
+        for site_id in ("site-a", "site-b", "site-a", "site-c"):
+            cache.get_or_fit(site_id, df)
+        assert len(fit.calls) == 3
+
+        cache.get_or_fit("site-a", df)  # still cached
+        assert len(fit.calls) == 3
+        cache.get_or_fit("site-b", df)  # evicted by site-c
+        assert len(fit.calls) == 4
+        assert cache.stats()["entries"] == 2
+
+    def test_fingerprint_tracks_last_timestamp_and_rows(self):
+        df = _frame(_history())
+        last, rows, _ = history_fingerprint(df).split(":")
+        assert int(rows) == len(df)
+        assert int(last) == df["ds"].iloc[-1].value
+        assert history_fingerprint(df) != history_fingerprint(df.iloc[:-1])
+
+
+# ---------------------------------------------------------------------------
+# compute_baseline_prophet with a cache
+# ---------------------------------------------------------------------------
+
+class TestComputeBaselineProphetCached:
+    def test_repeated_baseline_skips_refit(self):
+        fit = CountingFit()
+        cache = ProphetModelCache(max_entries=4, fit=fit)
+        history = _history()
+
+        values = [
+            compute_baseline_prophet(
+                history, "2026-03-08 14:00:00", "2026-03-08 15:00:00",
+                site_id="site-a", cache=cache,
+            )
+            for _ in range(3)
+        ]
+
+        assert len(fit.calls) == 1
+        assert values == [pytest.approx(history["kw"].mean())] * 3
+
+    def test_fit_failure_falls_back_to_simple(self):
+        def failing_fit(df, init):
+            raise RuntimeError("stan crashed")
+
+        cache = ProphetModelCache(max_entries=4, fit=failing_fit)
+        history = _history()
+        value = compute_baseline_prophet(
+            history, "2026-03-08 14:00:00", "2026-03-08 15:00:00",
+            site_id="site-a", cache=cache,
+        )
+        assert value == pytest.approx(compute_baseline_simple(history, 14))
+
+    def test_method_label_reports_fallback(self):
+        def failing_fit(df, init):
+            raise RuntimeError("stan crashed")
+
+        history = _history()
+        args = (history, "2026-03-08 14:00:00", "2026-03-08 15:00:00")
+        value, method = compute_baseline_with_method(
+            *args, site_id="site-a", cache=ProphetModelCache(max_entries=4, fit=failing_fit)
+        )
+        assert method == "simple"
+        assert value == pytest.approx(compute_baseline_simple(history, 14))
+
+        fit = CountingFit()
+        value, method = compute_baseline_with_method(
+            *args, site_id="site-a", cache=ProphetModelCache(max_entries=4, fit=fit)
+        )
+        assert method == "prophet"
+        assert value == pytest.approx(history["kw"].mean())
+
+
+# ---------------------------------------------------------------------------
+# Real Prophet fits (needs prophet)
+# ---------------------------------------------------------------------------
+
+def test_warm_start_refit_with_prophet():
+    pytest.importorskip("prophet")
+    history = _history(hours=24 * 5)
+    cache = ProphetModelCache(max_entries=2)
+    cache.get_or_fit("site-a", _frame(history.iloc[:-24]))
+    model = cache.get_or_fit("site-a", _frame(history))
+
+    assert cache.stats()["warm_starts"] == 1
+    assert len(model.predict(_frame(history)[["ds"]].tail(4))) == 4
+
+
+def test_fitted_model_survives_restart(tmp_path: Path):
+    pytest.importorskip("prophet")
+    df = _frame(_history(hours=24 * 3))
+    ProphetModelCache(max_entries=2, cache_dir=tmp_path).get_or_fit("site-a", df)
+
+    fit = CountingFit()
+    restarted = ProphetModelCache(max_entries=2, cache_dir=tmp_path, fit=fit)
+    model = restarted.get_or_fit("site-a", df)
+
+    assert fit.calls == []
+    assert restarted.stats()["disk_loads"] == 1
+    assert len(model.predict(df[["ds"]].head(4))) == 4
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
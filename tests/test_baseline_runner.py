@@ -0,0 +1,127 @@
+"""Tests for the process-pool Prophet baseline runner."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.baseline import compute_baseline_simple
+from services.baseline_runner import ParallelBaselineRunner
+
+EVENT_START = "2026-03-08 14:00:00"
+EVENT_END = "2026-03-08 15:00:00"
+
+
+def _history(level: float, hours: int = 24 * 7) -> pd.DataFrame:
+    timestamps = pd.date_range("2026-03-01", periods=hours, freq="h")
+    kw = level + 10 * np.sin(np.arange(hours) * 2 * np.pi / 24)
+    return pd.DataFrame({"timestamp": timestamps.astype(str), "kw": kw})
+
+
+# Runs in spawned workers, so it lives at module level. The site id picks
+# the behaviour: "bad" raises, "crash" kills the worker, "slow" sleeps,
+# "pid" reports the worker's process id.
+def scripted_forecast(history_df, event_start, event_end, site_id):
+    if "bad" in site_id:
+        raise RuntimeError("stan crashed")
+    if "crash" in site_id:
+        os._exit(1)
+    if "slow" in site_id:
+        time.sleep(1.0)
+    if "pid" in site_id:
+        time.sleep(0.3)
+        return float(os.getpid())
+    return float(history_df["kw"].mean())
+
+
+@pytest.fixture(scope="module")
+def runner():
+    with ParallelBaselineRunner(max_workers=2, forecast=scripted_forecast) as shared:
+        yield shared
+
+
+@pytest.fixture()
+def histories() -> dict[str, pd.DataFrame]:
+    return {f"site-{i}": _history(100 + 10 * i) for i in range(4)}
+
+
+def test_all_sites_are_forecast(runner, histories):
+    results = runner.run_all(histories, EVENT_START, EVENT_END)
+
+    assert set(results) == set(histories)
+    for site_id, result in results.items():
+        assert result.method == "prophet"
+        assert result.error is None
+        assert result.baseline_kw == pytest.approx(histories[site_id]["kw"].mean())
+
+
+def test_failed_site_falls_back_to_simple(runner, histories):
+    histories["site-bad"] = _history(50)
+    results = runner.run_all(histories, EVENT_START, EVENT_END)
+
+    bad = results.pop("site-bad")
+    assert bad.method == "simple"
+    assert "stan crashed" in bad.error
+    assert bad.baseline_kw == pytest.approx(compute_baseline_simple(histories["site-bad"], 14))
+    assert {r.method for r in results.values()} == {"prophet"}
+
+
+def test_dead_worker_does_not_lose_sites(runner, histories):
+    histories["site-crash"] = _history(50)
+    results = runner.run_all(histories, EVENT_START, EVENT_END)
+    assert set(results) == set(histories)
+    assert results["site-crash"].method == "simple"
+
+    # The broken pool is replaced for the next run.
+    again = runner.run_all({"site-0": histories["site-0"]}, EVENT_START, EVENT_END)
+    assert again["site-0"].method == "prophet"
+
+
+def test_dead_worker_only_downgrades_its_own_site(runner, histories):
+    # site-slow is still fitting on the other worker when site-crash dies.
+    histories = {
+        "site-crash": _history(50), "site-slow": _history(70), **histories,
+        "site-bad": _history(60),
+    }
+    results = runner.run_all(histories, EVENT_START, EVENT_END)
+
+    crash, bad = results.pop("site-crash"), results.pop("site-bad")
+    assert crash.method == "simple" and crash.error
+    assert bad.method == "simple" and "stan crashed" in bad.error
+    for site_id, result in results.items():
+        assert result.method == "prophet"
+        assert result.error is None
+        assert result.baseline_kw == pytest.approx(histories[site_id]["kw"].mean())
+
+
+def test_results_stream_in_completion_order(runner, histories):
+    histories = {"site-slow": _history(50), **histories}
+    order = [r.site_id for r in runner.run(histories, EVENT_START, EVENT_END)]
+    assert order[-1] == "site-slow"
+    assert sorted(order) == sorted(histories)
+
+
+def test_sites_are_spread_across_processes(runner):
+    histories = {f"site-pid-{i}": _history(100) for i in range(4)}
+    pids = {r.baseline_kw for r in runner.run(histories, EVENT_START, EVENT_END)}
+    assert len(pids) == 2
+    assert os.getpid() not in pids
+
+
+def test_worker_count_from_env(monkeypatch):
+    monkeypatch.setenv("DR_BASELINE_WORKERS", "3")
+    assert ParallelBaselineRunner().max_workers == 3
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,173 @@
+"""Tests for incremental per-site baseline state."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.baseline_engine import BaselineEngine
+from services.baseline_state import BaselineStateStore, P2Quantile, SiteBaselineState
+from services.data_adapters import MeterReading
+
+
+def _readings(site_id: str = "site-a", days: int = 30, seed: int = 1) -> list[MeterReading]:
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2026-01-01", periods=24 * days, freq="h", tz="UTC")
+    kw = rng.normal(100, 20, len(timestamps))
+    kw[rng.random(len(kw)) < 0.2] = np.nan
+    return [MeterReading(ts.isoformat(), float(v), site_id) for ts, v in zip(timestamps, kw)]
+
+
+def _frame(readings: list[MeterReading]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "timestamp": [r.timestamp for r in readings],
+        "kw": [r.kw for r in readings],
+    })
+
+
+# ---------------------------------------------------------------------------
+# P2Quantile
+# ---------------------------------------------------------------------------
+
+class TestP2Quantile:
+    def test_exact_for_five_or_fewer(self):
+        sketch = P2Quantile(0.75)
+        values = [4.0, 1.0, 9.0, 3.0, 7.0]
+        for i, value in enumerate(values, start=1):
+            sketch.add(value)
+            assert sketch.value() == pytest.approx(np.quantile(values[:i], 0.75))
+
+    def test_tracks_quantile_of_long_stream(self):
+        values = np.random.default_rng(4).normal(0, 1, 20000)
+        sketch = P2Quantile(0.75)
+        for value in values:
+            sketch.add(value)
+        assert sketch.value() == pytest.approx(np.quantile(values, 0.75), abs=0.02)
+
+    def test_empty_is_nan(self):
+        assert np.isnan(P2Quantile(0.5).value())
+
+
+# ---------------------------------------------------------------------------
+# SiteBaselineState
+# ---------------------------------------------------------------------------
+
+class TestSiteBaselineState:
+    @pytest.mark.parametrize("event_hour", [0, 14, 23])
+    def test_matches_engine_for_chronological_stream(self, event_hour):
+        readings = _readings()
+        state = SiteBaselineState()
+        for reading in readings:
+            state.push(reading)
+        expected = BaselineEngine().compute_all(_frame(readings), event_hour)
+
+        got = state.compute_all(event_hour)
+        assert [r.method for r in got] == [r.method for r in expected]
+        for streamed, batch in zip(got[:2], expected[:2]):
+            assert streamed.baseline_kwh == pytest.approx(batch.baseline_kwh, rel=1e-9)
+            assert streamed.confidence == pytest.approx(batch.confidence)
+            assert streamed.details == batch.details
+        # The percentile comes from a sketch, not an exact quantile.
+        assert got[2].baseline_kwh == pytest.approx(expected[2].baseline_kwh, rel=0.1)
+
+    def test_push_many_equals_push(self):
+        readings = _readings(days=10)
+        one_by_one = SiteBaselineState()
+        for reading in readings:
+            one_by_one.push(reading)
+        batched = SiteBaselineState()
+        batched.push_many(readings[:100])
+        batched.push_many(readings[100:])
+        assert json.dumps(batched.to_dict()) == json.dumps(one_by_one.to_dict())
+
+    def test_window_drops_readings_older_than_seven_days(self):
+        state = SiteBaselineState()
+        state.push(MeterReading("2026-03-01T14:00:00Z", 1000.0, "s"))
+        state.push(MeterReading("2026-03-09T14:00:00Z", 10.0, "s"))
+        state.push(MeterReading("2026-03-10T14:00:00Z", 20.0, "s"))
+        assert state.simple(14) == pytest.approx(15.0)
+        assert state.same_hour_count(14) == 3
+
+    def test_out_of_order_reading_inside_window_counts(self):
+        state = SiteBaselineState()
+        state.push(MeterReading("2026-03-10T14:00:00Z", 20.0, "s"))
+        state.push(MeterReading("2026-03-08T14:00:00Z", 10.0, "s"))
+        state.push(MeterReading("2026-02-01T14:00:00Z", 500.0, "s"))
+        assert state.simple(14) == pytest.approx(15.0)
+
+    def test_empty_hour_falls_back_to_overall(self):
+        state = SiteBaselineState()
+        state.push_many([
+            MeterReading("2026-03-01T03:00:00Z", 5.0, "s"),
+            MeterReading("2026-03-01T05:00:00Z", 9.0, "s"),
+        ])
+        assert state.simple(14) == pytest.approx(7.0)
+        assert state.ewma(14) == pytest.approx(7.0)
+        assert state.percentile_value(14) == pytest.approx(np.quantile([5.0, 9.0], 0.75))
+        assert state.compute(14, "auto").confidence == 0
+
+    def test_unparseable_timestamps_belong_to_no_hour(self):
+        readings = [
+            MeterReading("2026-03-01T14:00:00Z", 10.0, "s"),
+            MeterReading("not-a-time", 40.0, "s"),
+            MeterReading("2026-03-02T14:00:00Z", 20.0, "s"),
+        ]
+        batched = SiteBaselineState()
+        batched.push_many(readings)
+        one_by_one = SiteBaselineState()
+        for reading in readings:
+            one_by_one.push(reading)
+        assert json.dumps(batched.to_dict()) == json.dumps(one_by_one.to_dict())
+        assert batched.same_hour_count(14) == 2
+        assert batched.simple(14) == pytest.approx(15.0)
+        assert batched.simple(3) == pytest.approx(70.0 / 3)
+
+    def test_unknown_method_raises(self):
+        with pytest.raises(ValueError, match="unknown method"):
+            SiteBaselineState().compute(14, "median")
+
+    def test_round_trips_through_json(self):
+        state = SiteBaselineState()
+        state.push_many(_readings(days=9))
+        restored = SiteBaselineState.from_dict(json.loads(json.dumps(state.to_dict())))
+        assert restored.compute_all(14) == state.compute_all(14)
+
+        more = _readings(days=2, seed=9)
+        state.push_many(more)
+        restored.push_many(more)
+        assert json.dumps(restored.to_dict()) == json.dumps(state.to_dict())
+
+
+# ---------------------------------------------------------------------------
+# BaselineStateStore
+# ---------------------------------------------------------------------------
+
+class TestBaselineStateStore:
+    def test_routes_by_site_and_survives_restart(self, tmp_path: Path):
+        store = BaselineStateStore()
+        store.push_many(_readings("site-a", days=8) + _readings("site-b", days=8, seed=2))
+        path = tmp_path / "baseline_state.json"
+        store.save(path)
+
+        restored = BaselineStateStore.load(path)
+        assert set(restored.sites) == {"site-a", "site-b"}
+        for site_id in ("site-a", "site-b"):
+            assert restored.compute(site_id, 14) == store.compute(site_id, 14)
+        assert not (tmp_path / "baseline_state.json.tmp").exists()
+
+    def test_unknown_site_raises(self):
+        with pytest.raises(KeyError):
+            BaselineStateStore().compute("site-x", 14)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
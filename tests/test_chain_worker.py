@@ -0,0 +1,225 @@
+"""Tests for the persistent Node chain action worker pool."""
+
+from __future__ import annotations
+
+import json
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.chain_worker import (
+    ChainWorkerError,
+    ChainWorkerPool,
+    get_chain_worker_pool,
+    shutdown_chain_worker_pools,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+
+RUNTIME = PROJECT_ROOT / "scripts" / "chain_action_runtime.js"
+
+FAKE_SCRIPT = """
+"use strict";
+const { runCli } = require(%s);
+
+async function runAction(action, confirmMode, payload, ctx) {
+  ctx.calls = (ctx.calls || 0) + 1;
+  if (payload.sleep_ms) {
+    const started = Date.now();
+    await new Promise((resolve) => setTimeout(resolve, payload.sleep_ms));
+    return { ok: true, action, pid: process.pid, started, finished: Date.now() };
+  }
+  if (action === "echo") {
+    return { ok: true, action, confirm_mode: confirmMode || null, pid: process.pid, calls: ctx.calls, payload };
+  }
+  if (action === "crash") {
+    process.exit(3);
+  }
+  throw new Error(`Unsupported action: ${action}`);
+}
+
+runCli(runAction, (err) => {
+  process.stderr.write(String(err && err.message ? err.message : err) + "\\n");
+  process.exit(1);
+});
+"""
+
+
+@pytest.fixture()
+def fake_script(tmp_path: Path) -> Path:
+    script = tmp_path / "fake_chain_action.js"
+    script.write_text(FAKE_SCRIPT % json.dumps(str(RUNTIME)))
+    return script
+
+
+@pytest.fixture()
+def pool(fake_script: Path):
+    p = ChainWorkerPool(fake_script, size=1, timeout=10)
+    yield p
+    p.close()
+
+
+class TestChainWorkerPool:
+    def test_call_returns_action_output(self, pool: ChainWorkerPool):
+        out = pool.call("echo", {"tx_hash": "0xabc"}, confirm_mode="hybrid")
+        assert out["ok"] is True
+        assert out["action"] == "echo"
+        assert out["confirm_mode"] == "hybrid"
+        assert out["payload"] == {"tx_hash": "0xabc"}
+        assert "id" not in out
+
+    def test_worker_is_reused_across_calls(self, pool: ChainWorkerPool):
+        first = pool.call("echo", {})
+        second = pool.call("echo", {})
+        assert first["pid"] == second["pid"]
+        assert second["calls"] == 2
+        assert pool.health()["spawned"] == 1
+
+    def test_action_error_keeps_worker(self, pool: ChainWorkerPool):
+        first = pool.call("echo", {})
+        with pytest.raises(ChainWorkerError, match="Unsupported action: nope"):
+            pool.call("nope", {})
+        again = pool.call("echo", {})
+        assert again["pid"] == first["pid"]
+
+    def test_crashed_worker_is_respawned(self, pool: ChainWorkerPool):
+        first = pool.call("echo", {})
+        with pytest.raises(ChainWorkerError):
+            pool.call("crash", {})
+        again = pool.call("echo", {})
+        assert again["pid"] != first["pid"]
+        health = pool.health()
+        assert health["spawned"] == 2
+        assert health["failures"] == 1
+        assert health["alive"] == 1
+
+    def test_idle_worker_is_health_checked(self, fake_script: Path):
+        p = ChainWorkerPool(fake_script, size=1, timeout=10, health_interval=0)
+        try:
+            first = p.call("echo", {})
+            second = p.call("echo", {})
+            # ping does not go through the action handler
+            assert second["calls"] == first["calls"] + 1
+            assert second["pid"] == first["pid"]
+        finally:
+            p.close()
+
+    def test_startup_failure_surfaces_stderr(self, tmp_path: Path):
+        broken = tmp_path / "broken.js"
+        broken.write_text('require("definitely-not-installed-module");\n')
+        p = ChainWorkerPool(broken, size=1, timeout=10)
+        try:
+            with pytest.raises(ChainWorkerError, match="definitely-not-installed-module"):
+                p.call("echo", {})
+        finally:
+            p.close()
+
+
+def _concurrent_calls(p: ChainWorkerPool, action: str) -> list[dict]:
+    results: list[dict] = []
+
+    def call() -> None:
+        results.append(p.call(action, {"sleep_ms": 300}))
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    return sorted(results, key=lambda r: r["started"])
+
+
+class TestSigningLane:
+    def test_signing_actions_run_one_at_a_time(self, fake_script: Path):
+        p = ChainWorkerPool(fake_script, size=2, timeout=10)
+        try:
+            first, second = _concurrent_calls(p, "create_event")
+            assert second["started"] >= first["finished"]
+        finally:
+            p.close()
+
+    def test_read_only_actions_run_in_parallel(self, fake_script: Path):
+        p = ChainWorkerPool(fake_script, size=2, timeout=10)
+        try:
+            first, second = _concurrent_calls(p, "check_tx")
+            assert first["pid"] != second["pid"]
+            assert second["started"] < first["finished"]
+        finally:
+            p.close()
+
+
+RELOAD_SCRIPT = """
+"use strict";
+const fs = require("node:fs");
+const { cachedForFile, runCli } = require(%s);
+
+async function runAction(action, confirmMode, payload, ctx) {
+  const deployment = cachedForFile(ctx, "deployment", payload.path, () => {
+    ctx.builds = (ctx.builds || 0) + 1;
+    return JSON.parse(fs.readFileSync(payload.path, "utf-8"));
+  });
+  return { ok: true, deployment, builds: ctx.builds };
+}
+
+runCli(runAction, () => process.exit(1));
+"""
+
+
+def test_worker_reloads_rewritten_deployment(tmp_path: Path):
+    script = tmp_path / "reload_chain_action.js"
+    script.write_text(RELOAD_SCRIPT % json.dumps(str(RUNTIME)))
+    report = tmp_path / "deployment.json"
+    report.write_text(json.dumps({"contracts": {"settlement": "0xold"}}))
+    p = ChainWorkerPool(script, size=1, timeout=10)
+    try:
+        first = p.call("check_tx", {"path": str(report)})
+        assert p.call("check_tx", {"path": str(report)})["builds"] == 1
+
+        report.write_text(json.dumps({"contracts": {"settlement": "0xnew-address"}}))
+        after = p.call("check_tx", {"path": str(report)})
+        assert first["deployment"]["contracts"]["settlement"] == "0xold"
+        assert after["deployment"]["contracts"]["settlement"] == "0xnew-address"
+        assert after["builds"] == 2
+    finally:
+        p.close()
+
+
+class TestSharedPools:
+    def test_same_script_shares_pool(self, fake_script: Path):
+        try:
+            assert get_chain_worker_pool(fake_script) is get_chain_worker_pool(fake_script)
+        finally:
+            shutdown_chain_worker_pools()
+
+    def test_pool_size_from_env(self, fake_script: Path, monkeypatch):
+        monkeypatch.setenv("DR_CHAIN_WORKER_POOL_SIZE", "4")
+        try:
+            assert get_chain_worker_pool(fake_script).size == 4
+        finally:
+            shutdown_chain_worker_pools()
+
+
+def test_one_shot_cli_mode_still_supported(fake_script: Path):
+    result = subprocess.run(
+        ["node", str(fake_script), "echo", "sync"],
+        input=json.dumps({"x": 1}),
+        text=True,
+        capture_output=True,
+        check=True,
+    )
+    out = json.loads(result.stdout.strip().splitlines()[-1])
+    assert out["ok"] is True
+    assert out["confirm_mode"] == "sync"
+    assert out["payload"] == {"x": 1}
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
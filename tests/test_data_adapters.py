@@ -11,6 +11,7 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -19,10 +20,12 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from services.data_adapters import (
+    ArrowAdapter,
     CSVAdapter,
     JSONAdapter,
     DataAdapterRegistry,
     MeterReading,
+    validate_frame,
     validate_readings,
 )
 
@@ -185,6 +188,133 @@ class TestDataAdapterRegistry:
         assert "csv" in names
         assert "json" in names
 
+    def test_default_registry_has_parquet_and_arrow(self):
+        registry = DataAdapterRegistry.default()
+
+        assert registry.get("parquet").format == "parquet"
+        assert registry.get("arrow").format == "ipc"
+
+    def test_arrow_adapter_rejects_unknown_format(self):
+        with pytest.raises(ValueError, match="format"):
+            ArrowAdapter("orc")
+
+
+# ---------------------------------------------------------------------------
+# Columnar and chunked loading
+# ---------------------------------------------------------------------------
+
+def _write_meter_csv(path: Path, rows: int) -> None:
+    timestamps = pd.date_range("2026-03-10", periods=rows, freq="15min", tz="UTC")
+    lines = [f"{ts:%Y-%m-%dT%H:%M:%SZ},{i * 0.5}" for i, ts in enumerate(timestamps)]
+    path.write_text("timestamp,kw\n" + "\n".join(lines) + "\n")
+
+
+class TestColumnarLoading:
+    def test_csv_dataframe_is_typed(self, tmp_path: Path):
+        csv_file = tmp_path / "meter.csv"
+        _write_meter_csv(csv_file, rows=4)
+
+        df = CSVAdapter().load_dataframe(str(csv_file), site_id="site-a")
+
+        assert pd.api.types.is_datetime64_any_dtype(df["timestamp"])
+        assert df["kw"].dtype == "float64"
+        assert df["timestamp"].iloc[1] == pd.Timestamp("2026-03-10T00:15:00Z")
+        assert df["kw"].tolist() == [0.0, 0.5, 1.0, 1.5]
+
+    def test_csv_chunks_concatenate_to_whole_file(self, tmp_path: Path):
+        csv_file = tmp_path / "meter.csv"
+        _write_meter_csv(csv_file, rows=1001)
+        adapter = CSVAdapter()
+
+        chunks = list(adapter.iter_chunks(str(csv_file), "site-a", chunk_rows=250))
+
+        assert [len(c) for c in chunks] == [250, 250, 250, 250, 1]
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True),
+            adapter.load_dataframe(str(csv_file), "site-a"),
+        )
+
+    def test_csv_blank_kw_is_nan(self, tmp_path: Path):
+        csv_file = tmp_path / "meter.csv"
+        csv_file.write_text("timestamp,kw\n2026-03-10T10:00:00Z,\n2026-03-10T10:15:00Z,5\n")
+        df = CSVAdapter().load_dataframe(str(csv_file), site_id="site-a")
+        assert df["kw"].isna().tolist() == [True, False]
+
+    def test_empty_csv_gives_empty_typed_frame(self, tmp_path: Path):
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("timestamp,kw\n")
+        df = CSVAdapter().load_dataframe(str(csv_file), site_id="site-a")
+        assert len(df) == 0
+        assert list(df.columns) == ["timestamp", "kw"]
+        assert df["kw"].dtype == "float64"
+
+    def test_json_lines_are_streamed_in_chunks(self, tmp_path: Path):
+        jsonl_file = tmp_path / "meter.jsonl"
+        jsonl_file.write_text("".join(
+            json.dumps({"ts": f"2026-03-10T10:{m:02d}:00Z", "power": m}) + "\n"
+            for m in range(5)
+        ))
+        adapter = JSONAdapter(timestamp_key="ts", kw_key="power", lines=True)
+
+        chunks = list(adapter.iter_chunks(str(jsonl_file), "site-a", chunk_rows=2))
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        df = adapter.load_dataframe(str(jsonl_file), "site-a")
+        assert df["kw"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert len(adapter.load(str(jsonl_file), "site-a")) == 5
+
+    def test_json_document_dataframe_matches_readings(self, tmp_path: Path):
+        json_file = tmp_path / "meter.json"
+        data = {"readings": [
+            {"ts": "2026-03-10T10:00:00Z", "power": 200},
+            {"ts": "2026-03-10T10:15:00Z", "power": 210},
+        ]}
+        json_file.write_text(json.dumps(data))
+        adapter = JSONAdapter(data_path="readings", timestamp_key="ts", kw_key="power")
+
+        df = adapter.load_dataframe(str(json_file), "site-c")
+        readings = adapter.load(str(json_file), "site-c")
+
+        assert df["kw"].tolist() == [r.kw for r in readings]
+        assert list(df["timestamp"]) == [pd.Timestamp(r.timestamp) for r in readings]
+
+    def test_offset_change_across_dst_loads_as_utc(self, tmp_path: Path):
+        # US DST starts 2026-03-08: -08:00 readings are followed by -07:00 ones.
+        csv_file = tmp_path / "dst.csv"
+        csv_file.write_text(
+            "timestamp,kw\n"
+            "2026-03-08T01:00:00-08:00,1\n"
+            "2026-03-08T01:30:00-08:00,2\n"
+            "2026-03-08T03:00:00-07:00,3\n"
+            "2026-03-08T03:30:00-07:00,4\n"
+        )
+        adapter = CSVAdapter()
+
+        df = adapter.load_dataframe(str(csv_file), "site-a")
+        chunks = list(adapter.iter_chunks(str(csv_file), "site-a", chunk_rows=3))
+
+        assert df["timestamp"].dtype == "datetime64[ns, UTC]"
+        assert df["timestamp"].diff().iloc[1:].tolist() == [pd.Timedelta(minutes=30)] * 3
+        assert all(c["timestamp"].dtype == "datetime64[ns, UTC]" for c in chunks)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+    def test_json_lines_offset_change_across_dst_loads_as_utc(self, tmp_path: Path):
+        jsonl_file = tmp_path / "dst.jsonl"
+        jsonl_file.write_text("".join(
+            json.dumps({"ts": ts, "power": i}) + "\n"
+            for i, ts in enumerate(["2026-03-08T01:30:00-08:00", "2026-03-08T03:00:00-07:00"])
+        ))
+        adapter = JSONAdapter(timestamp_key="ts", kw_key="power", lines=True)
+
+        chunks = list(adapter.iter_chunks(str(jsonl_file), "site-a", chunk_rows=1))
+        df = adapter.load_dataframe(str(jsonl_file), "site-a")
+
+        assert df["timestamp"].dtype == "datetime64[ns, UTC]"
+        assert df["timestamp"].tolist() == [
+            pd.Timestamp("2026-03-08T09:30:00Z"), pd.Timestamp("2026-03-08T10:00:00Z"),
+        ]
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
 
 # ---------------------------------------------------------------------------
 # Validation
@@ -218,6 +348,107 @@ class TestValidateReadings:
         errors = validate_readings([])
         assert errors == []
 
+    def test_errors_stay_in_row_order(self):
+        readings = [
+            MeterReading("2026-03-10T10:00:00Z", -1.0, "site-a"),
+            MeterReading("", -2.0, "site-a"),
+            MeterReading("2026-03-10T10:30:00Z", 3.0, "site-a"),
+        ]
+        assert validate_readings(readings) == [
+            "reading[0]: negative kw value (-1.0)",
+            "reading[1]: missing timestamp",
+            "reading[1]: negative kw value (-2.0)",
+        ]
+
+
+def _clean_frame(rows: int = 96) -> pd.DataFrame:
+    timestamps = pd.date_range("2026-03-10", periods=rows, freq="15min", tz="UTC")
+    kw = 100 + 5 * np.sin(np.arange(rows) / 8)
+    return pd.DataFrame({"timestamp": timestamps, "kw": kw})
+
+
+class TestValidateFrame:
+    def test_clean_frame_is_ok(self):
+        report = validate_frame(_clean_frame())
+        assert report.ok
+        assert report.rows == 96
+        assert report.expected_interval_s == 900
+        assert report.missing_intervals == 0
+
+    def test_each_issue_is_counted_and_sampled(self):
+        df = _clean_frame()
+        df["timestamp"] = df["timestamp"].astype(object)
+        df.loc[3, "kw"] = -4.0
+        df.loc[5, "kw"] = np.nan
+        df.loc[7, "timestamp"] = None
+        df.loc[11, "timestamp"] = df.loc[10, "timestamp"]
+        df.loc[20, "timestamp"], df.loc[21, "timestamp"] = (
+            df.loc[21, "timestamp"], df.loc[20, "timestamp"],
+        )
+        df.loc[40, "kw"] = 5000.0
+        df = df.drop(index=[60, 61, 62]).reset_index(drop=True)
+
+        issues = validate_frame(df).issues
+
+        assert issues["negative_kw"].sample == [3]
+        assert issues["missing_kw"].sample == [5]
+        assert issues["missing_timestamp"].sample == [7]
+        assert issues["duplicate_timestamp"].sample == [11]
+        assert issues["out_of_order"].sample == [21]
+        assert issues["spike"].sample == [3, 40]
+        # Holes left by row 7's missing and row 11's repeated timestamp,
+        # and by the three dropped rows (the next row is re-indexed to 60).
+        assert issues["gap"].sample == [8, 12, 60]
+
+    def test_missing_intervals_use_expected_interval(self):
+        df = _clean_frame().drop(index=[10, 11, 12, 13]).reset_index(drop=True)
+        report = validate_frame(df, expected_interval="15min")
+        assert report.issues["gap"].count == 1
+        assert report.missing_intervals == 4
+
+    def test_sample_is_capped(self):
+        df = _clean_frame()
+        df["kw"] = -1.0
+        report = validate_frame(df, sample_size=3)
+        assert report.issues["negative_kw"].count == 96
+        assert report.issues["negative_kw"].sample == [0, 1, 2]
+
+    def test_string_timestamps_and_empty_frame(self):
+        df = pd.DataFrame({
+            "timestamp": ["2026-03-10T10:00:00Z", "not a time", "2026-03-10T10:30:00Z"],
+            "kw": [1.0, 2.0, 3.0],
+        })
+        assert validate_frame(df).issues["missing_timestamp"].sample == [1]
+
+        empty = validate_frame(pd.DataFrame({"timestamp": [], "kw": []}))
+        assert empty.ok and empty.rows == 0 and empty.expected_interval_s is None
+
+    def test_local_time_across_dst_is_validated(self):
+        # Quarter-hourly local readings; the offset changes at the DST jump.
+        df = pd.DataFrame({
+            "timestamp": [
+                "2026-03-08T01:30:00-08:00",
+                "2026-03-08T01:45:00-08:00",
+                "2026-03-08T03:00:00-07:00",
+                "2026-03-08T03:15:00-07:00",
+                "garbage",
+            ],
+            "kw": [1.0, 1.0, 1.0, 1.0, 1.0],
+        })
+        report = validate_frame(df)
+        assert report.expected_interval_s == 900
+        assert report.issues["gap"].count == 0
+        assert report.issues["out_of_order"].count == 0
+        assert report.issues["missing_timestamp"].sample == [4]
+
+    def test_report_serialises(self):
+        data = validate_frame(_clean_frame()).to_dict()
+        assert data["ok"] is True
+        assert set(data["issues"]) == {
+            "missing_timestamp", "missing_kw", "negative_kw", "duplicate_timestamp",
+            "out_of_order", "gap", "spike",
+        }
+
 
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
@@ -21,6 +21,8 @@ from services.db_backend import (
     PostgresBackend,
     create_backend,
     BackendType,
+    adapt_ddl,
+    column_exists,
 )
 
 
@@ -220,5 +222,112 @@ class TestLegacyConnectCompat:
         assert isinstance(conn, sqlite3.Connection)
 
 
+# ---------------------------------------------------------------------------
+# Dialect helpers
+# ---------------------------------------------------------------------------
+
+class TestDialect:
+    def test_adapt_ddl_widens_integers_for_postgres(self):
+        ddl = "CREATE TABLE t (id TEXT, payout INTEGER NOT NULL, n integer);"
+        assert adapt_ddl(ddl, BackendType.POSTGRES) == (
+            "CREATE TABLE t (id TEXT, payout BIGINT NOT NULL, n BIGINT);"
+        )
+        assert adapt_ddl(ddl, BackendType.SQLITE) == ddl
+
+    def test_placeholders_escape_literal_percent(self):
+        sql = "SELECT * FROM t WHERE name LIKE 'a%' AND id = ?"
+        assert PostgresBackend._adapt_placeholders(sql) == (
+            "SELECT * FROM t WHERE name LIKE 'a%%' AND id = %s"
+        )
+
+    def test_column_exists_sqlite(self, tmp_path: Path):
+        backend = SQLiteBackend(db_path=str(tmp_path / "test.db"))
+        backend.execute_script("CREATE TABLE t (id TEXT, val INTEGER);")
+        assert column_exists(backend, "t", "val")
+        assert not column_exists(backend, "t", "missing")
+
+
+# ---------------------------------------------------------------------------
+# Transaction scope and error mapping
+# ---------------------------------------------------------------------------
+
+class TestWriteScope:
+    def test_write_commits_outermost_block(self, tmp_path: Path):
+        backend = SQLiteBackend(db_path=str(tmp_path / "test.db"))
+        backend.execute_script("CREATE TABLE t (id TEXT PRIMARY KEY);")
+        with backend.write():
+            backend.execute("INSERT INTO t VALUES (?)", ("a",))
+            with backend.write():
+                backend.execute("INSERT INTO t VALUES (?)", ("b",))
+            assert backend.raw_connection.in_transaction
+        assert not backend.raw_connection.in_transaction
+        assert len(backend.fetchall("SELECT * FROM t")) == 2
+
+    def test_write_error_rolls_back(self, tmp_path: Path):
+        backend = SQLiteBackend(db_path=str(tmp_path / "test.db"))
+        backend.execute_script("CREATE TABLE t (id TEXT PRIMARY KEY);")
+        with pytest.raises(backend.IntegrityError):
+            with backend.write():
+                backend.execute("INSERT INTO t VALUES (?)", ("a",))
+                backend.execute("INSERT INTO t VALUES (?)", ("a",))
+        assert backend.fetchall("SELECT * FROM t") == []
+
+    def test_wraps_existing_connection(self, tmp_path: Path):
+        import sqlite3
+
+        raw = sqlite3.connect(tmp_path / "test.db")
+        backend = SQLiteBackend(connection=raw)
+        backend.execute_script("CREATE TABLE t (id TEXT);")
+        backend.execute("INSERT INTO t VALUES (?)", ("a",))
+        assert backend.fetchone("SELECT id FROM t")["id"] == "a"
+        assert raw.row_factory is None
+
+
+# ---------------------------------------------------------------------------
+# Services run on the backend protocol
+# ---------------------------------------------------------------------------
+
+class TestServiceStorage:
+    def test_open_storage_defaults_to_sqlite_pool(self, tmp_path: Path, monkeypatch):
+        from services.db import ConnectionPool, open_storage
+
+        monkeypatch.delenv("DR_DB_BACKEND", raising=False)
+        storage = open_storage(str(tmp_path / "app.db"))
+        assert isinstance(storage, ConnectionPool)
+        assert storage.backend_type == BackendType.SQLITE
+        assert storage.fetchone("SELECT COUNT(*) AS n FROM events")["n"] == 0
+        storage.close()
+        assert not storage.is_connected
+
+    def test_open_storage_postgres_requires_url(self, monkeypatch):
+        from services.db import open_storage
+
+        monkeypatch.setenv("DR_DB_BACKEND", "postgres")
+        monkeypatch.delenv("DR_PG_URL", raising=False)
+        with pytest.raises(ValueError, match="DR_PG_URL"):
+            open_storage()
+
+    def test_pool_maps_integrity_errors(self, tmp_path: Path):
+        from services.db import ConnectionPool
+
+        pool = ConnectionPool(str(tmp_path / "pool.db"), readers=1)
+        insert = "INSERT INTO audits(event_id,site_id,requested_at) VALUES(?,?,?)"
+        pool.execute(insert, ("e", "s", "t"))
+        with pytest.raises(pool.IntegrityError):
+            pool.execute(insert, ("e", "s", "t"))
+        assert pool.fetchall("SELECT * FROM audits")[0]["event_id"] == "e"
+        pool.close()
+
+    def test_services_accept_any_backend(self, tmp_path: Path):
+        from services.bridge import BridgeDirection, BridgeService
+        from services.db import ConnectionPool
+
+        pool = ConnectionPool(str(tmp_path / "svc.db"), readers=1)
+        bridge = BridgeService(db=pool)
+        transfer = bridge.initiate_transfer("0xsender", "10", BridgeDirection.HOME_TO_REMOTE)
+        assert bridge.get_transfer(transfer.transfer_id).amount_wei == "10"
+        pool.close()
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
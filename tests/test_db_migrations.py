@@ -0,0 +1,124 @@
+"""Tests for versioned schema migrations in services.db."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.bridge import BridgeService
+from services.db import (
+    CORE_MIGRATIONS,
+    Migration,
+    apply_migrations,
+    connect,
+    schema_version,
+)
+
+
+def _versions(conn: sqlite3.Connection, component: str) -> list[int]:
+    rows = conn.execute(
+        "SELECT version FROM schema_version WHERE component = ? ORDER BY version",
+        (component,),
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+# ---------------------------------------------------------------------------
+# apply_migrations
+# ---------------------------------------------------------------------------
+
+
+class TestApplyMigrations:
+    def test_fresh_database_records_core_versions(self, tmp_path: Path):
+        conn = connect(str(tmp_path / "fresh.db"))
+        assert _versions(conn, "core") == [m.version for m in CORE_MIGRATIONS]
+        assert schema_version(conn, "core") == CORE_MIGRATIONS[-1].version
+
+    def test_second_connect_applies_nothing(self, tmp_path: Path):
+        path = str(tmp_path / "again.db")
+        connect(path)
+        conn = connect(path)
+        assert apply_migrations(conn, "core", CORE_MIGRATIONS) == []
+
+    def test_only_newer_migrations_run(self, tmp_path: Path):
+        conn = sqlite3.connect(tmp_path / "custom.db")
+        calls: list[int] = []
+        first = (Migration(1, "one", lambda c: calls.append(1)),)
+        assert apply_migrations(conn, "custom", first) == [1]
+
+        both = first + (Migration(2, "two", lambda c: calls.append(2)),)
+        assert apply_migrations(conn, "custom", both) == [2]
+        assert calls == [1, 2]
+
+    def test_versions_must_increase(self, tmp_path: Path):
+        conn = sqlite3.connect(tmp_path / "bad.db")
+        noop = lambda c: None  # noqa: E731
+        with pytest.raises(ValueError, match="increasing"):
+            apply_migrations(conn, "bad", (Migration(2, "b", noop), Migration(1, "a", noop)))
+
+    def test_components_are_versioned_separately(self, tmp_path: Path):
+        path = str(tmp_path / "components.db")
+        BridgeService(db_path=path)
+        conn = connect(path)
+        assert _versions(conn, "bridge") == [1, 2]
+        assert _versions(conn, "core") == [1, 2, 3]
+
+
+# ---------------------------------------------------------------------------
+# Legacy databases
+# ---------------------------------------------------------------------------
+
+
+def test_legacy_database_is_upgraded_and_backfilled_once(tmp_path: Path):
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript(
+        """
+        CREATE TABLE events (
+            event_id TEXT PRIMARY KEY,
+            start_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            target_kw INTEGER NOT NULL,
+            reward_rate INTEGER NOT NULL,
+            penalty_rate INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            tx_hash TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            closed_at TEXT,
+            settled_at TEXT
+        );
+        INSERT INTO events VALUES(
+            'evt-legacy','2026-01-01T00:00:00Z','2026-01-01T01:00:00Z',
+            100,10,5,'active','0xabc','2026-01-01T00:00:00Z',NULL,NULL
+        );
+        """
+    )
+    legacy.commit()
+    legacy.close()
+
+    conn = connect(str(path))
+    row = conn.execute(
+        "SELECT tx_state, tx_submitted_at FROM events WHERE event_id = 'evt-legacy'"
+    ).fetchone()
+    assert row["tx_state"] == "submitted"
+    assert row["tx_submitted_at"] == "2026-01-01T00:00:00Z"
+
+    # A later manual edit must survive reconnects: the backfill is not re-run.
+    conn.execute("UPDATE events SET tx_state = NULL WHERE event_id = 'evt-legacy'")
+    conn.commit()
+    conn = connect(str(path))
+    row = conn.execute(
+        "SELECT tx_state FROM events WHERE event_id = 'evt-legacy'"
+    ).fetchone()
+    assert row["tx_state"] is None
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
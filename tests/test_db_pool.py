@@ -0,0 +1,155 @@
+"""Tests for the WAL-mode SQLite connection pool in services.db."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.api import create_app
+from services.bridge import BridgeDirection, BridgeService
+from services.db import ConnectionPool, connect
+from services.icm import ICMService, MessageType
+
+
+@pytest.fixture()
+def pool(tmp_path: Path):
+    p = ConnectionPool(str(tmp_path / "pool.db"), readers=2)
+    yield p
+    p.close()
+
+
+# ---------------------------------------------------------------------------
+# Pragmas
+# ---------------------------------------------------------------------------
+
+
+class TestPragmas:
+    def test_connect_enables_wal(self, tmp_path: Path):
+        conn = connect(str(tmp_path / "wal.db"))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_pragmas_follow_env(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("DR_SQLITE_SYNCHRONOUS", "full")
+        monkeypatch.setenv("DR_SQLITE_CACHE_SIZE", "-4000")
+        monkeypatch.setenv("DR_SQLITE_MMAP_SIZE", "0")
+        monkeypatch.setenv("DR_SQLITE_BUSY_TIMEOUT_MS", "1234")
+        conn = connect(str(tmp_path / "env.db"))
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4000
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 0
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+
+    def test_invalid_synchronous_falls_back_to_normal(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv("DR_SQLITE_SYNCHRONOUS", "sometimes")
+        conn = connect(str(tmp_path / "bad.db"))
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+# ---------------------------------------------------------------------------
+# ConnectionPool
+# ---------------------------------------------------------------------------
+
+
+class TestConnectionPool:
+    def test_readers_are_query_only(self, pool: ConnectionPool):
+        with pytest.raises(sqlite3.OperationalError):
+            pool.conn.execute("DELETE FROM events")
+
+    def test_write_block_uses_writer(self, pool: ConnectionPool):
+        with pool.write() as writer:
+            assert pool.conn is writer
+            with pool.write():
+                assert pool.conn is writer
+            assert pool.conn is writer
+        assert pool.conn is not writer
+
+    def test_write_error_rolls_back(self, pool: ConnectionPool):
+        with pytest.raises(RuntimeError):
+            with pool.write() as conn:
+                conn.execute(
+                    "INSERT INTO audits(event_id,site_id,requested_at) VALUES('e','s','t')"
+                )
+                raise RuntimeError("boom")
+        assert not pool.writer.in_transaction
+        assert pool.conn.execute("SELECT COUNT(*) FROM audits").fetchone()[0] == 0
+
+    def test_reads_do_not_wait_for_open_write(self, pool: ConnectionPool):
+        with pool.write() as conn:
+            conn.execute(
+                "INSERT INTO audits(event_id,site_id,requested_at) VALUES('e','s','t')"
+            )
+            counts: list[int] = []
+
+            def read() -> None:
+                counts.append(pool.conn.execute("SELECT COUNT(*) FROM audits").fetchone()[0])
+
+            reader = threading.Thread(target=read)
+            reader.start()
+            reader.join(timeout=2)
+            assert counts == [0]
+            conn.commit()
+        assert pool.conn.execute("SELECT COUNT(*) FROM audits").fetchone()[0] == 1
+
+    def test_threads_share_bounded_readers(self, pool: ConnectionPool):
+        seen: set[int] = set()
+
+        def grab() -> None:
+            seen.add(id(pool.conn))
+
+        threads = [threading.Thread(target=grab) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(seen) == pool.readers == 2
+
+
+# ---------------------------------------------------------------------------
+# Shared storage context
+# ---------------------------------------------------------------------------
+
+
+class TestSharedStorage:
+    def test_create_app_injects_one_pool(self, tmp_path: Path):
+        app = create_app(db_path=str(tmp_path / "app.db"))
+        db = app.state.db
+        assert app.state.submitter._db is db
+        assert app.state.bridge._db is db
+        assert app.state.icm._db is db
+        app.state.dispatcher.shutdown()
+
+    def test_cross_service_write_is_one_transaction(self, pool: ConnectionPool):
+        bridge = BridgeService(db=pool)
+        icm = ICMService(db=pool)
+
+        with pytest.raises(RuntimeError):
+            with pool.write():
+                bridge.initiate_transfer("0xsender", "10", BridgeDirection.HOME_TO_REMOTE)
+                icm.create_message(
+                    "fuji", "l1", MessageType.SETTLEMENT_SYNC, "0xsender", {"k": "v"}
+                )
+                raise RuntimeError("abort both")
+
+        assert pool.conn.execute("SELECT COUNT(*) FROM bridge_transfers").fetchone()[0] == 0
+        assert pool.conn.execute("SELECT COUNT(*) FROM icm_messages").fetchone()[0] == 0
+
+        with pool.write():
+            bridge.initiate_transfer("0xsender", "10", BridgeDirection.HOME_TO_REMOTE)
+            icm.create_message(
+                "fuji", "l1", MessageType.SETTLEMENT_SYNC, "0xsender", {"k": "v"}
+            )
+        assert pool.conn.execute("SELECT COUNT(*) FROM bridge_transfers").fetchone()[0] == 1
+        assert pool.conn.execute("SELECT COUNT(*) FROM icm_messages").fetchone()[0] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
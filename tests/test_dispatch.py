@@ -0,0 +1,161 @@
+"""Tests for bounded thread-pool dispatch of blocking service calls."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from asgi_client import AppClient
+from services.api import create_app
+from services.dispatch import Dispatcher
+from services.submitter import ServiceError
+
+
+# ---------------------------------------------------------------------------
+# Dispatcher
+# ---------------------------------------------------------------------------
+
+
+class TestDispatcher:
+    def test_calls_run_off_the_event_loop_thread(self):
+        dispatcher = Dispatcher(chain_workers=1, db_workers=1)
+
+        async def scenario():
+            return await dispatcher.db(threading.get_ident)
+
+        try:
+            worker_ident = asyncio.run(scenario())
+        finally:
+            dispatcher.shutdown()
+        assert worker_ident != threading.get_ident()
+
+    def test_lane_limit_bounds_concurrency(self):
+        dispatcher = Dispatcher(chain_workers=2, db_workers=1)
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow() -> None:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        async def scenario():
+            await asyncio.gather(*(dispatcher.chain(slow) for _ in range(6)))
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            dispatcher.shutdown()
+        assert peak == 2
+        assert dispatcher.health()["chain"]["completed"] == 6
+
+    def test_full_queue_is_rejected_with_503(self):
+        dispatcher = Dispatcher(chain_workers=1, db_workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(dispatcher.chain(release.wait))
+            queued = asyncio.ensure_future(dispatcher.chain(release.wait))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ServiceError) as exc_info:
+                await dispatcher.chain(release.wait)
+            health = dispatcher.health()["chain"]
+            release.set()
+            await asyncio.gather(running, queued)
+            return exc_info.value, health
+
+        try:
+            err, health = asyncio.run(scenario())
+        finally:
+            dispatcher.shutdown()
+        assert err.status_code == 503
+        assert err.code == "SERVER_BUSY"
+        assert err.retryable is True
+        assert health["active"] == 1
+        assert health["queued"] == 1
+        assert health["rejected"] == 1
+
+    def test_lanes_are_independent(self):
+        dispatcher = Dispatcher(chain_workers=1, db_workers=1)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = asyncio.ensure_future(dispatcher.chain(release.wait))
+            await asyncio.sleep(0.05)
+            value = await asyncio.wait_for(dispatcher.db(lambda: "db-ok"), timeout=2)
+            release.set()
+            await blocked
+            return value
+
+        try:
+            assert asyncio.run(scenario()) == "db-ok"
+        finally:
+            dispatcher.shutdown()
+
+    def test_failed_submit_releases_its_queue_slot(self):
+        dispatcher = Dispatcher(chain_workers=1, db_workers=1)
+        dispatcher.shutdown()
+
+        async def scenario():
+            with pytest.raises(RuntimeError):
+                await dispatcher.db(lambda: None)
+
+        asyncio.run(scenario())
+        assert dispatcher.health()["db"]["queued"] == 0
+
+
+# ---------------------------------------------------------------------------
+# API integration
+# ---------------------------------------------------------------------------
+
+
+def test_healthz_reports_dispatch_lanes(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DR_DISPATCH_CHAIN_WORKERS", "3")
+    monkeypatch.setenv("DR_DISPATCH_DB_WORKERS", "5")
+    app = create_app(db_path=str(tmp_path / "dispatch.db"))
+    client = AppClient(app)
+
+    payload = client.get("/healthz").json()
+
+    assert payload["dispatch"]["chain"]["max_workers"] == 3
+    assert payload["dispatch"]["db"]["max_workers"] == 5
+    assert payload["dispatch"]["chain"]["queued"] == 0
+    assert isinstance(payload["chain_workers"], list)
+    app.state.dispatcher.shutdown()
+
+
+def test_baseline_compare_runs_on_the_db_lane(tmp_path: Path):
+    app = create_app(db_path=str(tmp_path / "dispatch.db"))
+    client = AppClient(app)
+    history = [
+        {"timestamp": f"2026-03-0{d}T{h:02d}:00:00", "kw": 10.0}
+        for d in range(1, 8) for h in range(24)
+    ]
+
+    resp = client.post(
+        "/v1/baseline/compare",
+        json={"history": history, "event_hour": 14},
+        headers={"x-api-key": "operator-key", "x-actor-id": "operator"},
+    )
+
+    assert resp.status_code == 200
+    assert app.state.dispatcher.health()["db"]["completed"] == 1
+    app.state.dispatcher.shutdown()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
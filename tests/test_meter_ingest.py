@@ -0,0 +1,178 @@
+"""Tests for streaming NDJSON / CSV meter ingest."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.api import create_app
+from services.meter_ingest import MeterIngest
+from services.meter_store import MeterStore
+
+OP_HEADERS = {"x-api-key": "operator-key", "x-actor-id": "operator"}
+PART_HEADERS = {"x-api-key": "participant-key", "x-actor-id": "site-a"}
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> MeterStore:
+    return MeterStore(db_path=str(tmp_path / "meter.db"))
+
+
+def _ndjson(hours: int = 48, site_id: str = "site-a") -> bytes:
+    timestamps = pd.date_range("2026-03-01", periods=hours, freq="h")
+    return "".join(
+        json.dumps({"site_id": site_id, "timestamp": ts.isoformat(), "kw": 100.0 + i % 24}) + "\n"
+        for i, ts in enumerate(timestamps)
+    ).encode()
+
+
+def _csv(hours: int = 48) -> bytes:
+    timestamps = pd.date_range("2026-03-01", periods=hours, freq="h")
+    rows = "".join(f"{ts.isoformat()},{100.0 + i % 24}\n" for i, ts in enumerate(timestamps))
+    return ("timestamp,kw\n" + rows).encode()
+
+
+def _pieces(body: bytes, size: int = 37) -> list[bytes]:
+    # Odd piece size so lines are split across pieces.
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+# ---------------------------------------------------------------------------
+# MeterIngest
+# ---------------------------------------------------------------------------
+
+class TestMeterIngest:
+    def test_ndjson_pieces_are_reassembled(self, store):
+        report = MeterIngest(store, chunk_rows=10).ingest(_pieces(_ndjson()))
+        assert report.rows == report.written == 48
+        assert report.rejected_rows == 0
+        assert report.chunks == 5
+        assert report.rows_per_s > 0
+        np.testing.assert_array_equal(
+            store.read("site-a").kw, 100.0 + np.arange(48) % 24
+        )
+
+    def test_csv_uses_default_site(self, store):
+        report = MeterIngest(store, format="csv", site_id="site-b", chunk_rows=7).ingest(
+            _pieces(_csv())
+        )
+        assert report.written == 48
+        assert store.count("site-b") == 48
+
+    def test_bad_rows_are_counted_not_written(self, store):
+        body = _ndjson(hours=5) + b"\n".join([
+            b"{not json",
+            b'{"site_id": "site-a", "timestamp": "yesterday", "kw": 1}',
+            b'{"timestamp": "2026-03-05T00:00:00", "kw": 1}',
+            b'{"site_id": "site-a", "timestamp": "2026-03-05T00:00:00", "kw": "n/a"}',
+            b'{"site_id": "site-a", "timestamp": "2026-03-05T01:00:00", "kw": null}',
+            b"[1, 2]",
+        ])
+        report = MeterIngest(store, chunk_rows=4).ingest(_pieces(body))
+        assert report.rows == 11
+        assert report.written == 5
+        assert report.rejected == {
+            "malformed": 2,
+            "missing_site_id": 1,
+            "missing_timestamp": 1,
+            "missing_kw": 2,
+        }
+        assert store.count() == 5
+
+    def test_csv_row_with_extra_fields_is_malformed(self, store):
+        body = b"site_id,timestamp,kw\nsite-a,2026-03-01T00:00:00,1\nsite-a,2026-03-01T01:00:00,2,9\n"
+        report = MeterIngest(store, format="csv").ingest([body])
+        assert report.written == 1
+        assert report.rejected["malformed"] == 1
+
+    def test_validation_findings_are_reported(self, store):
+        timestamps = pd.date_range("2026-03-01", periods=24, freq="h").delete([5, 6, 7])
+        body = "".join(
+            json.dumps({"site_id": "site-a", "timestamp": ts.isoformat(), "kw": -1.0 if i == 0 else 10.0})
+            + "\n"
+            for i, ts in enumerate(timestamps)
+        ).encode()
+        report = MeterIngest(store).ingest([body])
+        assert report.issues["gap"] == 1
+        assert report.issues["negative_kw"] == 1
+        # Findings do not reject rows.
+        assert report.written == 21
+
+    def test_unknown_format_raises(self, store):
+        with pytest.raises(ValueError, match="unsupported"):
+            MeterIngest(store, format="xml")
+
+
+# ---------------------------------------------------------------------------
+# POST /v1/meters/ingest
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def client(tmp_path):
+    return TestClient(create_app(db_path=str(tmp_path / "test.db")))
+
+
+class TestIngestEndpoint:
+    def test_streamed_ndjson_is_stored(self, client):
+        resp = client.post(
+            "/v1/meters/ingest",
+            content=iter(_pieces(_ndjson(), size=500)),
+            headers={**OP_HEADERS, "content-type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["written"] == 48
+        assert data["rejected_rows"] == 0
+        assert client.app.state.meter_store.count("site-a") == 48
+
+        baseline = client.get(
+            "/v1/meters/site-a/baseline", params={"event_hour": 14}, headers=OP_HEADERS
+        )
+        assert baseline.status_code == 200
+
+    def test_csv_by_content_type(self, client):
+        resp = client.post(
+            "/v1/meters/ingest",
+            params={"site_id": "site-c"},
+            content=_csv(),
+            headers={**OP_HEADERS, "content-type": "text/csv"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["written"] == 48
+
+    def test_format_query_overrides_content_type(self, client):
+        resp = client.post(
+            "/v1/meters/ingest",
+            params={"site_id": "site-c", "format": "csv"},
+            content=_csv(),
+            headers={**OP_HEADERS, "content-type": "application/octet-stream"},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["written"] == 48
+
+    def test_unsupported_media_type(self, client):
+        resp = client.post(
+            "/v1/meters/ingest",
+            content=b"<readings/>",
+            headers={**OP_HEADERS, "content-type": "application/xml"},
+        )
+        assert resp.status_code == 415
+        assert resp.json()["code"] == "UNSUPPORTED_MEDIA_TYPE"
+
+    def test_operator_only(self, client):
+        resp = client.post("/v1/meters/ingest", content=_ndjson(), headers=PART_HEADERS)
+        assert resp.status_code == 403
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,128 @@
+"""Tests for the persistent meter readings store."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.baseline_engine import BaselineEngine
+from services.db import open_storage, schema_version
+from services.meter_store import MeterStore, parse_timezone
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> MeterStore:
+    return MeterStore(db_path=str(tmp_path / "meter.db"), batch_rows=50)
+
+
+def _hourly(days: int = 3, start: str = "2026-03-01") -> tuple[pd.DatetimeIndex, np.ndarray]:
+    timestamps = pd.date_range(start, periods=24 * days, freq="h")
+    return timestamps, 100.0 + np.arange(len(timestamps)) % 24
+
+
+def test_range_read_returns_numpy_arrays(store):
+    timestamps, kw = _hourly()
+    assert store.ingest("site-a", timestamps, kw) == len(kw)
+
+    series = store.read("site-a", "2026-03-02", "2026-03-03")
+    assert series.timestamps.dtype == np.dtype("datetime64[ns]")
+    assert series.kw.dtype == np.float64
+    assert len(series) == 24
+    assert series.timestamps[0] == np.datetime64("2026-03-02T00:00")
+    np.testing.assert_array_equal(series.kw, kw[24:48])
+
+
+def test_open_bounds_read_everything_in_order(store):
+    timestamps, kw = _hourly()
+    # Insert newest first; reads still come back oldest first.
+    store.ingest("site-a", timestamps[::-1], kw[::-1])
+    series = store.read("site-a")
+    np.testing.assert_array_equal(series.timestamps, timestamps.values)
+    np.testing.assert_array_equal(series.kw, kw)
+
+
+def test_reingest_replaces_reading(store):
+    store.ingest("site-a", ["2026-03-01T14:00:00"], [10.0])
+    store.ingest("site-a", ["2026-03-01T14:00:00"], [12.5])
+    assert store.count("site-a") == 1
+    assert store.read("site-a").kw.tolist() == [12.5]
+
+
+def test_missing_kw_round_trips_as_nan(store):
+    store.ingest("site-a", ["2026-03-01T00:00:00", "2026-03-01T01:00:00"], [np.nan, 3.0])
+    kw = store.read("site-a").kw
+    assert np.isnan(kw[0]) and kw[1] == 3.0
+
+
+def test_sites_are_kept_apart(store):
+    timestamps, kw = _hourly(days=1)
+    store.ingest(["site-a"] * 24 + ["site-b"] * 24, timestamps.append(timestamps), np.r_[kw, -kw])
+    assert store.sites() == ["site-a", "site-b"]
+    assert store.read("site-b").kw.max() < 0
+    assert store.count() == 48
+
+
+def test_aware_timestamps_are_stored_as_utc(store):
+    store.ingest("site-a", ["2026-03-01T09:00:00+09:00"], [1.0])
+    assert store.latest("site-a") == pd.Timestamp("2026-03-01T00:00:00", tz="UTC")
+    assert store.latest("site-x") is None
+
+
+def test_unparseable_timestamp_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.ingest("site-a", ["2026-03-01T00:00:00", None], [1.0, 2.0])
+    assert store.count() == 0
+
+
+def test_length_mismatch_is_rejected(store):
+    with pytest.raises(ValueError, match="same length"):
+        store.ingest(["site-a"], ["2026-03-01T00:00:00", "2026-03-01T01:00:00"], [1.0, 2.0])
+
+
+def test_history_matches_engine_on_frame(store):
+    timestamps, kw = _hourly(days=10)
+    store.ingest("site-a", timestamps, kw)
+    engine = BaselineEngine()
+    frame = pd.DataFrame({"timestamp": timestamps, "kw": kw})
+    assert engine.compute_all(store.history("site-a"), 14) == engine.compute_all(frame, 14)
+
+
+def test_history_in_local_time_matches_engine_on_aware_frame(store):
+    timestamps = pd.date_range("2026-03-01T00:00:00-07:00", periods=24 * 10, freq="h")
+    kw = 100.0 + np.arange(len(timestamps)) % 24
+    store.ingest("site-a", timestamps, kw)
+    engine = BaselineEngine()
+    frame = pd.DataFrame({"timestamp": timestamps.astype(str), "kw": kw})
+    inline = engine.compute_all(frame, 14)
+    assert engine.compute_all(store.history("site-a", tz="-07:00"), 14) == inline
+    assert engine.compute_all(store.history("site-a"), 14) != inline
+
+
+@pytest.mark.parametrize("tz", ["America/Denver", "-07:00", "+0530"])
+def test_parse_timezone_accepts_zones_and_offsets(tz):
+    assert parse_timezone(tz) is not None
+
+
+@pytest.mark.parametrize("tz", ["", "Mars/Olympus", "+25:00", "7"])
+def test_parse_timezone_rejects_unknown(tz):
+    with pytest.raises(ValueError):
+        parse_timezone(tz)
+
+
+def test_migration_is_recorded_once(tmp_path: Path):
+    db = open_storage(str(tmp_path / "meter.db"))
+    MeterStore(db=db)
+    MeterStore(db=db)
+    assert schema_version(db, "meter") == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
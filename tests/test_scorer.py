@@ -0,0 +1,78 @@
+"""Tests for scalar and vectorized payout scoring."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.scorer import calculate_payout, calculate_payouts
+
+INT64_MAX = np.iinfo(np.int64).max
+INT64_MIN = np.iinfo(np.int64).min
+
+
+# ---------------------------------------------------------------------------
+# calculate_payouts
+# ---------------------------------------------------------------------------
+
+
+class TestCalculatePayouts:
+    def test_matches_scalar_formula(self):
+        rng = np.random.default_rng(3)
+        reductions = rng.integers(-50, 500, size=2000)
+        shares = rng.integers(0, 400, size=2000)
+        expected = [
+            calculate_payout(int(r), int(s), 10, 5) for r, s in zip(reductions, shares)
+        ]
+        result = calculate_payouts(reductions, shares, 10, 5)
+        assert result.dtype == np.int64
+        assert result.tolist() == expected
+
+    def test_scalar_share_broadcasts(self):
+        result = calculate_payouts([0, 50, 100, 150], 100, 10, 5)
+        assert result.tolist() == [calculate_payout(r, 100, 10, 5) for r in (0, 50, 100, 150)]
+
+    def test_empty_input(self):
+        assert calculate_payouts([], 100, 10, 5).tolist() == []
+
+    def test_exact_at_int64_limits(self):
+        # Full reward exactly at INT64_MAX, and a shortfall ending at INT64_MIN.
+        assert calculate_payouts([1], [1], INT64_MAX, 0).tolist() == [INT64_MAX]
+        assert calculate_payouts([0], [1], 0, -INT64_MIN - 1).tolist() == [INT64_MIN + 1]
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ([10], [10], INT64_MAX, 0),  # share * reward_rate
+            ([0], [2], 1, INT64_MAX),  # shortfall * penalty_rate
+            ([INT64_MIN], [INT64_MAX], 0, 0),  # share - reduction
+            ([-1], [0], INT64_MAX, INT64_MAX),  # reward - penalty
+            ([-1], [0], INT64_MIN, 0),  # -1 * INT64_MIN
+        ],
+    )
+    def test_overflow_is_raised(self, args):
+        with pytest.raises(OverflowError):
+            calculate_payouts(*args)
+
+    def test_overflow_in_unselected_branch_is_ignored(self):
+        # The shortfall branch would overflow, but the target is met.
+        assert calculate_payouts([5], [5], 2, INT64_MAX).tolist() == [10]
+
+    def test_oversized_python_int_is_rejected(self):
+        with pytest.raises(OverflowError, match="reductions_kwh"):
+            calculate_payouts([2**64], 1, 1, 1)
+
+    def test_float_input_is_rejected(self):
+        with pytest.raises(TypeError):
+            calculate_payouts([1.5], 1, 1, 1)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,158 @@
+"""Tests for batched pending-tx reconciliation in SubmitterService."""
+
+from __future__ import annotations
+
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.dto import EventCreateRequest, ProofSubmitRequest
+from services.submitter import ServiceError, SubmitterService
+
+
+class FakeChain:
+    """Stands in for the Node chain action worker in live hybrid mode."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count(1)
+        self.confirmed: set[str] = set()
+        self.check_calls: list[list[str]] = []
+
+    def chain_tx(self, action: str, payload: dict) -> dict:
+        tx_hash = "0x" + f"{next(self._counter):064x}"
+        if action == "create_event":
+            self.confirmed.add(tx_hash)
+        return {
+            "tx_hash": tx_hash,
+            "tx_fee_wei": None,
+            "tx_state": "submitted",
+            "tx_submitted_at": "2026-03-07T14:53:24Z",
+            "tx_confirmed_at": None,
+            "tx_error": None,
+        }
+
+    def chain_action(self, action: str, payload: dict, confirm_mode=None) -> dict:
+        assert action == "check_txs"
+        hashes = list(payload["tx_hashes"])
+        self.check_calls.append(hashes)
+        results = []
+        for tx_hash in hashes:
+            if tx_hash in self.confirmed:
+                results.append(
+                    {
+                        "tx_hash": tx_hash,
+                        "tx_state": "confirmed",
+                        "fee_wei": "21000",
+                        "confirmed_at": "2026-03-07T14:54:00Z",
+                        "error": None,
+                    }
+                )
+            else:
+                results.append({"tx_hash": tx_hash, "tx_state": "submitted"})
+        return {"ok": True, "action": action, "results": results}
+
+
+@pytest.fixture()
+def live_svc(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "fuji-live")
+    monkeypatch.setenv("DR_TX_CONFIRM_MODE", "hybrid")
+    chain = FakeChain()
+    monkeypatch.setattr(
+        SubmitterService, "_chain_tx", lambda self, *args: chain.chain_tx(*args)
+    )
+    monkeypatch.setattr(
+        SubmitterService,
+        "_chain_action",
+        lambda self, *args, **kwargs: chain.chain_action(*args, **kwargs),
+    )
+    svc = SubmitterService(db_path=str(tmp_path / "reconcile.db"))
+    return svc, chain
+
+
+def _seed_event_with_proofs(svc: SubmitterService, event_id: str, sites: int) -> None:
+    svc.create_event(
+        EventCreateRequest(
+            event_id=event_id,
+            start_time="2026-03-07T14:54:21Z",
+            end_time="2026-03-07T15:54:21Z",
+            target_kw=1000,
+            reward_rate=10,
+            penalty_rate=5,
+        )
+    )
+    for i in range(sites):
+        svc.submit_proof(
+            ProofSubmitRequest(
+                event_id=event_id,
+                site_id=f"site-{i:03d}",
+                baseline_kwh=150,
+                actual_kwh=40,
+                uri=f"ipfs://site-{i:03d}",
+            ),
+            actor_id=f"site-{i:03d}",
+        )
+
+
+def test_reconcile_uses_one_batched_lookup(live_svc):
+    svc, chain = live_svc
+    _seed_event_with_proofs(svc, "evt-batch", sites=12)
+
+    chain.check_calls.clear()
+    event = svc.get_event("evt-batch")
+
+    assert event.tx_state == "confirmed"
+    assert len(chain.check_calls) == 1
+    assert len(chain.check_calls[0]) == 12
+
+
+def test_reconcile_respects_batch_size(live_svc, monkeypatch):
+    svc, chain = live_svc
+    _seed_event_with_proofs(svc, "evt-chunked", sites=10)
+    monkeypatch.setenv("DR_CHECK_TX_BATCH_SIZE", "4")
+
+    chain.check_calls.clear()
+    svc.get_event("evt-chunked")
+
+    assert [len(batch) for batch in chain.check_calls] == [4, 4, 2]
+
+
+def test_reconcile_applies_results_per_row(live_svc):
+    svc, chain = live_svc
+    _seed_event_with_proofs(svc, "evt-apply", sites=3)
+    rows = svc._db.fetchall(
+        "SELECT tx_hash FROM proofs WHERE event_id = ? ORDER BY site_id", ("evt-apply",)
+    )
+    chain.confirmed.add(rows[1]["tx_hash"])
+
+    svc.get_event("evt-apply")
+
+    states = svc._db.fetchall(
+        "SELECT site_id, tx_state, tx_fee_wei FROM proofs WHERE event_id = ? ORDER BY site_id",
+        ("evt-apply",),
+    )
+    assert [r["tx_state"] for r in states] == ["submitted", "confirmed", "submitted"]
+    assert states[1]["tx_fee_wei"] == "21000"
+
+
+def test_malformed_batch_response_is_rejected(live_svc, monkeypatch):
+    svc, chain = live_svc
+    _seed_event_with_proofs(svc, "evt-bad", sites=2)
+    monkeypatch.setattr(
+        SubmitterService,
+        "_chain_action",
+        lambda self, action, payload, confirm_mode=None: {"ok": True, "results": []},
+    )
+
+    with pytest.raises(ServiceError) as exc_info:
+        svc.get_event("evt-bad")
+    assert exc_info.value.code == "CHAIN_TX_INVALID_RESPONSE"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,136 @@
+"""Tests for set-based settlement in SubmitterService.settle_event."""
+
+from __future__ import annotations
+
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.dto import EventCreateRequest, ProofSubmitRequest
+from services.scorer import calculate_payout
+from services.submitter import ServiceError, SubmitterService
+
+
+@pytest.fixture()
+def svc(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "simulated")
+    counter = itertools.count(1)
+
+    def fake_chain_tx(self, action: str, payload: dict) -> dict:
+        return {
+            "tx_hash": "0x" + f"{next(counter):064x}",
+            "tx_fee_wei": "21000",
+            "tx_state": "confirmed",
+            "tx_submitted_at": "2026-03-07T14:53:24Z",
+            "tx_confirmed_at": "2026-03-07T14:53:30Z",
+            "tx_error": None,
+        }
+
+    monkeypatch.setattr(SubmitterService, "_chain_tx", fake_chain_tx)
+    service = SubmitterService(db_path=str(tmp_path / "settle.db"))
+    yield service
+    service.tx_watcher.close()
+
+
+def _closed_event(svc: SubmitterService, event_id: str, sites: int) -> list[str]:
+    svc.create_event(
+        EventCreateRequest(
+            event_id=event_id,
+            start_time="2026-03-07T14:54:21Z",
+            end_time="2026-03-07T15:54:21Z",
+            target_kw=sites * 100,
+            reward_rate=10,
+            penalty_rate=5,
+        )
+    )
+    site_ids = [f"site-{i:04d}" for i in range(sites)]
+    for i, site_id in enumerate(site_ids):
+        svc.submit_proof(
+            ProofSubmitRequest(
+                event_id=event_id,
+                site_id=site_id,
+                baseline_kwh=200,
+                actual_kwh=200 - (i % 150),
+                uri=f"ipfs://{site_id}",
+            ),
+            actor_id=site_id,
+        )
+    svc.close_event(event_id)
+    return site_ids
+
+
+class CountingStorage:
+    """Counts statements issued through the storage context."""
+
+    def __init__(self, svc: SubmitterService, monkeypatch) -> None:
+        self.calls: list[str] = []
+        for name in ("fetchone", "fetchall", "execute", "executemany"):
+            original = getattr(svc._db, name)
+            monkeypatch.setattr(svc._db, name, self._wrap(name, original))
+
+    def _wrap(self, name, original):
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return original(*args, **kwargs)
+
+        return call
+
+
+def test_statement_count_does_not_grow_with_sites(svc: SubmitterService, monkeypatch):
+    small = _closed_event(svc, "evt-small", sites=3)
+    large = _closed_event(svc, "evt-large", sites=120)
+    counter = CountingStorage(svc, monkeypatch)
+
+    svc.settle_event("evt-small", small)
+    small_calls = list(counter.calls)
+    counter.calls.clear()
+    svc.settle_event("evt-large", large)
+
+    assert counter.calls == small_calls
+    assert counter.calls.count("executemany") == 1
+
+
+def test_payouts_match_scorer(svc: SubmitterService):
+    site_ids = _closed_event(svc, "evt-pay", sites=20)
+    settled = svc.settle_event("evt-pay", [])
+
+    assert [s.site_id for s in settled] == site_ids
+    proofs = {
+        row["site_id"]: row["reduction_kwh"]
+        for row in svc._db.fetchall(
+            "SELECT site_id, reduction_kwh FROM proofs WHERE event_id = ?", ("evt-pay",)
+        )
+    }
+    for s in settled:
+        assert s.payout == calculate_payout(proofs[s.site_id], 100, 10, 5)
+    stored = svc._db.fetchall(
+        "SELECT site_id, payout, tx_state FROM settlements WHERE event_id = ? ORDER BY site_id",
+        ("evt-pay",),
+    )
+    assert [(r["site_id"], r["payout"]) for r in stored] == [(s.site_id, s.payout) for s in settled]
+    assert {r["tx_state"] for r in stored} == {"confirmed"}
+
+
+def test_duplicate_site_ids_are_settled_once(svc: SubmitterService):
+    _closed_event(svc, "evt-dup", sites=2)
+    settled = svc.settle_event("evt-dup", ["site-0001", "site-0000", "site-0001"])
+    assert [s.site_id for s in settled] == ["site-0001", "site-0000"]
+
+
+def test_missing_proof_reports_first_offending_site(svc: SubmitterService):
+    _closed_event(svc, "evt-missing", sites=2)
+    with pytest.raises(ServiceError) as exc_info:
+        svc.settle_event("evt-missing", ["site-0000", "site-9999"])
+    assert exc_info.value.code == "PROOF_MISSING"
+    assert exc_info.value.details == {"site_id": "site-9999"}
+    assert svc._db.fetchall("SELECT * FROM settlements") == []
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
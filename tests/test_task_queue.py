@@ -8,6 +8,7 @@ testing, Redis/Celery for production).
 from __future__ import annotations
 
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -17,12 +18,16 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from services.db import migrate, open_storage
 from services.task_queue import (
+    TASK_MIGRATIONS,
+    DurableTaskQueue,
     Task,
     TaskStatus,
     TaskQueue,
     InMemoryTaskQueue,
     TaskType,
+    create_task_queue,
 )
 
 
@@ -102,7 +107,8 @@ class TestInMemoryTaskQueue:
 
         task = q.dequeue()
         assert task is not None
-        assert task.task_type == TaskType.CONFIRM_TX
+        # Relays outrank confirmation polls.
+        assert task.task_type == TaskType.BRIDGE_RELAY
         assert task.status == TaskStatus.RUNNING
 
     def test_dequeue_empty_returns_none(self):
@@ -200,6 +206,426 @@ class TestInMemoryTaskQueue:
         with pytest.raises(ValueError, match="max retries"):
             q.retry(task.task_id)
 
+    def test_priority_lanes(self):
+        q = InMemoryTaskQueue()
+        for i in range(3):
+            q.enqueue(TaskType.CONFIRM_TX, {"n": i})
+        settle = q.enqueue(TaskType.SETTLE_EVENT, {"event_id": "evt-1"})
+        urgent = q.enqueue(TaskType.CONFIRM_TX, {"n": 3}, priority=0)
+
+        order = [t.task_id for t in q.dequeue_batch(5)]
+        assert order[:2] == [settle.task_id, urgent.task_id]
+        assert [q.get(i).payload["n"] for i in order[2:]] == [0, 1, 2]
+
+    def test_not_before_holds_task(self):
+        clock = FakeClock()
+        q = InMemoryTaskQueue(clock=clock)
+        later = q.enqueue(TaskType.SETTLE_EVENT, {}, not_before=clock.now + 10)
+        now = q.enqueue(TaskType.CONFIRM_TX, {})
+        assert q.dequeue().task_id == now.task_id
+        assert q.dequeue() is None
+        clock.now += 10
+        assert q.dequeue().task_id == later.task_id
+
+    def test_exhausted_task_is_dead_lettered(self):
+        q = InMemoryTaskQueue(max_retries=0)
+        task = q.enqueue(TaskType.ICM_DELIVER, {"message_id": "m1"})
+        q.dequeue()
+        q.fail(task.task_id, error="relay reverted")
+        with pytest.raises(ValueError, match="dead letter"):
+            q.retry(task.task_id)
+        assert q.get(task.task_id).status == TaskStatus.DEAD_LETTER
+        assert [t.task_id for t in q.dead_letters()] == [task.task_id]
+
+        requeued = q.requeue_dead_letter(task.task_id)
+        assert requeued.status == TaskStatus.PENDING and requeued.retry_count == 0
+        assert q.dead_letters() == []
+        assert q.dequeue().task_id == task.task_id
+        with pytest.raises(ValueError, match="not dead_letter"):
+            q.requeue_dead_letter(task.task_id)
+
+    def test_counters_follow_transitions(self):
+        q = InMemoryTaskQueue(max_retries=0)
+        a = q.enqueue(TaskType.CONFIRM_TX, {})
+        b = q.enqueue(TaskType.CONFIRM_TX, {})
+        c = q.enqueue(TaskType.SETTLE_EVENT, {})
+        q.dequeue_batch(3)
+        q.complete(c.task_id)
+        q.fail(a.task_id, "boom")
+        with pytest.raises(ValueError):
+            q.retry(a.task_id)
+
+        assert q.counts() == {
+            "pending": 0, "running": 1, "completed": 1, "failed": 0, "dead_letter": 1,
+        }
+        by_type = q.counts_by_type()
+        assert by_type["confirm_tx"]["running"] == 1
+        assert by_type["confirm_tx"]["dead_letter"] == 1
+        assert by_type["settle_event"]["completed"] == 1
+        assert sum(by_type["icm_deliver"].values()) == 0
+        assert q.list_by_status(TaskStatus.RUNNING) == [b]
+
+    def test_finished_tasks_expire_after_ttl(self):
+        clock = FakeClock()
+        q = InMemoryTaskQueue(clock=clock, finished_ttl_s=60)
+        done = q.enqueue(TaskType.CONFIRM_TX, {})
+        q.dequeue()
+        q.complete(done.task_id)
+        clock.now += 59
+        q.enqueue(TaskType.CONFIRM_TX, {})
+        assert q.get(done.task_id) is not None
+        clock.now += 1
+        q.enqueue(TaskType.CONFIRM_TX, {})
+        assert q.get(done.task_id) is None
+        assert q.counts()["completed"] == 0
+        assert len(q.list_by_type(TaskType.CONFIRM_TX)) == 2
+        assert q.evicted_count() == 1
+
+    def test_dedup_key_returns_in_flight_task(self):
+        q = InMemoryTaskQueue()
+        first = q.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"}, dedup_key="confirm:0x1")
+        assert q.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1") is first
+        q.dequeue()
+        assert q.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1") is first
+        assert q.pending_count() == 0
+
+        q.complete(first.task_id)
+        second = q.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert second.task_id != first.task_id
+
+    def test_retried_task_yields_key_to_newer_task(self):
+        q = InMemoryTaskQueue()
+        old = q.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1")
+        q.dequeue()
+        q.fail(old.task_id, "boom")
+        new = q.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1")
+        assert new.task_id != old.task_id
+
+        q.retry(old.task_id)
+        assert q.get(old.task_id).dedup_key is None
+        assert q.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1") is new
+
+    def test_finished_tasks_capped_oldest_first(self):
+        q = InMemoryTaskQueue(max_finished=2)
+        tasks = [q.enqueue(TaskType.ICM_DELIVER, {"n": i}) for i in range(5)]
+        for task in q.dequeue_batch(5):
+            q.complete(task.task_id)
+        assert [q.get(t.task_id) is not None for t in tasks] == [False, False, False, True, True]
+        assert q.counts()["completed"] == 2
+        assert q.counts_by_type()["icm_deliver"]["completed"] == 2
+
+    def test_shared_between_threads(self):
+        q = InMemoryTaskQueue(max_finished=5, finished_ttl_s=0.001)
+        errors: list[BaseException] = []
+
+        def producer():
+            for i in range(2000):
+                q.enqueue(TaskType.CONFIRM_TX, {"n": i}, not_before=time.time() + 0.0005)
+
+        def consumer():
+            deadline = time.monotonic() + 20
+            while q.evicted_count() + q.counts()["completed"] < 4000:
+                assert time.monotonic() < deadline
+                for task in q.dequeue_batch(8):
+                    q.complete(task.task_id)
+
+        def reader():
+            for _ in range(2000):
+                q.counts_by_type()
+                q.list_by_status(TaskStatus.COMPLETED)
+
+        def guarded(fn):
+            def run():
+                try:
+                    fn()
+                except BaseException as exc:
+                    errors.append(exc)
+            return run
+
+        threads = [
+            threading.Thread(target=guarded(fn))
+            for fn in (producer, producer, consumer, consumer, reader)
+        ]
+        # Switch threads often so unguarded dict iteration would be caught.
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=30)
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert errors == []
+        assert q.evicted_count() + q.counts()["completed"] == 4000
+
+
+# ---------------------------------------------------------------------------
+# DurableTaskQueue
+# ---------------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture()
+def durable(tmp_path, clock) -> DurableTaskQueue:
+    return DurableTaskQueue(
+        db_path=str(tmp_path / "tasks.db"), visibility_timeout_s=30, clock=clock
+    )
+
+
+class TestDurableTaskQueue:
+    def test_fifo_claim_marks_running(self, durable):
+        for i in range(3):
+            durable.enqueue(TaskType.CONFIRM_TX, {"order": i})
+        task = durable.dequeue()
+        assert task.payload == {"order": 0}
+        assert task.status == TaskStatus.RUNNING
+        assert durable.get(task.task_id).status == TaskStatus.RUNNING
+        assert durable.pending_count() == 2
+
+    def test_batch_dequeue_claims_each_task_once(self, durable):
+        durable.enqueue_many([(TaskType.ICM_DELIVER, {"n": i}) for i in range(10)])
+        first = durable.dequeue_batch(4)
+        second = durable.dequeue_batch(10)
+        assert [t.payload["n"] for t in first] == [0, 1, 2, 3]
+        assert [t.payload["n"] for t in second] == [4, 5, 6, 7, 8, 9]
+        assert durable.dequeue_batch(10) == []
+
+    def test_tasks_survive_restart(self, tmp_path, clock):
+        path = str(tmp_path / "tasks.db")
+        task = DurableTaskQueue(db_path=path, clock=clock).enqueue(
+            TaskType.SETTLE_EVENT, {"event_id": "evt-1"}
+        )
+        restarted = DurableTaskQueue(db_path=path, clock=clock)
+        assert restarted.pending_count() == 1
+        assert restarted.dequeue().task_id == task.task_id
+
+    def test_expired_lease_is_redelivered(self, durable, clock):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"})
+        assert durable.dequeue().task_id == task.task_id
+
+        clock.now += 29
+        assert durable.dequeue() is None
+        clock.now += 2
+        again = durable.dequeue()
+        assert again.task_id == task.task_id
+
+    def test_expired_lease_counts_as_retry(self, durable, clock):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        for attempt in range(3):
+            assert durable.dequeue().retry_count == attempt
+            clock.now += 31
+        assert durable.dequeue().retry_count == 3
+        clock.now += 31
+
+        assert durable.dequeue() is None
+        dead = durable.get(task.task_id)
+        assert dead.status == TaskStatus.DEAD_LETTER
+        assert dead.error == "lease expired"
+        fresh = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert fresh.task_id != task.task_id
+
+    def test_extend_lease_keeps_task_claimed(self, durable, clock):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {})
+        durable.dequeue()
+        clock.now += 25
+        durable.extend_lease(task.task_id)
+        clock.now += 25
+        assert durable.dequeue() is None
+
+    def test_extend_lease_requires_running(self, durable):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {})
+        with pytest.raises(ValueError, match="not running"):
+            durable.extend_lease(task.task_id)
+
+    def test_complete_fail_and_retry(self, durable):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"})
+        durable.dequeue()
+        failed = durable.fail(task.task_id, error="rpc timeout")
+        assert failed.status == TaskStatus.FAILED and failed.error == "rpc timeout"
+
+        retried = durable.retry(task.task_id)
+        assert retried.status == TaskStatus.PENDING
+        assert retried.retry_count == 1 and retried.error is None
+
+        durable.dequeue()
+        done = durable.complete(task.task_id, result={"fee_wei": "21000"})
+        assert done.status == TaskStatus.COMPLETED
+        assert durable.get(task.task_id).result == {"fee_wei": "21000"}
+
+    def test_max_retries(self, tmp_path, clock):
+        q = DurableTaskQueue(db_path=str(tmp_path / "tasks.db"), max_retries=1, clock=clock)
+        task = q.enqueue(TaskType.CONFIRM_TX, {})
+        q.dequeue()
+        q.fail(task.task_id, error="err")
+        q.retry(task.task_id)
+        q.dequeue()
+        q.fail(task.task_id, error="err")
+        with pytest.raises(ValueError, match="max retries"):
+            q.retry(task.task_id)
+
+    def test_claims_by_priority(self, durable):
+        durable.enqueue_many([(TaskType.CONFIRM_TX, {"n": i}) for i in range(3)])
+        settle = durable.enqueue(TaskType.SETTLE_EVENT, {"event_id": "evt-1"})
+        claimed = durable.dequeue_batch(2)
+        assert claimed[0].task_id == settle.task_id
+        assert claimed[1].payload == {"n": 0}
+        assert settle.priority == 0 and claimed[1].priority == 2
+
+    def test_not_before_holds_task(self, durable, clock):
+        task = durable.enqueue(TaskType.SETTLE_EVENT, {}, not_before=clock.now + 60)
+        assert durable.dequeue() is None
+        assert durable.pending_count() == 1
+        clock.now += 60
+        assert durable.dequeue().task_id == task.task_id
+
+    def test_exhausted_task_is_dead_lettered(self, tmp_path, clock):
+        q = DurableTaskQueue(db_path=str(tmp_path / "tasks.db"), max_retries=0, clock=clock)
+        task = q.enqueue(TaskType.BRIDGE_RELAY, {"transfer_id": "t1"})
+        q.dequeue()
+        q.fail(task.task_id, error="relay reverted")
+        with pytest.raises(ValueError, match="dead letter"):
+            q.retry(task.task_id)
+        dead = q.dead_letters()
+        assert [t.task_id for t in dead] == [task.task_id]
+        assert dead[0].status == TaskStatus.DEAD_LETTER and dead[0].error == "relay reverted"
+        assert q.counts()["dead_letter"] == 1
+
+        assert q.requeue_dead_letter(task.task_id).retry_count == 0
+        assert q.dequeue().task_id == task.task_id
+        with pytest.raises(ValueError, match="not dead_letter"):
+            q.requeue_dead_letter(task.task_id)
+
+    def test_priority_migration_backfills_existing_tasks(self, tmp_path, clock):
+        db = open_storage(str(tmp_path / "tasks.db"))
+        migrate(db, "task_queue", TASK_MIGRATIONS[:1])
+        with db.write():
+            db.executemany(
+                "INSERT INTO tasks (task_id, task_type, payload, status, available_at, "
+                "created_at, updated_at) VALUES (?, ?, '{}', 'pending', 0, 0, 0)",
+                [("task-old-confirm", "confirm_tx"), ("task-old-settle", "settle_event")],
+            )
+        q = DurableTaskQueue(db=db, clock=clock)
+        assert q.get("task-old-confirm").priority == 2
+        assert q.dequeue().task_id == "task-old-settle"
+
+    def test_counts_by_type(self, durable):
+        durable.enqueue(TaskType.CONFIRM_TX, {})
+        durable.enqueue(TaskType.SETTLE_EVENT, {})
+        durable.dequeue()
+        by_type = durable.counts_by_type()
+        assert by_type["settle_event"]["running"] == 1
+        assert by_type["confirm_tx"]["pending"] == 1
+        assert by_type["bridge_relay"] == {s.value: 0 for s in TaskStatus}
+
+    def test_finished_tasks_purged_after_ttl(self, tmp_path, clock):
+        q = DurableTaskQueue(db_path=str(tmp_path / "tasks.db"), clock=clock, finished_ttl_s=60)
+        done, failed, pending = (q.enqueue(TaskType.CONFIRM_TX, {}) for _ in range(3))
+        q.dequeue_batch(2)
+        q.complete(done.task_id)
+        q.fail(failed.task_id, "boom")
+        clock.now += 59
+        assert q.purge_finished() == 0
+        clock.now += 1
+        assert q.purge_finished() == 2
+        assert q.get(done.task_id) is None
+        assert q.counts() == {
+            "pending": 1, "running": 0, "completed": 0, "failed": 0, "dead_letter": 0,
+        }
+
+    def test_dead_letters_purged_after_their_ttl(self, tmp_path, clock):
+        q = DurableTaskQueue(
+            db_path=str(tmp_path / "tasks.db"), clock=clock, max_retries=0,
+            finished_ttl_s=60, dead_letter_ttl_s=600,
+        )
+        task = q.enqueue(TaskType.CONFIRM_TX, {})
+        q.dequeue()
+        with pytest.raises(ValueError, match="dead letter"):
+            q.retry(task.task_id)
+        clock.now += 599
+        assert q.purge_finished() == 0
+        assert [t.task_id for t in q.dead_letters()] == [task.task_id]
+        clock.now += 1
+        assert q.purge_finished() == 1
+        assert q.dead_letters() == []
+
+    def test_summary_counts_read_only_the_index(self, tmp_path, clock):
+        db = open_storage(str(tmp_path / "tasks.db"))
+        DurableTaskQueue(db=db, clock=clock)
+        plan = " ".join(
+            str(row["detail"]) for row in db.fetchall(
+                "EXPLAIN QUERY PLAN "
+                "SELECT task_type, status, COUNT(*) AS n FROM tasks GROUP BY task_type, status"
+            )
+        )
+        assert "COVERING INDEX idx_tasks_type_status" in plan
+
+    def test_dedup_key_returns_in_flight_task(self, durable):
+        first = durable.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"}, dedup_key="confirm:0x1")
+        again = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert again.task_id == first.task_id and again.payload == {"tx_hash": "0x1"}
+        durable.dequeue()
+        held = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert held.task_id == first.task_id
+
+        durable.complete(first.task_id)
+        second = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert second.task_id != first.task_id
+        assert durable.counts()["pending"] == 1
+
+    def test_retried_task_yields_key_to_newer_task(self, durable):
+        old = durable.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1")
+        durable.dequeue()
+        durable.fail(old.task_id, "boom")
+        new = durable.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1")
+        assert new.task_id != old.task_id
+
+        assert durable.retry(old.task_id).dedup_key is None
+        assert durable.enqueue(TaskType.ICM_DELIVER, {}, dedup_key="icm:m1").task_id == new.task_id
+
+    def test_retry_from_running_keeps_dedup_key(self, durable):
+        task = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        durable.dequeue()
+        assert durable.retry(task.task_id).dedup_key == "confirm:0x1"
+        again = durable.enqueue(TaskType.CONFIRM_TX, {}, dedup_key="confirm:0x1")
+        assert again.task_id == task.task_id
+
+    def test_complete_many(self, durable):
+        durable.enqueue_many([(TaskType.CONFIRM_TX, {"n": i}) for i in range(3)])
+        tasks = durable.dequeue_batch(3)
+        durable.complete_many({t.task_id: {"n": t.payload["n"]} for t in tasks})
+        assert durable.counts()["completed"] == 3
+        assert durable.get(tasks[2].task_id).result == {"n": 2}
+
+    def test_unknown_task_raises(self, durable):
+        with pytest.raises(ValueError, match="task not found"):
+            durable.complete("task-missing")
+
+    def test_list_by_type(self, durable):
+        durable.enqueue(TaskType.CONFIRM_TX, {})
+        durable.enqueue(TaskType.BRIDGE_RELAY, {})
+        durable.enqueue(TaskType.CONFIRM_TX, {})
+        assert len(durable.list_by_type(TaskType.CONFIRM_TX)) == 2
+
+    def test_factory_selects_backend(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("DR_TASK_QUEUE", "memory")
+        assert isinstance(create_task_queue(), InMemoryTaskQueue)
+        monkeypatch.setenv("DR_TASK_QUEUE", "durable")
+        monkeypatch.setenv("DR_AGENT_DB", str(tmp_path / "tasks.db"))
+        assert isinstance(create_task_queue(), DurableTaskQueue)
+
 
 # ---------------------------------------------------------------------------
 # TaskQueue protocol compliance
@@ -212,6 +638,11 @@ class TestTaskQueueProtocol:
         task = q.enqueue(TaskType.CONFIRM_TX, {})
         assert task.status == TaskStatus.PENDING
 
+    def test_durable_implements_protocol(self, tmp_path):
+        q: TaskQueue = DurableTaskQueue(db_path=str(tmp_path / "tasks.db"))
+        task = q.enqueue(TaskType.CONFIRM_TX, {})
+        assert q.dequeue_batch(5)[0].task_id == task.task_id
+
 
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, "-v"]))
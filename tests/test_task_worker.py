@@ -0,0 +1,359 @@
+"""Tests for the asyncio task worker runtime."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.api import create_app
+from services.icm import ICMService
+from services.submitter import ServiceError, SubmitterService
+from services.task_queue import DurableTaskQueue, InMemoryTaskQueue, TaskStatus, TaskType
+from services.task_worker import (
+    PermanentTaskError,
+    TaskWorker,
+    service_batch_handlers,
+    service_handlers,
+)
+
+OP_HEADERS = {"x-api-key": "operator-key", "x-actor-id": "operator"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _worker(queue, handlers, **kwargs) -> TaskWorker:
+    kwargs.setdefault("backoff_base_s", 0.0)
+    kwargs.setdefault("jitter", 0.0)
+    return TaskWorker(queue, handlers, poll_seconds=0.01, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# TaskWorker
+# ---------------------------------------------------------------------------
+
+class TestTaskWorker:
+    def test_handler_result_completes_task(self):
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"})
+
+        async def handler(t):
+            return {"seen": t.payload["tx_hash"]}
+
+        asyncio.run(_worker(queue, {TaskType.CONFIRM_TX: handler}).drain())
+        done = queue.get(task.task_id)
+        assert done.status == TaskStatus.COMPLETED
+        assert done.result == {"seen": "0x1"}
+
+    def test_transient_error_is_retried(self):
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.ICM_DELIVER, {"message_id": "m1"})
+        calls = []
+
+        async def flaky(t):
+            calls.append(t.retry_count)
+            if len(calls) < 3:
+                raise RuntimeError("rpc timeout")
+            return None
+
+        worker = _worker(queue, {TaskType.ICM_DELIVER: flaky})
+        asyncio.run(worker.drain())
+        assert calls == [0, 1, 2]
+        assert queue.get(task.task_id).status == TaskStatus.COMPLETED
+        assert worker.health()["retried"] == 2
+
+    def test_retry_waits_for_backoff(self):
+        clock = FakeClock()
+        queue = InMemoryTaskQueue(clock=clock)
+        queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0x1"})
+        calls = []
+
+        async def failing(t):
+            calls.append(t.retry_count)
+            raise RuntimeError("pending")
+
+        worker = _worker(
+            queue, {TaskType.CONFIRM_TX: failing}, backoff_base_s=2.0, backoff_max_s=5.0
+        )
+        asyncio.run(worker.drain())
+        assert calls == [0]
+        clock.now += 1.9
+        asyncio.run(worker.drain())
+        assert calls == [0]
+        clock.now += 0.2
+        asyncio.run(worker.drain())
+        assert calls == [0, 1]
+        assert [worker.backoff(n) for n in range(4)] == [2.0, 4.0, 5.0, 5.0]
+
+    def test_backoff_jitter_stays_within_bounds(self):
+        worker = _worker(
+            InMemoryTaskQueue(), {}, backoff_base_s=4.0, jitter=0.5, rng=random.Random(7)
+        )
+        delays = [worker.backoff(1) for _ in range(50)]
+        assert all(4.0 <= d <= 8.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_exhausted_retries_dead_letter_task(self):
+        queue = InMemoryTaskQueue(max_retries=2)
+        task = queue.enqueue(TaskType.CONFIRM_TX, {})
+
+        async def failing(t):
+            raise RuntimeError("boom")
+
+        worker = _worker(queue, {TaskType.CONFIRM_TX: failing})
+        asyncio.run(worker.drain())
+        failed = queue.get(task.task_id)
+        assert failed.status == TaskStatus.DEAD_LETTER
+        assert failed.retry_count == 2 and failed.error == "boom"
+        assert queue.dead_letters() == [failed]
+        assert worker.health()["failed"] == 1
+
+    @pytest.mark.parametrize("exc", [
+        PermanentTaskError("bad payload"),
+        ServiceError(404, "NOT_FOUND", "missing"),
+    ])
+    def test_permanent_errors_are_not_retried(self, exc):
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.SETTLE_EVENT, {})
+
+        async def handler(t):
+            raise exc
+
+        asyncio.run(_worker(queue, {TaskType.SETTLE_EVENT: handler}).drain())
+        assert queue.get(task.task_id).status == TaskStatus.FAILED
+        assert queue.get(task.task_id).retry_count == 0
+
+    def test_missing_handler_fails_task(self):
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.BRIDGE_RELAY, {})
+        asyncio.run(_worker(queue, {}).drain())
+        assert "no handler" in queue.get(task.task_id).error
+
+    def test_concurrency_limit(self):
+        queue = InMemoryTaskQueue()
+        for i in range(10):
+            queue.enqueue(TaskType.CONFIRM_TX, {"n": i})
+        active = peak = 0
+
+        async def slow(t):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        asyncio.run(_worker(queue, {TaskType.CONFIRM_TX: slow}, concurrency=3).drain())
+        assert peak == 3
+        assert queue.pending_count() == 0
+
+    def test_run_loop_picks_up_new_tasks(self):
+        queue = InMemoryTaskQueue()
+
+        async def scenario():
+            finished = asyncio.Event()
+
+            async def handler(t):
+                finished.set()
+
+            worker = _worker(queue, {TaskType.CONFIRM_TX: handler})
+            worker.start()
+            await asyncio.sleep(0.02)
+            queue.enqueue(TaskType.CONFIRM_TX, {})
+            worker.wake()
+            await asyncio.wait_for(finished.wait(), timeout=2)
+            await worker.stop()
+            return worker.health()
+
+        health = asyncio.run(scenario())
+        assert health["completed"] == 1 and not health["running"]
+
+    def test_batch_handler_coalesces_claims(self):
+        queue = InMemoryTaskQueue()
+        for i in range(10):
+            queue.enqueue(TaskType.CONFIRM_TX, {"n": i})
+        settle = queue.enqueue(TaskType.SETTLE_EVENT, {})
+        batches = []
+
+        async def confirm_all(tasks):
+            batches.append([t.payload["n"] for t in tasks])
+            return {t.task_id: {"n": t.payload["n"]} for t in tasks}
+
+        async def settle_one(t):
+            return None
+
+        worker = _worker(
+            queue,
+            {TaskType.SETTLE_EVENT: settle_one},
+            batch_handlers={TaskType.CONFIRM_TX: confirm_all},
+            concurrency=2,
+        )
+        asyncio.run(worker.drain())
+        assert batches == [list(range(10))]
+        assert queue.get(settle.task_id).status == TaskStatus.COMPLETED
+        assert queue.counts()["completed"] == 11
+        assert worker.health()["batches"] == 1
+
+    def test_batch_size_is_capped(self):
+        queue = InMemoryTaskQueue()
+        for i in range(5):
+            queue.enqueue(TaskType.CONFIRM_TX, {"n": i})
+        sizes = []
+
+        async def confirm_all(tasks):
+            sizes.append(len(tasks))
+            return {}
+
+        worker = _worker(
+            queue, {}, batch_handlers={TaskType.CONFIRM_TX: confirm_all}, max_batch=2
+        )
+        asyncio.run(worker.drain())
+        assert sorted(sizes) == [1, 2, 2]
+
+    def test_batch_outcomes_settle_each_task(self):
+        queue = InMemoryTaskQueue(max_retries=0)
+        ok = queue.enqueue(TaskType.CONFIRM_TX, {})
+        bad = queue.enqueue(TaskType.CONFIRM_TX, {})
+
+        async def confirm_all(tasks):
+            return {ok.task_id: {"ok": True}, bad.task_id: RuntimeError("rpc down")}
+
+        asyncio.run(
+            _worker(queue, {}, batch_handlers={TaskType.CONFIRM_TX: confirm_all}).drain()
+        )
+        assert queue.get(ok.task_id).result == {"ok": True}
+        assert queue.get(bad.task_id).status == TaskStatus.DEAD_LETTER
+        assert queue.get(bad.task_id).error == "rpc down"
+
+    def test_lease_is_extended_while_handler_runs(self, tmp_path):
+        queue = DurableTaskQueue(db_path=str(tmp_path / "tasks.db"), visibility_timeout_s=0.2)
+        queue.enqueue(TaskType.CONFIRM_TX, {})
+        redelivered = []
+
+        async def slow(t):
+            await asyncio.sleep(0.5)
+            redelivered.extend(await asyncio.to_thread(queue.dequeue_batch, 5))
+
+        asyncio.run(_worker(queue, {TaskType.CONFIRM_TX: slow}).drain())
+        assert redelivered == []
+        assert queue.counts()["completed"] == 1
+
+
+# ---------------------------------------------------------------------------
+# service_handlers
+# ---------------------------------------------------------------------------
+
+class TestServiceHandlers:
+    @pytest.fixture()
+    def services(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DR_CHAIN_MODE", "simulated")
+        db_path = str(tmp_path / "svc.db")
+        return SubmitterService(db_path=db_path), ICMService(db_path=db_path)
+
+    def test_confirm_tx_resolves_through_watcher(self, services):
+        submitter, icm = services
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0xabc"})
+        handlers = service_handlers(submitter, None, icm)
+        try:
+            asyncio.run(_worker(queue, handlers).drain())
+        finally:
+            submitter.tx_watcher.close()
+        done = queue.get(task.task_id)
+        assert done.status == TaskStatus.COMPLETED
+        assert done.result["tx_state"] == "confirmed"
+
+    def test_unknown_message_fails_without_retry(self, services):
+        submitter, icm = services
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.ICM_DELIVER, {"message_id": "msg-missing"})
+        asyncio.run(_worker(queue, service_handlers(submitter, None, icm)).drain())
+        failed = queue.get(task.task_id)
+        assert failed.status == TaskStatus.FAILED and failed.retry_count == 0
+        assert "not found" in failed.error
+
+    def test_confirm_tx_batch_shares_lookup_and_reconcile(self, services, monkeypatch):
+        submitter, icm = services
+        reconciled = []
+        monkeypatch.setattr(
+            submitter, "reconcile_txs", lambda event_id=None: reconciled.append(event_id)
+        )
+        queue = InMemoryTaskQueue()
+        a = queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0xaa", "event_id": "evt-1"})
+        b = queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0xaa", "event_id": "evt-1"})
+        c = queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0xbb", "event_id": "evt-2"})
+        bad = queue.enqueue(TaskType.CONFIRM_TX, {})
+        worker = _worker(queue, {}, batch_handlers=service_batch_handlers(submitter))
+        try:
+            asyncio.run(worker.drain())
+        finally:
+            submitter.tx_watcher.close()
+        assert worker.health()["batches"] == 1
+        assert [queue.get(t.task_id).result["tx_state"] for t in (a, b, c)] == ["confirmed"] * 3
+        assert queue.get(c.task_id).result["tx_hash"] == "0xbb"
+        assert "payload.tx_hash" in queue.get(bad.task_id).error
+        assert reconciled == ["evt-1", "evt-2"]
+
+    def test_payload_field_is_required(self, services):
+        submitter, icm = services
+        queue = InMemoryTaskQueue()
+        task = queue.enqueue(TaskType.SETTLE_EVENT, {})
+        asyncio.run(_worker(queue, service_handlers(submitter, None, icm)).drain())
+        assert "payload.event_id" in queue.get(task.task_id).error
+
+
+# ---------------------------------------------------------------------------
+# create_app lifespan
+# ---------------------------------------------------------------------------
+
+def test_app_worker_runs_enqueued_task(tmp_path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "simulated")
+    app = create_app(db_path=str(tmp_path / "app.db"))
+    with TestClient(app) as client:
+        task_id = client.post(
+            "/v1/tasks",
+            json={"task_type": "confirm_tx", "payload": {"tx_hash": "0xfeed"}},
+            headers=OP_HEADERS,
+        ).json()["task_id"]
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            status = client.get(f"/v1/tasks/{task_id}", headers=OP_HEADERS).json()["status"]
+            if status == "completed":
+                break
+            time.sleep(0.05)
+        assert status == "completed"
+        assert client.get("/healthz").json()["task_worker"]["completed"] == 1
+
+
+def test_app_shutdown_stops_dispatcher(tmp_path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "simulated")
+    app = create_app(db_path=str(tmp_path / "app.db"))
+    shutdowns = []
+    monkeypatch.setattr(app.state.dispatcher, "shutdown", lambda: shutdowns.append(True))
+    with TestClient(app):
+        assert shutdowns == []
+    assert shutdowns == [True]
+
+
+def test_app_worker_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("DR_TASK_WORKER", "off")
+    app = create_app(db_path=str(tmp_path / "app.db"))
+    assert app.state.task_worker is None
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
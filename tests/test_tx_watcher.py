@@ -0,0 +1,267 @@
+"""Tests for the background tx confirmation watcher."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.dto import EventCreateRequest, ProofSubmitRequest
+from services.submitter import ServiceError, SubmitterService
+from services.tx_watcher import TxWatcher
+
+
+class FakeChecker:
+    """Reports hashes as submitted until they are marked confirmed."""
+
+    def __init__(self) -> None:
+        self.confirmed: set[str] = set()
+        self.calls: list[list[str]] = []
+        self.error: Exception | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self, tx_hashes: list[str]) -> dict:
+        with self._lock:
+            self.calls.append(sorted(tx_hashes))
+        if self.error is not None:
+            raise self.error
+        return {
+            h: {
+                "tx_state": "confirmed" if h in self.confirmed else "submitted",
+                "tx_fee_wei": "21000" if h in self.confirmed else None,
+                "tx_confirmed_at": "2026-03-07T14:54:00Z" if h in self.confirmed else None,
+                "tx_error": None,
+            }
+            for h in tx_hashes
+        }
+
+
+@pytest.fixture()
+def checker() -> FakeChecker:
+    return FakeChecker()
+
+
+@pytest.fixture()
+def watcher(checker: FakeChecker):
+    w = TxWatcher(checker, poll_seconds=0.05)
+    yield w
+    w.close()
+
+
+# ---------------------------------------------------------------------------
+# TxWatcher
+# ---------------------------------------------------------------------------
+
+
+class TestTxWatcher:
+    def test_wait_returns_published_result(self, watcher: TxWatcher, checker: FakeChecker):
+        checker.confirmed.add("0xaa")
+        result = watcher.wait("0xaa", timeout=2)
+        assert result is not None
+        assert result["tx_state"] == "confirmed"
+        assert watcher.pending == []
+
+    def test_wait_times_out_and_stops_tracking(self, watcher: TxWatcher):
+        assert watcher.wait("0xbb", timeout=0.2) is None
+        assert watcher.pending == []
+
+    def test_waiters_share_one_batched_lookup(
+        self, watcher: TxWatcher, checker: FakeChecker
+    ):
+        results: dict[str, dict | None] = {}
+
+        def waiter(tx_hash: str) -> None:
+            results[tx_hash] = watcher.wait(tx_hash, timeout=2)
+
+        threads = [threading.Thread(target=waiter, args=(h,)) for h in ("0x1", "0x2", "0x1")]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        checker.confirmed.update({"0x1", "0x2"})
+        for t in threads:
+            t.join(timeout=3)
+
+        assert results["0x1"]["tx_state"] == "confirmed"
+        assert results["0x2"]["tx_state"] == "confirmed"
+        assert all(len(set(call)) == len(call) for call in checker.calls)
+        assert any(call == ["0x1", "0x2"] for call in checker.calls)
+
+    def test_lookup_error_is_raised_to_waiters(
+        self, watcher: TxWatcher, checker: FakeChecker
+    ):
+        checker.error = ServiceError(502, "CHAIN_TX_FAILED", "rpc down")
+        with pytest.raises(ServiceError) as exc_info:
+            watcher.wait("0xcc", timeout=2)
+        assert exc_info.value.code == "CHAIN_TX_FAILED"
+
+    def test_wait_async_does_not_block_event_loop(
+        self, watcher: TxWatcher, checker: FakeChecker
+    ):
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        async def scenario():
+            task = asyncio.create_task(ticker())
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.2, checker.confirmed.add, "0xdd")
+            result = await watcher.wait_async("0xdd", timeout=2)
+            task.cancel()
+            return result
+
+        result = asyncio.run(scenario())
+        assert result["tx_state"] == "confirmed"
+        assert ticks >= 5
+
+
+# ---------------------------------------------------------------------------
+# SubmitterService integration
+# ---------------------------------------------------------------------------
+
+
+def test_submit_proof_resumes_when_create_confirms(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "fuji-live")
+    monkeypatch.setenv("DR_TX_CONFIRM_MODE", "hybrid")
+    monkeypatch.setenv("DR_PROOF_CREATE_WAIT_SECONDS", "5")
+    monkeypatch.setenv("DR_TX_WATCH_POLL_SECONDS", "0.2")
+
+    checker = FakeChecker()
+    create_hash = "0x" + "1" * 64
+
+    def fake_chain_tx(self, action: str, payload: dict):
+        tx_hash = create_hash if action == "create_event" else "0x" + "2" * 64
+        state = "submitted" if action == "create_event" else "confirmed"
+        return {
+            "tx_hash": tx_hash,
+            "tx_fee_wei": None,
+            "tx_state": state,
+            "tx_submitted_at": "2026-03-07T14:53:24Z",
+            "tx_confirmed_at": None,
+            "tx_error": None,
+        }
+
+    monkeypatch.setattr(SubmitterService, "_chain_tx", fake_chain_tx)
+    monkeypatch.setattr(
+        SubmitterService, "_check_txs", lambda self, tx_hashes: checker(tx_hashes)
+    )
+
+    svc = SubmitterService(db_path=str(tmp_path / "watcher.db"))
+    svc.create_event(
+        EventCreateRequest(
+            event_id="event-watch",
+            start_time="2026-03-07T14:54:21Z",
+            end_time="2026-03-07T15:54:21Z",
+            target_kw=200,
+            reward_rate=10,
+            penalty_rate=5,
+        )
+    )
+    threading.Timer(0.5, checker.confirmed.add, args=(create_hash,)).start()
+
+    started = time.monotonic()
+    proof = svc.submit_proof(
+        ProofSubmitRequest(
+            event_id="event-watch",
+            site_id="site-a",
+            baseline_kwh=150,
+            actual_kwh=40,
+            uri="ipfs://site-a-watch",
+        ),
+        actor_id="site-a",
+    )
+    assert proof.site_id == "site-a"
+    assert time.monotonic() - started < 3
+    row = svc._db.fetchone(
+        "SELECT tx_state, tx_fee_wei FROM events WHERE event_id = ?", ("event-watch",)
+    )
+    assert row["tx_state"] == "confirmed"
+    assert row["tx_fee_wei"] == "21000"
+    svc.tx_watcher.close()
+
+
+
+def test_async_gate_runs_blocking_steps_off_loop(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "fuji-live")
+    monkeypatch.setenv("DR_TX_CONFIRM_MODE", "hybrid")
+    monkeypatch.setenv("DR_PROOF_CREATE_WAIT_SECONDS", "5")
+    monkeypatch.setenv("DR_TX_WATCH_POLL_SECONDS", "0.2")
+
+    checker = FakeChecker()
+    create_hash = "0x" + "3" * 64
+    checker.confirmed.add(create_hash)
+
+    def fake_chain_tx(self, action: str, payload: dict):
+        return {
+            "tx_hash": create_hash if action == "create_event" else "0x" + "4" * 64,
+            "tx_fee_wei": None,
+            "tx_state": "submitted" if action == "create_event" else "confirmed",
+            "tx_submitted_at": "2026-03-07T14:53:24Z",
+            "tx_confirmed_at": None,
+            "tx_error": None,
+        }
+
+    monkeypatch.setattr(SubmitterService, "_chain_tx", fake_chain_tx)
+    monkeypatch.setattr(
+        SubmitterService, "_check_txs", lambda self, tx_hashes: checker(tx_hashes)
+    )
+    svc = SubmitterService(db_path=str(tmp_path / "gate.db"))
+    svc.create_event(
+        EventCreateRequest(
+            event_id="event-gate",
+            start_time="2026-03-07T14:54:21Z",
+            end_time="2026-03-07T15:54:21Z",
+            target_kw=200,
+            reward_rate=10,
+            penalty_rate=5,
+        )
+    )
+    lanes: list[tuple[str, str]] = []
+
+    def lane(name: str):
+        async def run(fn, *args, **kwargs):
+            lanes.append((name, fn.__name__))
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+        return run
+
+    try:
+        asyncio.run(
+            svc.wait_for_create_confirmation(
+                "event-gate", run_chain=lane("chain"), run_db=lane("db")
+            )
+        )
+        assert lanes[0] == ("chain", "_reconcile_pending_txs")
+        assert all(name == "db" for name, _ in lanes[1:])
+        monkeypatch.setattr(
+            svc, "_ensure_create_confirmed_before_proof",
+            lambda event_id: pytest.fail("confirmation checked twice"),
+        )
+        svc.submit_proof(
+            ProofSubmitRequest(
+                event_id="event-gate",
+                site_id="site-a",
+                baseline_kwh=150,
+                actual_kwh=40,
+                uri="ipfs://site-a-gate",
+            ),
+            actor_id="site-a",
+            create_confirmed=True,
+        )
+    finally:
+        svc.tx_watcher.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,34 @@
+"""Tests for the standalone task worker entry point."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.task_queue import DurableTaskQueue, TaskStatus, TaskType
+from services.worker import build_worker
+
+
+def test_build_worker_runs_durable_tasks(tmp_path, monkeypatch):
+    monkeypatch.setenv("DR_CHAIN_MODE", "simulated")
+    worker, dispatch = build_worker(str(tmp_path / "worker.db"))
+    try:
+        assert isinstance(worker.queue, DurableTaskQueue)
+        task = worker.queue.enqueue(TaskType.CONFIRM_TX, {"tx_hash": "0xabc"})
+        asyncio.run(worker.drain())
+    finally:
+        dispatch.shutdown()
+    done = worker.queue.get(task.task_id)
+    assert done.status == TaskStatus.COMPLETED
+    assert done.result["tx_state"] == "confirmed"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))